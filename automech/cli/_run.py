@@ -83,6 +83,7 @@ def main(path: str = ".", safemode_off: bool = False):
             inp_key_dct["run_prefix"],
             inp_key_dct["save_prefix"],
             path,
+            incremental=inp_key_dct["incremental"],
         )
         ioprinter.program_exit("thermo")
 
@@ -119,6 +120,7 @@ def main(path: str = ".", safemode_off: bool = False):
             inp_key_dct["run_prefix"],
             inp_key_dct["save_prefix"],
             path,
+            incremental=inp_key_dct["incremental"],
         )
         ioprinter.program_exit("ktp")
 
@@ -12,9 +12,8 @@ from mechanalyzer.inf import spc as sinfo
 import elstruct
 from automol.geom import ring_fragments_geometry as _fragment_ring_geo
 from mechlib.filesys import save
+from mechlib.filesys import unique
 from mechroutines.es._routines.conformer import _saved_cnf_info
-from mechroutines.es._routines.conformer import _sym_unique
-from mechroutines.es._routines.conformer import _geo_unique
 
 THEORY_DCT = {
     'lvl_wbs': {
@@ -764,8 +763,8 @@ def main(insert_dct):
     inf_obj.utc_start_time = autofile.schema.utc_time()
     _, saved_geos, saved_enes = _saved_cnf_info(
         cnf_fs, mod_thy_info)
-    if _geo_unique(geo, ene, saved_geos, saved_enes, zrxn=zrxn):
-        sym_id = _sym_unique(
+    if unique.geo_unique(geo, ene, saved_geos, saved_enes, zrxn=zrxn):
+        sym_id = unique.sym_unique(
             geo, ene, saved_geos, saved_enes)
         if sym_id is None:
             if cnf_fs[0].file.info.exists():
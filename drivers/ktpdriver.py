@@ -13,17 +13,26 @@
 
 from mechroutines.ktp import tsk as ktp_tasks
 from mechroutines.ktp import label as ktp_label
+from mechroutines.ktp import read_inf_cache
+from mechroutines.ktp import write_inf_cache
+from mechroutines.thermo import basis as thmbasis
+from mechlib import filesys
+from mechlib import parallel
 from mechlib.amech_io import parser
 from mechlib.amech_io import rate_paths
+from mechlib.amech_io import read_task_graph
+from mechlib.amech_io import write_task_graph
 from mechlib.amech_io import printer as ioprinter
 from mechlib.reaction import split_unstable_pes
+from mechlib.reaction import instability_verdicts
 
 
 def run(pes_rlst, pes_grp_dct,
         ktp_tsk_lst,
         spc_dct, glob_dct,
         thy_dct, pes_mod_dct, spc_mod_dct,
-        run_prefix, save_prefix, mdriver_path):
+        run_prefix, save_prefix, mdriver_path,
+        incremental=False):
     """ Executes all kinetics tasks.
 
         :param pes_rlst: species from PESs to run
@@ -44,6 +53,8 @@ def run(pes_rlst, pes_grp_dct,
         :type save_prefix: str
         :param mdriver_path: path where mechdriver is running
         :type mdriver_path: str
+        :param incremental: skip MESS runs and fits whose inputs are unchanged
+        :type incremental: bool
     """
 
     # ------------------------------------------------------------------ #
@@ -57,78 +68,144 @@ def run(pes_rlst, pes_grp_dct,
     # Group the PESs into lists
     pes_grps_rlst = parser.rlst.pes_groups(pes_rlst, pes_grp_dct)
 
-    # --------------------------------------- #
-    # LOOP OVER ALL OF THE SUBPES in PES_RLST #
-    # --------------------------------------- #
-    for (pes_grp_rlst, pes_param_dct) in pes_grps_rlst:
-
-        print('WORKING ON PES')
-        print(pes_grp_rlst, pes_param_dct)
-
-        # Generate the paths needed for MESSRATE calculations
-        rate_paths_dct = rate_paths(pes_grp_rlst, run_prefix)
-
-        # Process info required ro run all of the PESs
-        if write_rate_tsk is not None:
-            nprocs = write_rate_tsk[-1]['nprocs']
-        elif run_fit_tsk is not None:
-            nprocs = run_fit_tsk[-1]['nprocs']
-        else:
-            nprocs = run_rate_tsk[-1]['nprocs']
-        if write_rate_tsk is not None:
-            proc_tsk = write_rate_tsk
-        else:
-            proc_tsk = run_fit_tsk
-        spc_dct, all_rxn_lst, all_instab_chnls, label_dct = _process(
-            proc_tsk, ktp_tsk_lst, pes_grp_rlst,
-            spc_mod_dct, spc_dct, glob_dct,
-            run_prefix, save_prefix, nprocs=nprocs)
-
-        # ---------------------------------------- #
-        # WRITE AND RUN TASK FOR EACH PES IN GROUP #
-        # ---------------------------------------- #
-        for pesgrp_num, (pes_inf, rxn_lst) in enumerate(pes_grp_rlst.items()):
-
-            # Print PES Channels that are being run
-            ioprinter.runlst(pes_inf, rxn_lst)
-
-            # Write the MESS file
+    # Locate the pf filesystems from the current SAVE filesystem
+    filesys.models.clear_pf_filesys()
+
+    # If several MESS jobs are to be run at once, write the inputs for every
+    # PES first, then run the MESS jobs concurrently and fit the rates after
+    mess_njobs = run_rate_tsk[-1]['njobs'] if run_rate_tsk is not None else 1
+    fit_njobs = run_fit_tsk[-1]['njobs'] if run_fit_tsk is not None else 1
+    concurrent_mess = mess_njobs > 1
+    mess_jobs, fit_grps = [], []
+
+    # Read the record of the task units run previously, if requested
+    graph_dct = read_task_graph(run_prefix) if incremental else None
+
+    # If requested, read the data for each reactant and product once for all
+    # of the PESs, keeping it in the run filesystem for the next run
+    inf_cache = read_inf_cache(run_prefix) if incremental else None
+    if incremental:
+        thmbasis.read_basis_energy_table(run_prefix)
+
+    # Fork the workers for the parallel sections of all of the tasks, sized
+    # for the largest of them, which inherit the model and theory information
+    tsks = (write_rate_tsk, run_rate_tsk, run_fit_tsk)
+    pool_nprocs = max(
+        [tsk[-1]['nprocs'] for tsk in tsks if tsk is not None] +
+        [mess_njobs, fit_njobs])
+    with parallel.worker_pool(
+            pool_nprocs, shared=(thy_dct, pes_mod_dct, spc_mod_dct)):
+
+        # --------------------------------------- #
+        # LOOP OVER ALL OF THE SUBPES in PES_RLST #
+        # --------------------------------------- #
+        for (pes_grp_rlst, pes_param_dct) in pes_grps_rlst:
+
+            print('WORKING ON PES')
+            print(pes_grp_rlst, pes_param_dct)
+
+            # Generate the paths needed for MESSRATE calculations
+            rate_paths_dct = rate_paths(pes_grp_rlst, run_prefix)
+
+            # Process info required ro run all of the PESs
             if write_rate_tsk is not None:
                 nprocs = write_rate_tsk[-1]['nprocs']
-                tsk_key_dct = write_rate_tsk[-1]
-                pes_param_dct = ktp_tasks.write_messrate_task(
-                    pesgrp_num, pes_inf, all_rxn_lst[pesgrp_num],
-                    tsk_key_dct, pes_param_dct,
-                    spc_dct,
-                    thy_dct, pes_mod_dct, spc_mod_dct,
-                    all_instab_chnls[pesgrp_num], label_dct,
-                    rate_paths_dct, run_prefix, save_prefix, nprocs=nprocs)
-
-            # Run mess to produce rates (currently nothing from tsk lst used)
-            if run_rate_tsk is not None:
+            elif run_fit_tsk is not None:
+                nprocs = run_fit_tsk[-1]['nprocs']
+            else:
                 nprocs = run_rate_tsk[-1]['nprocs']
-                tsk_key_dct = run_rate_tsk[-1]
-                ktp_tasks.run_messrate_task(
-                    pes_inf, all_rxn_lst[pesgrp_num],
-                    tsk_key_dct, spc_dct, rate_paths_dct)
+            if write_rate_tsk is not None:
+                proc_tsk = write_rate_tsk
+            else:
+                proc_tsk = run_fit_tsk
+            spc_dct, all_rxn_lst, all_instab_chnls, label_dct = _process(
+                proc_tsk, ktp_tsk_lst, pes_grp_rlst,
+                spc_mod_dct, spc_dct, glob_dct,
+                run_prefix, save_prefix, nprocs=nprocs)
+
+            # ---------------------------------------- #
+            # WRITE AND RUN TASK FOR EACH PES IN GROUP #
+            # ---------------------------------------- #
+            for pesgrp_num, (pes_inf, rxn_lst) in enumerate(pes_grp_rlst.items()):
 
-        # ---------------------------------------- #
-        # FIT THE COMBINES RATES FOR ENTIRE GROUP  #
-        # ---------------------------------------- #
+                # Print PES Channels that are being run
+                ioprinter.runlst(pes_inf, rxn_lst)
 
-        # Fit rates to functional forms; write parameters to ChemKin file
-        if run_fit_tsk is not None:
-            nprocs = run_fit_tsk[-1]['nprocs']
-            tsk_key_dct = run_fit_tsk[-1]
-            ktp_tasks.run_fits_task(
-                pes_grp_rlst, pes_param_dct, rate_paths_dct, mdriver_path,
-                pes_mod_dct, spc_mod_dct, thy_dct,
-                tsk_key_dct, spc_dct)
+                # Write the MESS file
+                if write_rate_tsk is not None:
+                    nprocs = write_rate_tsk[-1]['nprocs']
+                    tsk_key_dct = write_rate_tsk[-1]
+                    pes_param_dct = ktp_tasks.write_messrate_task(
+                        pesgrp_num, pes_inf, all_rxn_lst[pesgrp_num],
+                        tsk_key_dct, pes_param_dct,
+                        spc_dct,
+                        thy_dct, pes_mod_dct, spc_mod_dct,
+                        all_instab_chnls[pesgrp_num], label_dct,
+                        rate_paths_dct, run_prefix, save_prefix,
+                        nprocs=nprocs, inf_cache=inf_cache)
+                    if incremental:
+                        write_inf_cache(run_prefix, inf_cache)
+                        thmbasis.write_basis_energy_table(run_prefix)
+
+                # Run mess to produce rates (currently nothing from tsk lst used)
+                if run_rate_tsk is not None:
+                    nprocs = run_rate_tsk[-1]['nprocs']
+                    tsk_key_dct = run_rate_tsk[-1]
+                    if not concurrent_mess:
+                        ktp_tasks.run_messrate_task(
+                            pes_inf, all_rxn_lst[pesgrp_num],
+                            tsk_key_dct, spc_dct, rate_paths_dct,
+                            graph_dct=graph_dct)
+                    else:
+                        mess_jobs.append(ktp_tasks.messrate_job(
+                            pes_inf, all_rxn_lst[pesgrp_num],
+                            tsk_key_dct, spc_dct, rate_paths_dct))
+
+            # ---------------------------------------- #
+            # FIT THE COMBINES RATES FOR ENTIRE GROUP  #
+            # ---------------------------------------- #
+
+            # Fit rates to functional forms; write parameters to ChemKin file
+            if run_fit_tsk is not None:
+                fit_grps.append((pes_grp_rlst, pes_param_dct, rate_paths_dct))
+
+            if not concurrent_mess:
+                _run_fits(fit_grps, run_fit_tsk, mdriver_path,
+                          pes_mod_dct, spc_mod_dct, thy_dct, spc_dct,
+                          nprocs=fit_njobs, graph_dct=graph_dct)
+                fit_grps = []
+                if graph_dct is not None:
+                    write_task_graph(run_prefix, graph_dct)
+
+        # ------------------------------------------------------ #
+        # RUN MESS AND FIT THE RATES FOR ALL PES GROUPS AT ONCE  #
+        # ------------------------------------------------------ #
+        if concurrent_mess:
+            ktp_tasks.run_messrate_jobs(
+                mess_jobs, njobs=mess_njobs, graph_dct=graph_dct)
+            _run_fits(fit_grps, run_fit_tsk, mdriver_path,
+                      pes_mod_dct, spc_mod_dct, thy_dct, spc_dct,
+                      nprocs=fit_njobs, graph_dct=graph_dct)
+            if graph_dct is not None:
+                write_task_graph(run_prefix, graph_dct)
 
 
 # ------- #
 # UTILITY #
 # ------- #
+def _run_fits(fit_grps, run_fit_tsk, mdriver_path,
+              pes_mod_dct, spc_mod_dct, thy_dct, spc_dct, nprocs=1,
+              graph_dct=None):
+    """ Fit the rates of each PES group and write its CKIN file
+    """
+    for pes_grp_rlst, pes_param_dct, rate_paths_dct in fit_grps:
+        ktp_tasks.run_fits_task(
+            pes_grp_rlst, pes_param_dct, rate_paths_dct, mdriver_path,
+            pes_mod_dct, spc_mod_dct, thy_dct,
+            run_fit_tsk[-1], spc_dct,
+            nprocs=nprocs, graph_dct=graph_dct)
+
+
 def _process(tsk, ktp_tsk_lst, pes_grp_rlst,
              spc_mod_dct, spc_dct, glob_dct,
              run_prefix, save_prefix, nprocs=1):
@@ -141,6 +218,16 @@ def _process(tsk, ktp_tsk_lst, pes_grp_rlst,
 
     spc_mod_dct_i = spc_mod_dct[spc_mod]
 
+    # Find the verdicts for the species of all of the PESs in one pass
+    ioprinter.message('Identifying stability of all species...', newline=1)
+    spc_names = ()
+    for rxn_lst in pes_grp_rlst.values():
+        for _, (rcts, prds) in rxn_lst:
+            spc_names += rcts + prds
+    instability_verdicts(
+        spc_dct, spc_names, spc_mod_dct_i['vib']['geolvl'][1][1],
+        save_prefix, nprocs=nprocs)
+
     label_dct = {}
     all_chkd_rxn_lst, all_instab_chnls = (), ()
     for _, (pes_inf, rxn_lst) in enumerate(pes_grp_rlst.items()):
@@ -157,7 +244,6 @@ def _process(tsk, ktp_tsk_lst, pes_grp_rlst,
             ts_dct, spc_dct, glob_dct)
 
         # Set reaction list with unstable species broken apart
-        ioprinter.message('Identifying stability of all species...', newline=1)
         chkd_rxn_lst, instab_chnls = split_unstable_pes(
             rxn_lst, spc_dct, spc_mod_dct_i, save_prefix, nprocs=nprocs)
 
@@ -5,6 +5,8 @@
 
 from mechroutines.proc import run_tsk
 from mechroutines.proc import write_missing_data_report
+from mechlib import filesys
+from mechlib import parallel
 from mechlib.amech_io import parser
 from mechlib.amech_io import printer as ioprinter
 
@@ -26,6 +28,9 @@ def run(pes_rlst, spc_rlst,
         :type run_inp_dct: dict[]
     """
 
+    # Locate the pf filesystems from the current SAVE filesystem
+    filesys.models.clear_pf_filesys()
+
     # Build the spc and ts queues
     spc_queue, ts_queue = (), ()
     run_rlst = parser.rlst.combine(pes_rlst, spc_rlst)
@@ -55,30 +60,35 @@ def run(pes_rlst, spc_rlst,
     # Set master missing data list to write out at the end of run
     missing_data = ()
 
-    # Loop over Tasks
-    for tsk_lst in proc_tsk_lst:
+    # Fork the workers for the parallel sections of the tasks, which
+    # inherit the species and theory information rather than receiving it
+    nprocs = max(
+        (tsk_lst[2].get('nprocs', 1) for tsk_lst in proc_tsk_lst), default=1)
+    with parallel.worker_pool(nprocs, shared=(spc_dct, thy_dct)):
+        # Loop over Tasks
+        for tsk_lst in proc_tsk_lst:
 
-        [obj, tsk, prnt_keyword_dct] = tsk_lst
+            [obj, tsk, prnt_keyword_dct] = tsk_lst
 
-        # Build the queue of species based on user request
-        if obj == 'spc':
-            obj_queue = spc_queue
-        elif obj == 'ts':
-            obj_queue = ts_queue
-        elif obj == 'all':
-            obj_queue = spc_queue + ts_queue
+            # Build the queue of species based on user request
+            if obj == 'spc':
+                obj_queue = spc_queue
+            elif obj == 'ts':
+                obj_queue = ts_queue
+            elif obj == 'all':
+                obj_queue = spc_queue + ts_queue
 
-        # Set up model dictionaries for the code to use
-        spc_mod_dct_i = spc_mod_dct['global']
-        pes_mod_dct_i = pes_mod_dct['global']
+            # Set up model dictionaries for the code to use
+            spc_mod_dct_i = spc_mod_dct['global']
+            pes_mod_dct_i = pes_mod_dct['global']
 
-        # Run task and collate info about missing data
-        missing_data += run_tsk(
-            tsk, obj_queue,
-            prnt_keyword_dct,
-            spc_dct, thy_dct,
-            spc_mod_dct_i, pes_mod_dct_i,
-            run_prefix, save_prefix, mdriver_path)
+            # Run task and collate info about missing data
+            missing_data += run_tsk(
+                tsk, obj_queue,
+                prnt_keyword_dct,
+                spc_dct, thy_dct,
+                spc_mod_dct_i, pes_mod_dct_i,
+                run_prefix, save_prefix, mdriver_path)
 
     # Write a report that details what data is missing
     write_missing_data_report(missing_data, spc_dct)
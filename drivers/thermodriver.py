@@ -18,20 +18,24 @@
 """
 
 from mechroutines.thermo import tsk as thermo_tasks
+from mechroutines.thermo import basis as thmbasis
 from mechlib import filesys
+from mechlib import parallel
 from mechlib.amech_io import writer
 from mechlib.amech_io import parser
 from mechlib.amech_io import printer as ioprinter
 from mechlib.amech_io import thermo_paths
+from mechlib.amech_io import read_task_graph
+from mechlib.amech_io import write_task_graph
 from mechlib.reaction import split_unstable_full
-from autorun import execute_function_in_parallel
 
 
 def run(pes_rlst, spc_rlst,
         therm_tsk_lst,
         pes_mod_dct, spc_mod_dct,
         spc_dct, thy_dct,
-        run_prefix, save_prefix, mdriver_path):
+        run_prefix, save_prefix, mdriver_path,
+        incremental=False):
     """ Executes all thermochemistry tasks.
 
         :param pes_rlst: species from PESs to run
@@ -54,6 +58,8 @@ def run(pes_rlst, spc_rlst,
         :type save_prefix: str
         :param mdriver_path: path where mechdriver is running
         :type mdriver_path: str
+        :param incremental: skip task units whose inputs are unchanged
+        :type incremental: bool
     """
 
     # Print Header
@@ -67,6 +73,9 @@ def run(pes_rlst, spc_rlst,
     # PREPARE INFORMATION TO PASS TO THERMDRIVER TASKS #
     # ------------------------------------------------ #
 
+    # Locate the pf filesystems from the current SAVE filesystem
+    filesys.models.clear_pf_filesys()
+
     # Parse Tasks
     write_messpf_tsk = parser.run.extract_task('write_mess', therm_tsk_lst)
     run_messpf_tsk = parser.run.extract_task('run_mess', therm_tsk_lst)
@@ -86,71 +95,97 @@ def run(pes_rlst, spc_rlst,
         cnf_range = run_messpf_tsk[-1]['cnf_range']
         sort_str = run_messpf_tsk[-1]['sort']
         nprocs = run_messpf_tsk[-1]['nprocs']
-    ret = _set_spc_queue(
-        spc_mod_dct, pes_rlst, spc_rlst,
-        run_fit_tsk,
-        spc_dct, thy_dct,
-        save_prefix, run_prefix,
-        cnf_range, sort_str, nprocs=nprocs)
-    spc_grp_dct, spc_locs_dct, thm_paths_dct, sort_info_lst = ret
+    # Read the energies of the basis species kept by previous runs, if
+    # requested, before the workers are forked so that they see them
+    if incremental and run_fit_tsk is not None:
+        thmbasis.read_basis_energy_table(run_prefix)
 
-    # ----------------------------------- #
-    # RUN THE REQUESTED THERMDRIVER TASKS #
-    # ----------------------------------- #
+    # Fork the workers for the parallel sections of the tasks, which
+    # inherit the species and theory information rather than receiving it
+    with parallel.worker_pool(
+            nprocs, shared=(spc_dct, thy_dct, spc_mod_dct, pes_mod_dct)):
+        ret = _set_spc_queue(
+            spc_mod_dct, pes_rlst, spc_rlst,
+            run_fit_tsk,
+            spc_dct, thy_dct,
+            save_prefix, run_prefix,
+            cnf_range, sort_str, nprocs=nprocs)
+        spc_grp_dct, spc_locs_dct, thm_paths_dct, sort_info_lst = ret
 
-    # Write and Run MESSPF inputs to generate the partition functions
-    if write_messpf_tsk is not None:
-        thermo_tasks.write_messpf_task(
-            write_messpf_tsk, spc_locs_dct, spc_dct,
-            pes_mod_dct, spc_mod_dct,
-            run_prefix, save_prefix, thm_paths_dct)
-
-    # Run the MESSPF files that have been written
-    if run_messpf_tsk is not None:
-        thermo_tasks.run_messpf_task(
-            run_messpf_tsk, spc_locs_dct, spc_dct,
-            thm_paths_dct)
-
-    # Use MESS partition functions to compute thermo quantities
-    if run_fit_tsk is not None:
+        # Read the record of the task units run previously, if requested
+        graph_dct = read_task_graph(run_prefix) if incremental else None
 
-        ioprinter.nasa('header')
-        spc_mods, pes_mod = parser.models.extract_models(run_fit_tsk)
-        pes_mod_dct_i = pes_mod_dct[pes_mod]
+        # ----------------------------------- #
+        # RUN THE REQUESTED THERMDRIVER TASKS #
+        # ----------------------------------- #
 
-        # Get the reference scheme and energies (ref in different place)
-        ref_scheme = pes_mod_dct_i['therm_fit']['ref_scheme']
-        ref_enes = pes_mod_dct_i['therm_fit']['ref_enes']
-        spc_dct = thermo_tasks.get_heats_of_formation(
-            spc_locs_dct, spc_dct, spc_mods, spc_mod_dct,
-            ref_scheme, ref_enes, run_prefix, save_prefix, 
-            nprocs=nprocs)
+        # Write and Run MESSPF inputs to generate the partition functions
+        if write_messpf_tsk is not None:
+            thermo_tasks.write_messpf_task(
+                write_messpf_tsk, spc_locs_dct, spc_dct,
+                pes_mod_dct, spc_mod_dct,
+                run_prefix, save_prefix, thm_paths_dct,
+                nprocs=nprocs, graph_dct=graph_dct)
+            if graph_dct is not None:
+                write_task_graph(run_prefix, graph_dct)
 
-        # Combine species for pf generation
-        tsk_key_dct = run_fit_tsk[-1]
-        if tsk_key_dct['combine'] == 'stereo':
-            spc_dct = thermo_tasks.multi_species_pf(
+        # Run the MESSPF files that have been written
+        if run_messpf_tsk is not None:
+            thermo_tasks.run_messpf_task(
                 run_messpf_tsk, spc_locs_dct, spc_dct,
-                thm_paths_dct, spc_grp_dct)
-        else:
-            # spc_grp_dct = {name: (name,) for name in spc_locs_dct}
-            spc_dct = thermo_tasks.produce_boltzmann_weighted_conformers_pf(
-                run_messpf_tsk, spc_locs_dct, spc_dct,
-                thm_paths_dct)
+                thm_paths_dct, nprocs=nprocs, graph_dct=graph_dct,
+                spc_mod_dct=spc_mod_dct)
+            if graph_dct is not None:
+                write_task_graph(run_prefix, graph_dct)
+
+        # Use MESS partition functions to compute thermo quantities
+        if run_fit_tsk is not None:
+
+            ioprinter.nasa('header')
+            spc_mods, pes_mod = parser.models.extract_models(run_fit_tsk)
+            pes_mod_dct_i = pes_mod_dct[pes_mod]
+
+            # Get the reference scheme and energies (ref in different place)
+            ref_scheme = pes_mod_dct_i['therm_fit']['ref_scheme']
+            ref_enes = pes_mod_dct_i['therm_fit']['ref_enes']
+            # The heats of formation are added to the species in place
+            parallel.unshare(spc_dct)
+            spc_dct = thermo_tasks.get_heats_of_formation(
+                spc_locs_dct, spc_dct, spc_mods, spc_mod_dct,
+                ref_scheme, ref_enes, run_prefix, save_prefix, 
+                nprocs=nprocs)
+            if incremental:
+                thmbasis.write_basis_energy_table(run_prefix)
+
+            # Combine species for pf generation
+            tsk_key_dct = run_fit_tsk[-1]
+            if tsk_key_dct['combine'] == 'stereo':
+                spc_dct = thermo_tasks.multi_species_pf(
+                    run_messpf_tsk, spc_locs_dct, spc_dct,
+                    thm_paths_dct, spc_grp_dct)
+            else:
+                # spc_grp_dct = {name: (name,) for name in spc_locs_dct}
+                spc_dct = thermo_tasks.produce_boltzmann_weighted_conformers_pf(
+                    run_messpf_tsk, spc_locs_dct, spc_dct,
+                    thm_paths_dct)
 
-        # Write the NASA polynomials in CHEMKIN format
-        ckin_nasa_str_dct, ckin_path = thermo_tasks.nasa_polynomial_task(
-            mdriver_path, spc_locs_dct, thm_paths_dct, spc_dct,
-            spc_mod_dct, spc_mods, sort_info_lst, ref_scheme, spc_grp_dct)
+            # Write the NASA polynomials in CHEMKIN format
+            ckin_nasa_str_dct, ckin_path = thermo_tasks.nasa_polynomial_task(
+                mdriver_path, spc_locs_dct, thm_paths_dct, spc_dct,
+                spc_mod_dct, spc_mods, sort_info_lst, ref_scheme, spc_grp_dct,
+                nprocs=nprocs, graph_dct=graph_dct,
+                fit_method=tsk_key_dct['nasa_fit'])
+            if graph_dct is not None:
+                write_task_graph(run_prefix, graph_dct)
 
-        for idx, nasa_str in ckin_nasa_str_dct.items():
-            ioprinter.print_thermo(
-                spc_dct, nasa_str,
-                spc_locs_dct, idx, spc_mods[0])
+            for idx, nasa_str in ckin_nasa_str_dct.items():
+                ioprinter.print_thermo(
+                    spc_dct, nasa_str,
+                    spc_locs_dct, idx, spc_mods[0])
 
-            # Write all of the NASA polynomial strings
-            writer.ckin.write_nasa_file(
-                nasa_str, ckin_path, idx=idx)
+                # Write all of the NASA polynomial strings
+                writer.ckin.write_nasa_file(
+                    nasa_str, ckin_path, idx=idx)
 
 
 def _set_spc_queue(
@@ -197,31 +232,18 @@ def _set_spc_locs_dct(
         cnf_range='min', sort_info_lst=None, saddle=False, nprocs=1):
     """ get a dictionary of locs
     """
-    def _par_spc_locs_dct_setter(
-            spc_dct, spc_mod_dct_i, run_prefix, save_prefix,
-            cnf_range, sort_info_lst, saddle, nlocs_procs,
-            spc_queue, output_queue=None):
-        spc_locs_dct = {}
-
-        for spc_name in spc_queue:
-            spc_locs_lst = filesys.models.get_spc_locs_lst(
-                spc_dct[spc_name], spc_mod_dct_i,
-                run_prefix, save_prefix, saddle=saddle,
-                cnf_range=cnf_range, sort_info_lst=sort_info_lst,
-                nprocs=nlocs_procs)
-            spc_locs_dct[spc_name] = spc_locs_lst
-        output_queue.put((spc_locs_dct,))
-    nspc_procs = 1
-    nlocs_procs = 1
+    # Split the species over the processes if there are enough of them,
+    # otherwise loop over the species and split their conformers
     if len(spc_queue) >= nprocs:
-        nspc_procs = nprocs
+        args = (
+            spc_dct, spc_mod_dct_i, run_prefix, save_prefix,
+            cnf_range, sort_info_lst, saddle, 1)
+        sub_spc_locs_dct_lst = parallel.execute_in_pool(
+            _spc_locs_dct_units, spc_queue, args, nprocs=nprocs)
     else:
-        nlocs_procs = nprocs
-    args = (
-        spc_dct, spc_mod_dct_i, run_prefix, save_prefix,
-        cnf_range, sort_info_lst, saddle, nlocs_procs)
-    sub_spc_locs_dct_lst = execute_function_in_parallel(
-        _par_spc_locs_dct_setter, spc_queue, args, nprocs=nspc_procs)
+        sub_spc_locs_dct_lst = [_spc_locs_dct(
+            spc_queue, spc_dct, spc_mod_dct_i, run_prefix, save_prefix,
+            cnf_range, sort_info_lst, saddle, nprocs)]
     # fill dictionary in order
     spc_locs_dct = {}
     for spc in spc_queue:
@@ -230,3 +252,30 @@ def _set_spc_locs_dct(
                 spc_locs_dct[spc] = sub_spc_locs_dct[spc]
                 break
     return spc_locs_dct
+
+
+def _spc_locs_dct_units(
+        spc_dct, spc_mod_dct_i, run_prefix, save_prefix,
+        cnf_range, sort_info_lst, saddle, nlocs_procs,
+        spc_queue, output_queue=None):
+    """ Get the locs of each species in a sublist of the queue
+    """
+    output_queue.put((_spc_locs_dct(
+        spc_queue, spc_dct, spc_mod_dct_i, run_prefix, save_prefix,
+        cnf_range, sort_info_lst, saddle, nlocs_procs),))
+
+
+def _spc_locs_dct(
+        spc_queue, spc_dct, spc_mod_dct_i, run_prefix, save_prefix,
+        cnf_range, sort_info_lst, saddle, nlocs_procs):
+    """ Get the locs of each species in the queue
+    """
+    spc_locs_dct = {}
+    for spc_name in spc_queue:
+        spc_locs_lst = filesys.models.get_spc_locs_lst(
+            spc_dct[spc_name], spc_mod_dct_i,
+            run_prefix, save_prefix, saddle=saddle,
+            cnf_range=cnf_range, sort_info_lst=sort_info_lst,
+            nprocs=nlocs_procs)
+        spc_locs_dct[spc_name] = spc_locs_lst
+    return spc_locs_dct
@@ -9,6 +9,13 @@ from mechlib.amech_io._path import thermo_paths
 from mechlib.amech_io._path import rate_paths
 from mechlib.amech_io._path import output_path
 from mechlib.amech_io._path import job_path
+from mechlib.amech_io._graph import read_task_graph
+from mechlib.amech_io._graph import write_task_graph
+from mechlib.amech_io._graph import task_key
+from mechlib.amech_io._graph import task_fingerprint
+from mechlib.amech_io._graph import task_is_current
+from mechlib.amech_io._graph import task_data
+from mechlib.amech_io._graph import record_task
 
 
 __all__ = [
@@ -19,5 +26,12 @@ __all__ = [
     'thermo_paths',
     'rate_paths',
     'output_path',
-    'job_path'
+    'job_path',
+    'read_task_graph',
+    'write_task_graph',
+    'task_key',
+    'task_fingerprint',
+    'task_is_current',
+    'task_data',
+    'record_task'
 ]
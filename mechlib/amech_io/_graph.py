@@ -0,0 +1,192 @@
+""" Record of the inputs used for the tasks of a MechDriver run, used to
+    skip tasks whose inputs have not changed since they were last run.
+
+    Each task unit (e.g., the MESSPF input of one species model) is stored
+    under a key in a JSON file at the root of the run filesystem along with
+    a fingerprint of its inputs: the model and species information it uses
+    and the files it reads from the SAVE or RUN filesystems. Fingerprints
+    of downstream units include those of the units they depend on, so a
+    change in one species only invalidates the units built from it.
+"""
+
+import os
+import json
+import hashlib
+
+
+GRAPH_NAME = 'task_graph.json'
+
+
+def read_task_graph(run_prefix):
+    """ Read the record of the task units run previously
+
+        :param run_prefix: root-path to the run-filesystem
+        :type run_prefix: str
+        :rtype: dict[str: dict]
+    """
+
+    graph_dct = {}
+
+    graph_path = os.path.join(run_prefix, GRAPH_NAME)
+    if os.path.exists(graph_path):
+        try:
+            with open(graph_path, 'r', encoding='utf-8') as fobj:
+                graph_dct = json.load(fobj)
+        except (OSError, ValueError):
+            graph_dct = {}
+
+    return graph_dct
+
+
+def write_task_graph(run_prefix, graph_dct):
+    """ Write the record of the task units that have been run
+
+        :param run_prefix: root-path to the run-filesystem
+        :type run_prefix: str
+        :param graph_dct: fingerprint and data of each task unit
+        :type graph_dct: dict[str: dict]
+    """
+
+    graph_path = os.path.join(run_prefix, GRAPH_NAME)
+    tmp_path = f'{graph_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as fobj:
+        json.dump(graph_dct, fobj, indent=1)
+    os.replace(tmp_path, graph_path)
+
+
+def task_key(*labels):
+    """ Build the key of a task unit from labels such as the task name,
+        species name, conformer locators and model name
+
+        :rtype: str
+    """
+    return '|'.join(str(label) for label in labels)
+
+
+def task_fingerprint(*objs, paths=(), content_paths=()):
+    """ Hash the inputs of a task unit.
+
+        The objects are hashed by value. For each path, the relative names,
+        sizes and modification times of all files at or below the path are
+        hashed, so the fingerprint changes if any file is added, removed
+        or rewritten. Files that are rewritten on every run, such as the
+        MESS inputs, are instead given as content paths and hashed by their
+        contents, so rewriting them with the same contents keeps the
+        fingerprint.
+
+        :param objs: dictionaries, strings, etc. used by the task unit
+        :param paths: files or directories read by the task unit
+        :type paths: tuple(str)
+        :param content_paths: files read by the task unit
+        :type content_paths: tuple(str)
+        :rtype: str
+    """
+
+    hasher = hashlib.sha256()
+    try:
+        obj_str = json.dumps(objs, sort_keys=True, default=repr)
+    except TypeError:
+        # Dictionaries with keys of mixed types cannot be sorted
+        obj_str = repr(objs)
+    hasher.update(obj_str.encode())
+    for path in paths:
+        hasher.update(f'\n{path}'.encode())
+        for file_inf in _file_stats(path):
+            hasher.update(repr(file_inf).encode())
+    for path in content_paths:
+        hasher.update(f'\n{path}\n{_file_hash(path)}'.encode())
+
+    return hasher.hexdigest()
+
+
+def task_is_current(graph_dct, key, fprint, out_paths=()):
+    """ Assess if a task unit was last run with the same inputs and its
+        outputs still exist
+
+        :param graph_dct: fingerprint and data of each task unit
+        :type graph_dct: dict[str: dict]
+        :param key: key of the task unit
+        :type key: str
+        :param fprint: fingerprint of the current inputs of the task unit,
+            or None if the inputs could not be fingerprinted
+        :type fprint: str
+        :param out_paths: output files of the task unit
+        :type out_paths: tuple(str)
+        :rtype: bool
+    """
+    return (
+        fprint is not None and
+        graph_dct.get(key, {}).get('fprint') == fprint and
+        all(os.path.exists(path) for path in out_paths)
+    )
+
+
+def task_data(graph_dct, key):
+    """ Get the data stored with a task unit when it was recorded
+
+        :param graph_dct: fingerprint and data of each task unit
+        :type graph_dct: dict[str: dict]
+        :param key: key of the task unit
+        :type key: str
+    """
+    return graph_dct.get(key, {}).get('data')
+
+
+def record_task(graph_dct, key, fprint, data=None):
+    """ Record that a task unit was run with the given inputs, along with
+        any data from it that downstream tasks reuse
+
+        :param graph_dct: fingerprint and data of each task unit
+        :type graph_dct: dict[str: dict]
+        :param key: key of the task unit
+        :type key: str
+        :param fprint: fingerprint of the inputs of the task unit, or None
+            if the inputs could not be fingerprinted, in which case the unit
+            is not recorded
+        :type fprint: str
+        :param data: JSON-serializable output of the task unit
+    """
+    if fprint is not None:
+        graph_dct[key] = {'fprint': fprint, 'data': data}
+    else:
+        graph_dct.pop(key, None)
+
+
+# Helpers
+def _file_stats(path):
+    """ Relative names, sizes, and modification times of the files at or
+        below a path, in sorted order
+    """
+
+    stats = []
+    if os.path.isfile(path):
+        stat = os.stat(path)
+        stats.append(('', stat.st_size, stat.st_mtime_ns))
+    elif os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                file_path = os.path.join(root, name)
+                try:
+                    stat = os.stat(file_path)
+                except OSError:
+                    continue
+                stats.append((os.path.relpath(file_path, path),
+                              stat.st_size, stat.st_mtime_ns))
+
+    return stats
+
+
+def _file_hash(path):
+    """ Hash of the contents of a file, empty if the file does not exist
+    """
+
+    if not os.path.isfile(path):
+        return ''
+
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as fobj:
+        for block in iter(lambda: fobj.read(1 << 20), b''):
+            hasher.update(block)
+
+    return hasher.hexdigest()
@@ -75,6 +75,9 @@ MODPF_VAL_DCT = {
         'mod': ((str,), ('none', 'sampling', '1dhr'), 'none'),
         'geolvl': ((str,), (), None),
     },
+    'pf': {
+        'engine': ((str,), ('messpf', 'rrho'), 'messpf'),
+    },
     'rpath': {
         'enelvl': ((str,), (), None),
         'geolvl': ((str,), (), None),
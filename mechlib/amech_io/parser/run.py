@@ -44,7 +44,8 @@ RUN_INP_VAL_DCT = {
     'print_debug': ((bool,), (True, False), False),
     'run_prefix': ((str,), (), None),
     'save_prefix': ((str,), (), None),
-    'canonical': ((bool,), (True, False), False)
+    'canonical': ((bool,), (True, False), False),
+    'incremental': ((bool,), (True, False), False)
 }
 
 # HANDLE TASK KEYS
@@ -67,7 +68,8 @@ TSK_KEY_DCT = {
     'find_ts': (('spc', 'ts'), BASE + MREF + ('nobarrier', 'varecof_nprocs')),
     'conf_pucker': (('spc', 'ts'), BASE + ('cnf_range', 'sort', 
                                            'algorithm','thresholds','eps','checks','rand_tors')),
-    'conf_samp': (('spc', 'ts'), BASE + ('cnf_range', 'sort', 'resave',)),
+    'conf_samp': (('spc', 'ts'), BASE + ('cnf_range', 'sort', 'resave',
+                                         'ncores')),
     'conf_energy': (('spc', 'ts'), BASE + ('cnf_range', 'sort',)),
     'conf_grad': (('spc', 'ts'), BASE + ('cnf_range', 'sort',)),
     'conf_hess': (('spc', 'ts'), BASE + ('cnf_range', 'sort',)),
@@ -75,14 +77,14 @@ TSK_KEY_DCT = {
     'conf_prop': (('spc', 'ts'), BASE + ('cnf_range', 'sort',)),
     'conf_opt': (('spc', 'ts'), BASE + ('cnf_range', 'sort', 'resave',)),
     'hr_scan': (('spc', 'ts'), BASE + ('tors_model', 'resamp_min',
-                                       'cnf_range', 'sort',)),
+                                       'cnf_range', 'sort', 'ncores')),
     'hr_grad': (('spc', 'ts'), BASE + ('tors_model', 'cnf_range', 'sort',)),
     'hr_hess': (('spc', 'ts'), BASE + ('tors_model', 'cnf_range', 'sort',)),
     'hr_energy': (('spc', 'ts'), BASE + ('tors_model', 'cnf_range', 'sort',)),
     'hr_vpt2': (('spc', 'ts'), BASE + ('tors_model', 'cnf_range', 'sort',)),
     'hr_reopt': (('spc', 'ts'), BASE + ('tors_model', 'hrthresh',
                                         'cnf_range', 'sort',)),
-    'tau_samp': (('spc', 'ts'), BASE + ('resave',)),
+    'tau_samp': (('spc', 'ts'), BASE + ('resave', 'ncores')),
     'tau_energy': (('spc', 'ts'), BASE),
     'tau_grad': (('spc', 'ts'), BASE),
     'tau_hess': (('spc', 'ts'), BASE + ('hessmax',)),
@@ -116,11 +118,11 @@ TSK_KEY_DCT = {
                         'cnf_range', 'sort', 'nprocs')),
     'run_mess': ((), ('kin_model', 'spc_model', 'nprocs',
                       'well_extension', 'mess_version',
-                      'cnf_range', 'sort')),
+                      'cnf_range', 'sort', 'njobs')),
     'run_fits': ((), ('kin_model',
                       'well_extension', 'mess_version',
-                      'combine',
-                      'cnf_range', 'sort', 'nprocs',)),
+                      'combine', 'nasa_fit',
+                      'cnf_range', 'sort', 'nprocs', 'njobs')),
 }
 
 # tsk: (object types, (allowed values), default)  # use functions for weird
@@ -148,6 +150,9 @@ TSK_VAL_DCT = {
     'nobarrier': ((str,), ('pst', 'rpvtst', 'vrctst'), None),
     're_id': ((bool,), (True, False), False),
     'varecof_nprocs': ((int,), (), 10),
+    # Total number of cores shared by the electronic structure jobs run at
+    # once, each using the nprocs of its theory level
+    'ncores': ((int,), (), None),
     #adl added arguments for ring puckering
     'algorithm': ((str,), 
                   ('crest','pucker','torsions','robust','torsions2','etkdg'), 'pucker'),
@@ -156,7 +161,7 @@ TSK_VAL_DCT = {
     'eps': ((float,), (), 0.2),
     'checks': ((int,), (1,2), 1),
     'rand_tors': ((int,), (), 2),
-    # Trans
+    # Trans, KTP/Therm: number of jobs (OneDMin, MESS or fits) run at once
     'njobs': ((int,), (), 1),
     'nsamp': ((int,), (), 1),
     'conf': ((str,), ('sphere', 'min'), 'sphere'),
@@ -175,6 +180,7 @@ TSK_VAL_DCT = {
     'combine': ((str,), ('stereo',), None),
     'linked_pes': ((tuple,), (), None),
     'float_precision': ((str,), ('double', 'quadruple'), 'double'),
+    'nasa_fit': ((str,), ('thermp', 'numpy'), 'thermp'),
 }
 # Have nconfs and econfs keywords and combine them to figure out which to use?
 
@@ -1,10 +1,33 @@
 """
     Run MESS calculations
+
+    The k(T,P) values of each MESSRATE run are parsed once from its
+    rate.out and kept in a rate table (rate_table.npz) next to it, which
+    later reads use for as long as rate.out is unchanged. The other MESS
+    files, such as the (potentially very large) PED and aux files, are only
+    read if a routine asks for them.
 """
 
 import os
+import json
+import collections.abc
+import numpy
 from ioformat.pathtools import read_file
 import mess_io
+from mechlib.amech_io._graph import task_fingerprint
+
+
+RATE_TABLE_NAME = 'rate_table.npz'
+
+# Names of the MESS files read for each key of the rate strings
+MESS_FILE_DCT = {
+    'inp': 'mess.inp',
+    'ktp_out': 'rate.out',
+    'ke_out': 'ke.out',
+    'ped': 'ped.out',
+    'aux': 'mess.aux',
+    'log': 'mess.log'
+}
 
 
 def rate_strings(rate_paths_dct):
@@ -12,6 +35,8 @@ def rate_strings(rate_paths_dct):
 
         returns dictionary for each pes group for a 'base' MESS run
         and a well-extended MESS run
+
+        Each file of a run is only read the first time its string is used.
     """
 
     rate_strs_dct, mess_paths_dct = {}, {}
@@ -30,14 +55,8 @@ def rate_strings(rate_paths_dct):
                 mess_path = rate_paths_dct[pes_inf][full_typ]
 
                 if os.path.exists(os.path.join(mess_path, 'rate.out')):
-                    rate_strs_dct[pes_inf][full_typ] = {
-                        'inp': read_file(mess_path, 'mess.inp'),
-                        'ktp_out': read_file(mess_path, 'rate.out'),
-                        'ke_out': read_file(mess_path, 'ke.out'),
-                        'ped': read_file(mess_path, 'ped.out'),
-                        'aux': read_file(mess_path, 'mess.aux'),
-                        'log': read_file(mess_path, 'mess.log')
-                    }
+                    rate_strs_dct[pes_inf][full_typ] = _MessStrings(
+                        mess_path)
                 else:
                     rate_strs_dct[pes_inf][full_typ] = {}
 
@@ -46,6 +65,137 @@ def rate_strings(rate_paths_dct):
     return rate_strs_dct, mess_paths_dct
 
 
+def rate_table(mess_path, temps, pressures,
+               filter_reaction_types=('fake', 'self', 'loss', 'capture',
+                                      'reverse')):
+    """ Obtain the k(T,P) values of each reaction from a MESSRATE run,
+        filtered to the requested temperatures and pressures.
+
+        The values are read from the rate table of the run if it was built
+        from the current rate.out with the same filters. Otherwise they are
+        parsed from rate.out and the rate table is written.
+
+        :param mess_path: path to the MESSRATE run
+        :type mess_path: str
+        :param temps: temperatures of the rates (K)
+        :type temps: tuple(float)
+        :param pressures: pressures of the rates (atm)
+        :type pressures: tuple(float)
+        :return: temperatures and rates for each pressure of each reaction,
+            or None if there is no MESSRATE output
+        :rtype: dict[tuple: dict[float/str: (numpy.ndarray, numpy.ndarray)]]
+    """
+
+    out_path = os.path.join(mess_path, 'rate.out')
+    if not os.path.exists(out_path):
+        return None
+
+    filter_dct = {
+        'filter_kts': True,
+        'filter_reaction_types': filter_reaction_types,
+        'tmin': min(temps), 'tmax': max(temps),
+        'pmin': min(pressures), 'pmax': max(pressures)}
+    fprint = task_fingerprint(filter_dct, paths=(out_path,))
+
+    table_path = os.path.join(mess_path, RATE_TABLE_NAME)
+    rxn_ktp_dct = _read_rate_table(table_path, fprint)
+    if rxn_ktp_dct is None:
+        rxn_ktp_dct = mess_io.reader.rates.get_rxn_ktp_dct(
+            read_file(mess_path, 'rate.out'), **filter_dct)
+        _write_rate_table(table_path, fprint, rxn_ktp_dct)
+
+    return rxn_ktp_dct
+
+
+def _read_rate_table(table_path, fprint):
+    """ Read the k(T,P) values from a rate table if it has the fingerprint
+    """
+
+    if not os.path.exists(table_path):
+        return None
+    try:
+        with numpy.load(table_path, allow_pickle=False) as table:
+            if str(table['fprint']) != fprint:
+                return None
+            rxns = json.loads(str(table['rxns']))
+            rows = numpy.asarray(table['rows'])
+            offsets = numpy.asarray(table['offsets'])
+            temps = numpy.asarray(table['temps'])
+            kts = numpy.asarray(table['kts'])
+    except (OSError, ValueError, KeyError):
+        return None
+
+    rxn_ktp_dct = {}
+    for idx, (rxn_idx, pressure) in enumerate(rows):
+        start, end = offsets[idx], offsets[idx+1]
+        ktp_dct = rxn_ktp_dct.setdefault(_tuplify(rxns[int(rxn_idx)]), {})
+        ktp_dct['high' if numpy.isinf(pressure) else float(pressure)] = (
+            temps[start:end], kts[start:end])
+
+    return rxn_ktp_dct
+
+
+def _write_rate_table(table_path, fprint, rxn_ktp_dct):
+    """ Write the k(T,P) values into a rate table with one row for each
+        pressure of each reaction, which indexes into flat arrays of the
+        temperatures and rates
+    """
+
+    rows, offsets, temps, kts = [], [0], [], []
+    for rxn_idx, ktp_dct in enumerate(rxn_ktp_dct.values()):
+        for pressure, (_temps, _kts) in ktp_dct.items():
+            rows.append(
+                (rxn_idx, numpy.inf if pressure == 'high' else pressure))
+            temps.append(numpy.asarray(_temps, dtype=float))
+            kts.append(numpy.asarray(_kts, dtype=float))
+            offsets.append(offsets[-1] + len(temps[-1]))
+
+    tmp_path = f'{table_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'wb') as fobj:
+            numpy.savez(
+                fobj,
+                fprint=numpy.array(fprint),
+                rxns=numpy.array(json.dumps(list(rxn_ktp_dct))),
+                rows=numpy.array(rows, dtype=float).reshape(-1, 2),
+                offsets=numpy.array(offsets, dtype=int),
+                temps=numpy.concatenate(temps) if temps else numpy.zeros(0),
+                kts=numpy.concatenate(kts) if kts else numpy.zeros(0))
+        os.replace(tmp_path, table_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _tuplify(obj):
+    """ Convert the lists of a reaction label read from JSON to tuples
+    """
+    if isinstance(obj, list):
+        return tuple(_tuplify(val) for val in obj)
+    return obj
+
+
+class _MessStrings(collections.abc.Mapping):
+    """ Dictionary of the input and output strings of a MESS run that
+        reads each file on first access
+    """
+
+    def __init__(self, mess_path):
+        self.mess_path = mess_path
+        self._dct = {}
+
+    def __getitem__(self, key):
+        if key not in self._dct:
+            self._dct[key] = read_file(self.mess_path, MESS_FILE_DCT[key])
+        return self._dct[key]
+
+    def __iter__(self):
+        return iter(MESS_FILE_DCT)
+
+    def __len__(self):
+        return len(MESS_FILE_DCT)
+
+
 def messpf(pf_path):
     """ Obtain the log partition functions from the MESSPF file
     """
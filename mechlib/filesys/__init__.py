@@ -11,6 +11,7 @@ from mechlib.filesys import mincnf
 from mechlib.filesys import models
 from mechlib.filesys import read
 from mechlib.filesys import save
+from mechlib.filesys import unique
 
 
 __all__ = [
@@ -22,5 +23,6 @@ __all__ = [
     'mincnf',
     'models',
     'read',
-    'save'
+    'save',
+    'unique'
 ]
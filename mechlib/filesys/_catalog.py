@@ -0,0 +1,241 @@
+""" Persistent catalog of conformer energies for the CONFS layer
+
+    The catalog is a small JSON sidecar file written into the CONFS layer
+    of the save filesystem (save/SPC/THY/CONFS or save/RXN/THY/TS/CONFS).
+    For each single-point level it holds the energy of every conformer,
+    along with its ZPE, and the modification times of the files those
+    values were read from:
+
+        {'levels': {'<method>|<basis>|<orb>': {'<rid>|<cid>': entry}}}
+
+        entry = {'ene': float, 'ene_mtime': float,
+                 'zpe': float or None, 'zpe_mtime': float or None}
+
+    An entry is only trusted while the mtimes still match the files on
+    disk; otherwise the caller falls back to reading the files directly.
+"""
+
+import os
+import json
+import autofile
+from phydat import phycon
+
+
+CATALOG_NAME = 'cnf_catalog.json'
+
+
+# Functions to read and write the catalog file
+def catalog_path(cnf_save_fs):
+    """ Path to the catalog file in the CONFS layer
+
+        :param cnf_save_fs: CONF object with save filesys prefix
+        :type cnf_save_fs: autofile.fs.conformer obj
+        :rtype: str
+    """
+    return os.path.join(cnf_save_fs[0].path(), CATALOG_NAME)
+
+
+def read_catalog(cnf_save_fs):
+    """ Read the catalog for a CONFS layer. An empty catalog is
+        returned if the file does not exist or cannot be parsed.
+
+        :param cnf_save_fs: CONF object with save filesys prefix
+        :type cnf_save_fs: autofile.fs.conformer obj
+        :rtype: dict[str: dict]
+    """
+
+    catalog = {'levels': {}}
+
+    cat_path = catalog_path(cnf_save_fs)
+    if os.path.exists(cat_path):
+        try:
+            with open(cat_path, 'r', encoding='utf-8') as fobj:
+                catalog = json.load(fobj)
+        except (OSError, ValueError):
+            print(f'Unable to read conformer catalog at {cat_path}')
+
+    return catalog
+
+
+def write_catalog(cnf_save_fs, catalog):
+    """ Write the catalog for a CONFS layer. The file is written to a
+        temporary path and moved into place so that concurrent readers
+        never see a partially written catalog.
+
+        :param cnf_save_fs: CONF object with save filesys prefix
+        :type cnf_save_fs: autofile.fs.conformer obj
+        :param catalog: conformer catalog
+        :type catalog: dict[str: dict]
+    """
+
+    cat_path = catalog_path(cnf_save_fs)
+    if os.path.isdir(os.path.dirname(cat_path)):
+        tmp_path = f'{cat_path}.{os.getpid()}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as fobj:
+                json.dump(catalog, fobj)
+            os.replace(tmp_path, cat_path)
+        except OSError:
+            print(f'Unable to write conformer catalog at {cat_path}')
+
+
+def merge_entries(cnf_save_fs, sp_thy_locs, entry_dct):
+    """ Re-read the catalog, add the new entries for the level and
+        write it back out.
+
+        :param cnf_save_fs: CONF object with save filesys prefix
+        :type cnf_save_fs: autofile.fs.conformer obj
+        :param sp_thy_locs: (method, basis, orb_label) of the energy
+        :type sp_thy_locs: tuple(str)
+        :param entry_dct: catalog entries for each conformer locator
+        :type entry_dct: dict[tuple(str): dict]
+    """
+
+    if entry_dct:
+        catalog = read_catalog(cnf_save_fs)
+        lvl_dct = catalog['levels'].setdefault(_level_key(sp_thy_locs), {})
+        for locs, entry in entry_dct.items():
+            lvl_dct[_locs_key(locs)] = entry
+        write_catalog(cnf_save_fs, catalog)
+
+
+# Functions for individual conformer entries
+def level_entries(catalog, sp_thy_locs):
+    """ Obtain the entries of the catalog for a single-point level,
+        keyed by the conformer locators.
+
+        :param catalog: conformer catalog
+        :type catalog: dict[str: dict]
+        :param sp_thy_locs: (method, basis, orb_label) of the energy
+        :type sp_thy_locs: tuple(str)
+        :rtype: dict[tuple(str): dict]
+    """
+    lvl_dct = catalog['levels'].get(_level_key(sp_thy_locs), {})
+    return {tuple(key.split('|')): entry for key, entry in lvl_dct.items()}
+
+
+def current_entry(entry, cnf_save_fs, locs, sp_thy_locs, need_zpe=False):
+    """ Return the entry if the files it was built from are unchanged
+        on disk, otherwise return None.
+
+        :param entry: catalog entry for a conformer
+        :type entry: dict[str: float]
+        :param cnf_save_fs: CONF object with save filesys prefix
+        :type cnf_save_fs: autofile.fs.conformer obj
+        :param locs: conformer locators
+        :type locs: tuple(str)
+        :param sp_thy_locs: (method, basis, orb_label) of the energy
+        :type sp_thy_locs: tuple(str)
+        :param need_zpe: require the ZPE in the entry to be current
+        :type need_zpe: bool
+        :rtype: dict[str: float] or None
+    """
+
+    ret = None
+    if entry is not None:
+        ene_path, freq_path = _file_paths(cnf_save_fs, locs, sp_thy_locs)
+        valid = _mtime(ene_path) == entry.get('ene_mtime')
+        if valid and need_zpe:
+            valid = (
+                entry.get('zpe') is not None and
+                _mtime(freq_path) == entry.get('zpe_mtime'))
+        if valid:
+            ret = entry
+
+    return ret
+
+
+def build_entry(cnf_save_fs, locs, sp_thy_locs, ene=None, freqs=None):
+    """ Build a catalog entry for a conformer. Values that are not
+        supplied are read from the save filesystem.
+
+        :param cnf_save_fs: CONF object with save filesys prefix
+        :type cnf_save_fs: autofile.fs.conformer obj
+        :param locs: conformer locators
+        :type locs: tuple(str)
+        :param sp_thy_locs: (method, basis, orb_label) of the energy
+        :type sp_thy_locs: tuple(str)
+        :param ene: electronic energy of the conformer
+        :type ene: float
+        :param freqs: harmonic frequencies of the conformer
+        :type freqs: tuple(float)
+        :rtype: dict[str: float] or None
+    """
+
+    entry = None
+    ene_path, freq_path = _file_paths(cnf_save_fs, locs, sp_thy_locs)
+    ene_mtime = _mtime(ene_path)
+    if ene_mtime is not None:
+        if ene is None:
+            sp_fs = autofile.fs.single_point(cnf_save_fs[-1].path(locs))
+            ene = sp_fs[-1].file.energy.read(sp_thy_locs)
+        zpe_mtime = _mtime(freq_path)
+        zpe = None
+        if zpe_mtime is not None:
+            if freqs is None:
+                freqs = cnf_save_fs[-1].file.harmonic_frequencies.read(locs)
+            zpe = harmonic_zpe(freqs)
+        entry = {'ene': ene, 'ene_mtime': ene_mtime,
+                 'zpe': zpe, 'zpe_mtime': zpe_mtime}
+
+    return entry
+
+
+def harmonic_zpe(freqs):
+    """ Harmonic ZPE of a conformer from its real frequencies, leaving out
+        any imaginary modes. This is the ZPE used to sort the conformers,
+        whether the energies are read from the catalog or the files.
+
+        :param freqs: harmonic frequencies of the conformer
+        :type freqs: tuple(float)
+        :rtype: float
+    """
+    return 0.5 * sum(freq for freq in freqs if freq > 0.) * phycon.WAVEN2EH
+
+
+def update_conformer(cnf_save_fs, locs, sp_thy_locs):
+    """ Refresh the catalog entry of a single conformer after its
+        files have been written to the save filesystem.
+
+        :param cnf_save_fs: CONF object with save filesys prefix
+        :type cnf_save_fs: autofile.fs.conformer obj
+        :param locs: conformer locators
+        :type locs: tuple(str)
+        :param sp_thy_locs: (method, basis, orb_label) of the energy
+        :type sp_thy_locs: tuple(str)
+    """
+    entry = build_entry(cnf_save_fs, locs, sp_thy_locs)
+    if entry is not None:
+        merge_entries(cnf_save_fs, sp_thy_locs, {tuple(locs): entry})
+
+
+# Helpers
+def _file_paths(cnf_save_fs, locs, sp_thy_locs):
+    """ Paths to the energy and frequency files of a conformer
+    """
+    sp_fs = autofile.fs.single_point(cnf_save_fs[-1].path(locs))
+    ene_path = sp_fs[-1].file.energy.path(sp_thy_locs)
+    freq_path = cnf_save_fs[-1].file.harmonic_frequencies.path(locs)
+    return ene_path, freq_path
+
+
+def _mtime(path):
+    """ Modification time of a file, None if it does not exist
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+    return mtime
+
+
+def _level_key(sp_thy_locs):
+    """ Catalog key for a single-point level
+    """
+    return '|'.join(str(x) for x in sp_thy_locs)
+
+
+def _locs_key(locs):
+    """ Catalog key for a conformer locator
+    """
+    return '|'.join(str(x) for x in locs)
@@ -0,0 +1,161 @@
+""" Staged writes into the CONFS layer of the SAVE filesystem
+
+    The files for a conformer are first written into a hidden staging copy
+    of the CONFS layer that sits next to the real one, using the usual
+    autofile objects. On commit, each staged directory that does not yet
+    exist in the real filesystem is moved into place with a single rename,
+    so a new conformer appears with all of its files at once and readers
+    never see it half-written. Staged files for a conformer that already
+    exists are moved over the existing files one at a time.
+
+    The name of each staging directory holds the host and process that
+    made it. Staging directories left behind by a process that died
+    before it could remove them are removed when the next transaction is
+    opened in the same directory.
+"""
+
+import os
+import re
+import time
+import shutil
+import socket
+import tempfile
+import contextlib
+import autofile
+
+
+STAGE_PREFIX = '.stage_'
+
+# Age (s) after which a staging directory made on another host is stale
+STALE_STAGE_AGE = 86400.0
+
+
+@contextlib.contextmanager
+def conformer_transaction(cnf_fs):
+    """ Stage writes into the CONFS layer and commit them on exit.
+
+        Used as::
+
+            with conformer_transaction(cnf_fs) as stage_fs:
+                stage_fs[-1].create(cnf_locs)
+                stage_fs[-1].file.geometry.write(geo, cnf_locs)
+
+        Any number of conformers may be written in one transaction. If an
+        exception is raised, nothing is committed.
+
+        :param cnf_fs: CONF object with save filesys prefix
+        :type cnf_fs: autofile.fs.conformer obj
+        :return: CONF object for the staging copy of the layer
+        :rtype: autofile.fs.conformer obj
+    """
+
+    prefix = os.path.dirname(cnf_fs[0].path())
+    os.makedirs(prefix, exist_ok=True)
+    _remove_stale_stages(prefix)
+    stage_prefix = tempfile.mkdtemp(
+        prefix=f'{STAGE_PREFIX}{os.getpid()}@{socket.gethostname()}@',
+        dir=prefix)
+    try:
+        stage_fs = autofile.fs.conformer(stage_prefix)
+        yield stage_fs
+        if os.path.exists(stage_fs[0].path()):
+            _commit_tree(stage_fs[0].path(), cnf_fs[0].path())
+    finally:
+        shutil.rmtree(stage_prefix, ignore_errors=True)
+
+
+def final_path(path):
+    """ Path that a file or directory in a staging copy of the CONFS
+        layer will have once it is committed; other paths are unchanged
+
+        :param path: path in the staging copy of the layer
+        :type path: str
+        :rtype: str
+    """
+    return re.sub(
+        rf'{re.escape(os.sep)}{re.escape(STAGE_PREFIX)}[^{re.escape(os.sep)}]+'
+        rf'(?={re.escape(os.sep)}|$)', '', path)
+
+
+def _remove_stale_stages(prefix):
+    """ Remove the staging directories in a directory that were left by
+        processes that no longer exist
+    """
+
+    host = socket.gethostname()
+    for name in os.listdir(prefix):
+        if not name.startswith(STAGE_PREFIX):
+            continue
+        path = os.path.join(prefix, name)
+        stage_host, stage_pid = _stage_owner(name)
+        if stage_host == host:
+            stale = not _process_exists(stage_pid)
+        else:
+            try:
+                stale = time.time() - os.path.getmtime(path) > STALE_STAGE_AGE
+            except OSError:
+                stale = False
+        if stale:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _stage_owner(name):
+    """ Host and process ID of the process that made a staging directory
+    """
+    host, pid = None, None
+    match = re.match(
+        rf'{re.escape(STAGE_PREFIX)}(?P<pid>[0-9]+)@(?P<host>[^@]+)@', name)
+    if match is not None:
+        host, pid = match.group('host'), int(match.group('pid'))
+    return host, pid
+
+
+def _process_exists(pid):
+    """ Assess if a process with the ID exists on this host
+    """
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _commit_tree(src, dst):
+    """ Move a staged file or directory into the real filesystem
+    """
+
+    if not os.path.exists(dst):
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        try:
+            os.rename(src, dst)
+            _fsync_dir(os.path.dirname(dst))
+            return
+        except OSError:
+            # Another process created the directory first, so merge into it
+            if not os.path.exists(dst):
+                raise
+
+    if os.path.isdir(src):
+        for name in sorted(os.listdir(src)):
+            _commit_tree(os.path.join(src, name), os.path.join(dst, name))
+    else:
+        os.replace(src, dst)
+
+
+def _fsync_dir(path):
+    """ Flush a directory entry to disk, where the platform supports it
+    """
+    try:
+        dir_fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
@@ -13,9 +13,11 @@ import automol.zmat
 import automol.geom
 from automol.reac import with_structures
 from automol.geom import hydrogen_bonded_structure
-from autorun import execute_function_in_parallel
 from mechanalyzer.inf import thy as tinfo
+from mechlib import parallel
 from mechlib.amech_io import printer as ioprinter
+from mechlib.filesys import _catalog
+from mechlib.filesys import unique
 
 
 def min_energy_conformer_locators(
@@ -206,48 +208,50 @@ def _sorted_cnf_lsts(
         :rtype (tuple(tuple(tuple(str),tuple(str))), tuple(float))
     """
 
-    def _parallel_get_sort_energy_parameters(
-            cnf_save_fs, mod_thy_info, freq_info,
-            sp_info, sort_prop_dct, cnf_locs_lst,
-            output_queue=None):
-        locs_enes_dct = {}
-        first_enes = None
-        # print('locs on proc', os.getpid(),  cnf_locs_lst)
-        for locs in cnf_locs_lst:
-            sort_ene, first_enes = _sort_energy_parameter(
-                locs, cnf_save_fs, mod_thy_info, freq_info,
-                sp_info, sort_prop_dct, first_enes=first_enes)
-            if first_enes is not None:
-                locs_enes_dct[tuple(locs)] = (sort_ene, sum(first_enes))
-            else:
-                locs_enes_dct[tuple(locs)] = (sort_ene, first_enes)
-        output_queue.put((locs_enes_dct,))
-
     fnd_cnf_enes_lst = []
     fnd_cnf_locs_lst = []
     if len(cnf_locs_lst) == 1:
         fnd_cnf_enes_lst = [10]
         fnd_cnf_locs_lst = cnf_locs_lst
     else:
+        # Read the energy catalog of the CONFS layer, if it can be used
+        cat_prop = _catalog_sort_prop(mod_thy_info, freq_info, sort_prop_dct)
+        if cat_prop is not None:
+            sp_thy_locs = (
+                sp_info[1:4] if sp_info is not None else mod_thy_info[1:4])
+            cat_dct = _catalog.level_entries(
+                _catalog.read_catalog(cnf_save_fs), sp_thy_locs)
+        else:
+            sp_thy_locs, cat_dct = None, {}
+
         args = (
                 cnf_save_fs, mod_thy_info, freq_info,
-                sp_info, sort_prop_dct
+                sp_info, sort_prop_dct, (cat_prop, sp_thy_locs, cat_dct)
                 )
-        locs_enes_dct_lst = execute_function_in_parallel(
-            _parallel_get_sort_energy_parameters, cnf_locs_lst,
+        locs_enes_dct_lst = parallel.execute_in_pool(
+            _sort_energy_parameter_units, cnf_locs_lst,
             args, nprocs=nprocs)
         first_ene = None
         for locs_enes_dct in locs_enes_dct_lst:
             for locs in locs_enes_dct:
-                _, locs_first_ene = locs_enes_dct[locs]
+                _, locs_first_ene, _ = locs_enes_dct[locs]
                 if locs_first_ene is not None:
                     first_ene = locs_first_ene
                 break
 
+        # Write any entries that were missing or stale back to the catalog
+        if cat_prop is not None:
+            new_entry_dct = {}
+            for locs_enes_dct in locs_enes_dct_lst:
+                for locs, (_, _, new_entry) in locs_enes_dct.items():
+                    if new_entry is not None:
+                        new_entry_dct[locs] = new_entry
+            _catalog.merge_entries(cnf_save_fs, sp_thy_locs, new_entry_dct)
+
         for locs in cnf_locs_lst:
             for locs_enes_dct in locs_enes_dct_lst:
                 if tuple(locs) in locs_enes_dct:
-                    sort_ene, tmp_first_ene = locs_enes_dct[tuple(locs)]
+                    sort_ene, tmp_first_ene, _ = locs_enes_dct[tuple(locs)]
                     if sort_ene is not None:
                         if first_ene is not None:
                             sort_ene = sort_ene + (
@@ -289,6 +293,59 @@ def _sorted_cnf_lsts(
     return cnf_locs_lst, cnf_enes_lst
 
 
+def _sort_energy_parameter_units(
+        cnf_save_fs, mod_thy_info, freq_info,
+        sp_info, sort_prop_dct, cat_info, cnf_locs_lst,
+        output_queue=None):
+    """ Get the sort energy parameters of each conformer in a list
+    """
+    locs_enes_dct = {}
+    first_enes = None
+    cat_prop, sp_thy_locs, cat_dct = cat_info
+    for locs in cnf_locs_lst:
+        # Use the catalog entry if the files are unchanged
+        new_entry = None
+        if cat_prop is not None:
+            entry = _catalog.current_entry(
+                cat_dct.get(tuple(locs)), cnf_save_fs, locs,
+                sp_thy_locs, need_zpe=(cat_prop == 'ground'))
+            if entry is not None:
+                sort_ene = entry['ene']
+                if cat_prop == 'ground':
+                    sort_ene += entry['zpe']
+                locs_enes_dct[tuple(locs)] = (sort_ene, None, None)
+                continue
+
+        sort_ene, first_enes = _sort_energy_parameter(
+            locs, cnf_save_fs, mod_thy_info, freq_info,
+            sp_info, sort_prop_dct, first_enes=first_enes)
+        if cat_prop is not None and sort_ene is not None:
+            new_entry = _catalog.build_entry(
+                cnf_save_fs, locs, sp_thy_locs,
+                ene=(sort_ene if cat_prop == 'electronic' else None))
+        if first_enes is not None:
+            locs_enes_dct[tuple(locs)] = (
+                sort_ene, sum(first_enes), new_entry)
+        else:
+            locs_enes_dct[tuple(locs)] = (
+                sort_ene, first_enes, new_entry)
+    output_queue.put((locs_enes_dct,))
+
+
+def _catalog_sort_prop(mod_thy_info, freq_info, sort_prop_dct):
+    """ Determine if the conformer energy catalog can be used to sort
+        the conformers, which is possible when sorting by the electronic
+        or ground-state energy with frequencies from the geometry level.
+    """
+    cat_prop = None
+    if freq_info is None or freq_info == mod_thy_info:
+        if not sort_prop_dct or 'electronic' in sort_prop_dct:
+            cat_prop = 'electronic'
+        elif sort_prop_dct.get('enthalpy') == 0:
+            cat_prop = 'ground'
+    return cat_prop
+
+
 def _wait_for_energy_to_be_saved(cnf_save_fs, locs, sp_fs, sp_info):
     """ in case a geo was just written and its about to write and ene
     """
@@ -709,7 +766,7 @@ def this_conformer_was_run_in_run(zma, cnf_fs, save_cnf_fs, thy_info):
                 out_enes.append(10000)
                 out_geos.append(None)
         for idx, _ in enumerate(out_enes):
-            sym_idx = _sym_unique(
+            sym_idx = unique.sym_unique(
                 ran_geo, ran_ene,
                 [out_geos[idx]], [out_enes[idx]], ethresh=1.0e-5)
             if sym_idx is not None:
@@ -718,29 +775,6 @@ def this_conformer_was_run_in_run(zma, cnf_fs, save_cnf_fs, thy_info):
     return match_locs is not None, sym_locs
 
 
-def _sym_unique(geo, ene, saved_geos, saved_enes, ethresh=1.0e-5):
-    """ Check if a conformer is symmetrically distinct from the
-        existing conformers in the filesystem
-    """
-
-    sym_idx = None
-    new_saved_geos = []
-    idx_dct = {}
-    for i, (sene, sgeo) in enumerate(zip(saved_enes, saved_geos)):
-        if abs(ene - sene) < ethresh:
-            idx_dct[len(new_saved_geos)] = i
-            new_saved_geos.append(sgeo)
-    if new_saved_geos:
-        _, sym_idx = automol.geom.is_unique(
-            geo, new_saved_geos, check_dct={'coulomb': 1e-2})
-
-    if sym_idx is not None:
-        print(' - Structure is not symmetrically unique.')
-        sym_idx = idx_dct[sym_idx]
-
-    return sym_idx
-
-
 def collect_rrho_params(
         cnf_save_fs, locs, sp_info, freq_info, mod_thy_info):
     """ get geo, freqs, and elec. ene from filesystem
@@ -860,7 +894,7 @@ def _sort_energy_parameter(
         # ioprinter.debug_message('sorting by electronic energy')
         sort_ene = sp_ene
     if sort_prop == 'ground':
-        zpe = 0.5 * sum(freqs) * phycon.WAVEN2EH
+        zpe = _catalog.harmonic_zpe(freqs)
         sort_ene += zpe
     elif sort_prop == 'enthalpy':
         ioprinter.info_message('Sorting by Enthalpy(T) not implemented yet')
@@ -871,7 +905,7 @@ def _sort_energy_parameter(
         sort_ene = sort_ene / phycon.EH2KCAL
     elif sort_prop == 'gibbs':
         # ioprinter.debug_message('sorting by Gibbs')
-        zpe = 0.5 * sum(freqs) * phycon.WAVEN2EH
+        zpe = _catalog.harmonic_zpe(freqs)
         zpe = (zpe) * phycon.EH2KCAL
         spe = sp_ene * phycon.EH2KCAL
         if first_enes is None:
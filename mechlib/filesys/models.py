@@ -2,6 +2,9 @@
   Build filesystem objects
 """
 
+import functools
+import collections.abc
+import automol
 import autofile
 from mechanalyzer.inf import spc as sinfo
 from mechanalyzer.inf import thy as tinfo
@@ -13,6 +16,21 @@ from mechlib.filesys.mincnf import fs_confs_dict
 from mechlib.filesys._build import build_fs
 from mechlib.filesys._build import root_locs
 from mechlib.amech_io import printer as ioprinter
+from mechlib import parallel
+
+
+# Layers of the pf filesystems set up so far in this driver run
+_PF_LAYER_MEMO = {}
+
+# Files of the conformer read for each layer of the pf filesystems
+_PF_INPUT_FILES = (
+    ('harm', ('geometry', 'energy', 'hessian')),
+    ('symm', ('geometry',)),
+    ('tors', ('geometry', 'energy')),
+    ('vpt2', ('geometry', 'hessian', 'anharmonicity_matrix',
+              'vibro_rot_alpha_matrix', 'quartic_centrifugal_dist_consts',
+              'anharmonic_zpve')),
+)
 
 
 def pf_rngs_filesys(spc_dct_i, spc_model_dct_i,
@@ -59,55 +77,248 @@ def pf_filesys(spc_dct_i, spc_model_dct_i,
                run_prefix, save_prefix, saddle, name=None, spc_locs=None,
                nprocs=1):
     """ Create various filesystems needed
+
+        The conformer filesystems of each layer ('harm', 'symm', 'tors',
+        'vpt2') are only located when the layer is first accessed, so a
+        model does not pay for the layers it never reads. Each layer is
+        kept for the rest of the driver run (see `clear_pf_filesys`), so
+        later calls for the same species, level, and conformer reuse it.
     """
 
-    pf_filesystems = {
-        'harm': None,
-        'symm': None,
-        'tors': None,
-        'vpt2': None,
-    }
     cnf_range = 'min'
     if spc_locs is not None:
         cnf_range = 'specified'
-    pf_filesystems['harm'] = set_model_filesys(
-        spc_dct_i, spc_model_dct_i['vib']['geolvl'][1][1],
-        run_prefix, save_prefix, saddle, name=name,
-        cnf_range=cnf_range, spc_locs=spc_locs,
-        nprocs=nprocs)
-    if 'symm' in spc_model_dct_i:
-        if 'mod' in spc_model_dct_i['symm']:
-            pf_filesystems['symm'] = set_model_filesys(
-                spc_dct_i, spc_model_dct_i['symm']['geolvl'][1][1],
-                run_prefix, save_prefix, saddle, name=name,
-                cnf_range=cnf_range, spc_locs=spc_locs)
-    if 'tors' in spc_model_dct_i:
-        if 'mod' in spc_model_dct_i['tors']:
-            if spc_model_dct_i['tors']['mod'] != 'rigid':
-                scan_locs = get_matching_tors_locs(
-                    spc_model_dct_i, spc_dct_i, pf_filesystems['harm'],
-                    run_prefix, save_prefix, saddle=saddle, name=name)
-                if scan_locs is not None:
-                    pf_filesystems['tors'] = set_model_filesys(
-                        spc_dct_i, spc_model_dct_i['tors']['geolvl'][1][1],
-                        run_prefix, save_prefix, saddle, name=name,
-                        cnf_range='specified', spc_locs=scan_locs)
-                else:
-                    pf_filesystems['tors'] = None
-    if 'vib' in spc_model_dct_i:
-        if spc_model_dct_i['vib']['mod'] in ['vpt2', 'fund']:
-            pf_filesystems['vpt2'] = set_model_filesys(
-                spc_dct_i, spc_model_dct_i['vib']['vpt2lvl'][1][1],
-                run_prefix, save_prefix, saddle, name=name,
-                cnf_range=cnf_range, spc_locs=spc_locs)
-    else:
-        pf_filesystems['vpt2'] = None
+    args = (spc_dct_i, spc_model_dct_i, run_prefix, save_prefix, saddle,
+            name, cnf_range, spc_locs)
+
+    layer_fns = {
+        'harm': functools.partial(_harm_layer, *args, nprocs=nprocs),
+        'symm': functools.partial(_symm_layer, *args),
+        'tors': functools.partial(_tors_layer, *args),
+        'vpt2': functools.partial(_vpt2_layer, *args),
+    }
 
     # Add the prefixes for now
-    pf_filesystems['run_prefix'] = run_prefix
-    pf_filesystems['save_prefix'] = save_prefix
+    return _PfFilesystems(
+        layer_fns,
+        {'run_prefix': run_prefix, 'save_prefix': save_prefix})
 
-    return pf_filesystems
+
+def clear_pf_filesys():
+    """ Forget the pf filesystem layers set up so far, so that they are
+        located again from the current state of the SAVE filesystem.
+        The workers of an open pool would keep the layers they were forked
+        with, so this must be called before the pool is opened.
+    """
+    if parallel.pool_is_open():
+        raise RuntimeError(
+            'The pf filesystems cannot be cleared while a pool of workers '
+            'is open')
+    _PF_LAYER_MEMO.clear()
+
+
+class _PfFilesystems(collections.abc.Mapping):
+    """ Dictionary of the pf filesystems that sets up each layer on first
+        access
+    """
+
+    def __init__(self, layer_fns, prefix_dct):
+        self._layer_fns = layer_fns
+        self._dct = dict(prefix_dct)
+
+    def __getitem__(self, key):
+        if key not in self._dct and key in self._layer_fns:
+            self._dct[key] = self._layer_fns[key](self)
+        return self._dct[key]
+
+    def __iter__(self):
+        return iter(tuple(self._layer_fns) + tuple(
+            key for key in self._dct if key not in self._layer_fns))
+
+    def __len__(self):
+        return len(set(self._layer_fns) | set(self._dct))
+
+
+def pf_input_paths(pf_filesystems, spc_dct_i, spc_model_dct_i):
+    """ Paths of the files read from the SAVE filesystem for the models
+        of a species, used to fingerprint the inputs of a task unit
+        without walking the whole species filesystem.
+
+        Covers the geometry, energy, Hessian, and z-matrix files of the
+        conformer of each pf filesystem layer, the anharmonic data of the
+        VPT2 layer, the single-point energies of the energy levels, the
+        geometry and energy files of the SCAN and CSCAN points of each
+        rotor, and, for the tau models, the TAU layer of the samples.
+
+        :param pf_filesystems: pf filesystems of the species
+        :type pf_filesystems: dict[str: list]
+        :param spc_dct_i: species information
+        :type spc_dct_i: dict[str: obj]
+        :param spc_model_dct_i: keyword dict of specific species model
+        :type spc_model_dct_i: dict[str: obj]
+        :rtype: tuple(str)
+    """
+
+    paths = ()
+    for layer, names in _PF_INPUT_FILES:
+        layer_fs = pf_filesystems[layer]
+        if layer_fs is None:
+            continue
+        cnf_fs, cnf_path, cnf_locs = layer_fs[:3]
+        paths += tuple(
+            getattr(cnf_fs[-1].file, name).path(cnf_locs) for name in names)
+        zma_fs = autofile.fs.zmatrix(cnf_path)
+        paths += (zma_fs[-1].file.zmatrix.path([0]),
+                  zma_fs[-1].file.torsions.path([0]))
+
+    rxn_info = spc_dct_i.get('canon_rxn_info')
+    if rxn_info is not None:
+        spc_info = rinfo.ts_info(rxn_info)
+    else:
+        spc_info = sinfo.from_dct(spc_dct_i, canonical=True)
+
+    # Single-point energies of the conformer at the vibrational level
+    if pf_filesystems['harm'] is not None:
+        sp_fs = autofile.fs.single_point(pf_filesystems['harm'][1])
+        for key, val in spc_model_dct_i.get('ene', {}).items():
+            if 'lvl' in key and val is not None:
+                level = tinfo.modify_orb_label(val[1][1], spc_info)
+                paths += (sp_fs[-1].file.energy.path(level[1:4]),)
+
+    # Points of the torsional scans of the rotors
+    if pf_filesystems['tors'] is not None:
+        paths += _scan_input_paths(
+            pf_filesystems['tors'][1], spc_info, spc_model_dct_i)
+
+    # Samples of the tau models, whose files and JSON database are all
+    # kept in the TAU layer
+    tors_model = spc_model_dct_i.get('tors', {}).get('mod', 'rigid')
+    if (rxn_info is None and
+            (spc_model_dct_i['vib']['mod'] == 'tau' or 'tau' in tors_model)):
+        mod_thy_info = tinfo.modify_orb_label(
+            spc_model_dct_i['vib']['geolvl'][1][1], spc_info)
+        _, tau_save_fs = build_fs(
+            None, pf_filesystems['save_prefix'], 'TAU',
+            spc_locs=spc_info, thy_locs=mod_thy_info[1:])
+        paths += (tau_save_fs[0].path(),)
+
+    return paths
+
+
+def _scan_input_paths(cnf_path, spc_info, spc_model_dct_i):
+    """ Paths of the geometry and energy files at each point of the SCAN
+        and CSCAN filesystems of the torsions of a conformer
+    """
+
+    zma_fs = autofile.fs.zmatrix(cnf_path)
+    if not zma_fs[-1].file.torsions.exists([0]):
+        return ()
+    tors_names = {
+        automol.data.tors.name(tors)
+        for tors in zma_fs[-1].file.torsions.read([0])}
+    ene_info = tinfo.modify_orb_label(
+        spc_model_dct_i['tors']['enelvl'][1][1], spc_info)
+
+    paths = ()
+    zma_path = zma_fs[-1].path([0])
+    for scn_fs in (autofile.fs.scan(zma_path), autofile.fs.cscan(zma_path)):
+        if not scn_fs[0].exists():
+            continue
+        for locs in scn_fs[-1].existing():
+            # The coordinate names come just before the coordinate values
+            if set(locs[-2]) <= tors_names:
+                sp_fs = autofile.fs.single_point(scn_fs[-1].path(locs))
+                paths += (scn_fs[-1].file.geometry.path(locs),
+                          sp_fs[-1].file.energy.path(ene_info[1:4]))
+
+    return tuple(sorted(paths))
+
+
+def _memo_layer(layer, spc_dct_i, saddle, name, run_prefix, save_prefix,
+                key_vals, layer_fn):
+    """ Set up a layer of the pf filesystems, or reuse it if it was
+        already set up for the same species and inputs in this run
+    """
+    key = repr((
+        layer, root_locs(spc_dct_i, saddle=saddle, name=name),
+        spc_dct_i.get('hbond_cutoffs'), run_prefix, save_prefix, key_vals))
+    if key not in _PF_LAYER_MEMO:
+        _PF_LAYER_MEMO[key] = layer_fn()
+    return _PF_LAYER_MEMO[key]
+
+
+def _harm_layer(spc_dct_i, spc_model_dct_i, run_prefix, save_prefix,
+                saddle, name, cnf_range, spc_locs, _pf_filesystems,
+                nprocs=1):
+    """ Filesystem of the conformer at the vibrational level
+    """
+    level = spc_model_dct_i['vib']['geolvl'][1][1]
+    return _memo_layer(
+        'harm', spc_dct_i, saddle, name, run_prefix, save_prefix,
+        (level, cnf_range, spc_locs),
+        lambda: set_model_filesys(
+            spc_dct_i, level,
+            run_prefix, save_prefix, saddle, name=name,
+            cnf_range=cnf_range, spc_locs=spc_locs,
+            nprocs=nprocs))
+
+
+def _symm_layer(spc_dct_i, spc_model_dct_i, run_prefix, save_prefix,
+                saddle, name, cnf_range, spc_locs, _pf_filesystems):
+    """ Filesystem of the conformer at the symmetry level
+    """
+    if 'mod' not in spc_model_dct_i.get('symm', {}):
+        return None
+    level = spc_model_dct_i['symm']['geolvl'][1][1]
+    return _memo_layer(
+        'symm', spc_dct_i, saddle, name, run_prefix, save_prefix,
+        (level, cnf_range, spc_locs),
+        lambda: set_model_filesys(
+            spc_dct_i, level,
+            run_prefix, save_prefix, saddle, name=name,
+            cnf_range=cnf_range, spc_locs=spc_locs))
+
+
+def _tors_layer(spc_dct_i, spc_model_dct_i, run_prefix, save_prefix,
+                saddle, name, cnf_range, spc_locs, pf_filesystems):
+    """ Filesystem of the conformer at the torsional scan level that
+        matches the conformer at the vibrational level
+    """
+    if spc_model_dct_i.get('tors', {}).get('mod', 'rigid') == 'rigid':
+        return None
+
+    def _set_tors_filesys():
+        scan_locs = get_matching_tors_locs(
+            spc_model_dct_i, spc_dct_i, pf_filesystems['harm'],
+            run_prefix, save_prefix, saddle=saddle, name=name)
+        if scan_locs is None:
+            return None
+        return set_model_filesys(
+            spc_dct_i, spc_model_dct_i['tors']['geolvl'][1][1],
+            run_prefix, save_prefix, saddle, name=name,
+            cnf_range='specified', spc_locs=scan_locs)
+
+    return _memo_layer(
+        'tors', spc_dct_i, saddle, name, run_prefix, save_prefix,
+        (spc_model_dct_i['tors']['geolvl'][1][1],
+         spc_model_dct_i['vib']['geolvl'][1][1], cnf_range, spc_locs),
+        _set_tors_filesys)
+
+
+def _vpt2_layer(spc_dct_i, spc_model_dct_i, run_prefix, save_prefix,
+                saddle, name, cnf_range, spc_locs, _pf_filesystems):
+    """ Filesystem of the conformer at the VPT2 level
+    """
+    if spc_model_dct_i.get('vib', {}).get('mod') not in ('vpt2', 'fund'):
+        return None
+    level = spc_model_dct_i['vib']['vpt2lvl'][1][1]
+    return _memo_layer(
+        'vpt2', spc_dct_i, saddle, name, run_prefix, save_prefix,
+        (level, cnf_range, spc_locs),
+        lambda: set_model_filesys(
+            spc_dct_i, level,
+            run_prefix, save_prefix, saddle, name=name,
+            cnf_range=cnf_range, spc_locs=spc_locs))
 
 
 def set_model_filesys(spc_dct_i, level,
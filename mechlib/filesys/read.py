@@ -1,6 +1,8 @@
 """ drivers for coordinate scans
 """
+import os
 import itertools
+import collections.abc
 import numpy
 from scipy.interpolate import CubicSpline
 from scipy.interpolate import Akima1DInterpolator
@@ -15,100 +17,78 @@ from mechlib.filesys._build import build_fs
 from mechlib.filesys.mincnf import min_energy_conformer_locators
 
 
+SCAN_DATA_KEYS = ('geometry', 'gradient', 'hessian', 'zmatrix')
+
+# Number of tau samples whose geometries, gradients or Hessians are held
+# at once
+TAU_CHUNK_SIZE = 500
+
+
 def potential(names, grid_vals, cnf_save_path,
               mod_tors_ene_info, ref_ene,
               constraint_dct,
               read_geom=False, read_grad=False,
               read_hess=False, read_zma=False,
               read_energy_backstep=True,
-              remove_bad_points=True):
+              remove_bad_points=True,
+              hess_mmap_path=None):
     """ Get the potential for a hindered rotor
+
+        The scan filesystem is walked once, point by point, without
+        building the full list of grid coordinates. If `hess_mmap_path`
+        is given, the Hessians are stored in a memory-mapped array at that
+        path and the returned dictionary holds views into it, rather than
+        holding every Hessian in memory.
     """
 
     print('potential test:')
     print('names', names)
     print('grids', grid_vals)
 
-    # Build initial lists for storing potential energies and Hessians
-    # grid_points = automol.pot.points(grid_vals)
-    grid_coords = tuple(itertools.product(*grid_vals))
-    back_coords = tuple(tuple(val + 4*numpy.pi for val in grid)
-                        for grid in grid_coords)
-    pot, geoms, grads, hessians, zmas, paths = {}, {}, {}, {}, {}, {}
-
-    # Set up filesystem information
-    zma_fs = autofile.fs.zmatrix(cnf_save_path)
-    zma_path = zma_fs[-1].path([0])
-    if constraint_dct is None:
-        scn_fs = autofile.fs.scan(zma_path)
-    else:
-        scn_fs = autofile.fs.cscan(zma_path)
-    # Read the filesystem
-    for idx, vals in enumerate(grid_coords):
+    # Read the energies on the grid
+    ene_grid = potential_energy_grid(
+        names, grid_vals, cnf_save_path, mod_tors_ene_info,
+        constraint_dct, read_energy_backstep=read_energy_backstep)
 
-        # Get angles in degrees for potential for now
+    # Build the potential relative to the reference energy
+    pot = {}
+    for idx, vals in enumerate(itertools.product(*grid_vals)):
         vals_conv = tuple(val*phycon.RAD2DEG for val in vals)
-
-        # Get locs for reading filesysten
-        locs = [names, vals]
-        back_locs = [names, back_coords[idx]]
-        if constraint_dct is not None:
-            locs = [constraint_dct] + locs
-            back_locs = [constraint_dct] + back_locs
-        # print('path', scn_fs[-1].path(locs))
-
-        # Read values of interest
-        ene = energy(scn_fs, locs, mod_tors_ene_info)
-        if read_energy_backstep:
-            back_ene = energy(scn_fs, back_locs, mod_tors_ene_info)
-            step_ene = None
-            if ene is not None:
-                if back_ene is not None:
-                    step_ene = min(ene, back_ene)
-                else:
-                    step_ene = ene
-            elif back_ene is not None:
-                step_ene = back_ene
-
-            if step_ene is not None:
-                enediff = (step_ene - ref_ene) * phycon.EH2KCAL
-                if idx == 0:
-                    if enediff > 0.05:
-                        print('Warning the first potential value does not',
-                              f'match the reference energy {enediff:.2f}')
-                    ref_ene = step_ene
-                    enediff = 0
-                pot[vals_conv] = enediff
-            else:
-                pot[vals_conv] = None
+        step_ene = ene_grid.flat[idx]
+        if numpy.isnan(step_ene):
+            pot[vals_conv] = None
         else:
-            pot[vals_conv] = (ene - ref_ene) * phycon.EH2KCAL
-
-        if read_geom:
-            if scn_fs[-1].file.geometry.exists(locs):
-                geoms[vals_conv] = scn_fs[-1].file.geometry.read(locs)
-            else:
-                geoms[vals_conv] = None
-
-        if read_grad:
-            if scn_fs[-1].file.gradient.exists(locs):
-                grads[vals_conv] = scn_fs[-1].file.gradient.read(locs)
-            else:
-                grads[vals_conv] = None
-
-        if read_hess:
-            if scn_fs[-1].file.hessian.exists(locs):
-                hessians[vals_conv] = scn_fs[-1].file.hessian.read(locs)
-            else:
-                hessians[vals_conv] = None
-
-        if read_zma:
-            if scn_fs[-1].file.zmatrix.exists(locs):
-                zmas[vals_conv] = scn_fs[-1].file.zmatrix.read(locs)
-            else:
-                zmas[vals_conv] = None
-
-        paths[vals] = scn_fs[-1].path(locs)
+            step_ene = float(step_ene)
+            enediff = (step_ene - ref_ene) * phycon.EH2KCAL
+            if read_energy_backstep and idx == 0:
+                if enediff > 0.05:
+                    print('Warning the first potential value does not',
+                          f'match the reference energy {enediff:.2f}')
+                ref_ene = step_ene
+                enediff = 0
+            pot[vals_conv] = enediff
+
+    # Read the other data lazily, one point at a time
+    keys = tuple(key for key, read in zip(
+        SCAN_DATA_KEYS, (read_geom, read_grad, read_hess, read_zma)) if read)
+    data_dcts = {key: {} for key in SCAN_DATA_KEYS}
+    paths = {}
+    hess_arr = None
+    for idx, (vals, path, data) in enumerate(iter_potential_data(
+            names, grid_vals, cnf_save_path, constraint_dct, keys=keys)):
+        vals_conv = tuple(val*phycon.RAD2DEG for val in vals)
+        if hess_mmap_path is not None and data.get('hessian') is not None:
+            if hess_arr is None:
+                hess_arr = _hessian_memmap(
+                    hess_mmap_path, ene_grid.size,
+                    numpy.shape(data['hessian']))
+            hess_arr[idx] = data['hessian']
+            data['hessian'] = hess_arr[idx]
+        for key in keys:
+            data_dcts[key][vals_conv] = data[key]
+        paths[vals] = path
+    if hess_arr is not None:
+        hess_arr.flush()
 
     # If potential has any terms that are not None, ID and remove bad points
     if remove_bad_points and len(names) == 1:
@@ -121,7 +101,163 @@ def potential(names, grid_vals, cnf_save_path,
         else:
             pot = {}
 
-    return pot, geoms, grads, hessians, zmas, paths
+    return (pot, data_dcts['geometry'], data_dcts['gradient'],
+            data_dcts['hessian'], data_dcts['zmatrix'], paths)
+
+
+def potential_energy_grid(names, grid_vals, cnf_save_path,
+                          mod_tors_ene_info, constraint_dct,
+                          read_energy_backstep=True):
+    """ Read the energies of a scan into an array with one axis per
+        scan coordinate. Points with no energy are set to NaN.
+
+        If requested, the energy at each point is the lower of the
+        energies of the forward scan and of the back-step scan, whose
+        coordinates are shifted by 4 pi.
+
+        :param names: names of the scan coordinates
+        :type names: tuple(str)
+        :param grid_vals: values of each scan coordinate
+        :type grid_vals: tuple(tuple(float))
+        :param cnf_save_path: path to the conformer holding the scan
+        :type cnf_save_path: str
+        :param mod_tors_ene_info: theory level of the energies
+        :type mod_tors_ene_info: tuple(str)
+        :param constraint_dct: constrained coordinates of the scan
+        :type constraint_dct: dict[str: float]
+        :param read_energy_backstep: use the back-step scan energies
+        :type read_energy_backstep: bool
+        :rtype: numpy.ndarray
+    """
+
+    scn_fs = _scan_fs(cnf_save_path, constraint_dct)
+    ene_grid = numpy.full(tuple(len(grid) for grid in grid_vals), numpy.nan)
+    for idx, vals in enumerate(itertools.product(*grid_vals)):
+        enes = [_scan_energy(
+            scn_fs, _scan_locs(names, vals, constraint_dct),
+            mod_tors_ene_info)]
+        if read_energy_backstep:
+            back_vals = tuple(val + 4*numpy.pi for val in vals)
+            enes.append(_scan_energy(
+                scn_fs, _scan_locs(names, back_vals, constraint_dct),
+                mod_tors_ene_info))
+        enes = [ene for ene in enes if ene is not None]
+        if enes:
+            ene_grid.flat[idx] = min(enes)
+
+    return ene_grid
+
+
+def scan_energy_arrays(scn_fs, names, grid_vals, mod_tors_ene_info,
+                       constraint_dct=None):
+    """ Read the energies of the forward and back-step scans of a rotor
+        in one pass over the scan filesystem. Points with no energy are
+        set to NaN.
+
+        :param scn_fs: SCAN/CSCAN object with save filesys prefix
+        :type scn_fs: autofile.fs.scan or autofile.fs.cscan object
+        :param names: names of the scan coordinates
+        :type names: tuple(str)
+        :param grid_vals: values of each scan coordinate
+        :type grid_vals: tuple(tuple(float))
+        :param mod_tors_ene_info: theory level of the energies
+        :type mod_tors_ene_info: tuple(str)
+        :param constraint_dct: constrained coordinates of the scan
+        :type constraint_dct: dict[str: float]
+        :return: forward and back-step energies, flattened over the grid
+        :rtype: (numpy.ndarray, numpy.ndarray)
+    """
+
+    npts = int(numpy.prod([len(grid) for grid in grid_vals]))
+    enes = numpy.full((2, npts), numpy.nan)
+    for idx, vals in enumerate(itertools.product(*grid_vals)):
+        back_vals = tuple(val + 4*numpy.pi for val in vals)
+        for row, _vals in enumerate((vals, back_vals)):
+            ene = _scan_energy(
+                scn_fs, _scan_locs(names, _vals, constraint_dct),
+                mod_tors_ene_info)
+            if ene is not None:
+                enes[row, idx] = ene
+
+    return enes[0], enes[1]
+
+
+def iter_potential_data(names, grid_vals, cnf_save_path, constraint_dct,
+                        keys=('geometry',)):
+    """ Walk the points of a scan, yielding the data saved at each one.
+        Only the data at the current point is held in memory.
+
+        :param names: names of the scan coordinates
+        :type names: tuple(str)
+        :param grid_vals: values of each scan coordinate
+        :type grid_vals: tuple(tuple(float))
+        :param cnf_save_path: path to the conformer holding the scan
+        :type cnf_save_path: str
+        :param constraint_dct: constrained coordinates of the scan
+        :type constraint_dct: dict[str: float]
+        :param keys: data to read: geometry, gradient, hessian, zmatrix
+        :type keys: tuple(str)
+        :return: coordinate values, path, and data of each point
+        :rtype: iterator of (tuple(float), str, dict[str: obj])
+    """
+
+    assert set(keys) <= set(SCAN_DATA_KEYS), (
+        f'Scan data keys {keys} must be in {SCAN_DATA_KEYS}')
+
+    scn_fs = _scan_fs(cnf_save_path, constraint_dct)
+    for vals in itertools.product(*grid_vals):
+        locs = _scan_locs(names, vals, constraint_dct)
+        path = scn_fs[-1].path(locs)
+        data = dict.fromkeys(keys)
+        if keys and os.path.isdir(path):
+            for key in keys:
+                scn_file = getattr(scn_fs[-1].file, key)
+                if scn_file.exists(locs):
+                    data[key] = scn_file.read(locs)
+        yield vals, path, data
+
+
+def _scan_fs(cnf_save_path, constraint_dct):
+    """ Build the scan filesystem for a conformer
+    """
+    zma_fs = autofile.fs.zmatrix(cnf_save_path)
+    zma_path = zma_fs[-1].path([0])
+    if constraint_dct is None:
+        scn_fs = autofile.fs.scan(zma_path)
+    else:
+        scn_fs = autofile.fs.cscan(zma_path)
+    return scn_fs
+
+
+def _scan_locs(names, vals, constraint_dct):
+    """ Build the locators of a point of the scan filesystem
+    """
+    locs = [names, vals]
+    if constraint_dct is not None:
+        locs = [constraint_dct] + locs
+    return locs
+
+
+def _scan_energy(scn_fs, locs, mod_tors_ene_info):
+    """ Read the energy at a point of the scan filesystem, checking only
+        for the energy file if the point directory does not exist
+    """
+    ene = None
+    path = scn_fs[-1].path(locs)
+    if os.path.isdir(path):
+        sp_fs = autofile.fs.single_point(path)
+        if sp_fs[-1].file.energy.exists(mod_tors_ene_info[1:4]):
+            ene = sp_fs[-1].file.energy.read(mod_tors_ene_info[1:4])
+    return ene
+
+
+def _hessian_memmap(mmap_path, npts, hess_shape):
+    """ Create a memory-mapped array on disk to hold the Hessians
+        at each point of a scan
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(mmap_path)), exist_ok=True)
+    return numpy.lib.format.open_memmap(
+        mmap_path, mode='w+', dtype=float, shape=(npts,) + hess_shape)
 
 
 def identify_bad_point(pot, thresh=0.05):
@@ -179,6 +315,66 @@ def identify_bad_point(pot, thresh=0.05):
     return bad_angle
 
 
+def identify_bad_points(angles, enes, thresh=0.05):
+    """ Identifies the bad points of a torsional potential in every region
+        where the Akima and cubic spline fits disagree, along with a quality
+        score for the potential
+
+        :param angles: angles of the points of the potential (degrees)
+        :type angles: numpy.ndarray
+        :param enes: energies of the points of the potential (kcal/mol)
+        :type enes: numpy.ndarray
+        :return: bad angles (degrees), largest normalized difference of
+            the splines, and the fraction of points that are not bad
+        :rtype: (numpy.ndarray, float, float)
+    """
+
+    angles = numpy.asarray(angles, dtype=float)
+    enes = numpy.asarray(enes, dtype=float)
+    if len(angles) < 3 or not numpy.any(enes):
+        return numpy.zeros(0), 0.0, 1.0
+
+    # Get the angles relative to the first, between -180 and 180
+    start_angle = angles[0]
+    shifted_angles = angles - start_angle
+    shifted_angles[shifted_angles > 180] -= 360
+
+    # For methyl rotors, double the threshold
+    if len(shifted_angles) == 4:
+        thresh *= 2
+
+    # Fit cubic and Akima splines to the sorted potential and evaluate
+    # them on a fine grid to check for ringing
+    sorted_idxs = numpy.argsort(shifted_angles)
+    sorted_angles = shifted_angles[sorted_idxs]
+    cub_spline = CubicSpline(sorted_angles, enes[sorted_idxs])
+    akima_spline = Akima1DInterpolator(sorted_angles, enes[sorted_idxs])
+    fine_grid = numpy.arange(min(sorted_angles), max(sorted_angles), 1)
+    norm_diff = (
+        (cub_spline(fine_grid) - akima_spline(fine_grid)) / max(enes))
+
+    # Find the regions of the fine grid where the splines disagree, and take
+    # the higher of the two points nearest the peak of each region
+    bad_fine = numpy.concatenate(([0], (norm_diff > thresh).astype(int), [0]))
+    edges = numpy.flatnonzero(numpy.diff(bad_fine))
+    bad_angles = []
+    for start, end in zip(edges[::2], edges[1::2]):
+        peak_angle = fine_grid[start + numpy.argmax(norm_diff[start:end])]
+        near_idxs = numpy.argsort(abs(shifted_angles - peak_angle))[:2]
+        bad_angles.append(
+            shifted_angles[near_idxs[numpy.argmax(enes[near_idxs])]])
+    bad_angles = numpy.array(bad_angles, dtype=float)
+
+    # Convert back to the original angles
+    bad_angles[bad_angles < 0] += 360
+    bad_angles = numpy.unique(bad_angles + start_angle)
+
+    max_norm_diff = float(max(norm_diff)) if norm_diff.size else 0.0
+    score = 1.0 - len(bad_angles) / len(angles)
+
+    return bad_angles, max_norm_diff, score
+
+
 def remove_bad_point(pot, bad_angle):
     """ Remove a single bad angle from a potential
     """
@@ -382,6 +578,133 @@ def instability_transformation(spc_dct, spc_name, thy_info, save_prefix,
     return _instab, path
 
 
+def tau_sample_energies(tau_save_fs, tau_locs, db_style='jsondb'):
+    """ Read the energies of the tau samples into an array, with a single
+        read of the JSON database
+
+        :param tau_save_fs: TAU object with save filesys prefix
+        :type tau_save_fs: autofile.fs.tau object
+        :param tau_locs: locators of the samples
+        :type tau_locs: tuple(tuple(str))
+        :param db_style: 'jsondb' or 'directory'
+        :type db_style: str
+        :rtype: numpy.ndarray
+    """
+
+    if not tau_locs:
+        return numpy.zeros(0)
+    if db_style == 'jsondb':
+        enes = tau_save_fs[-1].json.energy.read_all(tau_locs)
+    else:
+        enes = [tau_save_fs[-1].file.energy.read(locs) for locs in tau_locs]
+
+    return numpy.array(enes, dtype=float)
+
+
+def tau_sample_data(tau_save_fs, tau_locs, key, db_style='jsondb',
+                    chunk_size=TAU_CHUNK_SIZE):
+    """ Sequence of the geometries, gradients or Hessians of the tau
+        samples, read from the filesystem as the sequence is walked
+
+        The samples are read `chunk_size` at a time, so only one chunk is
+        held in memory at once. For the 'jsondb' style, each chunk is
+        read from the database with a single read.
+
+        :param tau_save_fs: TAU object with save filesys prefix
+        :type tau_save_fs: autofile.fs.tau object
+        :param tau_locs: locators of the samples
+        :type tau_locs: tuple(tuple(str))
+        :param key: data to read: 'geometry', 'gradient' or 'hessian'
+        :type key: str
+        :param db_style: 'jsondb' or 'directory'
+        :type db_style: str
+        :rtype: collections.abc.Sequence
+    """
+    assert key in ('geometry', 'gradient', 'hessian'), (
+        f'Tau sample data key {key} must be geometry, gradient or hessian')
+    return _TauSampleData(tau_save_fs, tuple(tau_locs), key, db_style,
+                          chunk_size)
+
+
+def tau_samples(samp_dct, chunk_size=TAU_CHUNK_SIZE):
+    """ Read the tau samples described by the plain data kept for them
+        when the filesystem was read for the MESS input
+
+        The energies are read into an array, while the geometries, and
+        the gradients and Hessians if they are used, are sequences read
+        from the filesystem a chunk at a time as they are walked.
+
+        :param samp_dct: SAVE prefix, locators, database style of the
+            samples, and whether their gradients and Hessians are used
+        :type samp_dct: dict[str: obj]
+        :rtype: (numpy.ndarray, Sequence, Sequence, Sequence)
+    """
+
+    _, tau_save_fs = build_fs(
+        None, samp_dct['save_prefix'], 'TAU',
+        spc_locs=samp_dct['spc_locs'], thy_locs=samp_dct['thy_locs'])
+    tau_locs, db_style = samp_dct['tau_locs'], samp_dct['db_style']
+
+    enes = tau_sample_energies(tau_save_fs, tau_locs, db_style=db_style)
+    geos = tau_sample_data(
+        tau_save_fs, tau_locs, 'geometry',
+        db_style=db_style, chunk_size=chunk_size)
+    grads, hessians = [], []
+    if samp_dct['hessians']:
+        grads = tau_sample_data(
+            tau_save_fs, tau_locs, 'gradient',
+            db_style=db_style, chunk_size=chunk_size)
+        hessians = tau_sample_data(
+            tau_save_fs, tau_locs, 'hessian',
+            db_style=db_style, chunk_size=chunk_size)
+
+    return enes, geos, grads, hessians
+
+
+class _TauSampleData(collections.abc.Sequence):
+    """ Geometries, gradients or Hessians of the tau samples, read a chunk
+        at a time from the sample files or the JSON database
+    """
+
+    def __init__(self, tau_save_fs, tau_locs, key, db_style, chunk_size):
+        self._tau_save_fs = tau_save_fs
+        self._tau_locs = tau_locs
+        self._key = key
+        self._db_style = db_style
+        self._chunk_size = max(1, chunk_size)
+        self._chunk = (None, ())
+
+    def __len__(self):
+        return len(self._tau_locs)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError('tau sample index out of range')
+        chunk_idx, chunk = self._chunk
+        if chunk_idx != idx // self._chunk_size:
+            chunk_idx = idx // self._chunk_size
+            chunk = self._read_chunk(chunk_idx)
+            self._chunk = (chunk_idx, chunk)
+        return chunk[idx % self._chunk_size]
+
+    def __iter__(self):
+        for chunk_idx in range(0, len(self), self._chunk_size):
+            yield from self._read_chunk(chunk_idx // self._chunk_size)
+
+    def _read_chunk(self, chunk_idx):
+        start = chunk_idx * self._chunk_size
+        locs_lst = self._tau_locs[start:start+self._chunk_size]
+        if self._db_style == 'jsondb':
+            tau_json = getattr(self._tau_save_fs[-1].json, self._key)
+            return list(tau_json.read_all(locs_lst))
+        tau_file = getattr(self._tau_save_fs[-1].file, self._key)
+        return [tau_file.read(locs) for locs in locs_lst]
+
+
 def energy_trans(etrans_save_fs, etrans_locs):
     """ Read out the the enery transfer parameters in the filesys
     """
@@ -6,6 +6,8 @@ import automol
 import elstruct
 import autofile
 from mechlib.amech_io import printer as ioprinter
+from mechlib.filesys import _catalog
+from mechlib.filesys import _stage
 
 
 def atom(sp_ret, cnf_fs, thy_locs, zma,
@@ -49,12 +51,14 @@ def _conformer_setup(cnf_fs, rng_locs, tors_locs, zma_locs):
     return cnf_locs, zma_locs, zma_fs, sp_fs
 
 
-def _conformer_aux_info(zma_fs, zma_locs, zrxn=None):
+def _conformer_aux_info(zma_fs, zma_locs, zrxn=None, zma=None):
     """ Save rings, rotors, and reaction objects
         into the ZMA fs
     """
-    _save_rotors(zma_fs, zma_locs, zrxn=zrxn)
-    _save_rings(zma_fs, zma_locs, zrxn=zrxn)
+    if zma is None:
+        zma = zma_fs[-1].file.zmatrix.read(zma_locs)
+    _save_rotors(zma_fs, zma_locs, zrxn=zrxn, zma=zma)
+    _save_rings(zma_fs, zma_locs, zrxn=zrxn, zma=zma)
     _save_reaction(zma_fs, zma_locs, zrxn=zrxn)
 
 
@@ -63,47 +67,63 @@ def conformer(opt_ret, hess_ret, cnf_fs, thy_locs,
               rng_locs=None, tors_locs=None, zma_locs=None):
     """ Save a conformer and relevant information.
 
+        The files of the conformer are staged and then committed into
+        the CONFS layer together.
+
         thy_fs = (_fs, _locs)
     """
-    cnf_locs, zma_locs, zma_fs, sp_fs = _conformer_setup(
-        cnf_fs, rng_locs, tors_locs, zma_locs)
+    with _stage.conformer_transaction(cnf_fs) as stage_fs:
+        cnf_locs, zma_locs, zma_fs, sp_fs = _conformer_setup(
+            stage_fs, rng_locs, tors_locs, zma_locs)
 
-    # Save data from optimization and hessian jobs
-    _save_geom(opt_ret, cnf_fs, cnf_locs)
-    _save_zmatrix(opt_ret, zma_fs, zma_locs, init_zma=init_zma)
-    _save_energy(opt_ret, sp_fs, thy_locs)
+        # Save data from optimization and hessian jobs
+        _save_geom(opt_ret, stage_fs, cnf_locs)
+        zma = _save_zmatrix(opt_ret, zma_fs, zma_locs, init_zma=init_zma)
+        _save_energy(opt_ret, sp_fs, thy_locs)
 
-    if hess_ret is not None:
-        _save_hessian(hess_ret, cnf_fs, cnf_locs)
+        if hess_ret is not None:
+            _save_hessian(hess_ret, stage_fs, cnf_locs)
+
+        # Save auxiliary information for the structure, if needed
+        _conformer_aux_info(zma_fs, zma_locs, zrxn=zrxn, zma=zma)
+    print(f" - Committed at {cnf_fs[-1].path(cnf_locs)}")
 
     # Save ring and cnf samp files, if needed
     init_cnf_samp(cnf_fs, cnf_locs)
 
-    # Save auxiliary information for the structure, if needed
-    _conformer_aux_info(zma_fs, zma_locs, zrxn=zrxn)
+    # Update the conformer energy catalog of the CONFS layer
+    _catalog.update_conformer(cnf_fs, cnf_locs, thy_locs)
 
 
 def parsed_conformer(
         save_info, cnf_fs, thy_locs, rng_locs,
         zma_locs=(0,), tors_locs=None, zrxn=None, hess_ret=None):
     """ Save a conformer and relavent information without an output ret
-    """
-    cnf_locs, zma_locs, zma_fs, sp_fs = _conformer_setup(
-        cnf_fs, rng_locs, tors_locs, zma_locs)
 
-    # Save data from optimization and hessian jobs
-    geo, zma, ene, inf_obj, inp_str = save_info
-    _save_geom_parsed(geo, inf_obj, inp_str, cnf_fs, cnf_locs)
-    _save_zmatrix_parsed(zma, inf_obj, inp_str, zma_fs, zma_locs)
-    _save_energy_parsed(ene, inf_obj, inp_str, sp_fs, thy_locs)
-    if hess_ret is not None:
-        _save_hessian(hess_ret, cnf_fs, cnf_locs)
+        The files of the conformer are staged and then committed into
+        the CONFS layer together.
+    """
+    with _stage.conformer_transaction(cnf_fs) as stage_fs:
+        cnf_locs, zma_locs, zma_fs, sp_fs = _conformer_setup(
+            stage_fs, rng_locs, tors_locs, zma_locs)
+
+        # Save data from optimization and hessian jobs
+        geo, zma, ene, inf_obj, inp_str = save_info
+        _save_geom_parsed(geo, inf_obj, inp_str, stage_fs, cnf_locs)
+        _save_zmatrix_parsed(zma, inf_obj, inp_str, zma_fs, zma_locs)
+        _save_energy_parsed(ene, inf_obj, inp_str, sp_fs, thy_locs)
+        if hess_ret is not None:
+            _save_hessian(hess_ret, stage_fs, cnf_locs)
+
+        # Save auxiliary information for the structure, if needed
+        _conformer_aux_info(zma_fs, zma_locs, zrxn=zrxn, zma=zma)
+    print(f" - Committed at {cnf_fs[-1].path(cnf_locs)}")
 
     # Save ring and cnf samp files, if needed
     init_cnf_samp(cnf_fs, cnf_locs)
 
-    # Save auxiliary information for the structure, if needed
-    _conformer_aux_info(zma_fs, zma_locs, zrxn=zrxn)
+    # Update the conformer energy catalog of the CONFS layer
+    _catalog.update_conformer(cnf_fs, cnf_locs, thy_locs)
 
 
 def sym_indistinct_conformer(geo, cnf_fs, cnf_tosave_locs, cnf_saved_locs):
@@ -346,7 +366,7 @@ def _save_geom_parsed(geo, inf_obj, inp_str, cnf_fs, cnf_locs):
 
     cnf_fs[-1].create(cnf_locs)
     cnf_path = cnf_fs[-1].path(cnf_locs)
-    print(f" - Saving at {cnf_path}")
+    print(f" - Saving at {_stage.final_path(cnf_path)}")
 
     cnf_fs[-1].file.geometry_info.write(inf_obj, cnf_locs)
     cnf_fs[-1].file.geometry_input.write(inp_str, cnf_locs)
@@ -374,7 +394,7 @@ def _save_grad(ret, cnf_fs, cnf_locs):
 
     cnf_fs[-1].create(cnf_locs)
     cnf_path = cnf_fs[-1].path(cnf_locs)
-    print(f" - Saving at {cnf_path}")
+    print(f" - Saving at {_stage.final_path(cnf_path)}")
 
     cnf_fs[-1].file.gradient_info.write(inf_obj, cnf_locs)
     cnf_fs[-1].file.gradient_input.write(inp_str, cnf_locs)
@@ -386,7 +406,7 @@ def _save_zmatrix_parsed(zma, inf_obj, inp_str, zma_fs, zma_locs):
     """
     zma_fs[-1].create(zma_locs)
     zma_path = zma_fs[-1].path(zma_locs)
-    print(f" - Saving at {zma_path}")
+    print(f" - Saving at {_stage.final_path(zma_path)}")
 
     zma_fs[-1].file.geometry_info.write(inf_obj, zma_locs)
     zma_fs[-1].file.geometry_input.write(inp_str, zma_locs)
@@ -411,13 +431,15 @@ def _save_zmatrix(ret, zma_fs, zma_locs, init_zma=None):
         zma = read_job_zma(ret, init_zma=init_zma)
     _save_zmatrix_parsed(zma, inf_obj, inp_str, zma_fs, zma_locs)
 
+    return zma
+
 
 def _save_energy_parsed(ene, inf_obj, inp_str, sp_fs, sp_locs):
     """ Save an energy that has been parsed
     """
     sp_fs[-1].create(sp_locs)
     sp_path = sp_fs[-1].path(sp_locs)
-    print(f" - Saving at {sp_path}")
+    print(f" - Saving at {_stage.final_path(sp_path)}")
 
     sp_fs[-1].file.input.write(inp_str, sp_locs)
     sp_fs[-1].file.info.write(inf_obj, sp_locs)
@@ -440,7 +462,7 @@ def _save_hessian_parsed(hess, freqs, inf_obj, inp_str, cnf_fs, cnf_locs):
     """
     cnf_fs[-1].create(cnf_locs)
     cnf_path = cnf_fs[-1].path(cnf_locs)
-    print(f" - Saving at {cnf_path}")
+    print(f" - Saving at {_stage.final_path(cnf_path)}")
 
     cnf_fs[-1].file.hessian_info.write(inf_obj, cnf_locs)
     cnf_fs[-1].file.hessian_input.write(inp_str, cnf_locs)
@@ -460,13 +482,15 @@ def _save_hessian(ret, cnf_fs, cnf_locs):
     _save_hessian_parsed(hess, freqs, inf_obj, inp_str, cnf_fs, cnf_locs)
 
 
-def _save_rotors(zma_fs, zma_locs, zrxn=None):
+def _save_rotors(zma_fs, zma_locs, zrxn=None, zma=None):
     """ Save the rotors
 
-        Reading the ZMA from the filesystem to build rotors
+        Reading the ZMA from the filesystem to build rotors, unless
+        it is given
     """
 
-    zma = zma_fs[-1].file.zmatrix.read(zma_locs)
+    if zma is None:
+        zma = zma_fs[-1].file.zmatrix.read(zma_locs)
     # print('zma')
     # print(automol.zmat.string(zma))
     # print('\nzrxn')
@@ -476,22 +500,25 @@ def _save_rotors(zma_fs, zma_locs, zrxn=None):
     if rotors:
         tors_lst = automol.data.rotor.rotors_torsions(rotors, sort=True)
         zma_path = zma_fs[-1].path(zma_locs)
-        print(f" - Rotors identified from Z-Matrix at {zma_path}")
+        print(" - Rotors identified from Z-Matrix at "
+              f"{_stage.final_path(zma_path)}")
         print(" - Saving rotor information at same location.")
         zma_fs[-1].file.torsions.write(tors_lst, zma_locs)
 
 
-def _save_rings(zma_fs, zma_locs, zrxn=None):
+def _save_rings(zma_fs, zma_locs, zrxn=None, zma=None):
     """ Save rings
     """
 
-    zma = zma_fs[-1].file.zmatrix.read(zma_locs)
+    if zma is None:
+        zma = zma_fs[-1].file.zmatrix.read(zma_locs)
     tsg = None if zrxn is None else automol.reac.ts_graph(zrxn)
     rings_atoms = automol.zmat.all_rings_atoms(zma, tsg=tsg)
     ring_dct = automol.zmat.all_rings_dct(zma, rings_atoms)
     if ring_dct:
         zma_path = zma_fs[-1].path(zma_locs)
-        print(f" - Ring torsions identified from Z-Matrix at {zma_path}")
+        print(" - Ring torsions identified from Z-Matrix at "
+              f"{_stage.final_path(zma_path)}")
         print(" - Saving ring torsions information at same location.")
         zma_fs[-1].file.ring_torsions.write(ring_dct, zma_locs)
 
@@ -502,7 +529,8 @@ def _save_reaction(zma_fs, zma_locs, zrxn=None):
 
     if zrxn is not None:
         zma_path = zma_fs[-1].path(zma_locs)
-        print(f" - Saving Reaction Class+Graph object at {zma_path}")
+        print(" - Saving Reaction Class+Graph object at "
+              f"{_stage.final_path(zma_path)}")
         zma_fs[-1].file.reaction.write(zrxn, zma_locs)
 
 
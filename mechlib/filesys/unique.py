@@ -0,0 +1,355 @@
+""" Assess the uniqueness of geometries against the saved conformers
+
+    The distance matrix and Coulomb spectrum of each geometry are computed
+    once and cached, so that comparing a new geometry against all of the
+    saved conformers is done with a single array operation. The array
+    comparisons act as a prefilter: only the saved geometries that pass it
+    are handed to automol for the full comparison, which keeps the results
+    identical to comparing against every saved geometry with automol.
+
+    Batches of geometries are further bucketed by energy and by a
+    fingerprint of their torsional angles, so each geometry of the batch
+    is only compared with those in nearby buckets.
+"""
+
+import functools
+import collections
+import numpy
+import automol.geom
+from mechlib.amech_io.printer import bad_conformer
+
+
+# Thresholds mirroring the automol.geom.is_unique check dictionaries
+DIST_THRESH = 0.3
+COULOMB_RTOL = 1.0e-2
+ENE_THRESH = 1.0e-5
+
+# Loose bound on the difference of the torsional angles (in radians) of two
+# geometries that automol could find to be the same, which only serves to
+# rule out geometries whose torsions are clearly different
+TORS_THRESH = 0.5
+
+
+# Checks against lists of saved geometries
+def geo_unique(geo, ene, seen_geos, seen_enes, zrxn=None,
+               ethresh=ENE_THRESH):
+    """ Assess if a geometry is unique to saved geos
+
+        A geometry is only compared against the saved geometries if
+        one of them has an energy within `ethresh` of its own.
+
+        :param geo: geometry to check
+        :type geo: automol geom data structure
+        :param ene: energy of the geometry
+        :type ene: float
+        :param seen_geos: geometries already saved
+        :type seen_geos: tuple(automol geom data structure)
+        :param seen_enes: energies of the saved geometries
+        :type seen_enes: tuple(float)
+        :param zrxn: reaction object, if the geometry is a TS
+        :type zrxn: automol.reac.Reaction object
+        :rtype: bool
+    """
+
+    unique = True
+    if _near_energy_idxs(ene, seen_enes, ethresh).size:
+        unique = _geo_unique_among(
+            geo, seen_geos, numpy.arange(len(seen_geos)), zrxn)
+
+    if not unique:
+        bad_conformer('not unique')
+
+    return unique
+
+
+def sym_unique(geo, ene, saved_geos, saved_enes, ethresh=ENE_THRESH):
+    """ Check if a conformer is symmetrically distinct from the
+        existing conformers in the filesystem
+
+        :param geo: geometry to check
+        :type geo: automol geom data structure
+        :param ene: energy of the geometry
+        :type ene: float
+        :param saved_geos: geometries already saved
+        :type saved_geos: tuple(automol geom data structure)
+        :param saved_enes: energies of the saved geometries
+        :type saved_enes: tuple(float)
+        :return: index of the symmetrically equivalent saved geometry
+        :rtype: int or None
+    """
+
+    sym_idx = _sym_idx_among(
+        geo, saved_geos, _near_energy_idxs(ene, saved_enes, ethresh))
+
+    if sym_idx is not None:
+        print(' - Structure is not symmetrically unique.')
+
+    return sym_idx
+
+
+def batch_unique(geos, enes, seen_geos, seen_enes, zrxn=None,
+                 ethresh=ENE_THRESH):
+    """ Assess the uniqueness of a batch of geometries against the saved
+        geometries and against one another.
+
+        Each geometry is compared, as in `geo_unique` and `sym_unique`,
+        against the saved geometries and the earlier geometries of the
+        batch that were found to be unique and symmetrically distinct.
+        Indices of equivalent structures refer to the list of saved
+        geometries extended by those geometries, in order.
+
+        The energies are kept in buckets of width `ethresh`, so only the
+        geometries in the buckets next to that of a geometry are checked
+        for a close energy. For minima, only the geometries whose torsional
+        angles are all close to those of the geometry are passed on to the
+        distance matrix and automol comparisons.
+
+        :param geos: geometries to check
+        :type geos: tuple(automol geom data structure)
+        :param enes: energies of the geometries
+        :type enes: tuple(float)
+        :param seen_geos: geometries already saved
+        :type seen_geos: tuple(automol geom data structure)
+        :param seen_enes: energies of the saved geometries
+        :type seen_enes: tuple(float)
+        :param zrxn: reaction object, if the geometries are TSs
+        :type zrxn: automol.reac.Reaction object
+        :return: (unique, sym_idx) for each geometry
+        :rtype: tuple((bool, int or None))
+    """
+
+    all_geos, all_enes = list(seen_geos), list(seen_enes)
+    ene_buckets = collections.defaultdict(list)
+    for idx, ene in enumerate(all_enes):
+        ene_buckets[_ene_bucket(ene, ethresh)].append(idx)
+
+    # Torsions are not compared for TSs, so they are not fingerprinted
+    quads, fprints = (), []
+    if zrxn is None and (all_geos or geos):
+        quads = _torsion_quadruples((all_geos or list(geos))[0])
+        fprints = [_torsion_fingerprint(geo, quads) for geo in all_geos]
+
+    ret = ()
+    for geo, ene in zip(geos, enes):
+        fprint = _torsion_fingerprint(geo, quads)
+        ene_idxs = _bucket_near_energy_idxs(
+            ene, all_enes, ene_buckets, ethresh)
+
+        unique, sym_idx = True, None
+        if ene_idxs.size:
+            # As for geo_unique, all of the geometries are then compared
+            cand_idxs = numpy.arange(len(all_geos))
+            if quads:
+                cand_idxs = _torsion_candidates(fprint, fprints, TORS_THRESH)
+            unique = _geo_unique_among(geo, all_geos, cand_idxs, zrxn)
+        if not unique:
+            bad_conformer('not unique')
+        else:
+            sym_idx = _sym_idx_among(geo, all_geos, ene_idxs)
+            if sym_idx is not None:
+                print(' - Structure is not symmetrically unique.')
+            else:
+                ene_buckets[_ene_bucket(ene, ethresh)].append(len(all_geos))
+                all_geos.append(geo)
+                all_enes.append(ene)
+                fprints.append(fprint)
+        ret += ((unique, sym_idx),)
+
+    return ret
+
+
+# Full comparisons of the geometries that pass the prefilters
+def _geo_unique_among(geo, geos, idxs, zrxn):
+    """ Assess if a geometry is unique among the geometries at some indices
+    """
+
+    if zrxn is None:
+        check_dct = {'dist': DIST_THRESH, 'tors': None}
+    else:
+        check_dct = {'dist': DIST_THRESH}
+
+    unique = True
+    cand_idxs = idxs[_dist_candidates(
+        geo, [geos[idx] for idx in idxs], DIST_THRESH)]
+    if cand_idxs.size:
+        unique, _ = automol.geom.is_unique(
+            geo, [geos[idx] for idx in cand_idxs], check_dct=check_dct)
+
+    return unique
+
+
+def _sym_idx_among(geo, geos, idxs):
+    """ Index of the geometry symmetrically equivalent to a geometry among
+        those at some indices, if any
+    """
+
+    sym_idx = None
+    if idxs.size:
+        cand_idxs = idxs[_coulomb_candidates(
+            geo, [geos[idx] for idx in idxs], COULOMB_RTOL)]
+        if cand_idxs.size:
+            _, cand_sym_idx = automol.geom.is_unique(
+                geo, [geos[idx] for idx in cand_idxs],
+                check_dct={'coulomb': COULOMB_RTOL})
+            if cand_sym_idx is not None:
+                sym_idx = int(cand_idxs[cand_sym_idx])
+
+    return sym_idx
+
+
+# Vectorized prefilters
+def _near_energy_idxs(ene, enes, ethresh):
+    """ Indices of the energies that lie within the threshold
+    """
+    enes = numpy.asarray(enes, dtype=float)
+    if not enes.size:
+        return numpy.array([], dtype=int)
+    return numpy.flatnonzero(numpy.abs(enes - ene) < ethresh)
+
+
+def _ene_bucket(ene, ethresh):
+    """ Bucket of an energy
+    """
+    return int(numpy.floor(ene / ethresh))
+
+
+def _bucket_near_energy_idxs(ene, enes, ene_buckets, ethresh):
+    """ Indices of the energies that lie within the threshold, looked up
+        from the buckets next to that of the energy
+    """
+    bucket = _ene_bucket(ene, ethresh)
+    idxs = sorted(
+        idx for key in (bucket-1, bucket, bucket+1)
+        for idx in ene_buckets.get(key, ())
+        if abs(enes[idx] - ene) < ethresh)
+    return numpy.array(idxs, dtype=int)
+
+
+def _torsion_candidates(fprint, fprints, thresh):
+    """ Indices of the geometries whose torsional angles all agree with
+        those of the geometry within the threshold
+    """
+
+    if not fprints:
+        return numpy.array([], dtype=int)
+    if not fprint.size:
+        return numpy.arange(len(fprints))
+
+    diffs = numpy.abs(numpy.stack(fprints) - fprint) % (2.0 * numpy.pi)
+    diffs = numpy.minimum(diffs, 2.0 * numpy.pi - diffs)
+    return numpy.flatnonzero((diffs < thresh).all(axis=1))
+
+
+def _dist_candidates(geo, geos, thresh):
+    """ Indices of the geometries whose distance matrices agree with
+        that of the geometry within the threshold
+    """
+
+    dmat, _ = descriptors(geo)
+    dmats = [descriptors(geoi)[0] for geoi in geos]
+    if not dmats:
+        return numpy.array([], dtype=int)
+    if any(dmati.shape != dmat.shape for dmati in dmats):
+        return numpy.arange(len(dmats))
+
+    diffs = numpy.abs(numpy.stack(dmats) - dmat).max(axis=(1, 2))
+    return numpy.flatnonzero(diffs < thresh)
+
+
+def _coulomb_candidates(geo, geos, rtol):
+    """ Indices of the geometries whose Coulomb spectra agree with
+        that of the geometry within the relative tolerance
+    """
+
+    _, spec = descriptors(geo)
+    specs = [descriptors(geoi)[1] for geoi in geos]
+    if not specs:
+        return numpy.array([], dtype=int)
+    if any(speci.shape != spec.shape for speci in specs):
+        return numpy.arange(len(specs))
+
+    specs = numpy.stack(specs)
+    close = numpy.abs(specs - spec) <= 1.0e-8 + rtol * numpy.abs(specs)
+    return numpy.flatnonzero(close.all(axis=1))
+
+
+# Torsion fingerprints
+def _torsion_quadruples(geo):
+    """ Atoms of the dihedral angles about each rotational bond of a
+        geometry, taking the heavy atom neighbors of lowest index at each
+        end, so that rotations of terminal hydrogens are not included
+    """
+    try:
+        ret = _cached_torsion_quadruples(geo)
+    except TypeError:
+        ret = _cached_torsion_quadruples.__wrapped__(geo)
+    return ret
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_torsion_quadruples(geo):
+    """ Find the atoms of the dihedral angles of a geometry
+    """
+
+    gra = automol.geom.graph(geo)
+    symbs = automol.geom.symbols(geo)
+    ngb_dct = automol.graph.atoms_neighbor_atom_keys(gra)
+
+    quads = ()
+    for key2, key3 in sorted(
+            tuple(sorted(bnd))
+            for bnd in automol.graph.rotational_bond_keys(gra)):
+        end1 = sorted(key for key in ngb_dct[key2]
+                      if key != key3 and symbs[key] != 'H')
+        end4 = sorted(key for key in ngb_dct[key3]
+                      if key != key2 and symbs[key] != 'H')
+        if end1 and end4:
+            quads += ((end1[0], key2, key3, end4[0]),)
+
+    return quads
+
+
+def _torsion_fingerprint(geo, quads):
+    """ Dihedral angles of a geometry for the given sets of atoms, cached
+        so that they are only computed once per geometry
+    """
+    try:
+        ret = _cached_torsion_fingerprint(geo, quads)
+    except TypeError:
+        ret = _cached_torsion_fingerprint.__wrapped__(geo, quads)
+    return ret
+
+
+@functools.lru_cache(maxsize=8192)
+def _cached_torsion_fingerprint(geo, quads):
+    """ Compute the dihedral angles of a geometry
+    """
+    return numpy.array(
+        [automol.geom.dihedral_angle(geo, *quad) for quad in quads],
+        dtype=float)
+
+
+# Cached descriptors
+def descriptors(geo):
+    """ Distance matrix and Coulomb spectrum of a geometry, cached
+        so that they are only computed once per geometry
+
+        :param geo: geometry
+        :type geo: automol geom data structure
+        :rtype: (numpy.ndarray, numpy.ndarray)
+    """
+    try:
+        ret = _cached_descriptors(geo)
+    except TypeError:
+        # Geometries holding unhashable coordinates are not cached
+        ret = _cached_descriptors.__wrapped__(geo)
+    return ret
+
+
+@functools.lru_cache(maxsize=8192)
+def _cached_descriptors(geo):
+    """ Compute the descriptors of a geometry
+    """
+    dmat = numpy.asarray(automol.geom.distance_matrix(geo), dtype=float)
+    spec = numpy.asarray(automol.geom.coulomb_spectrum(geo), dtype=float)
+    return dmat, spec
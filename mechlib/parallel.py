@@ -0,0 +1,271 @@
+""" Pool of pre-forked worker processes shared by the parallel sections
+    of a driver
+
+    A driver opens the pool once with `worker_pool`, handing it the large
+    read-only objects (e.g., the species and theory dictionaries) that its
+    parallel sections pass to their workers. The workers are forked after
+    these objects are registered, so each worker inherits them through
+    copy-on-write memory rather than receiving a pickled copy with every
+    call. When a registered object is passed as an argument to
+    `execute_in_pool`, only a small reference to it is sent to the worker.
+    The workers only see the objects as they were when the pool was
+    opened, so an object that is modified in place must be removed from
+    the shared objects with `unshare` before it is passed again. This is
+    checked: a digest of each shared object is kept when the pool is
+    opened, and passing a shared object that no longer matches its digest
+    raises an error.
+
+    The same holds for the module-level caches of the processes (e.g., the
+    pf filesystems of `mechlib.filesys.models`): the workers keep them as
+    they were at the fork and any entries they add are not seen by the
+    parent. Drivers therefore load such caches before opening the pool,
+    and any data the parent needs from a worker is returned on the output
+    queue.
+
+    The functions run in the pool follow the same calling convention as
+    those for `autorun.execute_function_in_parallel`:
+
+        func(*args, items, output_queue=None)
+
+    where the function puts a one-element tuple holding its result on the
+    output queue. Functions must be defined at the module level so that
+    they can be sent to the workers by reference. Outside of a pool, for
+    functions that cannot be sent, or when more processes are requested
+    than the pool has, `execute_in_pool` falls back to
+    `autorun.execute_function_in_parallel`. Inside a worker, it runs the
+    items serially, since the cores are already in use by the pool.
+"""
+
+import os
+import queue
+import pickle
+import hashlib
+import traceback
+import contextlib
+import multiprocessing
+from autorun import execute_function_in_parallel
+
+
+# State of the pool of the current process
+_POOL = {}
+_SHARED = ()
+_SHARED_DIGESTS = ()
+_IN_WORKER = False
+_UNSHARED = object()
+
+
+@contextlib.contextmanager
+def worker_pool(nprocs, shared=()):
+    """ Fork a pool of `nprocs` workers that inherit the shared objects,
+        to be used by `execute_in_pool` until the context is exited.
+
+        Used as::
+
+            with worker_pool(nprocs, shared=(spc_dct, thy_dct)):
+                ...
+
+        If a pool is already open, it is reused and the objects shared
+        with it are left unchanged.
+
+        :param nprocs: number of worker processes
+        :type nprocs: int
+        :param shared: read-only objects passed to the workers by reference
+        :type shared: tuple(obj)
+    """
+
+    global _SHARED, _SHARED_DIGESTS  # pylint: disable=global-statement
+
+    if _POOL or _IN_WORKER or nprocs is None or nprocs <= 1:
+        yield
+        return
+
+    _SHARED = tuple(shared)
+    _SHARED_DIGESTS = tuple(_digest(obj) for obj in _SHARED)
+    ctx = multiprocessing.get_context('fork')
+    task_queue, result_queue = ctx.Queue(), ctx.Queue()
+    procs = tuple(
+        ctx.Process(target=_worker, args=(task_queue, result_queue))
+        for _ in range(nprocs))
+    for proc in procs:
+        proc.start()
+    _POOL.update({
+        'procs': procs, 'task_queue': task_queue,
+        'result_queue': result_queue})
+
+    try:
+        yield
+    finally:
+        for _ in procs:
+            task_queue.put(None)
+        for proc in procs:
+            proc.join()
+        _POOL.clear()
+        _SHARED, _SHARED_DIGESTS = (), ()
+
+
+def pool_is_open():
+    """ Assess if a pool of workers is open in this process
+
+        :rtype: bool
+    """
+    return bool(_POOL)
+
+
+def unshare(*objs):
+    """ Stop passing objects to the workers by reference, so that they
+        are sent to the workers in their current state.
+
+        :param objs: objects shared with the open pool
+        :type objs: tuple(obj)
+    """
+
+    global _SHARED  # pylint: disable=global-statement
+
+    # Keep the positions of the other objects, which the workers use
+    _SHARED = tuple(
+        _UNSHARED if any(obj is uobj for uobj in objs) else obj
+        for obj in _SHARED)
+
+
+def execute_in_pool(func, items, args, nprocs=1):
+    """ Run a function over a list of items split into at most `nprocs`
+        sublists, using the workers of the open pool.
+
+        :param func: function to run over the sublists of items
+        :type func: function
+        :param items: items to split over the processes
+        :type items: tuple(obj)
+        :param args: arguments passed to the function before the items
+        :type args: tuple(obj)
+        :param nprocs: number of processes to split the items over
+        :type nprocs: int
+        :return: result put on the output queue for each sublist
+        :rtype: list(obj)
+    """
+
+    items = list(items)
+    nprocs = max(1, min(nprocs or 1, len(items)))
+
+    if _IN_WORKER:
+        return _run_serial(func, items, args)
+    if (not _POOL or nprocs > len(_POOL['procs']) or
+            not _sendable(func)):
+        return execute_function_in_parallel(func, items, args, nprocs=nprocs)
+
+    # Replace the shared objects with references to them
+    ref_args = tuple(_shared_ref(arg) for arg in args)
+
+    for idx in range(nprocs):
+        _POOL['task_queue'].put((idx, func, ref_args, items[idx::nprocs]))
+
+    # Collect the results of every sublist before raising any error, so
+    # that none are left on the queue for the next call
+    ret_dct, err_lst = {}, []
+    while len(ret_dct) < nprocs:
+        try:
+            idx, ret, err = _POOL['result_queue'].get(timeout=5)
+        except queue.Empty:
+            if not all(proc.is_alive() for proc in _POOL['procs']):
+                raise RuntimeError(  # pylint: disable=raise-missing-from
+                    'A worker of the process pool exited abnormally')
+            continue
+        ret_dct[idx] = ret
+        if err is not None:
+            err_lst.append(err)
+    if err_lst:
+        raise RuntimeError(f'Error in process pool worker:\n{err_lst[0]}')
+
+    return [ret for idx in range(nprocs) for ret in ret_dct[idx]]
+
+
+# Helpers
+def _worker(task_queue, result_queue):
+    """ Run tasks from the queue until the sentinel is received
+    """
+
+    global _IN_WORKER  # pylint: disable=global-statement
+    _IN_WORKER = True
+
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        idx, func, ref_args, items = task
+        try:
+            args = tuple(_shared_obj(arg) for arg in ref_args)
+            ret = _run_serial(func, items, args)
+            result_queue.put((idx, ret, None))
+        except (Exception, SystemExit):  # pylint: disable=broad-except
+            result_queue.put(
+                (idx, None, f'(pid {os.getpid()}) {traceback.format_exc()}'))
+
+
+def _run_serial(func, items, args):
+    """ Run the function over all of the items in this process
+    """
+    output_queue = _ListQueue()
+    func(*args, items, output_queue=output_queue)
+    return [ret[0] for ret in output_queue.rets]
+
+
+def _sendable(func):
+    """ Assess if a function can be sent to the workers by reference
+    """
+    try:
+        pickle.dumps(func)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+    return True
+
+
+def _shared_ref(arg):
+    """ Reference to an argument if it is one of the shared objects,
+        checking that it is unchanged since the workers were forked
+    """
+    for idx, obj in enumerate(_SHARED):
+        if arg is obj:
+            if _digest(obj) != _SHARED_DIGESTS[idx]:
+                raise RuntimeError(
+                    'An object shared with the process pool was modified '
+                    'after the workers were forked; call parallel.unshare '
+                    'on it before modifying it')
+            return _SharedRef(idx)
+    return arg
+
+
+def _digest(obj):
+    """ Digest of the contents of an object, or None if it cannot be
+        pickled, in which case it is not checked
+    """
+    try:
+        obj_str = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return None
+    return hashlib.sha256(obj_str).hexdigest()
+
+
+def _shared_obj(arg):
+    """ Shared object inherited by the worker for a reference
+    """
+    if isinstance(arg, _SharedRef):
+        return _SHARED[arg.idx]
+    return arg
+
+
+class _SharedRef:  # pylint: disable=too-few-public-methods
+    """ Index of a shared object, sent to the workers in its place
+    """
+    def __init__(self, idx):
+        self.idx = idx
+
+
+class _ListQueue:  # pylint: disable=too-few-public-methods
+    """ Stand-in for an output queue that keeps the results in a list
+    """
+    def __init__(self):
+        self.rets = []
+
+    def put(self, ret):
+        """ Add a result to the list
+        """
+        self.rets.append(ret)
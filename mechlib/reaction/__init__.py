@@ -7,6 +7,7 @@ from mechlib.reaction import rxnid
 from mechlib.reaction import grid
 from mechlib.reaction._instab import split_unstable_full
 from mechlib.reaction._instab import split_unstable_pes
+from mechlib.reaction._instab import instability_verdicts
 from mechlib.reaction._util import reverse_ts_zmatrix
 from mechlib.reaction._util import zmatrix_conversion_keys
 
@@ -16,6 +17,7 @@ __all__ = [
     'rxnid',
     'split_unstable_full',
     'split_unstable_pes',
+    'instability_verdicts',
     'reverse_ts_zmatrix',
     'zmatrix_conversion_keys',
 ]
@@ -1,18 +1,50 @@
 """
  Library to deal unstable species
+
+ Whether a species is unstable, and the InChIs of the products it splits
+ into, is read from the instability files in the SAVE filesystem. These
+ verdicts are found once for all of the species of a run, in parallel, and
+ kept in a file at the root of the SAVE filesystem along with a fingerprint
+ of the minimum-energy conformer and of the Z-Matrix and instability files
+ they were read from, so that the drivers reuse them until those change.
 """
 
+import os
+import json
+import autofile
 import automol
+from mechanalyzer.inf import spc as sinfo
+from mechanalyzer.inf import thy as tinfo
 from mechlib import filesys
+from mechlib import parallel
+from mechlib import amech_io
 from mechlib.amech_io import printer as ioprinter
 
 
+VERDICT_CACHE_NAME = 'instab_verdicts.json'
+
+# Verdicts read from or written to the file of each SAVE filesystem
+_VERDICT_CACHE = {}
+
+
 # Handle reaction lst
 def split_unstable_full(pes_rlst, spc_rlst, spc_dct,
                         spc_model_dct_i, save_prefix, nprocs=1):
     """ Loop over the pes reaction list and break up the unstable species
     """
 
+    # Find the verdicts for all of the species of the run in one pass
+    spc_names = ()
+    if pes_rlst is not None:
+        for _, rxn_lst in pes_rlst.items():
+            for _, (rcts, prds) in rxn_lst:
+                spc_names += rcts + prds
+    if spc_rlst is not None:
+        spc_names += tuple(list(spc_rlst.values())[0])
+    instability_verdicts(
+        spc_dct, spc_names, spc_model_dct_i['vib']['geolvl'][1][1],
+        save_prefix, nprocs=nprocs)
+
     # Get split names from full PES run lst
     _split_rxn_names = ()
     if pes_rlst is not None:
@@ -56,6 +88,14 @@ def split_unstable_pes(
     # Get theory
     thy_info = spc_model_dct_i['vib']['geolvl'][1][1]
 
+    # Build the mapping dictionary for all species on the PES at once
+    rxn_names = ()
+    for _, (rcts, prds) in rxn_lst:
+        rxn_names += rcts + prds
+    split_map = _split_mapping(spc_dct, thy_info, save_prefix,
+                               spc_names=rxn_names, zma_locs=(0,),
+                               nprocs=nprocs)
+
     # Loop over the reactions and split
     new_rxn_lst = ()
     unstable_chnl_idxs = ()
@@ -64,12 +104,6 @@ def split_unstable_pes(
         # Unpack the reaction
         chnl_idx, (rcts, prds) = rxn
 
-        # Build the mapping dictionary for the rxn species
-        rxn_names = rcts + prds
-        split_map = _split_mapping(spc_dct, thy_info, save_prefix,
-                                   spc_names=rxn_names, zma_locs=(0,),
-                                   nprocs=nprocs)
-
         # Assess and split the reactants and products for unstable species
         new_rcts = ()
         for rct in rcts:
@@ -116,14 +150,13 @@ def split_unstable_spc(
     thy_info = spc_model_dct_i['vib']['geolvl'][1][1]
 
     # Split each species
+    spc_names = tuple(list(spc_rlst.values())[0])
+    split_map = _split_mapping(spc_dct, thy_info, save_prefix,
+                               spc_names=spc_names, zma_locs=(0,),
+                               nprocs=nprocs)
     _split_spc_names = ()
-    for spc in list(spc_rlst.values())[0]:
-        split_names = _split_species(
-            spc_dct, spc, thy_info, save_prefix, zma_locs=(0,), nprocs=nprocs)
-        if split_names:
-            _split_spc_names += split_names
-        else:
-            _split_spc_names += (spc,)
+    for spc in spc_names:
+        _split_spc_names += split_map[spc]
     split_spc_names = tuple(i for n, i in enumerate(_split_spc_names)
                             if i not in _split_spc_names[:n])
 
@@ -154,11 +187,16 @@ def _split_mapping(spc_dct, thy_info, save_prefix,
     if spc_names is None:
         spc_names = tuple(name for name in spc_dct.keys() if 'ts_' not in name)
 
+    verdict_dct = instability_verdicts(
+        spc_dct, spc_names, thy_info, save_prefix,
+        zma_locs=zma_locs, nprocs=nprocs)
+
     split_map = {}
     for spc_name in spc_names:
+        if spc_name in split_map:
+            continue
         split_names = _split_species(
-            spc_dct, spc_name, thy_info,
-            save_prefix, zma_locs=zma_locs, nprocs=nprocs)
+            spc_dct, spc_name, verdict_dct.get(spc_name))
         if split_names:
             split_map[spc_name] = split_names
         else:
@@ -167,44 +205,178 @@ def _split_mapping(spc_dct, thy_info, save_prefix,
     return split_map
 
 
-def _split_species(spc_dct, spc_name, thy_info, save_prefix,
-                   zma_locs=(0,), nprocs=1):
-    """ Assess if a given species has an instability transformation
-        file located in the save filesystem within a Z-Matrix layer:
+def instability_verdicts(spc_dct, spc_names, thy_info, save_prefix,
+                         zma_locs=(0,), nprocs=1):
+    """ Assess if each of a set of species has an instability
+        transformation file in the save filesystem within a Z-Matrix layer:
         SPC/THY/CONFS/Z/ which are specified by the provided info.
 
-        If file is found, use the contained information to break-up
-        the species into products of the instability transformation. If
-        no file found, return species.
+        The verdicts of the unique species that were not already found,
+        or whose minimum-energy conformer or its Z-Matrix and instability
+        files have changed since, are read by a pool of
+        `nprocs` processes and saved at the root of the save filesystem.
 
         :param spc_dct: species information
            dict[spc_name: spc_information]
-        :param spc_name: mechanism name of species to assess
-        :type spc_name: str
-        :param thy_info: ???
-        :type thy_info: ???
+        :param spc_names: mechanism names of species to assess
+        :type spc_names: tuple(str)
         :param save_prefix: root-path to the save-filesystem
         :type save_prefix: str
         :param zma_locs: locs for zma filesys (put in spc dct)
         :type zma_locs:
+        :return: InChIs of the instability products of each species, or
+            None for each stable species
+        :rtype: dict[str: (tuple(str), str)]
+    """
+
+    verdict_cache = _verdict_cache(save_prefix)
+
+    # Use the verdicts already found for species whose conformers are the same
+    key_dct, read_names = {}, ()
+    for spc_name in spc_names:
+        if spc_name in key_dct or 'ts_' in spc_name:
+            continue
+        key, cnf_save_fs, mod_thy_info = _verdict_key(
+            spc_dct[spc_name], thy_info, save_prefix, zma_locs)
+        key_dct[spc_name] = key
+        entry = verdict_cache.get(key)
+        if entry is not None and not entry['checked']:
+            entry['checked'] = entry['fprint'] == _verdict_fingerprint(
+                spc_dct[spc_name], cnf_save_fs, mod_thy_info, zma_locs)
+        if entry is None or not entry['checked']:
+            read_names += (spc_name,)
+
+    # Read the verdicts for the rest in parallel and save them
+    if read_names:
+        args = (spc_dct, thy_info, save_prefix, zma_locs)
+        for sub_verdict_dct in parallel.execute_in_pool(
+                _instability_verdict_units, read_names, args,
+                nprocs=max(1, min(nprocs, len(read_names)))):
+            for spc_name, entry in sub_verdict_dct.items():
+                verdict_cache[key_dct[spc_name]] = entry
+        _write_verdict_cache(save_prefix, verdict_cache)
+
+    verdict_dct = {}
+    for spc_name, key in key_dct.items():
+        entry = verdict_cache[key]
+        verdict_dct[spc_name] = (
+            (tuple(entry['ichs']), entry['path'])
+            if entry['ichs'] is not None else None)
+
+    return verdict_dct
+
+
+def _instability_verdict_units(spc_dct, thy_info, save_prefix, zma_locs,
+                               spc_names, output_queue=None):
+    """ Read the instability verdicts for a set of species
+    """
+    verdict_dct = {}
+    for spc_name in spc_names:
+        _, cnf_save_fs, mod_thy_info = _verdict_key(
+            spc_dct[spc_name], thy_info, save_prefix, zma_locs)
+        fprint = _verdict_fingerprint(
+            spc_dct[spc_name], cnf_save_fs, mod_thy_info, zma_locs)
+
+        # Attempt to read the graph of the instability trans
+        # Get the product graphs and inchis
+        tra, path = filesys.read.instability_transformation(
+            spc_dct, spc_name, thy_info,
+            save_prefix, zma_locs=zma_locs)
+        ichs = None
+        if tra is not None:
+            zrxn, _ = tra
+            prd_gras = automol.reac.product_graphs(zrxn)
+            ichs = [automol.graph.chi(gra, stereo=True) for gra in prd_gras]
+
+        verdict_dct[spc_name] = {
+            'fprint': fprint, 'checked': True, 'ichs': ichs, 'path': path}
+    output_queue.put((verdict_dct,))
+
+
+def _verdict_key(spc_dct_i, thy_info, save_prefix, zma_locs):
+    """ Key of the verdict for a species, and the conformer filesystem
+        and theory info that it is read from
+    """
+    spc_info = sinfo.from_dct(spc_dct_i, canonical=True)
+    mod_thy_info = tinfo.modify_orb_label(thy_info, spc_info)
+    _, cnf_save_fs = filesys.build_fs(
+        save_prefix, save_prefix, 'CONFORMER',
+        spc_locs=spc_info,
+        thy_locs=mod_thy_info[1:])
+    key = amech_io.task_key(
+        *spc_info, *mod_thy_info[1:], *zma_locs,
+        spc_dct_i['hbond_cutoffs'])
+    return key, cnf_save_fs, mod_thy_info
+
+
+def _verdict_fingerprint(spc_dct_i, cnf_save_fs, mod_thy_info, zma_locs):
+    """ Fingerprint of the minimum-energy conformer of a species and of the
+        Z-Matrix and instability files of the conformer
+    """
+    min_locs, min_path = filesys.mincnf.min_energy_conformer_locators(
+        cnf_save_fs, mod_thy_info, hbond_cutoffs=spc_dct_i['hbond_cutoffs'])
+    paths = ()
+    if min_path:
+        zma_save_fs = autofile.fs.zmatrix(min_path)
+        paths = (zma_save_fs[-1].file.zmatrix.path(zma_locs),
+                 zma_save_fs[-1].file.instability.path(zma_locs))
+    return amech_io.task_fingerprint(min_locs, paths=paths)
+
+
+def _verdict_cache(save_prefix):
+    """ Verdicts found for the species of a save filesystem, read from its
+        file the first time they are needed in this run
+    """
+    if save_prefix not in _VERDICT_CACHE:
+        verdict_cache = {}
+        cache_path = os.path.join(save_prefix, VERDICT_CACHE_NAME)
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as fobj:
+                    verdict_cache = json.load(fobj)
+            except (OSError, ValueError):
+                verdict_cache = {}
+        # Verdicts from previous runs must be checked against the filesystem
+        for entry in verdict_cache.values():
+            entry['checked'] = False
+        _VERDICT_CACHE[save_prefix] = verdict_cache
+    return _VERDICT_CACHE[save_prefix]
+
+
+def _write_verdict_cache(save_prefix, verdict_cache):
+    """ Write the verdicts found for the species of a save filesystem
+    """
+    cache_path = os.path.join(save_prefix, VERDICT_CACHE_NAME)
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as fobj:
+            json.dump(verdict_cache, fobj, indent=1)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        ioprinter.warning_message(
+            f'Could not save the instability verdicts at {cache_path}')
+
+
+def _split_species(spc_dct, spc_name, verdict):
+    """ Break up a species into the products of its instability
+        transformation, if one was found.
+
+        :param spc_dct: species information
+           dict[spc_name: spc_information]
+        :param spc_name: mechanism name of species to assess
+        :type spc_name: str
+        :param verdict: InChIs of the instability products and the path to
+            the instability file, or None if the species is stable
+        :type verdict: (tuple(str), str)
     """
 
     # Initialize an empty list
     split_names = ()
-    
-    # Attempt to read the graph of the instability trans
-    # Get the product graphs and inchis
-    tra, path = filesys.read.instability_transformation(
-        spc_dct, spc_name, thy_info,
-        save_prefix, zma_locs=zma_locs, nprocs=nprocs)
-
-    if tra is not None:
+
+    if verdict is not None:
+        constituent_ichs, path = verdict
         ioprinter.info_message('\nFound instability files at path:')
         ioprinter.info_message(f'  {path}')
-        zrxn, _ = tra
-        prd_gras = automol.reac.product_graphs(zrxn)
-        constituent_ichs = tuple(automol.graph.chi(gra, stereo=True)
-                                 for gra in prd_gras)
 
         _split_names = ()
         for ich in constituent_ichs:
@@ -0,0 +1,181 @@
+""" Concurrent conformer sampling from a pool of pre-screened samples
+"""
+
+import os
+import fcntl
+import contextlib
+import numpy
+import automol
+import elstruct
+import autofile
+from mechlib.amech_io.printer import info_message, warning_message
+from mechroutines.es import runner as es_runner
+from mechroutines.es._routines import _util as util
+
+
+# Number of candidate samples generated for each sample requested when the
+# samples are run concurrently, and the smallest difference (radians) in
+# any torsion for two candidates to both be run
+CNF_POOL_FACTOR = 5
+TORS_DIST_THRESH = numpy.radians(10.0)
+
+
+def iter_sampled_conformers(zma, spc_info, thy_info, cnf_run_fs, rid,
+                            script_str, overwrite, num_to_samp, nsampd,
+                            tors_range_dct, nworkers, max_attempts,
+                            zrxn=None, retryfail=False, **kwargs):
+    """ Generate and screen a pool of candidate samples at once, then run
+        their optimizations concurrently, `nworkers` at a time, and yield
+        each optimization that succeeds as it finishes.
+
+        Each failed optimization is replaced by another candidate, so that
+        `num_to_samp` optimizations succeed unless `max_attempts`
+        optimizations have been run or no more candidates can be found.
+
+        :return: sample Z-Matrix, conformer ID, RUN filesystem and the
+            ret of each successful optimization
+        :rtype: iterator of (automol zmat, str, autofile.fs.run, tuple)
+    """
+
+    info_message(
+        'Generating a pool of sample Z-Matrices that do not have',
+        'high intramolecular repulsion...')
+    candidates = list(
+        _candidate_pool(zma, num_to_samp, nsampd, tors_range_dct))
+
+    job_kwargs_lst, samp_zmas, cids = [], [], []
+
+    def _add_job():
+        """ Add the optimization of the next candidate to the jobs,
+            sampling more candidates once the pool has been used
+        """
+        if not candidates and tors_range_dct:
+            candidates.extend(
+                _candidate_pool(zma, num_to_samp, 1, tors_range_dct))
+        if not candidates:
+            return False
+
+        samp_zma = candidates.pop(0)
+        cid = autofile.schema.generate_new_conformer_id()
+        locs = [rid, cid]
+        cnf_run_fs[-1].create(locs)
+        samp_zmas.append(samp_zma)
+        cids.append(cid)
+        job_kwargs_lst.append({
+            'job': elstruct.Job.OPTIMIZATION,
+            'script_str': script_str,
+            'run_fs': autofile.fs.run(cnf_run_fs[-1].path(locs)),
+            'geo': samp_zma,
+            'spc_info': spc_info,
+            'thy_info': thy_info,
+            'zrxn': zrxn,
+            'overwrite': overwrite,
+            'saddle': bool(zrxn is not None),
+            'retryfail': retryfail,
+            **kwargs
+        })
+        return True
+
+    while len(job_kwargs_lst) < num_to_samp and _add_job():
+        pass
+
+    info_message(
+        f'Running {len(job_kwargs_lst)} samples, {nworkers} at a time...')
+    nsuccess = 0
+    # Jobs added while iterating are run as slots open up
+    for job_idx, (success, ret) in es_runner.iter_executed_jobs(
+            job_kwargs_lst, nworkers=nworkers):
+        if success:
+            nsuccess += 1
+            info_message(f"\nFinished run {nsuccess}/{num_to_samp}")
+            yield (samp_zmas[job_idx], cids[job_idx],
+                   job_kwargs_lst[job_idx]['run_fs'], ret)
+        elif len(job_kwargs_lst) < max_attempts:
+            _add_job()
+
+    if nsuccess < num_to_samp:
+        info_message(
+            f'Max sample num: {len(job_kwargs_lst)} attempted, '
+            'ending search', 'Run again if more samples desired.')
+
+
+def _candidate_pool(zma, num_to_samp, nsampd, tors_range_dct):
+    """ Build up to `num_to_samp` sample Z-Matrices that do not have high
+        repulsion and whose torsions all differ from those of the other
+        samples in the pool
+    """
+
+    # Start from the reference structure if it has not been run yet
+    samp_zmas = (zma,) if nsampd == 0 else ()
+    if tors_range_dct:
+        samp_zmas += tuple(automol.zmat.samples(
+            zma, CNF_POOL_FACTOR * num_to_samp, tors_range_dct))
+    samp_zmas = tuple(
+        samp_zma for samp_zma in samp_zmas
+        if automol.zmat.has_low_relative_repulsion_energy(samp_zma, zma))
+    if not samp_zmas:
+        warning_message('All sample Z-Matrices have high repulsion.')
+        return ()
+
+    # Compare the torsions of all pairs of samples at once, then keep each
+    # sample that is not close to one kept before it
+    tors_names = tuple(tors_range_dct)
+    tors_vals = numpy.array([
+        [automol.zmat.value_dictionary(samp_zma)[name] for name in tors_names]
+        for samp_zma in samp_zmas]).reshape(len(samp_zmas), len(tors_names))
+    diffs = numpy.abs(numpy.angle(numpy.exp(
+        1j * (tors_vals[:, None, :] - tors_vals[None, :, :]))))
+    close = numpy.all(diffs < TORS_DIST_THRESH, axis=2)
+
+    keep_idxs = []
+    for idx in range(len(samp_zmas)):
+        if not numpy.any(close[idx, keep_idxs]):
+            keep_idxs.append(idx)
+            if len(keep_idxs) == num_to_samp:
+                break
+    info_message(
+        f'Kept {len(keep_idxs)} distinct samples '
+        f'from a pool of {len(samp_zmas)}')
+
+    return tuple(samp_zmas[idx] for idx in keep_idxs)
+
+
+def update_cnf_nsamp(cnf_save_fs, cnf_run_fs, rid, inf_obj):
+    """ Add a sample to the count in the conformer branch info files,
+        holding a lock on the branch so that the counts of MechDriver
+        processes sampling the same ring at once are not lost
+    """
+    with _branch_lock(cnf_run_fs, rid):
+        nsampd = util.calc_nsampd(cnf_save_fs, cnf_run_fs, rid)
+        nsampd += 1
+        inf_obj.nsamp = nsampd
+        cnf_save_fs[1].file.info.write(inf_obj, [rid])
+        cnf_run_fs[1].file.info.write(inf_obj, [rid])
+    return nsampd
+
+
+@contextlib.contextmanager
+def _branch_lock(cnf_run_fs, rid):
+    """ Hold an exclusive lock on a conformer branch, using a lock file in
+        the branch of the run filesystem that is removed on release
+    """
+    cnf_run_fs[1].create([rid])
+    lock_path = os.path.join(cnf_run_fs[1].path([rid]), '.nsamp.lock')
+    while True:
+        lock_file = open(lock_path, 'a', encoding='utf-8')  # pylint: disable=consider-using-with
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        # Retry if the holder before us removed the file while we waited
+        try:
+            locked = (
+                os.stat(lock_path).st_ino == os.fstat(lock_file.fileno()).st_ino)
+        except FileNotFoundError:
+            locked = False
+        if locked:
+            break
+        lock_file.close()
+    try:
+        yield
+    finally:
+        os.remove(lock_path)
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+        lock_file.close()
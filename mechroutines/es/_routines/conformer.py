@@ -19,6 +19,7 @@ from mechlib.amech_io.printer import debug_message, error_message, obj
 from mechlib.amech_io.printer import existing_path, bad_conformer, checking
 from mechroutines.es import runner as es_runner
 from mechroutines.es._routines import _util as util
+from mechroutines.es._routines import _cnf_pool as cnf_pool
 from mechroutines.es._routines._geom import remove_imag
 
 from automol.extern import Ring_Reconstruction as RR
@@ -376,9 +377,9 @@ def single_conformer(zma, spc_info, mod_thy_info,
                     viable = _inchi_are_same(spc_info[0], geo)
 
             if viable:
-                if _geo_unique(geo, ene, saved_geos, saved_enes, zrxn=zrxn):
-                    sym_id = _sym_unique(
-                        geo, ene, saved_geos, saved_enes)
+                is_unique, sym_id = filesys.unique.batch_unique(
+                    (geo,), (ene,), saved_geos, saved_enes, zrxn=zrxn)[0]
+                if is_unique:
                     if sym_id is None:
                         if cnf_save_fs[0].file.info.exists():
                             debug_message(
@@ -437,8 +438,11 @@ def conformer_sampling(zma, spc_info, thy_info,
                        zrxn=None, two_stage=False,
                        retryfail=False, resave=False,
                        repulsion_thresh=40.0, print_debug=True,
-                       **kwargs):
+                       nworkers=1, **kwargs):
     """ run sampling algorithm to find conformers
+
+        With `nworkers` > 1, a pool of candidate samples is generated and
+        screened up front, and the optimizations are run concurrently.
     """
 
     # Check if any saving needs to be done before hand
@@ -469,6 +473,14 @@ def conformer_sampling(zma, spc_info, thy_info,
         info_message(
             f'Running {nsamp-nsampd} samples...', newline=1)
 
+    if nworkers > 1 and not (two_stage and tors_range_dct):
+        _run_conformer_pool(
+            zma, spc_info, thy_info, cnf_run_fs, cnf_save_fs, ref_rid,
+            script_str, overwrite, nsamp0 - nsampd, nsampd, tors_range_dct,
+            inf_obj, nworkers, brk_tot_samp,
+            zrxn=zrxn, retryfail=retryfail, **kwargs)
+        return
+
     # Generate all of the conformers, as needed
     samp_idx = 1
     samp_attempt_idx = 1
@@ -547,9 +559,9 @@ def conformer_sampling(zma, spc_info, thy_info,
 
         # save function added here
         if success:
-            inf_obj_temp, _, out_str = ret
-            prog = inf_obj_temp.prog
-            samp_geo = elstruct.reader.opt_geometry(prog, out_str)
+            samp_geo = es_runner.read_job_data(
+                elstruct.Job.OPTIMIZATION, run_fs, ret,
+                ('geometry',))['geometry']
             # Determine ring state and update rid
             rid = rng_loc_for_geo(samp_geo, cnf_save_fs)
             if rid is None:
@@ -558,18 +570,47 @@ def conformer_sampling(zma, spc_info, thy_info,
             save_conformer(
                 ret, cnf_run_fs, cnf_save_fs, locs, thy_info,
                 zrxn=zrxn, orig_ich=spc_info[0], rid_traj=True,
-                init_zma=samp_zma, ref_zma=samp_zma)
-            nsampd = util.calc_nsampd(cnf_save_fs, cnf_run_fs, ref_rid)
-            nsampd += 1
+                init_zma=samp_zma, ref_zma=samp_zma, run_fs=run_fs)
+            nsampd = cnf_pool.update_cnf_nsamp(
+                cnf_save_fs, cnf_run_fs, ref_rid, inf_obj)
             samp_idx += 1
-            inf_obj.nsamp = nsampd
-            cnf_save_fs[1].file.info.write(inf_obj, [ref_rid])
-            cnf_run_fs[1].file.info.write(inf_obj, [ref_rid])
 
         # Increment attempt counter
         samp_attempt_idx += 1
 
 
+def _run_conformer_pool(zma, spc_info, thy_info, cnf_run_fs, cnf_save_fs,
+                        rid, script_str, overwrite, num_to_samp, nsampd,
+                        tors_range_dct, inf_obj, nworkers, max_attempts,
+                        zrxn=None, retryfail=False, **kwargs):
+    """ Run the optimizations of a pool of samples concurrently, `nworkers`
+        at a time, saving each conformer as its optimization finishes
+    """
+
+    if num_to_samp <= 0:
+        info_message(
+            'Requested number of samples have been completed.',
+            'Conformer search complete.')
+        return
+
+    for samp_zma, cid, run_fs, ret in cnf_pool.iter_sampled_conformers(
+            zma, spc_info, thy_info, cnf_run_fs, rid, script_str, overwrite,
+            num_to_samp, nsampd, tors_range_dct, nworkers, max_attempts,
+            zrxn=zrxn, retryfail=retryfail, **kwargs):
+        samp_geo = es_runner.read_job_data(
+            elstruct.Job.OPTIMIZATION, run_fs, ret,
+            ('geometry',))['geometry']
+        # Determine ring state and update rid
+        samp_rid = rng_loc_for_geo(samp_geo, cnf_save_fs)
+        if samp_rid is None:
+            samp_rid = autofile.schema.generate_new_ring_id()
+        save_conformer(
+            ret, cnf_run_fs, cnf_save_fs, [samp_rid, cid],
+            thy_info, zrxn=zrxn, orig_ich=spc_info[0], rid_traj=True,
+            init_zma=samp_zma, ref_zma=samp_zma, run_fs=run_fs)
+        cnf_pool.update_cnf_nsamp(cnf_save_fs, cnf_run_fs, rid, inf_obj)
+
+
 def ring_conformer_sampling(
         zma, spc_info, thy_info,
         cnf_run_fs, cnf_save_fs,
@@ -1344,20 +1385,29 @@ def _presamp_save(spc_info, cnf_run_fs, cnf_save_fs,
 
 
 def save_conformer(ret, cnf_run_fs, cnf_save_fs, locs, thy_info, zrxn=None,
-                   orig_ich='', rid_traj=False, init_zma=None, ref_zma=None):
+                   orig_ich='', rid_traj=False, init_zma=None, ref_zma=None,
+                   run_fs=None):
     """ save the conformers that have been found so far
           # Only go through save procedure if conf not in save
           # may need to get geo, ene, etc; maybe make function
+
+        If the RUN filesystem of the optimization is given as `run_fs`,
+        the energy and geometry are taken from its parsed-output cache.
     """
 
     saved_locs, saved_geos, saved_enes = _saved_cnf_info(
         cnf_save_fs, thy_info, locs)
 
-    inf_obj, _, out_str = ret
-    prog = inf_obj.prog
-    method = inf_obj.method
-    ene = elstruct.reader.energy(prog, method, out_str)
-    geo = elstruct.reader.opt_geometry(prog, out_str)
+    if run_fs is not None:
+        job_data = es_runner.read_job_data(
+            elstruct.Job.OPTIMIZATION, run_fs, ret, ('energy', 'geometry'))
+        ene, geo = job_data['energy'], job_data['geometry']
+    else:
+        inf_obj, _, out_str = ret
+        prog = inf_obj.prog
+        method = inf_obj.method
+        ene = elstruct.reader.energy(prog, method, out_str)
+        geo = elstruct.reader.opt_geometry(prog, out_str)
     zma = None
     if init_zma is not None:
         zma = filesys.save.read_zma_from_geo(init_zma, geo)
@@ -1375,9 +1425,9 @@ def save_conformer(ret, cnf_run_fs, cnf_save_fs, locs, thy_info, zrxn=None,
 
     # Determine uniqueness of conformer, save if needed
     if viable:
-        if _geo_unique(geo, ene, saved_geos, saved_enes, zrxn):
-            sym_id = _sym_unique(
-                geo, ene, saved_geos, saved_enes)
+        is_unique, sym_id = filesys.unique.batch_unique(
+            (geo,), (ene,), saved_geos, saved_enes, zrxn=zrxn)[0]
+        if is_unique:
             # Determine correct ring location
             rid = rng_loc_for_geo(geo, cnf_save_fs)
             if rid is None:
@@ -1605,33 +1655,6 @@ def _geo_connected(geo, rxn):
     return connected
 
 
-def _geo_unique(geo, ene, seen_geos, seen_enes, zrxn=None):
-    """ Assess if a geometry is unique to saved geos
-        Need to pass the torsions
-    """
-
-    if zrxn is None:
-        check_dct = {'dist': 0.3, 'tors': None}
-    else:
-        check_dct = {'dist': 0.3}
-
-    no_similar_energies = True
-    for sene in seen_enes:
-        if abs(sene - ene) < 1e-5:
-            no_similar_energies = False
-
-    if no_similar_energies:
-        unique = True
-    else:
-        unique, _ = automol.geom.is_unique(
-            geo, seen_geos, check_dct=check_dct)
-
-    if not unique:
-        bad_conformer('not unique')
-
-    return unique
-
-
 def _inchi_are_same(orig_ich, geo):
     """ Assess if a geometry has the same connectivity to
      saved geos evaluated in temrs of inchi
@@ -1661,29 +1684,6 @@ def _check_old_inchi(orig_ich, seen_geos, saved_locs, cnf_save_fs):
                 f'inchi do not match for {smi} at {path}')
 
 
-def _sym_unique(geo, ene, saved_geos, saved_enes, ethresh=1.0e-5):
-    """ Check if a conformer is symmetrically distinct from the
-        existing conformers in the filesystem
-    """
-
-    sym_idx = None
-    new_saved_geos = []
-    idx_dct = {}
-    for i, (sene, sgeo) in enumerate(zip(saved_enes, saved_geos)):
-        if abs(ene - sene) < ethresh:
-            idx_dct[len(new_saved_geos)] = i
-            new_saved_geos.append(sgeo)
-    if new_saved_geos:
-        _, sym_idx = automol.geom.is_unique(
-            geo, new_saved_geos, check_dct={'coulomb': 1e-2})
-
-    if sym_idx is not None:
-        print(' - Structure is not symmetrically unique.')
-        sym_idx = idx_dct[sym_idx]
-
-    return sym_idx
-
-
 def _ts_geo_viable(zma, zrxn, cnf_save_fs, mod_thy_info, zma_locs=(0,), ref_zma=None):
     """ Perform a series of checks to assess the viability
         of a transition state geometry prior to saving
@@ -360,9 +360,9 @@ def single_conformer(zma, spc_info, mod_thy_info,
             saved_locs, saved_geos, saved_enes = _saved_cnf_info(
                 cnf_save_fs, mod_thy_info)
 
-            if _geo_unique(geo, ene, saved_geos, saved_enes, zrxn=zrxn):
-                sym_id = _sym_unique(
-                    geo, ene, saved_geos, saved_enes)
+            is_unique, sym_id = filesys.unique.batch_unique(
+                (geo,), (ene,), saved_geos, saved_enes, zrxn=zrxn)[0]
+            if is_unique:
                 if sym_id is None:
                     if cnf_save_fs[0].file.info.exists():
                         debug_message(
@@ -772,9 +772,9 @@ def save_conformer(ret, cnf_run_fs, cnf_save_fs, locs, thy_info, zrxn=None,
 
     # Determine uniqueness of conformer, save if needed
     if viable:
-        if _geo_unique(geo, ene, saved_geos, saved_enes, zrxn):
-            sym_id = _sym_unique(
-                geo, ene, saved_geos, saved_enes)
+        is_unique, sym_id = filesys.unique.batch_unique(
+            (geo,), (ene,), saved_geos, saved_enes, zrxn=zrxn)[0]
+        if is_unique:
             print('save_conformer locs:', locs, sym_id)
             if sym_id is None:
                 filesys.save.conformer(
@@ -995,34 +995,6 @@ def _geo_connected(geo, rxn):
     return connected
 
 
-def _geo_unique(geo, ene, seen_geos, seen_enes, zrxn=None):
-    """ Assess if a geometry is unique to saved geos
-
-        Need to pass the torsions
-    """
-
-    if zrxn is None:
-        check_dct = {'dist': 0.3, 'tors': None}
-    else:
-        check_dct = {'dist': 0.3}
-
-    no_similar_energies = True
-    for sene in seen_enes:
-        if abs(sene - ene) < 1e-5:
-            no_similar_energies = False
-
-    if no_similar_energies:
-        unique = True
-    else:
-        unique, _ = automol.geom.is_unique(
-            geo, seen_geos, check_dct=check_dct)
-
-    if not unique:
-        bad_conformer('not unique')
-
-    return unique
-
-
 def _inchi_are_same(orig_ich, geo):
     """ Assess if a geometry has the same connectivity to
      saved geos evaluated in temrs of inchi
@@ -1052,29 +1024,6 @@ def _check_old_inchi(orig_ich, seen_geos, saved_locs, cnf_save_fs):
                 f'inchi do not match for {smi} at {path}')
 
 
-def _sym_unique(geo, ene, saved_geos, saved_enes, ethresh=1.0e-5):
-    """ Check if a conformer is symmetrically distinct from the
-        existing conformers in the filesystem
-    """
-
-    sym_idx = None
-    new_saved_geos = []
-    idx_dct = {}
-    for i, (sene, sgeo) in enumerate(zip(saved_enes, saved_geos)):
-        if abs(ene - sene) < ethresh:
-            idx_dct[len(new_saved_geos)] = i
-            new_saved_geos.append(sgeo)
-    if new_saved_geos:
-        _, sym_idx = automol.geom.is_unique(
-            geo, new_saved_geos, check_dct={'coulomb': 1e-2})
-
-    if sym_idx is not None:
-        print(' - Structure is not symmetrically unique.')
-        sym_idx = idx_dct[sym_idx]
-
-    return sym_idx
-
-
 def _ts_geo_viable(zma, zrxn, cnf_save_fs, mod_thy_info, zma_locs=(0,)):
     """ Perform a series of checks to assess the viability
         of a transition state geometry prior to saving
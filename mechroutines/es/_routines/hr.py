@@ -5,6 +5,7 @@ import automol
 import elstruct
 from mechlib.amech_io import printer as ioprinter
 from mechroutines.es.runner import scan, qchem_params
+from mechroutines.es.runner import iter_forked_calls
 
 
 def hindered_rotor_scans(
@@ -15,8 +16,14 @@ def hindered_rotor_scans(
         zrxn=None,
         saddle=False,
         increment=0.5235987756,
-        retryfail=True):
+        retryfail=True,
+        nworkers=1):
     """ Perform scans over each of the torsional coordinates
+
+        With `nworkers` > 1, the relaxed scans of up to `nworkers` rotors
+        are run at once, each in its own process, since the scan of one
+        rotor does not depend on the others. For rigid scans, the points
+        of all of the rotors are run as one batch of jobs.
     """
 
     if tors_model != '1dhrfa':
@@ -47,16 +54,114 @@ def hindered_rotor_scans(
         zma, run_tors_names, tors_model)
 
     ioprinter.run_rotors(run_tors_names, const_names)
-    for tors_names, tors_grids in zip(run_tors_names, run_tors_grids):
 
-        ioprinter.info_message(
-            f'Running Rotor: {"-".join(tors_names)}', newline=1)
+    # Setting the constraints
+    constraint_dcts = tuple(
+        automol.zmat.constraint_dict(zma, const_names, tors_names)
+        for tors_names in run_tors_names)
+
+    if nworkers > 1 and scn_typ == 'rigid':
+        scan.execute_rigid_scans(
+            zma=zma,
+            spc_info=spc_info,
+            mod_thy_info=mod_thy_info,
+            coord_names_lst=run_tors_names,
+            coord_grids_lst=run_tors_grids,
+            scn_run_fs=scn_run_fs,
+            scn_save_fs=scn_save_fs,
+            script_str=script_str,
+            overwrite=overwrite,
+            zrxn=zrxn,
+            constraint_dct_lst=constraint_dcts,
+            retryfail=retryfail,
+            nworkers=nworkers,
+            **kwargs,
+        )
+        return
+
+    rotor_kwargs_lst = tuple(
+        {'zma': zma, 'spc_info': spc_info, 'mod_thy_info': mod_thy_info,
+         'tors_names': tors_names, 'tors_grids': tors_grids,
+         'constraint_dct': constraint_dct,
+         'scn_run_fs': scn_run_fs, 'scn_save_fs': scn_save_fs,
+         'scn_typ': scn_typ, 'script_str': script_str,
+         'overwrite': overwrite, 'zrxn': zrxn,
+         'update_guess': update_guess, 'reverse_sweep': reverse_sweep,
+         'backstep': backstep, 'saddle': saddle, 'retryfail': retryfail,
+         **kwargs}
+        for tors_names, tors_grids, constraint_dct in zip(
+            run_tors_names, run_tors_grids, constraint_dcts))
+
+    if nworkers > 1 and len(rotor_kwargs_lst) > 1:
+        _run_rotor_scans(rotor_kwargs_lst, nworkers)
+    else:
+        for rotor_kwargs in rotor_kwargs_lst:
+            _scan_rotor(**rotor_kwargs)
+
+
+def _run_rotor_scans(rotor_kwargs_lst, nworkers):
+    """ Run the scans of the rotors in forked processes, `nworkers` at a
+        time. As when the scans are run one after another, an error in
+        the scan of any rotor is raised, once all of the scans are done.
+    """
+
+    ioprinter.info_message(
+        f'Running the scans of {len(rotor_kwargs_lst)} rotors, '
+        f'{nworkers} at a time...', newline=1)
+    errors = ()
+    for idx, exitcode, error in iter_forked_calls(
+            _scan_rotor, rotor_kwargs_lst, nworkers=nworkers):
+        tors_str = '-'.join(rotor_kwargs_lst[idx]['tors_names'])
+        if exitcode != 0:
+            ioprinter.warning_message(
+                f'Scan of rotor {tors_str} exited abnormally')
+            errors += (
+                f'Scan of rotor {tors_str} failed:\n' +
+                (error if error is not None else f'exit code {exitcode}'),)
+        else:
+            ioprinter.info_message(f'Finished Rotor: {tors_str}')
 
-        # Setting the constraints
-        constraint_dct = automol.zmat.constraint_dict(
-            zma, const_names, tors_names)
-        print('in hr', tors_names)
-        scan.execute_scan(
+    if errors:
+        raise RuntimeError('\n'.join(errors))
+
+
+def _scan_rotor(zma, spc_info, mod_thy_info,
+                tors_names, tors_grids, constraint_dct,
+                scn_run_fs, scn_save_fs, scn_typ,
+                script_str, overwrite,
+                zrxn=None, update_guess=True, reverse_sweep=True,
+                backstep=True, saddle=False, retryfail=True,
+                **kwargs):
+    """ Run and save the scan of a single rotor, followed by its
+        backsteps, if requested
+    """
+
+    ioprinter.info_message(
+        f'Running Rotor: {"-".join(tors_names)}', newline=1)
+
+    print('in hr', tors_names)
+    scan.execute_scan(
+        zma=zma,
+        spc_info=spc_info,
+        mod_thy_info=mod_thy_info,
+        coord_names=tors_names,
+        coord_grids=tors_grids,
+        scn_run_fs=scn_run_fs,
+        scn_save_fs=scn_save_fs,
+        scn_typ=scn_typ,
+        script_str=script_str,
+        overwrite=overwrite,
+        zrxn=zrxn,
+        update_guess=update_guess,
+        reverse_sweep=reverse_sweep,
+        saddle=saddle,
+        constraint_dct=constraint_dct,
+        retryfail=retryfail,
+        **kwargs,
+    )
+    if backstep:
+        ioprinter.info_message('Attempting backstep routine')
+        scan.run_backsteps(
             zma=zma,
             spc_info=spc_info,
             mod_thy_info=mod_thy_info,
@@ -67,32 +172,11 @@ def hindered_rotor_scans(
             scn_typ=scn_typ,
             script_str=script_str,
             overwrite=overwrite,
-            zrxn=zrxn,
-            update_guess=update_guess,
-            reverse_sweep=reverse_sweep,
             saddle=saddle,
             constraint_dct=constraint_dct,
             retryfail=retryfail,
             **kwargs,
         )
-        if backstep:
-            ioprinter.info_message('Attempting backstep routine')
-            scan.run_backsteps(
-                zma=zma,
-                spc_info=spc_info,
-                mod_thy_info=mod_thy_info,
-                coord_names=tors_names,
-                coord_grids=tors_grids,
-                scn_run_fs=scn_run_fs,
-                scn_save_fs=scn_save_fs,
-                scn_typ=scn_typ,
-                script_str=script_str,
-                overwrite=overwrite,
-                saddle=saddle,
-                constraint_dct=constraint_dct,
-                retryfail=retryfail,
-                **kwargs,
-            )
 
 
 def check_hr_pot(tors_pots, tors_zmas, tors_paths, emax=-0.5, emin=-10.0):
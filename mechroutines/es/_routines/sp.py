@@ -108,10 +108,11 @@ def run_energy(zma, geo, spc_info, thy_info,
         )
 
         if success:
-            inf_obj, inp_str, out_str = ret
+            inf_obj, inp_str, _ = ret
 
             ioprinter.info_message(" - Reading energy from output...")
-            ene = elstruct.reader.energy(inf_obj.prog, inf_obj.method, out_str)
+            ene = es_runner.read_job_data(
+                elstruct.Job.ENERGY, run_fs, ret, ('energy',))['energy']
 
             ioprinter.energy(ene)
             sp_save_fs[-1].create(thy_info[1:4])
@@ -183,14 +184,16 @@ def run_gradient(zma, geo, spc_info, thy_info,
             )
 
             if success:
-                inf_obj, inp_str, out_str = ret
+                inf_obj, inp_str, _ = ret
 
                 if is_atom:
                     grad = ()
                 else:
                     ioprinter.info_message(
                         " - Reading gradient from output...")
-                    grad = elstruct.reader.gradient(inf_obj.prog, out_str)
+                    grad = es_runner.read_job_data(
+                        elstruct.Job.GRADIENT, run_fs, ret,
+                        ('gradient',))['gradient']
 
                     ioprinter.info_message(" - Saving gradient...")
                     if _json_database(geo_save_path):
@@ -247,12 +250,13 @@ def rerun_hessian_and_opt(
         )
 
         if success:
-            inf_obj, _, out_str = ret
-            tight_geo = elstruct.reader.opt_geometry(inf_obj.prog, out_str)
+            tight_geo = es_runner.read_job_data(
+                elstruct.Job.OPTIMIZATION, run_fs, ret,
+                ('geometry',))['geometry']
             save_conformer(
                 ret, geo_run_fs, geo_save_fs, locs,
                 thy_info,  orig_ich=spc_info[0],
-                init_zma=zma, zrxn=zrxn)
+                init_zma=zma, zrxn=zrxn, run_fs=run_fs)
             if geo_save_fs[-1].exists(locs):
                 ioprinter.info_message(
                     'TightOpt complete. Rerunning Hessian Job')
@@ -337,14 +341,15 @@ def run_hessian(zma, geo, spc_info, thy_info,
             )
 
             if success:
-                inf_obj, inp_str, out_str = ret
+                inf_obj, inp_str, _ = ret
 
                 ioprinter.info_message(" - Reading hessian from output...")
 
                 # If requested, determine if there are too many frequencies
                 if correct_vals:
-                    hfrqs = elstruct.reader.harmonic_frequencies(
-                        inf_obj.prog, out_str)
+                    hfrqs = es_runner.read_job_data(
+                        elstruct.Job.HESSIAN, run_fs, ret,
+                        ('frequencies',))['frequencies']
                     imags = tuple(x for x in hfrqs if x < 0.0)
                     nimags = len(imags)
                     too_many_imags = (
@@ -356,8 +361,9 @@ def run_hessian(zma, geo, spc_info, thy_info,
                 # If requested, determine if there are frequencies below thrsh
                 correct_low_vals = False
                 if correct_low_vals:
-                    hfrqs = elstruct.reader.harmonic_frequencies(
-                        inf_obj.prog, out_str)
+                    hfrqs = es_runner.read_job_data(
+                        elstruct.Job.HESSIAN, run_fs, ret,
+                        ('frequencies',))['frequencies']
                     reals = tuple(x for x in hfrqs if x > 0.0)
                     has_low_freqs = any(x for x in reals if x < 30.0)
                 else:
@@ -399,7 +405,9 @@ def run_hessian(zma, geo, spc_info, thy_info,
                         imag_success = True
 
                     if imag_success:
-                        hess = elstruct.reader.hessian(inf_obj.prog, out_str)
+                        hess = es_runner.read_job_data(
+                            elstruct.Job.HESSIAN, run_fs, ret,
+                            ('hessian',))['hessian']
 
                         ioprinter.info_message(" - Saving Hessian...")
                         if _json_database(geo_save_path):
@@ -420,7 +428,7 @@ def run_hessian(zma, geo, spc_info, thy_info,
                             f" - Save path: {geo_save_path}")
 
                         if thy_info[0] == 'gaussian09':
-                            _hess_grad(inf_obj.prog, out_str, geo_save_fs,
+                            _hess_grad(run_fs, ret, geo_save_fs,
                                        geo_save_path, locs, overwrite)
                         _hess_freqs(geo, geo_save_fs, geo_save_path,
                                     locs, run_prefix, overwrite)
@@ -671,7 +679,7 @@ def _hess_freqs(geo, geo_save_fs, save_path, locs, run_prefix, overwrite):
         ioprinter.frequencies(freqs)
 
 
-def _hess_grad(prog, out_str, geo_save_fs,
+def _hess_grad(run_fs, ret, geo_save_fs,
                save_path, locs, overwrite):
     """ Grab and save the gradient from a Hessian job if possible.
     """
@@ -695,7 +703,8 @@ def _hess_grad(prog, out_str, geo_save_fs,
         # Read the Gradient from the electronic structure output
         ioprinter.info_message(
             " - Attempting to read gradient from Hessian from output...")
-        grad = elstruct.reader.gradient(prog, out_str)
+        grad = es_runner.read_job_data(
+            elstruct.Job.HESSIAN, run_fs, ret, ('gradient',))['gradient']
 
         if grad is not None:
 
@@ -21,9 +21,12 @@ def tau_sampling(zma, ref_ene, spc_info,
                  db_style='directory',
                  nsamp_par=(False, 3, 3, 1, 50, 50),
                  tors_names=(),
-                 zrxn=None, resave=False,
+                 zrxn=None, resave=False, nworkers=1,
                  **kwargs):
     """ Sample over torsions optimizing all other coordinates
+
+        If `nworkers` is greater than one, the optimizations of the
+        samples are run concurrently, `nworkers` at a time.
     """
 
     if resave:
@@ -45,6 +48,7 @@ def tau_sampling(zma, ref_ene, spc_info,
         nsamp_par=nsamp_par,
         tors_names=tors_names,
         zrxn=zrxn,
+        nworkers=nworkers,
         **kwargs,
     )
 
@@ -64,7 +68,7 @@ def run_tau(zma, spc_info, thy_info,
             tau_run_fs, tau_save_fs, script_str, overwrite,
             nsamp_par=(False, 3, 3, 1, 50, 50),
             tors_names=(),
-            zrxn=None, **kwargs):
+            zrxn=None, nworkers=1, **kwargs):
     """ run sampling algorithm to find tau dependent geometries
     """
 
@@ -94,6 +98,13 @@ def run_tau(zma, spc_info, thy_info,
     # Set the filesystem objects
     inf_obj = autofile.schema.info_objects.tau_trunk(0, tors_range_dct)
 
+    if nworkers > 1:
+        _run_tau_pool(
+            zma, spc_info, thy_info, tau_run_fs, tau_save_fs,
+            script_str, overwrite, num_to_samp, tors_range_dct, inf_obj,
+            nworkers, zrxn=zrxn, **kwargs)
+        return
+
     while True:
         nsamp = nsamp0 - nsampd
 
@@ -133,54 +144,112 @@ def run_tau(zma, spc_info, thy_info,
                 **kwargs
             )
         else:
-            warning_message('repulsive ZMA:')
-            inp_str = elstruct.writer.optimization(
-                geo=samp_zma,
-                charge=spc_info[1],
-                mult=spc_info[2],
-                method=thy_info[1],
-                basis=thy_info[2],
-                prog=thy_info[0],
-                orb_type=thy_info[3],
-                mol_options=['nosym'],
-                frozen_coordinates=tors_range_dct.keys(),
-            )
-            tau_run_fs[-1].file.geometry_input.write(inp_str, locs)
-            warning_message(
-                'geometry for bad ZMA at', tau_run_fs[-1].path(locs))
-
-        if tau_save_fs[0].file.info.exists():
-            inf_obj_s = tau_save_fs[0].file.info.read()
-            nsampd = inf_obj_s.nsamp
-        elif tau_run_fs[0].file.info.exists():
-            inf_obj_r = tau_run_fs[0].file.info.read()
-            nsampd = inf_obj_r.nsamp
-        nsampd += 1
-        inf_obj.nsamp = nsampd
-        tau_save_fs[0].file.info.write(inf_obj)
-        tau_run_fs[0].file.info.write(inf_obj)
+            _write_repulsive_input(
+                samp_zma, spc_info, thy_info, tau_run_fs, locs,
+                tors_range_dct)
+
+        nsampd = _update_tau_nsamp(tau_run_fs, tau_save_fs, inf_obj, nsampd)
+
+
+def _run_tau_pool(zma, spc_info, thy_info, tau_run_fs, tau_save_fs,
+                  script_str, overwrite, num_to_samp, tors_range_dct,
+                  inf_obj, nworkers, zrxn=None, **kwargs):
+    """ Generate all of the remaining samples at once and run their
+        optimizations concurrently, `nworkers` at a time
+    """
+
+    nsampd = util.calc_nsampd(tau_save_fs, tau_run_fs, rid=None)
+    samp_zmas = (
+        automol.zmat.samples(zma, num_to_samp, tors_range_dct)
+        if num_to_samp > 0 else ())
+
+    job_kwargs_lst = []
+    for samp_zma in samp_zmas:
+        locs = [autofile.schema.generate_new_tau_id()]
+        tau_run_fs[-1].create(locs)
+
+        if automol.zmat.has_low_relative_repulsion_energy(samp_zma, zma):
+            job_kwargs_lst.append({
+                'job': elstruct.Job.OPTIMIZATION,
+                'script_str': script_str,
+                'run_fs': autofile.fs.run(tau_run_fs[-1].path(locs)),
+                'geo': samp_zma,
+                'spc_info': spc_info,
+                'thy_info': thy_info,
+                'saddle': bool(zrxn is not None),
+                'overwrite': overwrite,
+                'frozen_coordinates': tors_range_dct.keys(),
+                **kwargs
+            })
+        else:
+            _write_repulsive_input(
+                samp_zma, spc_info, thy_info, tau_run_fs, locs,
+                tors_range_dct)
+            nsampd = _update_tau_nsamp(
+                tau_run_fs, tau_save_fs, inf_obj, nsampd)
+
+    info_message(
+        f'Running {len(job_kwargs_lst)} samples, {nworkers} at a time...')
+    for samp_idx, _ in enumerate(es_runner.iter_executed_jobs(
+            job_kwargs_lst, nworkers=nworkers)):
+        info_message(f"\nFinished run {samp_idx+1}/{len(job_kwargs_lst)}")
+        nsampd = _update_tau_nsamp(tau_run_fs, tau_save_fs, inf_obj, nsampd)
+
+
+def _write_repulsive_input(samp_zma, spc_info, thy_info, tau_run_fs, locs,
+                           tors_range_dct):
+    """ Write the input for a sample with high repulsion that is not run
+    """
+
+    warning_message('repulsive ZMA:')
+    inp_str = elstruct.writer.optimization(
+        geo=samp_zma,
+        charge=spc_info[1],
+        mult=spc_info[2],
+        method=thy_info[1],
+        basis=thy_info[2],
+        prog=thy_info[0],
+        orb_type=thy_info[3],
+        mol_options=['nosym'],
+        frozen_coordinates=tors_range_dct.keys(),
+    )
+    tau_run_fs[-1].file.geometry_input.write(inp_str, locs)
+    warning_message(
+        'geometry for bad ZMA at', tau_run_fs[-1].path(locs))
+
+
+def _update_tau_nsamp(tau_run_fs, tau_save_fs, inf_obj, nsampd):
+    """ Add a sample to the count in the tau trunk info files
+    """
+
+    if tau_save_fs[0].file.info.exists():
+        inf_obj_s = tau_save_fs[0].file.info.read()
+        nsampd = inf_obj_s.nsamp
+    elif tau_run_fs[0].file.info.exists():
+        inf_obj_r = tau_run_fs[0].file.info.read()
+        nsampd = inf_obj_r.nsamp
+    nsampd += 1
+    inf_obj.nsamp = nsampd
+    tau_save_fs[0].file.info.write(inf_obj)
+    tau_run_fs[0].file.info.write(inf_obj)
+
+    return nsampd
 
 
 def save_tau(tau_run_fs, tau_save_fs, mod_thy_info, db_style='directory'):
     """ save the tau dependent geometries that have been found so far
     """
 
-    if db_style == 'jsondb':
-        saved_locs = tau_save_fs[-1].json_existing()
-        saved_geos = tau_save_fs[-1].json.geometry.read_all(saved_locs)
-    elif db_style == 'directory':
-        saved_geos = [tau_save_fs[-1].file.geometry.read(locs)
-                      for locs in tau_save_fs[-1].existing()]
     if not tau_run_fs[0].exists():
         info_message("No tau geometries to save. Skipping...")
     else:
         if db_style == 'jsondb':
             save_info = [[], [], [], [], []]
             sp_save_info = [[], [], [], [], []]
+        run_info = []
         for locs in tau_run_fs[-1].existing():
             run_path = tau_run_fs[-1].path(locs)
             run_fs = autofile.fs.run(run_path)
-            save_path = tau_save_fs[-1].root.path()
 
             reading("tau run", run_path)
 
@@ -191,8 +260,18 @@ def save_tau(tau_run_fs, tau_save_fs, mod_thy_info, db_style='directory'):
                 prog = inf_obj.prog
                 method = inf_obj.method
                 ene = elstruct.reader.energy(prog, method, out_str)
-
                 geo = elstruct.reader.opt_geometry(prog, out_str)
+                run_info.append((locs, inf_obj, inp_str, ene, geo))
+
+        # Drop the repeated samples, checking all of them at once; samples
+        # that are only equivalent by symmetry are all kept
+        uniq_lst = filesys.unique.batch_unique(
+            [info[4] for info in run_info], [info[3] for info in run_info],
+            (), ())
+        for (locs, inf_obj, inp_str, ene, geo), (is_unique, _) in zip(
+                run_info, uniq_lst):
+            save_path = tau_save_fs[-1].root.path()
+            if is_unique:
                 if db_style == 'directory':
                     save_geo(save_path)
                     tau_save_fs[-1].create(locs)
@@ -229,8 +308,6 @@ def save_tau(tau_run_fs, tau_save_fs, mod_thy_info, db_style='directory'):
                     sp_save_fs[-1].json.info.write(inf_obj, mod_thy_info[1:4])
                     sp_save_fs[-1].json.energy.write(ene, mod_thy_info[1:4])
 
-                saved_geos.append(geo)
-
         print('\nWriting the geometries and energies into JSON file...')
         if db_style == 'jsondb':
             tau_save_fs[-1].json_create()
@@ -260,28 +337,28 @@ def assess_pf_convergence(tau_save_fs, ref_ene,
     """ Determine how much the partition function has converged
     """
 
-    # Calculate sigma values at various temperatures for the PF
-    for temp in temps:
-        sumq = 0.
-        sum2 = 0.
-        idx = 0
+    # Read the energies of all of the samples at once
+    inf_obj_s = tau_save_fs[0].file.info.read()
+    nsamp = inf_obj_s.nsamp
+    saved_locs = tau_save_fs[-1].json_existing()
+    ratio = len(saved_locs) / float(nsamp)
+    enes = (filesys.read.tau_sample_energies(tau_save_fs, saved_locs) -
+            ref_ene) * phycon.EH2KCAL
+
+    # Calculate running sigma values at all temperatures for the PF
+    # with one cumulative sum over the samples
+    idxs = numpy.arange(1, len(enes)+1, dtype=float)
+    tmps = numpy.exp(
+        -enes[None, :]*349.7/(0.695*numpy.array(temps)[:, None]))
+    sumqs = numpy.cumsum(tmps, axis=1)
+    sum2s = numpy.cumsum(tmps**2, axis=1)
+    sigmas = numpy.sqrt(abs(sum2s/idxs - (sumqs/idxs)**2)/idxs)
+    for temp, sumq, sigma in zip(temps, sumqs, sigmas):
         debug_message('integral convergence for T = ', temp)
-        inf_obj_s = tau_save_fs[0].file.info.read()
-        nsamp = inf_obj_s.nsamp
-        saved_locs = tau_save_fs[-1].json_existing()
-        ratio = len(saved_locs) / float(nsamp)
-        for locs in saved_locs:
-            idx += 1
-            ene = tau_save_fs[-1].json.energy.read(locs)
-            ene = (ene - ref_ene) * phycon.EH2KCAL
-            tmp = numpy.exp(-ene*349.7/(0.695*temp))
-            sumq = sumq + tmp
-            sum2 = sum2 + tmp**2
-            sigma = numpy.sqrt(
-                (abs(sum2/float(idx)-(sumq/float(idx))**2))/float(idx))
+        for idx, _sumq, _sigma in zip(idxs, sumq, sigma):
             debug_message(
-                sumq/float(idx), sigma, 100.*sigma*float(idx)/sumq, idx)
-        info_message('Ratio of good to sampled geometries: ', ratio)
+                _sumq/idx, _sigma, 100.*_sigma*idx/_sumq, int(idx))
+    info_message('Ratio of good to sampled geometries: ', ratio)
 
 
 def _check_vma(zma, tau_save_fs):
@@ -8,6 +8,11 @@
 from mechroutines.es.runner._run import execute_job
 from mechroutines.es.runner._run import run_job
 from mechroutines.es.runner._run import read_job
+from mechroutines.es.runner._run import read_job_data
+from mechroutines.es.runner._pool import execute_jobs
+from mechroutines.es.runner._pool import iter_executed_jobs
+from mechroutines.es.runner._pool import iter_forked_calls
+from mechroutines.es.runner._pool import job_workers
 from mechroutines.es.runner._opt import multi_stage_optimization
 from mechroutines.es.runner._par import qchem_params
 from mechroutines.es.runner._wfn import multireference_calculation_parameters
@@ -18,6 +23,11 @@ __all__ = [
     'execute_job',
     'run_job',
     'read_job',
+    'read_job_data',
+    'execute_jobs',
+    'iter_executed_jobs',
+    'iter_forked_calls',
+    'job_workers',
     'multi_stage_optimization',
     'qchem_params',
     'multireference_calculation_parameters',
@@ -0,0 +1,185 @@
+""" Cache of data parsed from electronic structure outputs
+
+    The data parsed from the output of a job (success, energy, geometry,
+    gradient, Hessian, frequencies, program version) is stored in a small
+    JSON file in the job directory of the RUN filesystem. The cache is
+    keyed by a hash of the program and the input string of the job and by
+    the modification time of the output file, so it is discarded as soon
+    as the job is rerun.
+"""
+
+import os
+import json
+import hashlib
+import elstruct
+
+
+CACHE_NAME = 'parsed.json'
+
+READER_DCT = {
+    'energy': elstruct.reader.energy,
+    'geometry': lambda prog, _, out_str: elstruct.reader.opt_geometry(
+        prog, out_str),
+    'gradient': lambda prog, _, out_str: elstruct.reader.gradient(
+        prog, out_str),
+    'hessian': lambda prog, _, out_str: elstruct.reader.hessian(
+        prog, out_str),
+    'frequencies': lambda prog, _, out_str: (
+        elstruct.reader.harmonic_frequencies(prog, out_str)),
+    'version': lambda prog, _, out_str: elstruct.reader.program_version(
+        prog, out_str),
+}
+
+
+def input_key(prog, inp_str):
+    """ Hash of the program and input string of a job
+
+        :param prog: electronic structure program
+        :type prog: str
+        :param inp_str: input string of the job
+        :type inp_str: str
+        :rtype: str
+    """
+    return hashlib.sha256(f'{prog}\n{inp_str}'.encode()).hexdigest()
+
+
+def read_parsed(job, run_fs, ret, keys):
+    """ Obtain data parsed from the output of a job, reading it from the
+        cache if possible and parsing the output string otherwise. Newly
+        parsed data is added to the cache.
+
+        :param job: label for job formatted to elstruct package definitions
+        :type job: str
+        :param run_fs: filesystem object for the run filesys where job is run
+        :type run_fs: autofile.fs.run object
+        :param ret: (inf_obj, inp_str, out_str) of the job
+        :type ret: tuple
+        :param keys: names of the data to parse; see READER_DCT
+        :type keys: tuple(str)
+        :rtype: dict[str: obj]
+    """
+
+    inf_obj, inp_str, out_str = ret
+    prog, method = inf_obj.prog, inf_obj.method
+
+    cache = read_cache(job, run_fs, prog, inp_str)
+    data = cache.get('data', {})
+
+    missing = tuple(key for key in keys if key not in data)
+    if missing:
+        for key in missing:
+            data[key] = READER_DCT[key](prog, method, out_str)
+        cache['data'] = data
+        write_cache(job, run_fs, prog, inp_str, cache)
+
+    return {key: data[key] for key in keys}
+
+
+def read_cache(job, run_fs, prog, inp_str):
+    """ Read the cache of a job, returning an empty cache if there is
+        none or if it was written for a different input or output
+
+        :param job: label for job formatted to elstruct package definitions
+        :type job: str
+        :param run_fs: filesystem object for the run filesys where job is run
+        :type run_fs: autofile.fs.run object
+        :param prog: electronic structure program
+        :type prog: str
+        :param inp_str: input string of the job
+        :type inp_str: str
+        :rtype: dict[str: obj]
+    """
+
+    cache = {}
+
+    cache_path = _cache_path(job, run_fs)
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as fobj:
+                cache = json.load(fobj)
+        except (OSError, ValueError):
+            cache = {}
+        if (cache.get('key') != input_key(prog, inp_str) or
+                cache.get('out_mtime') != _output_mtime(job, run_fs)):
+            cache = {}
+        else:
+            cache['data'] = {key: _tuplify(val)
+                             for key, val in cache.get('data', {}).items()}
+
+    return cache
+
+
+def write_cache(job, run_fs, prog, inp_str, cache):
+    """ Write the cache of a job into its directory in the RUN filesystem
+
+        :param job: label for job formatted to elstruct package definitions
+        :type job: str
+        :param run_fs: filesystem object for the run filesys where job is run
+        :type run_fs: autofile.fs.run object
+        :param prog: electronic structure program
+        :type prog: str
+        :param inp_str: input string of the job
+        :type inp_str: str
+        :param cache: data to write in the cache
+        :type cache: dict[str: obj]
+    """
+
+    cache = dict(cache)
+    cache['key'] = input_key(prog, inp_str)
+    cache['out_mtime'] = _output_mtime(job, run_fs)
+
+    cache_path = _cache_path(job, run_fs)
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as fobj:
+            json.dump(cache, fobj, default=_jsonify)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError):
+        print(f' - Unable to write parsed output cache at {cache_path}')
+
+
+def clear_cache(job, run_fs):
+    """ Remove the cache of a job, as done when the job is rerun
+
+        :param job: label for job formatted to elstruct package definitions
+        :type job: str
+        :param run_fs: filesystem object for the run filesys where job is run
+        :type run_fs: autofile.fs.run object
+    """
+    cache_path = _cache_path(job, run_fs)
+    if os.path.exists(cache_path):
+        os.remove(cache_path)
+
+
+# Helpers
+def _cache_path(job, run_fs):
+    """ Path to the cache file in the job directory
+    """
+    return os.path.join(run_fs[-1].path([job]), CACHE_NAME)
+
+
+def _output_mtime(job, run_fs):
+    """ Modification time of the output file of a job
+    """
+    try:
+        mtime = os.path.getmtime(run_fs[-1].file.output.path([job]))
+    except OSError:
+        mtime = None
+    return mtime
+
+
+def _jsonify(val):
+    """ Convert arrays in the parsed data into lists that can be written
+    """
+    if hasattr(val, 'tolist'):
+        return val.tolist()
+    raise TypeError(f'Cannot write {type(val)} to the parsed output cache')
+
+
+def _tuplify(val):
+    """ Convert the nested lists read from JSON into the nested tuples
+        used by automol and elstruct
+    """
+    if isinstance(val, list):
+        val = tuple(_tuplify(x) for x in val)
+    return val
@@ -0,0 +1,161 @@
+""" Concurrent execution of independent electronic structure jobs
+
+    Jobs are submitted as dictionaries of the keyword arguments taken by
+    `run_job` and are run in a bounded pool of forked worker processes.
+    Each worker runs a single job through `run_job`, so the RUNNING,
+    SUCCESS, and FAILURE status written to the info file of the RUN
+    filesystem is the same as for jobs run one after another. The results
+    are read back from the RUN filesystem by the parent process with
+    `read_job` as each job finishes.
+
+    Processes are used rather than threads since the program launchers
+    change the working directory of the process running them.
+"""
+
+import sys
+import traceback
+import multiprocessing
+import multiprocessing.connection
+import autofile
+from mechroutines.es.runner._run import run_job
+from mechroutines.es.runner._run import read_job
+from mechroutines.es.runner._run import execute_job
+
+
+def job_workers(method_dct, ncores=None):
+    """ Determine the number of jobs that can be run at once on a node
+        with `ncores` cores, given the number of processors each job
+        requests in the theory level.
+
+        :param method_dct: theory level of the jobs
+        :type method_dct: dict[str: obj]
+        :param ncores: number of cores that can be used for the jobs
+        :type ncores: int
+        :rtype: int
+    """
+
+    nworkers = 1
+    if ncores is not None:
+        nprocs = method_dct.get('nprocs')
+        nprocs = nprocs if nprocs is not None else 1
+        nworkers = max(1, ncores // max(1, nprocs))
+
+    return nworkers
+
+
+def execute_jobs(job_kwargs_lst, nworkers=1):
+    """ Run and read a batch of independent electronic structure jobs,
+        with up to `nworkers` jobs running at any one time.
+
+        :param job_kwargs_lst: keyword arguments of `run_job` for each job
+        :type job_kwargs_lst: tuple(dict[str: obj])
+        :param nworkers: number of jobs to run concurrently
+        :type nworkers: int
+        :return: (success, ret) of each job, in the order submitted
+        :rtype: tuple((bool, tuple))
+    """
+
+    ret_dct = dict(iter_executed_jobs(job_kwargs_lst, nworkers=nworkers))
+
+    return tuple(ret_dct[idx] for idx in range(len(job_kwargs_lst)))
+
+
+def iter_executed_jobs(job_kwargs_lst, nworkers=1):
+    """ Run a batch of independent electronic structure jobs, with up to
+        `nworkers` jobs running at any one time, and yield the results of
+        the jobs as they finish. Jobs appended to `job_kwargs_lst` while
+        iterating, e.g., to replace jobs that failed, are also run.
+
+        :param job_kwargs_lst: keyword arguments of `run_job` for each job
+        :type job_kwargs_lst: list(dict[str: obj])
+        :param nworkers: number of jobs to run concurrently
+        :type nworkers: int
+        :return: index of each job in the batch and its (success, ret)
+        :rtype: iterator of (int, (bool, tuple))
+    """
+
+    if nworkers is None or nworkers <= 1:
+        for idx, job_kwargs in enumerate(job_kwargs_lst):
+            yield idx, execute_job(**job_kwargs)
+    else:
+        for idx, exitcode, _ in iter_forked_calls(
+                run_job, job_kwargs_lst, nworkers=nworkers):
+            job_kwargs = job_kwargs_lst[idx]
+            if exitcode != 0:
+                _mark_failed(job_kwargs['job'], job_kwargs['run_fs'])
+            yield idx, read_job(job_kwargs['job'], job_kwargs['run_fs'])
+
+
+def iter_forked_calls(func, kwargs_lst, nworkers=1):
+    """ Call a function once for each set of keyword arguments, with up
+        to `nworkers` calls running at any one time in forked worker
+        processes, and yield each call as it finishes. Calls appended to
+        `kwargs_lst` while iterating are also made.
+
+        The function is run for what it writes to the filesystem; its
+        return value is not passed back, but the traceback of any error
+        it raises is.
+
+        :param func: function to call
+        :type func: function
+        :param kwargs_lst: keyword arguments of each call
+        :type kwargs_lst: list(dict[str: obj])
+        :param nworkers: number of calls to run concurrently
+        :type nworkers: int
+        :return: index of each call, the exit code of its process and the
+            traceback of the error raised by the call, or None
+        :rtype: iterator of (int, int, str)
+    """
+
+    ctx = multiprocessing.get_context('fork')
+    next_idx = 0
+    running = {}
+    while next_idx < len(kwargs_lst) or running:
+        # Fill any open worker slots
+        while next_idx < len(kwargs_lst) and len(running) < max(1, nworkers):
+            recv_conn, send_conn = ctx.Pipe(duplex=False)
+            proc = ctx.Process(
+                target=_call, args=(func, kwargs_lst[next_idx], send_conn))
+            proc.start()
+            send_conn.close()
+            running[recv_conn] = (next_idx, proc)
+            next_idx += 1
+
+        # Report the calls that have finished, which send their error or
+        # close the pipe when the process ends
+        for recv_conn in multiprocessing.connection.wait(list(running)):
+            idx, proc = running.pop(recv_conn)
+            try:
+                error = recv_conn.recv()
+            except EOFError:
+                error = None
+            recv_conn.close()
+            proc.join()
+            yield idx, proc.exitcode, error
+
+
+def _call(func, kwargs, send_conn):
+    """ Make a call in a worker process, sending the traceback of any error
+        it raises to the parent process, which then has exit code 1
+    """
+    error = None
+    try:
+        func(**kwargs)
+    except Exception:  # pylint: disable=broad-except
+        error = traceback.format_exc()
+    send_conn.send(error)
+    send_conn.close()
+    if error is not None:
+        sys.exit(1)
+
+
+def _mark_failed(job, run_fs):
+    """ Set the status of a job whose worker died to FAILURE, so that
+        it is not mistaken for a job that is still running.
+    """
+    if run_fs[-1].file.info.exists([job]):
+        inf_obj = run_fs[-1].file.info.read([job])
+        if inf_obj.status == autofile.schema.RunStatus.RUNNING:
+            print(f' - Job at {run_fs[-1].path([job])} exited abnormally.')
+            inf_obj.status = autofile.schema.RunStatus.FAILURE
+            run_fs[-1].file.info.write(inf_obj, [job])
@@ -6,6 +6,7 @@ import elstruct
 import autofile
 import automol
 from . import _seq as optseq
+from . import _cache
 
 
 BASE_ERRS = (elstruct.Error.SCF_NOCONV,
@@ -158,8 +159,9 @@ def run_job(job, script_str, run_fs,
         inf_obj.utc_start_time = autofile.schema.utc_time()
         run_fs[-1].file.info.write(inf_obj, [job])
 
-        # Write the initial geo/zma
+        # Write the initial geo/zma and discard data parsed from old outputs
         _write_input_geo(geo, job, run_fs)
+        _cache.clear_cache(job, run_fs)
 
         # Set job runner based on user request; set special options as needed
         runner = JOB_RUNNER_DCT[job]
@@ -220,7 +222,14 @@ def read_job(job, run_fs):
         prog = inf_obj.prog
         ret = (inf_obj, inp_str, out_str)
 
-        success = bool(is_successful_output(out_str, job, prog))
+        # Use the success status parsed on a previous read, if any
+        cache = _cache.read_cache(job, run_fs, prog, inp_str)
+        if 'success' in cache:
+            success = cache['success']
+        else:
+            success = bool(is_successful_output(out_str, job, prog))
+            cache['success'] = success
+            _cache.write_cache(job, run_fs, prog, inp_str, cache)
         if success:
             print(" - Reading successful output...")
     else:
@@ -237,6 +246,26 @@ def read_job(job, run_fs):
     return success, ret
 
 
+def read_job_data(job, run_fs, ret, keys):
+    """ Obtain data (e.g., energy, geometry, hessian) parsed from the
+        output of a job read with `read_job`. The data is taken from the
+        parsed-output cache of the job in the RUN filesystem, if it exists,
+        and otherwise is parsed from the output and added to the cache.
+
+        :param job: label for job formatted to elstruct package definitions
+        :type job: str
+        :param run_fs: filesystem object for the run filesys where job is run
+        :type run_fs: autofile.fs.run object
+        :param ret: (inf_obj, inp_str, out_str) of the job
+        :type ret: tuple
+        :param keys: data to obtain: energy, geometry, gradient, hessian,
+            frequencies, and/or version
+        :type keys: tuple(str)
+        :rtype: dict[str: obj]
+    """
+    return _cache.read_parsed(job, run_fs, ret, keys)
+
+
 def is_successful_output(out_str, job, prog):
     """ Parses the output string of the electronic structure job
         and calls the appropraite elstruct status readers to assess
@@ -14,6 +14,7 @@ from mechlib import filesys
 from mechlib.amech_io import printer as ioprinter
 from mechroutines.es.runner._run import execute_job
 from mechroutines.es.runner._run import read_job
+from mechroutines.es.runner._pool import iter_executed_jobs
 
 
 def execute_scan(zma, spc_info, mod_thy_info,
@@ -111,6 +112,100 @@ def run_scan(zma, spc_info, mod_thy_info,
         )
 
 
+def execute_rigid_scans(zma, spc_info, mod_thy_info,
+                        coord_names_lst, coord_grids_lst,
+                        scn_run_fs, scn_save_fs,
+                        script_str, overwrite,
+                        zrxn=None,
+                        constraint_dct_lst=None, retryfail=True,
+                        nworkers=1,
+                        **kwargs):
+    """ Run the energies at the points of several rigid scans, with up to
+        `nworkers` points of any of the scans running at one time, and
+        save the resulting information.
+
+        The points of a rigid scan do not use the structures of the points
+        run before them, so all of the points of all of the scans are run
+        as a single batch of jobs.
+
+        :param coord_names_lst: names of the coordinates of each scan
+        :type coord_names_lst: tuple(tuple(str))
+        :param coord_grids_lst: values of the coordinates of each scan
+        :type coord_grids_lst: tuple(tuple(tuple(float)))
+        :param constraint_dct_lst: constrained coordinates of each scan
+        :type constraint_dct_lst: tuple(dict[str: float])
+    """
+
+    job = _set_job('rigid')
+    if constraint_dct_lst is None:
+        constraint_dct_lst = (None,) * len(coord_names_lst)
+
+    job_kwargs_lst, run_idxs = [], []
+    for idx, (coord_names, coord_grids, constraint_dct) in enumerate(
+            zip(coord_names_lst, coord_grids_lst, constraint_dct_lst)):
+
+        if _scan_finished(coord_names, coord_grids, scn_save_fs,
+                          constraint_dct=constraint_dct, overwrite=overwrite):
+            continue
+
+        grid_vals = tuple(itertools.product(*coord_grids))
+        if _scan_is_running(
+                grid_vals, coord_names, constraint_dct, scn_run_fs, job):
+            continue
+
+        # Build the SCANS/CSCANS filesystems
+        coord_locs = coord_names if constraint_dct is None else constraint_dct
+        scn_save_fs[1].create([coord_locs])
+        inf_obj = autofile.schema.info_objects.scan_branch(
+            dict(zip(coord_names, coord_grids)))
+        scn_save_fs[1].file.info.write(inf_obj, [coord_locs])
+        run_idxs.append(idx)
+
+        for vals in grid_vals:
+            locs = [coord_names, vals]
+            if constraint_dct is not None:
+                locs = [constraint_dct] + locs
+            if scn_save_fs[-1].file.geometry.exists(locs) and not overwrite:
+                continue
+
+            scn_run_fs[-1].create(locs)
+            samp_zma = automol.zmat.set_values_by_name(
+                zma, dict(zip(coord_names, vals)),
+                angstrom=False, degree=False)
+            if constraint_dct is not None:
+                samp_zma = automol.zmat.set_values_by_name(
+                    samp_zma, constraint_dct,
+                    angstrom=False, degree=False)
+            job_kwargs_lst.append(dict(
+                job=job,
+                script_str=script_str,
+                run_fs=autofile.fs.run(scn_run_fs[-1].path(locs)),
+                geo=samp_zma,
+                spc_info=spc_info,
+                thy_info=mod_thy_info,
+                zrxn=zrxn,
+                overwrite=overwrite,
+                retryfail=retryfail,
+                **kwargs
+            ))
+
+    ioprinter.info_message(
+        f'Running {len(job_kwargs_lst)} scan points, '
+        f'{nworkers} at a time...')
+    for pt_idx, _ in enumerate(iter_executed_jobs(
+            job_kwargs_lst, nworkers=nworkers)):
+        print(f'Finished Scan Point {pt_idx+1}/{len(job_kwargs_lst)}')
+
+    for idx in run_idxs:
+        save_scan(
+            scn_run_fs=scn_run_fs,
+            scn_save_fs=scn_save_fs,
+            scn_typ='rigid',
+            coord_names=coord_names_lst[idx],
+            constraint_dct=constraint_dct_lst[idx],
+            mod_thy_info=mod_thy_info)
+
+
 def run_backsteps(
         zma, spc_info, mod_thy_info,
         coord_names, coord_grids,
@@ -156,51 +251,40 @@ def run_backsteps(
     rev_grid_vals_lst = tuple(tuple(val + 4*numpy.pi for val in grid)
                               for grid in rev_grid_vals_orig_lst)
 
-    pot = {}
-    for idx, grid_vals in enumerate(mixed_grid_vals_lst):
-        locs = [coord_names, grid_vals]
-        back_locs = [coord_names, rev_grid_vals_lst[idx]]
-        if constraint_dct is not None:
-            locs = [constraint_dct] + locs
-            back_locs = [constraint_dct] + back_locs
-        path = scn_save_fs[-1].path(locs)
-        back_path = scn_save_fs[-1].path(back_locs)
-        sp_save_fs = autofile.fs.single_point(path)
-        back_sp_save_fs = autofile.fs.single_point(back_path)
-        ene = None
-        if sp_save_fs[-1].file.energy.exists(mod_thy_info[1:4]):
-            ene = sp_save_fs[-1].file.energy.read(mod_thy_info[1:4])
-            ene = ene * phycon.EH2KCAL
-        if back_sp_save_fs[-1].file.energy.exists(mod_thy_info[1:4]):
-            back_ene = back_sp_save_fs[-1].file.energy.read(mod_thy_info[1:4])
-            back_ene = back_ene * phycon.EH2KCAL
-            if ene is None:
-                ene = back_ene
-            if back_ene < ene:
-                ene = back_ene
-        if ene:
-            pot[grid_vals] = ene
+    # Read the forward and back-step energies of the whole rotor at once,
+    # taking the lower of the two at each point
+    fwd_enes, back_enes = filesys.read.scan_energy_arrays(
+        scn_save_fs, coord_names, coord_grids, mod_thy_info,
+        constraint_dct=constraint_dct)
+    enes = numpy.fmin(fwd_enes, back_enes) * phycon.EH2KCAL
+    has_ene = ~numpy.isnan(enes)
+    if not has_ene[0] or numpy.count_nonzero(has_ene) < 3:
+        ioprinter.info_message(
+            f'Too few energies saved for rotor {coord_names}, '
+            'skipping backsteps')
+        return
 
     # Convert the energies to a baseline relative to the first point;
     # helps with numerical issues related to the spline fitting
-    ref_ene = pot[mixed_grid_vals_lst[0]]
-    for grid_vals, ene in pot.items():
-        pot[grid_vals] = ene - ref_ene
-
     # Convert units to degrees (will need to fix for 2-D stuff)
-    conv_pot = {}
-    for grid_vals, ene in pot.items():
-        conv_grid_vals = (grid_vals[0] * phycon.RAD2DEG,)
-        conv_pot[conv_grid_vals] = ene
+    angles = numpy.array(
+        [grid_vals[0] for grid_vals in mixed_grid_vals_lst]) * phycon.RAD2DEG
+    bad_angles, max_norm_diff, score = filesys.read.identify_bad_points(
+        angles[has_ene], enes[has_ene] - enes[0], thresh=0.0165)
+    ioprinter.info_message(
+        f'Scan quality of rotor {coord_names}: {score:.2f} '
+        f'(max norm diff of splines {max_norm_diff:.4f}, '
+        f'{numpy.count_nonzero(~has_ene)} points missing)')
 
-    bad_grid_vals = (filesys.read.identify_bad_point(conv_pot, thresh=0.0165),)
-    if bad_grid_vals[0] is not None:
+    if bad_angles.size:
         print('Akima spline identified potential hysteresis at ',
-              bad_grid_vals[0]*phycon.DEG2RAD)
+              bad_angles*phycon.DEG2RAD)
+        # Backsteps are needed until the sweep has passed every bad point
+        min_bad_val = min(bad_angles) * phycon.DEG2RAD
         passed_bad_point = False
         for idx, rev_grid_vals in enumerate(rev_grid_vals_lst):
 
-            if rev_grid_vals_orig_lst[idx] <= bad_grid_vals[0]*phycon.DEG2RAD:
+            if rev_grid_vals_orig_lst[idx][0] <= min_bad_val:
                 passed_bad_point = True
 
             # Get locs for reading and running filesysten
@@ -255,14 +339,14 @@ def run_backsteps(
             ioprinter.info_message(
                 "Comparing to ", rev_grid_vals_orig_lst[idx])
             path = scn_save_fs[-1].path(locs)
-            path_orig = scn_save_fs[-1].path(locs_orig)
             sp_save_fs = autofile.fs.single_point(path)
-            orig_sp_save_fs = autofile.fs.single_point(path_orig)
             ene = sp_save_fs[-1].file.energy.read(mod_thy_info[1:4])
 
+            # The forward energy was read with the rest of the rotor
             no_backstep_required = False
-            if orig_sp_save_fs[-1].file.energy.exists(mod_thy_info[1:4]):
-                ene_orig = orig_sp_save_fs[-1].file.energy.read(mod_thy_info[1:4])
+            pot = numpy.nan
+            ene_orig = fwd_enes[len(mixed_grid_vals_lst) - 1 - idx]
+            if not numpy.isnan(ene_orig):
                 ene = ene * phycon.EH2KCAL
                 ene_orig = ene_orig * phycon.EH2KCAL
                 pot = ene - ene_orig
@@ -21,6 +21,7 @@ from mechroutines.es.ts import ts_zma_locs
 
 from mechroutines.es.runner import scan
 from mechroutines.es.runner import qchem_params
+from mechroutines.es.runner import job_workers
 from mechroutines.es._routines import sp as sp_module
 
 
@@ -233,6 +234,8 @@ def conformer_tsk(job, spc_dct, spc_name,
             two_stage = saddle
             mc_nsamp = spc_dct_i['mc_nsamp']
             resave = es_keyword_dct['resave']
+            nworkers = job_workers(
+                method_dct, es_keyword_dct.get('ncores'))
 
             # Read the geometry and zma from the ini file system
             geo = ini_cnf_save_fs[-1].file.geometry.read(ini_locs)
@@ -280,7 +283,7 @@ def conformer_tsk(job, spc_dct, spc_name,
                 zrxn=zrxn, two_stage=two_stage,
                 retryfail=retryfail, resave=resave,
                 repulsion_thresh=40.0, print_debug=print_debug,
-                **kwargs)
+                nworkers=nworkers, **kwargs)
             
             visited_rids.add(rid)
             if True:
@@ -323,7 +326,7 @@ def conformer_tsk(job, spc_dct, spc_name,
                             zrxn=zrxn, two_stage=two_stage,
                             retryfail=retryfail, resave=False,
                             repulsion_thresh=40.0, print_debug=print_debug,
-                            **kwargs)
+                            nworkers=nworkers, **kwargs)
                 
 
 
@@ -700,6 +703,8 @@ def tau_tsk(job, spc_dct, spc_name,
 
             tors_names = automol.data.rotor.rotors_torsion_names(torsions, flat=True)
             resave = es_keyword_dct['resave']
+            nworkers = job_workers(
+                method_dct, es_keyword_dct.get('ncores'))
 
             tau.tau_sampling(
                 zma, ref_ene, spc_info,
@@ -709,7 +714,7 @@ def tau_tsk(job, spc_dct, spc_name,
                 db_style=db_style,
                 nsamp_par=nsamp_par,
                 tors_names=tors_names,
-                zrxn=zrxn, resave=resave,
+                zrxn=zrxn, resave=resave, nworkers=nworkers,
                 **kwargs)
 
         elif job in ('energy', 'grad'):
@@ -1003,7 +1008,9 @@ def hr_tsk(job, spc_dct, spc_name,
                 zrxn=zrxn,
                 saddle=saddle,
                 increment=increment,
-                retryfail=retryfail)
+                retryfail=retryfail,
+                nworkers=job_workers(
+                    method_dct, es_keyword_dct.get('ncores')))
 
         elif job == 'reopt':
 
@@ -3,9 +3,13 @@
 
 from mechroutines.ktp import rates
 from mechroutines.ktp import label
+from mechroutines.ktp._spcinf import read_inf_cache
+from mechroutines.ktp._spcinf import write_inf_cache
 
 
 __all__ = [
     'rates',
     'label',
+    'read_inf_cache',
+    'write_inf_cache',
 ]
@@ -2,16 +2,17 @@
 """
 
 from phydat import phycon
-from mechroutines.models import build
 from mechlib.amech_io import printer as ioprinter
 from mechlib import filesys
+from mechroutines.ktp._spcinf import read_spc_inf
 
 
 # Functions to handle energies for a channel
 def set_reference_ene(rxn_lst, spc_dct, tsk_key_dct,
                       model_basis_energy_dct,
                       thy_dct, pes_model_dct_i, spc_model_dct_i,
-                      run_prefix, save_prefix, ref_idx=0, nprocs=1):
+                      run_prefix, save_prefix, ref_idx=0, nprocs=1,
+                      inf_cache=None):
     """ Sets the reference species for the PES for which all energies
         are scaled relative to.
     """
@@ -27,23 +28,17 @@ def set_reference_ene(rxn_lst, spc_dct, tsk_key_dct,
         f' first set of reactants on PES: {"+".join(ref_rgts)}')
 
     # Get the model for the first reference species
-    cnf_range = tsk_key_dct['cnf_range']
     sort_info_lst = filesys.mincnf.sort_info_lst(tsk_key_dct['sort'], thy_dct)
 
     # Get the elec+zpe energy for the reference species
     ioprinter.info_message('')
     hf0k = 0.0
     for rgt in ref_rgts:
-        spc_locs_lst = filesys.models.get_spc_locs_lst(
-            spc_dct[rgt], spc_model_dct_i,
-            run_prefix, save_prefix, saddle=False,
-            cnf_range=cnf_range, sort_info_lst=sort_info_lst,
-            name=rgt, nprocs=nprocs)
-        chnl_infs_i, model_basis_energy_dct = build.read_spc_data(
-            spc_dct, rgt,
+        chnl_infs_i, model_basis_energy_dct = read_spc_inf(
+            spc_dct, rgt, tsk_key_dct, sort_info_lst,
             pes_model_dct_i, spc_model_dct_i,
             run_prefix, save_prefix, model_basis_energy_dct,
-            spc_locs=spc_locs_lst[0] if len(spc_locs_lst)> 0 else None)
+            inf_cache=inf_cache, nprocs=nprocs)
 
         hf0k += chnl_infs_i['ene_chnlvl']
         # hf0k += chnl_infs_i['ene_tsref']
@@ -171,14 +171,15 @@ def obtain_multipes_rxn_ktp_dct(pes_grp_rlst,
         Call additional
     """
 
-    # Read the MESS input and output for all PES group members
+    # Set up the MESS input and output for all PES group members, which
+    # are only read as they are needed
     rate_strs_dct, mess_paths_dct = reader.mess.rate_strings(rate_paths_dct)
 
     # Read MESS file and get rate constants
     if len(pes_grp_rlst) == 1:
         rxn_ktp_dct = _single_pes_ktp_dct(
             pes_grp_rlst,
-            tsk_key_dct, rate_strs_dct, mess_paths_dct,
+            tsk_key_dct, mess_paths_dct,
             pes_mod_dct[pes_mod]['rate_temps'],
             pes_mod_dct[pes_mod]['pressures']
         )
@@ -192,9 +193,9 @@ def obtain_multipes_rxn_ktp_dct(pes_grp_rlst,
     return rxn_ktp_dct
 
 def _single_pes_ktp_dct(pes_grp_rlst,
-                        tsk_key_dct, rate_strs_dct, mess_paths_dct,
+                        tsk_key_dct, mess_paths_dct,
                         temps, pressures):
-    """ Read the rates from a single PES
+    """ Read the rates from the rate table of a single PES
     """
 
     # Read options
@@ -207,35 +208,21 @@ def _single_pes_ktp_dct(pes_grp_rlst,
     if mess_version == 'v1' and use_well_extension:
         typ = f'wext-{mess_version}'
         mess_path = mess_paths_dct[pes_inf][typ]
-        mess_str = rate_strs_dct[pes_inf][typ]['ktp_out']
     elif mess_version == 'v1' and not use_well_extension:
         typ = f'base-{mess_version}'
         mess_path = mess_paths_dct[pes_inf][typ]
-        mess_str = rate_strs_dct[pes_inf][typ]['ktp_out']
     elif mess_version == 'v2':
         typ = f'base-{mess_version}'
         mess_path = mess_paths_dct[pes_inf][typ]
-        mess_str = rate_strs_dct[pes_inf][typ]['ktp_out']
 
     # If file found, read and fit the rate constants
-    if mess_str is not None:
+    rxn_ktp_dct = reader.mess.rate_table(mess_path, temps, pressures)
+    if rxn_ktp_dct is not None:
         print('Fitting rates for single PES...')
         print(f'Fitting rates from {mess_path}')
-
-        rxn_ktp_dct = mess_io.reader.rates.get_rxn_ktp_dct(
-            mess_str,
-            filter_kts=True,
-            filter_reaction_types=('fake', 'self',
-                                   'loss', 'capture', 'reverse'),
-            tmin=min(temps),
-            tmax=max(temps),
-            pmin=min(pressures),
-            pmax=max(pressures)
-        )
         print('Reaction dict test')
         print(rxn_ktp_dct.keys())
     else:
-        rxn_ktp_dct = None
         print(f'No MESS output found at {mess_path}')
 
     return rxn_ktp_dct
@@ -0,0 +1,204 @@
+""" Cache of the MESS data read for the reactants and products of the
+    channels, shared across all of the PESs of an incremental kTPDriver run
+
+    Species such as H, OH, and HO2 appear on many channels of many PESs.
+    The data read for each of them (conformer locators, vibrational
+    analysis, rotor potentials, symmetry factors, etc.) depends only on
+    the species, the models, and the SAVE filesystem, so it is read once
+    and reused for every channel it appears on.
+
+    The cache is kept in the RUN filesystem between runs. Entries read
+    back from it are only used if a fingerprint of the models, the
+    conformer locators, and the files read from the SAVE filesystem (the
+    conformer files and the points of the torsional scans and tau samples
+    of the species) matches the one from when the data was read.
+"""
+
+import os
+import copy
+import pickle
+from mechlib import amech_io
+from mechlib import filesys
+from mechlib.amech_io import printer as ioprinter
+from mechroutines.models import build
+
+
+CACHE_NAME = 'spc_inf_cache.pkl'
+
+
+def read_spc_inf(spc_dct, spc_name, tsk_key_dct, sort_info_lst,
+                 pes_model_dct_i, spc_model_dct_i,
+                 run_prefix, save_prefix, model_basis_energy_dct,
+                 calc_ene_trans=True, inf_cache=None, nprocs=1):
+    """ Read the MESS data for a species from the SAVE filesystem, or
+        take it from the cache if it has already been read with the
+        same models and the SAVE filesystem is unchanged.
+
+        :param spc_dct: species information
+        :type spc_dct: dict[str: dict]
+        :param spc_name: mechanism name of species
+        :type spc_name: str
+        :param tsk_key_dct: keywords of the write_mess task
+        :type tsk_key_dct: dict[str: obj]
+        :param sort_info_lst: info used to sort the conformers
+        :type sort_info_lst: tuple
+        :param pes_model_dct_i: keyword dict of specific PES model
+        :type pes_model_dct_i: dict[]
+        :param spc_model_dct_i: keyword dict of specific species model
+        :type spc_model_dct_i: dict[]
+        :param run_prefix: root-path to the run-filesystem
+        :type run_prefix: str
+        :param save_prefix: root-path to the save-filesystem
+        :type save_prefix: str
+        :param model_basis_energy_dct: energies of basis species
+        :type model_basis_energy_dct: dict[]
+        :param inf_cache: data read for each species, updated in place;
+            if None, the data is read without using a cache
+        :type inf_cache: dict[str: dict]
+        :rtype: (dict[], dict[])
+    """
+
+    key = inf_cache_key(spc_name, tsk_key_dct, calc_ene_trans)
+
+    # Use the entry if it was read in this run
+    if inf_cache is not None and inf_cache.get(key, {}).get('checked'):
+        return _cached_spc_inf(
+            inf_cache[key], spc_name, model_basis_energy_dct)
+
+    spc_locs_lst = filesys.models.get_spc_locs_lst(
+        spc_dct[spc_name], spc_model_dct_i,
+        run_prefix, save_prefix, saddle=False,
+        cnf_range=tsk_key_dct['cnf_range'], sort_info_lst=sort_info_lst,
+        name=spc_name, nprocs=nprocs)
+    spc_locs = spc_locs_lst[0] if spc_locs_lst else None
+
+    # Use the entry from a previous run if its inputs are unchanged
+    fprint = None
+    if inf_cache is not None:
+        fprint = _fingerprint(
+            spc_dct[spc_name], spc_name, spc_locs,
+            pes_model_dct_i, spc_model_dct_i, key, run_prefix, save_prefix)
+        if key in inf_cache and inf_cache[key]['fprint'] == fprint:
+            inf_cache[key]['checked'] = True
+            return _cached_spc_inf(
+                inf_cache[key], spc_name, model_basis_energy_dct)
+
+    basis_names = set(model_basis_energy_dct)
+    inf_dct, model_basis_energy_dct = build.read_spc_data(
+        spc_dct, spc_name,
+        pes_model_dct_i, spc_model_dct_i,
+        run_prefix, save_prefix, model_basis_energy_dct,
+        calc_ene_trans=calc_ene_trans,
+        spc_locs=spc_locs)
+
+    if inf_cache is not None:
+        inf_cache[key] = cache_entry(
+            inf_dct, {name: val for name, val in model_basis_energy_dct.items()
+                      if name not in basis_names},
+            fprint=fprint)
+
+    return inf_dct, model_basis_energy_dct
+
+
+def cache_entry(inf_dct, basis_ene_dct, fprint=None):
+    """ Entry of the cache for the data read for a species in this run
+
+        :param inf_dct: MESS data of the species
+        :type inf_dct: dict[]
+        :param basis_ene_dct: basis energies read along with the data
+        :type basis_ene_dct: dict[]
+        :param fprint: fingerprint of the inputs of the data, None if the
+            entry is not kept between runs
+        :type fprint: str
+        :rtype: dict[str: obj]
+    """
+    return {
+        'fprint': fprint,
+        'checked': True,
+        'inf_dct': copy.deepcopy(inf_dct),
+        'basis_ene_dct': basis_ene_dct
+    }
+
+
+def _cached_spc_inf(entry, spc_name, model_basis_energy_dct):
+    """ Data for a species from its entry in the cache
+    """
+    ioprinter.info_message(
+        f'Using the filesystem info already read for {spc_name}')
+    for name, val in entry['basis_ene_dct'].items():
+        model_basis_energy_dct.setdefault(name, val)
+    return copy.deepcopy(entry['inf_dct']), model_basis_energy_dct
+
+
+def inf_cache_key(spc_name, tsk_key_dct, calc_ene_trans=True):
+    """ Key of the data for a species in the cache
+
+        :param spc_name: mechanism name of species
+        :type spc_name: str
+        :param tsk_key_dct: keywords of the write_mess task
+        :type tsk_key_dct: dict[str: obj]
+        :rtype: str
+    """
+    return amech_io.task_key(
+        spc_name, tsk_key_dct['kin_model'], tsk_key_dct['spc_model'],
+        tsk_key_dct['cnf_range'], tsk_key_dct['sort'], calc_ene_trans)
+
+
+def read_inf_cache(run_prefix):
+    """ Read the cache of species data kept in the run filesystem
+
+        :param run_prefix: root-path to the run-filesystem
+        :type run_prefix: str
+        :rtype: dict[str: dict]
+    """
+
+    inf_cache = {}
+
+    cache_path = os.path.join(run_prefix, CACHE_NAME)
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as fobj:
+                inf_cache = pickle.load(fobj)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError,
+                ImportError):
+            inf_cache = {}
+
+    # Entries from previous runs must be checked against the filesystem
+    for entry in inf_cache.values():
+        entry['checked'] = False
+
+    return inf_cache
+
+
+def write_inf_cache(run_prefix, inf_cache):
+    """ Write the cache of species data into the run filesystem
+
+        :param run_prefix: root-path to the run-filesystem
+        :type run_prefix: str
+        :param inf_cache: data read for each species
+        :type inf_cache: dict[str: dict]
+    """
+
+    cache_path = os.path.join(run_prefix, CACHE_NAME)
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as fobj:
+        pickle.dump(inf_cache, fobj)
+    os.replace(tmp_path, cache_path)
+
+
+def _fingerprint(spc_dct_i, spc_name, spc_locs,
+                 pes_model_dct_i, spc_model_dct_i,
+                 key, run_prefix, save_prefix):
+    """ Fingerprint of the inputs of the data read for a species: its
+        information, the models, its conformer locators, and the files
+        read for its conformers from the SAVE filesystem, including the
+        points of their torsional scans and tau samples
+    """
+    pf_filesystems = filesys.models.pf_filesys(
+        spc_dct_i, spc_model_dct_i, run_prefix, save_prefix, False,
+        name=spc_name, spc_locs=spc_locs)
+    paths = filesys.models.pf_input_paths(
+        pf_filesystems, spc_dct_i, spc_model_dct_i)
+    return amech_io.task_fingerprint(
+        key, spc_dct_i, spc_locs, pes_model_dct_i, spc_model_dct_i,
+        paths=paths)
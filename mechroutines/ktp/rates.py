@@ -12,6 +12,7 @@ from mechlib.amech_io.parser.spc import tsnames_in_dct, base_tsname
 from mechlib.amech_io import reader
 from mechlib.amech_io import printer as ioprinter
 from mechlib import filesys
+from mechlib import parallel
 from mechroutines.models import blocks
 from mechroutines.models import build
 from mechroutines.models import etrans
@@ -21,6 +22,9 @@ from mechroutines.models.typ import need_fake_wells
 from mechroutines.models.typ import is_abstraction_pes
 from mechroutines.ktp._ene import set_reference_ene
 from mechroutines.ktp._ene import sum_channel_enes
+from mechroutines.ktp._spcinf import read_spc_inf
+from mechroutines.ktp._spcinf import inf_cache_key
+from mechroutines.ktp._spcinf import cache_entry
 
 from mechroutines.ktp._multipes import energy_dist_params
 from mechroutines.ktp._multipes import set_prod_density_param
@@ -295,8 +299,16 @@ def make_pes_mess_str(spc_dct, rxn_lst, pes_idx, pesgrp_num,
                       run_prefix, save_prefix, label_dct,
                       tsk_key_dct, pes_param_dct,
                       thy_dct, pes_model_dct_i, spc_model_dct_i,
-                      spc_model, nprocs=1):
+                      spc_model, nprocs=1, inf_cache=None):
     """ Write all the MESS input file strings for the reaction channels
+
+        The data read for the reactants and products is kept in `inf_cache`,
+        if given, so that it can be reused across channels and PESs.
+
+        If `nprocs` > 1, the data for every unique reactant, product, and
+        TS configuration on the PES is first read concurrently by a pool of
+        processes, and the channel strings are then assembled in order
+        from that data, giving the same strings as a serial run.
     """
 
     ioprinter.messpf('channel_section')
@@ -314,9 +326,23 @@ def make_pes_mess_str(spc_dct, rxn_lst, pes_idx, pesgrp_num,
         rxn_lst, spc_dct, tsk_key_dct,
         basis_energy_dct[spc_model],
         thy_dct, pes_model_dct_i, spc_model_dct_i,
-        run_prefix, save_prefix, ref_idx=0, nprocs=nprocs)
+        run_prefix, save_prefix, ref_idx=0, nprocs=nprocs,
+        inf_cache=inf_cache)
     basis_energy_dct[spc_model].update(model_basis_energy_dct)
 
+    # Read the data for all species and TSs of the PES concurrently
+    # (without a cache, the data is only kept for the channels of this PES)
+    ts_inf_dct = {}
+    if nprocs > 1:
+        persist = inf_cache is not None
+        if not persist:
+            inf_cache = {}
+        ts_inf_dct = _read_pes_infs(
+            rxn_lst, pes_idx, spc_dct, tsk_key_dct,
+            basis_energy_dct[spc_model],
+            thy_dct, pes_model_dct_i, spc_model_dct_i,
+            run_prefix, save_prefix, inf_cache, nprocs, persist=persist)
+
     # Loop over all the channels and write the MESS strings
     written_labels = []
     hot_enes_dct = {}
@@ -336,7 +362,8 @@ def make_pes_mess_str(spc_dct, rxn_lst, pes_idx, pesgrp_num,
             spc_dct, tsk_key_dct,
             basis_energy_dct[spc_model],
             thy_dct, pes_model_dct_i, spc_model_dct_i,
-            run_prefix, save_prefix, nprocs=nprocs)
+            run_prefix, save_prefix, nprocs=nprocs, inf_cache=inf_cache,
+            ts_inf_dct=ts_inf_dct)
 
         basis_energy_dct[spc_model].update(chn_basis_ene_dct)
 
@@ -372,6 +399,109 @@ def make_pes_mess_str(spc_dct, rxn_lst, pes_idx, pesgrp_num,
     return rxn_chan_str, full_dat_str_dct, hot_enes_dct
 
 
+def _read_pes_infs(rxn_lst, pes_idx, spc_dct, tsk_key_dct,
+                   model_basis_energy_dct,
+                   thy_dct, pes_model_dct_i, spc_model_dct_i,
+                   run_prefix, save_prefix, inf_cache, nprocs,
+                   persist=True):
+    """ Read the data for each unique reactant, product, and TS
+        configuration on the PES with a pool of processes.
+
+        The data for the reactants and products is added to `inf_cache`,
+        where `get_channel_data` finds it. The data for the TSs is
+        returned, along with the basis energies read for it. Unless
+        `persist` is set, the entries are not fingerprinted for reuse in
+        later runs.
+
+        :rtype: dict[str: (dict[], dict[])]
+    """
+
+    # Collect the units in the order they appear on the channels, skipping
+    # the species already read in this run
+    units, unit_cache = [], {}
+    for chnl_idx, (reacs, prods) in rxn_lst:
+        for rgts in (reacs, prods):
+            for rgt in rgts:
+                unit = ('spc', rgt, bool(len(rgts) == 1))
+                key = inf_cache_key(rgt, tsk_key_dct, unit[2])
+                if (unit not in units and
+                        not inf_cache.get(key, {}).get('checked')):
+                    units.append(unit)
+                    if key in inf_cache:
+                        unit_cache[key] = inf_cache[key]
+        for name in tsnames_in_dct(pes_idx, chnl_idx, spc_dct):
+            units.append(('ts', name, tuple(reacs), tuple(prods)))
+
+    ioprinter.info_message(
+        f'Reading the data for {len(units)} species and TSs on the PES '
+        f'with {nprocs} processes')
+    sort_info_lst = filesys.mincnf.sort_info_lst(tsk_key_dct['sort'], thy_dct)
+    args = (spc_dct, tsk_key_dct, sort_info_lst, model_basis_energy_dct,
+            pes_model_dct_i, spc_model_dct_i, run_prefix, save_prefix,
+            unit_cache if persist else None)
+    ts_inf_dct = {}
+    if not units:
+        return ts_inf_dct
+    for sub_inf_cache, sub_ts_inf_dct in parallel.execute_in_pool(
+            _read_pes_inf_units, units, args,
+            nprocs=min(nprocs, len(units))):
+        inf_cache.update(sub_inf_cache)
+        ts_inf_dct.update(sub_ts_inf_dct)
+
+    return ts_inf_dct
+
+
+def _read_pes_inf_units(spc_dct, tsk_key_dct, sort_info_lst,
+                        model_basis_energy_dct,
+                        pes_model_dct_i, spc_model_dct_i,
+                        run_prefix, save_prefix, inf_cache,
+                        units, output_queue=None):
+    """ Read the data for a set of species and TS units
+
+        If `inf_cache` is None, the data for the species is read without
+        a cache and returned as entries that are only used in this run.
+    """
+    sub_inf_cache, ts_inf_dct = {}, {}
+    for unit in units:
+        basis_ene_dct = copy.deepcopy(model_basis_energy_dct)
+        if unit[0] == 'spc':
+            _, name, calc_ene_trans = unit
+            key = inf_cache_key(name, tsk_key_dct, calc_ene_trans)
+            if inf_cache is None:
+                inf_dct, basis_ene_dct = read_spc_inf(
+                    spc_dct, name, tsk_key_dct, sort_info_lst,
+                    pes_model_dct_i, spc_model_dct_i,
+                    run_prefix, save_prefix, basis_ene_dct,
+                    calc_ene_trans=calc_ene_trans)
+                sub_inf_cache[key] = cache_entry(inf_dct, {
+                    bname: val for bname, val in basis_ene_dct.items()
+                    if bname not in model_basis_energy_dct})
+                continue
+            key_cache = {key: inf_cache[key]} if key in inf_cache else {}
+            read_spc_inf(
+                spc_dct, name, tsk_key_dct, sort_info_lst,
+                pes_model_dct_i, spc_model_dct_i,
+                run_prefix, save_prefix, basis_ene_dct,
+                calc_ene_trans=calc_ene_trans, inf_cache=key_cache)
+            sub_inf_cache.update(key_cache)
+        else:
+            _, name, reacs, prods = unit
+            spc_locs_lst = filesys.models.get_spc_locs_lst(
+                spc_dct[name], spc_model_dct_i,
+                run_prefix, save_prefix, saddle=True,
+                cnf_range=tsk_key_dct['cnf_range'],
+                sort_info_lst=sort_info_lst, name=name)
+            inf_dct, basis_ene_dct = build.read_ts_data(
+                spc_dct, name, reacs, prods,
+                pes_model_dct_i, spc_model_dct_i,
+                run_prefix, save_prefix, basis_ene_dct,
+                spc_locs=spc_locs_lst[0] if spc_locs_lst else None)
+            ts_inf_dct[name] = (inf_dct, {
+                bname: val for bname, val in basis_ene_dct.items()
+                if bname not in model_basis_energy_dct})
+    output_queue.put(((sub_inf_cache, ts_inf_dct),))
+
+
 def _make_channel_mess_strs(tsname, reacs, prods, pesgrp_num,
                             spc_dct, label_dct, written_labels,
                             pes_param_dct, chnl_infs, chnl_enes,
@@ -766,7 +896,8 @@ def get_channel_data(reacs, prods, tsname_allconfigs,
                      spc_dct, tsk_key_dct,
                      model_basis_energy_dct,
                      thy_dct, pes_model_dct_i, spc_model_dct_i,
-                     run_prefix, save_prefix, nprocs=1):
+                     run_prefix, save_prefix, nprocs=1, inf_cache=None,
+                     ts_inf_dct=None):
     """ For all species and transition state for the channel and
         read all required data from the save filesys, then process and
         format it to be able to write it into a MESS filesystem.
@@ -776,6 +907,11 @@ def get_channel_data(reacs, prods, tsname_allconfigs,
         :type reacs: tuple(str)
         :param prods: mechanisms name for the products of the reaction channel
         :type prods: tuple(str)
+        :param inf_cache: data already read for the reactants and products
+        :type inf_cache: dict[str: dict]
+        :param ts_inf_dct: data already read for the TS configurations,
+            with the basis energies read for it
+        :type ts_inf_dct: dict[str: (dict[], dict[])]
     """
 
     # Initialize the dict
@@ -791,22 +927,23 @@ def get_channel_data(reacs, prods, tsname_allconfigs,
     for rgts, side in zip((reacs, prods), ('reacs', 'prods')):
         _need_ene_trans = bool(len(rgts) == 1)
         for rgt in rgts:
-            spc_locs_lst = filesys.models.get_spc_locs_lst(
-                spc_dct[rgt], spc_model_dct_i,
-                run_prefix, save_prefix, saddle=False,
-                cnf_range=cnf_range, sort_info_lst=sort_info_lst,
-                name=rgt, nprocs=nprocs)
-            chnl_infs_i, model_basis_energy_dct = build.read_spc_data(
-                spc_dct, rgt,
+            chnl_infs_i, model_basis_energy_dct = read_spc_inf(
+                spc_dct, rgt, tsk_key_dct, sort_info_lst,
                 pes_model_dct_i, spc_model_dct_i,
                 run_prefix, save_prefix, model_basis_energy_dct,
                 calc_ene_trans=_need_ene_trans,
-                spc_locs=spc_locs_lst[0])
+                inf_cache=inf_cache, nprocs=nprocs)
             chnl_infs[side].append(chnl_infs_i)
 
     # Get data for all configurations for a TS
     chnl_infs['ts'] = []
     for name in tsname_allconfigs:
+        if ts_inf_dct is not None and name in ts_inf_dct:
+            inf_dct, basis_ene_dct = ts_inf_dct[name]
+            for bname, val in basis_ene_dct.items():
+                model_basis_energy_dct.setdefault(bname, val)
+            chnl_infs['ts'].append(inf_dct)
+            continue
         spc_locs_lst = filesys.models.get_spc_locs_lst(
             spc_dct[name], spc_model_dct_i,
             run_prefix, save_prefix, saddle=True,
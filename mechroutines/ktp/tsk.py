@@ -7,6 +7,8 @@ import chemkin_io
 import autorun
 import ratefit
 from mechlib import filesys
+from mechlib import parallel
+from mechlib import amech_io
 from mechlib.amech_io import writer
 from mechlib.amech_io import output_path
 from mechlib.amech_io import printer as ioprinter
@@ -23,7 +25,7 @@ def write_messrate_task(pesgrp_num, pes_inf, rxn_lst,
                         thy_dct, pes_model_dct, spc_model_dct,
                         unstab_chnls, label_dct,
                         rate_paths_dct, run_prefix, save_prefix,
-                        nprocs=1):
+                        nprocs=1, inf_cache=None):
     """ Reads and processes all information in the save filesys for
         all species on the PES that are required for MESS rate calculations,
         as specified by the model dictionaries built from user input.
@@ -37,6 +39,8 @@ def write_messrate_task(pesgrp_num, pes_inf, rxn_lst,
         :param spc_model: model for partition fxns for rates from user input
         :type spc_model: str
         :param mess_path: path to write mess file (change since pfx given?)
+        :param inf_cache: data already read for the reactants and products
+        :type inf_cache: dict[str: dict]
     """
 
     _, pes_idx, _ = pes_inf
@@ -53,7 +57,7 @@ def write_messrate_task(pesgrp_num, pes_inf, rxn_lst,
         run_prefix, save_prefix, label_dct,
         tsk_key_dct, pes_param_dct,
         thy_dct, pes_model_dct_i, spc_model_dct_i, spc_mod,
-        nprocs=nprocs)
+        nprocs=nprocs, inf_cache=inf_cache)
 
     # Write the energy transfer section strings for MESS file
     energy_trans_str = make_global_etrans_str(
@@ -72,15 +76,32 @@ def write_messrate_task(pesgrp_num, pes_inf, rxn_lst,
     return pes_param_dct
 
 
-def run_messrate_task(pes_inf, rxn_lst, tsk_key_dct, spc_dct, rate_paths_dct):
+def run_messrate_task(pes_inf, rxn_lst, tsk_key_dct, spc_dct, rate_paths_dct,
+                      graph_dct=None):
     """ Run the MESSRATE input file.
 
         First tries to run a well-extended file, then tries to
         run the base file if it exists.
 
+        If a task graph is given, MESS is not rerun if the input file
+        is unchanged since it was last run.
+
         Need an overwrite task
     """
 
+    mess_job = messrate_job(
+        pes_inf, rxn_lst, tsk_key_dct, spc_dct, rate_paths_dct)
+    run_messrate_jobs((mess_job,), njobs=1, graph_dct=graph_dct)
+
+
+def messrate_job(pes_inf, rxn_lst, tsk_key_dct, spc_dct, rate_paths_dct):
+    """ Determine the MESSRATE input file to run for a PES.
+
+        :return: script string and path for the MESS job, or None if
+            there is no input file to run
+        :rtype: (str, str)
+    """
+
     _, pes_idx, _ = pes_inf
 
     # Get the path to the MESSRATE file to run
@@ -112,9 +133,7 @@ def run_messrate_task(pes_inf, rxn_lst, tsk_key_dct, spc_dct, rate_paths_dct):
             ioprinter.running(
                 f'MESS well-extended input with version {mess_version} '
                 f'at {path}')
-        autorun.run_script(
-            autorun.SCRIPT_DCT[f'messrate-{mess_version}'], path
-        )
+        mess_job = (autorun.SCRIPT_DCT[f'messrate-{mess_version}'], path)
     else:
         if typ == 'base':
             ioprinter.warning_message(
@@ -124,14 +143,84 @@ def run_messrate_task(pes_inf, rxn_lst, tsk_key_dct, spc_dct, rate_paths_dct):
             ioprinter.warning_message(
                 f'No MESS well-extended input for version {mess_version} '
                 f'found at {path}')
+        mess_job = None
+
+    return mess_job
+
+
+def run_messrate_jobs(mess_jobs, njobs=1, graph_dct=None):
+    """ Run the MESSRATE jobs of independent PESs concurrently, with at
+        most `njobs` jobs running at once. A job that fails is reported
+        and does not stop the others.
+
+        :param mess_jobs: script string and path of each MESS job
+        :type mess_jobs: tuple((str, str))
+        :param njobs: number of MESS jobs to run at once
+        :type njobs: int
+        :param graph_dct: record of task units to skip unchanged jobs
+        :type graph_dct: dict[str: dict]
+    """
+
+    mess_jobs = tuple(job for job in mess_jobs if job is not None)
+
+    # Skip the jobs whose input is unchanged since they were last run
+    if graph_dct is not None:
+        fprint_dct = {
+            job: amech_io.task_fingerprint(
+                job[0], content_paths=(os.path.join(job[1], 'mess.inp'),))
+            for job in mess_jobs}
+        run_jobs = ()
+        for job in mess_jobs:
+            if amech_io.task_is_current(
+                    graph_dct, amech_io.task_key('run_mess', job[1]),
+                    fprint_dct[job],
+                    out_paths=(os.path.join(job[1], 'rate.out'),)):
+                ioprinter.info_message(
+                    f'MESS input unchanged at {job[1]}, skipping...')
+            else:
+                run_jobs += (job,)
+        mess_jobs = run_jobs
+
+    fail_lst = []
+    if mess_jobs:
+        nprocs = max(1, min(njobs, len(mess_jobs)))
+        for sub_fail_lst in parallel.execute_in_pool(
+                _run_mess_jobs, mess_jobs, (), nprocs=nprocs):
+            fail_lst.extend(sub_fail_lst)
+    for path in fail_lst:
+        ioprinter.warning_message(f'MESS job failed at {path}')
+
+    if graph_dct is not None:
+        for job in mess_jobs:
+            if job[1] not in fail_lst:
+                amech_io.record_task(
+                    graph_dct, amech_io.task_key('run_mess', job[1]),
+                    fprint_dct[job])
+
+
+def _run_mess_jobs(mess_jobs, output_queue=None):
+    """ Run a set of MESS jobs, returning the paths of those that fail
+    """
+    fail_lst = []
+    for script_str, path in mess_jobs:
+        try:
+            autorun.run_script(script_str, path)
+        except (Exception, SystemExit):  # pylint: disable=broad-except
+            fail_lst.append(path)
+    output_queue.put((fail_lst,))
 
 
 def run_fits_task(pes_grp_rlst, pes_param_dct, rate_paths_dct, mdriver_path,
                   pes_mod_dct, spc_mod_dct, thy_dct,
-                  tsk_key_dct, spc_dct):
+                  tsk_key_dct, spc_dct, nprocs=1, graph_dct=None):
     """ Run the fits and potentially
 
         assume that the rate_paths_dct will come in with all PESs in group
+
+        The rate constants of different reactions are fit by up to
+        `nprocs` processes at once. If a task graph is given, the fits are
+        skipped if the MESS outputs and models of the group are unchanged
+        since the CKIN file was last written.
     """
 
     # Combine all PESs into a string for writing the CKIN file
@@ -149,6 +238,24 @@ def run_fits_task(pes_grp_rlst, pes_param_dct, rate_paths_dct, mdriver_path,
     ioprinter.obj('vspace')
     ioprinter.obj('line_dash')
 
+    # Skip the fits if nothing they use has changed since the last run
+    ckin_path = output_path('CKIN', prefix=mdriver_path)
+    ckin_filename = f'{tot_fml}.ckin'
+    if graph_dct is not None:
+        key = amech_io.task_key('run_fits', tot_fml)
+        fprint = amech_io.task_fingerprint(
+            tsk_key_dct, pes_mod_dct[pes_mod], spc_mod_dct[spc_mod],
+            pes_param_dct, sort_info_lst,
+            paths=tuple(os.path.join(path, 'rate.out')
+                        for pes_inf in pes_grp_rlst
+                        for path in rate_paths_dct[pes_inf].values()))
+        if amech_io.task_is_current(
+                graph_dct, key, fprint,
+                out_paths=(os.path.join(ckin_path, ckin_filename),)):
+            ioprinter.info_message(
+                f'MESS outputs unchanged for {tot_fml}, skipping fits...')
+            return
+
     # Obtain the rate constants from the MESS files
     ioprinter.info_message(
         'Reading Rate Constants from MESS outputs', newline=1)
@@ -161,14 +268,8 @@ def run_fits_task(pes_grp_rlst, pes_param_dct, rate_paths_dct, mdriver_path,
     ioprinter.info_message(
         'Fitting Rate Constants for PES to Functional Forms', newline=1)
     ratefit_dct = pes_mod_dct[pes_mod]['rate_fit']
-    rxn_param_dct, rxn_err_dct = ratefit.fit.fit_rxn_ktp_dct(
-        rxn_ktp_dct,
-        ratefit_dct['fit_method'],
-        pdep_dct=ratefit_dct['pdep_fit'],
-        arrfit_dct=ratefit_dct['arrfit_fit'],
-        chebfit_dct=ratefit_dct['chebfit_fit'],
-        troefit_dct=ratefit_dct['troefit_fit'],
-    )
+    rxn_param_dct, rxn_err_dct = _fit_rxn_ktp_dct(
+        rxn_ktp_dct, ratefit_dct, nprocs=nprocs)
 
     # Write the reactions block header, which contains model info
     rxn_block_cmt = writer.ckin.model_header(
@@ -183,6 +284,53 @@ def run_fits_task(pes_grp_rlst, pes_param_dct, rate_paths_dct, mdriver_path,
         rxn_param_dct=rxn_param_dct, rxn_cmts_dct=rxn_cmts_dct)
 
     # Write the file
-    ckin_path = output_path('CKIN', prefix=mdriver_path)
-    ckin_filename = f'{tot_fml}.ckin'
     ioformat.pathtools.write_file(ckin_str, ckin_path, ckin_filename)
+
+    if graph_dct is not None:
+        amech_io.record_task(graph_dct, key, fprint)
+
+
+def _fit_rxn_ktp_dct(rxn_ktp_dct, ratefit_dct, nprocs=1):
+    """ Fit the rate constants of each reaction, splitting the reactions
+        over `nprocs` processes. The fit parameters and errors are
+        returned in the order of the reactions in `rxn_ktp_dct`.
+    """
+
+    rxns = tuple(rxn_ktp_dct.keys())
+    nprocs = max(1, min(nprocs, len(rxns)))
+    if nprocs == 1:
+        rxn_param_dct, rxn_err_dct = _fit_rxns(rxn_ktp_dct, ratefit_dct)
+    else:
+        sub_dct_lst = parallel.execute_in_pool(
+            _par_fit_rxns, rxns, (rxn_ktp_dct, ratefit_dct), nprocs=nprocs)
+        sub_param_dct, sub_err_dct = {}, {}
+        for _param_dct, _err_dct in sub_dct_lst:
+            sub_param_dct.update(_param_dct)
+            sub_err_dct.update(_err_dct)
+        rxn_param_dct = {rxn: sub_param_dct[rxn] for rxn in rxns
+                         if rxn in sub_param_dct}
+        rxn_err_dct = {rxn: sub_err_dct[rxn] for rxn in rxns
+                       if rxn in sub_err_dct}
+
+    return rxn_param_dct, rxn_err_dct
+
+
+def _par_fit_rxns(rxn_ktp_dct, ratefit_dct, rxns, output_queue=None):
+    """ Fit the rate constants of a subset of the reactions
+    """
+    sub_ktp_dct = {rxn: rxn_ktp_dct[rxn] for rxn in rxns}
+    output_queue.put((_fit_rxns(sub_ktp_dct, ratefit_dct),))
+
+
+def _fit_rxns(rxn_ktp_dct, ratefit_dct):
+    """ Fit the rate constants of the reactions to the functional forms
+        requested in the rate fit model
+    """
+    return ratefit.fit.fit_rxn_ktp_dct(
+        rxn_ktp_dct,
+        ratefit_dct['fit_method'],
+        pdep_dct=ratefit_dct['pdep_fit'],
+        arrfit_dct=ratefit_dct['arrfit_fit'],
+        chebfit_dct=ratefit_dct['chebfit_fit'],
+        troefit_dct=ratefit_dct['troefit_fit'],
+    )
@@ -1,12 +1,21 @@
 """ Handle symmetry factor stuff
 """
 
+import os
+import json
 import numpy
 
 import automol
 from autofile import fs
+from mechlib import amech_io
 from mechlib.amech_io import printer as ioprinter
 
+# File kept in the conformer directory with the sampled symmetry numbers
+SYMM_CACHE_NAME = 'symm_factors.json'
+
+# RMSD (bohr) below which two sampled geometries are the same structure
+SAME_GEO_RMSD = 0.1
+
 def symmetry_factor(pf_filesystems, spc_mod_dct_i, spc_dct_i, rotors,
                     grxn=None, zma=None, racemic=True):
     """ Determines the the overall (internal and external) symmetry factor for
@@ -48,20 +57,31 @@ def symmetry_factor(pf_filesystems, spc_mod_dct_i, spc_dct_i, rotors,
             # Obtain the external symssetry number
             ext_symm = automol.geom.external_symmetry_factor(geo)
 
-            # Set up the symmetry filesystem, read symmetrically similar geos
-            # includes minimum geo
+            # Reuse the numbers sampled before if the symmetry filesystem
+            # and rotors are unchanged
             sym_fs = fs.symmetry(cnf_path)
-            symm_geos = [geo]
-            symm_geos += [sym_fs[-1].file.geometry.read(locs)
-                          for locs in sym_fs[-1].existing()]
+            cache_fprint = amech_io.task_fingerprint(
+                _rotors_key(rotors), repr(grxn),
+                paths=(cnf_fs[-1].file.geometry.path(min_cnf_locs),
+                       sym_fs[0].path()))
+            cache_ret = _read_symm_cache(cnf_path, cache_fprint)
+            if cache_ret is not None:
+                ioprinter.info_message(
+                    ' - Using internal sym number sampled previously.')
+                int_symm, endgrp = cache_ret
+            elif rotors is not None:
+                # Read symmetrically similar geos, includes minimum geo
+                symm_geos = [geo]
+                symm_geos += [sym_fs[-1].file.geometry.read(locs)
+                              for locs in sym_fs[-1].existing()]
 
-            # Obtain the internal symmetry number and end group factors
-            if rotors is not None:
+                # Obtain the internal symmetry number and end group factors
                 ioprinter.info_message(
                     ' - Determining internal sym number ',
                     'using sampling routine.')
                 int_symm, endgrp = automol.symm.symmetry_factors_from_sampling(
-                    symm_geos, rotors, grxn=grxn)
+                    _unique_geos(symm_geos), rotors, grxn=grxn)
+                _write_symm_cache(cnf_path, cache_fprint, int_symm, endgrp)
             else:
                 ioprinter.info_message(' - No torsions, internal sym is 1.0')
                 int_symm, endgrp = 1.0, 1.0
@@ -103,6 +123,82 @@ def symmetry_factor(pf_filesystems, spc_mod_dct_i, spc_dct_i, rotors,
     return symm_factor
 
 
+def _rotors_key(rotors):
+    """ Torsions of the rotors that the sampled symmetry numbers depend on
+    """
+    if rotors is None:
+        return None
+    return [
+        (automol.data.tors.name(torsion),
+         automol.data.tors.axis(torsion),
+         automol.data.tors.groups(torsion),
+         automol.data.tors.symmetry(torsion))
+        for rotor in rotors
+        for torsion in automol.data.rotor.torsions(rotor, key_typ="geom")]
+
+
+def _read_symm_cache(cnf_path, fprint):
+    """ Read the internal symmetry number and end group factor sampled for
+        a conformer, if they were sampled from the same inputs
+    """
+    cache_path = os.path.join(cnf_path, SYMM_CACHE_NAME)
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as fobj:
+            cache_dct = json.load(fobj)
+    except (OSError, ValueError):
+        return None
+    if cache_dct.get('fprint') != fprint:
+        return None
+    return cache_dct['int_symm'], cache_dct['endgrp']
+
+
+def _write_symm_cache(cnf_path, fprint, int_symm, endgrp):
+    """ Write the sampled internal symmetry number and end group factor
+        next to the conformer
+    """
+    cache_path = os.path.join(cnf_path, SYMM_CACHE_NAME)
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as fobj:
+            json.dump({'fprint': fprint, 'int_symm': int_symm,
+                       'endgrp': endgrp}, fobj)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError):
+        ioprinter.warning_message(
+            f'Could not save the sampled symmetry numbers at {cache_path}')
+
+
+def _unique_geos(geos):
+    """ Remove the geometries that are the same structure as one before
+        them, up to a rotation and translation.
+
+        The RMSDs of all pairs of geometries after optimal alignment are
+        found together, so that the sampling routine only compares the
+        distinct structures.
+    """
+    if len(geos) < 2:
+        return geos
+
+    xyzs = numpy.array([automol.geom.coordinates(geo) for geo in geos])
+    xyzs = xyzs - xyzs.mean(axis=1)[:, None, :]
+
+    # Kabsch alignment of every pair, without reflections
+    covs = numpy.einsum('iak,jal->ijkl', xyzs, xyzs)
+    umats, svals, vtmats = numpy.linalg.svd(covs)
+    signs = numpy.sign(numpy.linalg.det(umats @ vtmats))
+    svals[..., -1] *= signs
+    norms = numpy.sum(xyzs**2, axis=(1, 2))
+    msds = (norms[:, None] + norms[None, :] - 2.0 * svals.sum(axis=-1))
+    rmsds = numpy.sqrt(numpy.maximum(msds, 0.0) / xyzs.shape[1])
+
+    uni_idxs = []
+    for idx in range(len(geos)):
+        if all(rmsds[idx, uidx] > SAME_GEO_RMSD for uidx in uni_idxs):
+            uni_idxs.append(idx)
+
+    return [geos[idx] for idx in uni_idxs]
+
+
 def _umbrella_factor(rotors, geo, grxn=None):
     """ check to see if this torsion has umbrella floppies
     """
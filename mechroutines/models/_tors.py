@@ -2,6 +2,7 @@
   Functions handling hindered rotor model calculations
 """
 
+import os
 import automol
 import autorun
 import mess_io
@@ -144,7 +145,9 @@ def _read_potentials(rotors, spc_dct_i, run_path, cnf_save_path,
             read_grad=is_mdhrv,
             read_hess=is_mdhrv,
             read_energy_backstep=False,
-            remove_bad_points=True)
+            remove_bad_points=True,
+            hess_mmap_path=(os.path.join(run_path, 'mdhr_hessians.npy')
+                            if is_mdhrv else None))
 
         if is_mdhrv:
             script_str = autorun.SCRIPT_DCT['projrot']
@@ -255,6 +258,34 @@ def make_hr_strings(rotors, mdhr_dct=None):
     return mess_allr_str, mess_hr_str, mess_flux_str, projrot_str, mdhr_dat
 
 
+def hr_data(rotors):
+    """ Gather the data of each 1DHR torsion needed to evaluate its
+        partition function in-process: the geometry, the rotating group,
+        axis, and symmetry, and the potential (kcal/mol) over one period
+        :return hr_dat: (geo, group, axis, symmetry, pot) for each torsion
+    """
+
+    hr_dat = ()
+
+    # Convert the rotor objects indexing to be in geoms
+    zma = automol.data.rotor.rotors_zmatrix(rotors)
+    geo = automol.zmat.geometry(zma)
+
+    for rotor in rotors:
+        pot_dct = automol.data.potent.dict_(
+            automol.data.rotor.potential(rotor))
+        pot = tuple(pot_dct[key] for key in sorted(pot_dct))
+        for torsion in automol.data.rotor.torsions(rotor, key_typ="geom"):
+            hr_dat += ((
+                geo,
+                tuple(automol.data.tors.groups(torsion)[0]),
+                tuple(automol.data.tors.axis(torsion)),
+                automol.data.tors.symmetry(torsion),
+                pot),)
+
+    return hr_dat
+
+
 def _tors_strs(torsion, rotor, geo):
     """ Gather the 1DHR torsional data and gather them into a MESS file
     """
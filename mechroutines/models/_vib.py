@@ -3,6 +3,8 @@
 """
 
 import os
+import pickle
+import hashlib
 from copy import deepcopy
 import autorun
 import automol._deprecated
@@ -21,6 +23,9 @@ import numpy
 import itertools
 
 
+PROJROT_CACHE_NAME = 'projrot.pkl'
+
+
 def full_vib_analysis(
         spc_dct_i, pf_filesystems, spc_mod_dct_i,
         run_prefix, zrxn=None):
@@ -170,20 +175,30 @@ def read_locs_harmonic_freqs(cnf_fs, cnf_locs, run_prefix, zrxn=None):
 
         ioprinter.reading('Hessian', cnf_fs[-1].path(cnf_locs))
 
-        # Build the run filesystem using locs
+        # Use the ProjRot results for the same Hessian if already run
         fml_str = automol.geom.formula_string(geo)
-        vib_path = job_path(run_prefix, 'PROJROT', 'FREQ', fml_str)
-
-        # Obtain the frequencies
-        ioprinter.info_message(
-            'Calling ProjRot to diagonalize Hessian and get freqs...')
         script_str = autorun.SCRIPT_DCT['projrot']
-        freqs, _, imag_freqs, _ = autorun.projrot.frequencies(
-            script_str, vib_path, [geo], [[]], [hess])
+        cache_path, cache_key = _projrot_cache_path(
+            run_prefix, fml_str, hess, 'harm', script_str, geo)
+        cache_ret = _read_projrot_cache(cache_path, cache_key)
+        if cache_ret is not None:
+            freqs, imag_freqs, norm_coord_str = cache_ret
+        else:
+            # Build the run filesystem using locs
+            vib_path = job_path(run_prefix, 'PROJROT', 'FREQ', fml_str)
 
-        # Obtain the displacements
-        norm_coord_str, _ = autorun.projrot.displacements(
-            script_str, vib_path, [geo], [[]], [hess])
+            # Obtain the frequencies
+            ioprinter.info_message(
+                'Calling ProjRot to diagonalize Hessian and get freqs...')
+            freqs, _, imag_freqs, _ = autorun.projrot.frequencies(
+                script_str, vib_path, [geo], [[]], [hess])
+
+            # Obtain the displacements
+            norm_coord_str, _ = autorun.projrot.displacements(
+                script_str, vib_path, [geo], [[]], [hess])
+
+            _write_projrot_cache(
+                cache_path, cache_key, (freqs, imag_freqs, norm_coord_str))
 
         # Calculate the zpve
         ioprinter.frequencies(freqs)
@@ -248,15 +263,25 @@ def tors_projected_freqs(pf_filesystems, mess_hr_str, projrot_hr_str,
         harm_geo, hess, tors_geo,
         zrxn, pf_filesystems, zma_locs)
     fml_str = automol.geom.formula_string(harm_geo)
-    vib_path = job_path(prefix, 'PROJROT', 'FREQ', fml_str, print_path=True)
-    # print('proj test:', vib_path)
-    # tors_path = job_path(run_pfx, 'MESS', 'TORS', fml_str, print_path=True)
     mess_script_str = autorun.SCRIPT_DCT['messpf']
     projrot_script_str = autorun.SCRIPT_DCT['projrot']
     dist_cutoff_dct1 = {('H', 'O'): 2.26767, ('H', 'C'): 2.26767}
     # dist_cutoff_dct2 = {('H', 'O'): 2.83459, ('H', 'C'): 2.83459,
     dist_cutoff_dct2 = {('H', 'O'): 2.83459, ('H', 'C'): 3.023,
                         ('C', 'O'): 3.7807}
+
+    # Use the ProjRot results for the same Hessian and rotors if already run
+    cache_path, cache_key = _projrot_cache_path(
+        prefix, fml_str, hess, 'tors', mess_script_str, projrot_script_str,
+        harm_geo, tors_geo, mess_hr_str, projrot_hr_str,
+        dist_cutoff_dct1, dist_cutoff_dct2, zrxn is not None)
+    cache_ret = _read_projrot_cache(cache_path, cache_key)
+    if cache_ret is not None:
+        return cache_ret
+
+    vib_path = job_path(prefix, 'PROJROT', 'FREQ', fml_str, print_path=True)
+    # print('proj test:', vib_path)
+    # tors_path = job_path(run_pfx, 'MESS', 'TORS', fml_str, print_path=True)
     proj_inf = autorun.projected_frequencies(
         mess_script_str, projrot_script_str, vib_path,
         mess_hr_str, projrot_hr_str,
@@ -272,7 +297,57 @@ def tors_projected_freqs(pf_filesystems, mess_hr_str, projrot_hr_str,
 
     proj_freqs, proj_imag, _, harm_freqs, tors_freqs = proj_inf
 
-    return proj_freqs, harm_freqs, tors_freqs, proj_imag, harm_disps
+    ret = (proj_freqs, harm_freqs, tors_freqs, proj_imag, harm_disps)
+    _write_projrot_cache(cache_path, cache_key, ret)
+
+    return ret
+
+
+def _projrot_cache_path(prefix, fml_str, hess, *inputs):
+    """ Path in the run filesystem for the ProjRot results of a Hessian
+        and a set of other inputs (geometries, rotor strings, ...), named
+        by a hash of the inputs, along with the full hash
+    """
+    hasher = hashlib.sha256()
+    # Hash the full Hessian, which repr may abbreviate
+    hasher.update(numpy.asarray(hess, dtype=float).tobytes())
+    for inp in inputs:
+        hasher.update(f'|{inp!r}'.encode())
+    cache_key = hasher.hexdigest()
+    cache_path = job_path(
+        prefix, 'PROJROT', 'CACHE', fml_str,
+        locs_id=int(cache_key[:12], 16), make_path=False)
+    return cache_path, cache_key
+
+
+def _read_projrot_cache(cache_path, cache_key):
+    """ Read the ProjRot results stored for a set of inputs, if any
+    """
+    ret = None
+    cache_file = os.path.join(cache_path, PROJROT_CACHE_NAME)
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, 'rb') as fobj:
+                key, ret = pickle.load(fobj)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            key, ret = None, None
+        if key != cache_key:
+            ret = None
+        else:
+            ioprinter.info_message(
+                'Using ProjRot results already obtained at', cache_path)
+    return ret
+
+
+def _write_projrot_cache(cache_path, cache_key, ret):
+    """ Store the ProjRot results for a set of inputs
+    """
+    os.makedirs(cache_path, exist_ok=True)
+    cache_file = os.path.join(cache_path, PROJROT_CACHE_NAME)
+    tmp_file = f'{cache_file}.{os.getpid()}.tmp'
+    with open(tmp_file, 'wb') as fobj:
+        pickle.dump((cache_key, ret), fobj)
+    os.replace(tmp_file, cache_file)
 
 
 def potential_scale_factor(harm_freqs, proj_freqs, tors_freqs):
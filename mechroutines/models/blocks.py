@@ -7,6 +7,7 @@ from operator import mul
 import automol.combine
 import mess_io
 from phydat import phycon
+from mechlib import filesys
 
 
 def barrier_dat_block(ts_inf_dct, reac_dcts, prod_dcts):
@@ -117,12 +118,15 @@ def tau_block(inf_dct):
     """ write  MESS string when using the Tau MonteCarlo
     """
 
-    # Write the data string and set its name
+    # Read the samples as they are written, relative to the energy of the
+    # reference conformer, then write the data string and set its name
+    samp_dct = inf_dct['samp_dct']
+    enes, geos, grads, hessians = filesys.read.tau_samples(samp_dct)
     dat_str = mess_io.writer.monte_carlo_data(
-        geos=inf_dct['samp_geoms'],
-        enes=inf_dct['samp_enes'],
-        grads=inf_dct['samp_grads'],
-        hessians=inf_dct['samp_hessians']
+        geos=geos,
+        enes=((enes - samp_dct['ref_ene']) * phycon.EH2KCAL).tolist(),
+        grads=grads,
+        hessians=hessians
     )
 
     # Set the name of the tau dat file and add to dct
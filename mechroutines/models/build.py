@@ -367,6 +367,11 @@ def mol_data(spc_name, spc_dct,
     allr_str = tors_strs[0]
     mdhr_dat = tors_strs[4]
 
+    # Get the rotor data for evaluating the partition function in-process
+    hr_dat = ()
+    if typ.rrho_pf(spc_mod_dct_i) and allr_str and not mdhr_dat:
+        hr_dat = tors.hr_data(rotors)
+
     # Obtain symmetry factor
     ioprinter.info_message(
         'Determining the symmetry factor...', newline=1)
@@ -424,12 +429,12 @@ def mol_data(spc_name, spc_dct,
 
     # Create info dictionary
     keys = ['geom', 'sym_factor', 'freqs', 'imag', 'elec_levels',
-            'mess_hr_str', 'mdhr_dat',
+            'mess_hr_str', 'mdhr_dat', 'hr_dat',
             'xmat', 'rovib_coups', 'rot_dists',
             'ene_chnlvl', 'ene_reflvl', 'zpe_chnlvl', 'ene_tsref',
             'edown_str', 'collid_freq_str']
     vals = [geom, sym_factor, freqs, imag, elec_levels,
-            allr_str, mdhr_dat,
+            allr_str, mdhr_dat, hr_dat,
             xmat, rovib_coups, rot_dists,
             hf0k, ene_reflvl, zpe, hf0k_trs,
             edown_str, collid_freq_str]
@@ -658,7 +663,8 @@ def _rpath_ene_data(ts_dct, frm_name, scn_vals,
         read_grad=True,
         read_hess=True,
         read_energy_backstep=False,
-        remove_bad_points=False)
+        remove_bad_points=False,
+        hess_mmap_path=os.path.join(vib_path, 'rpath_hessians.npy'))
 
     script_str = autorun.SCRIPT_DCT['projrot']
     freqs = autorun.projrot.pot_frequencies(
@@ -894,63 +900,36 @@ def tau_data(spc_dct_i,
         elif db_style == 'jsondb':
             tau_locs = tau_save_fs[-1].json_existing()
 
+    # Only the locators of the samples are kept; the samples themselves
+    # are read a chunk at a time when the MESS input is written
+    samp_dct = {
+        'save_prefix': save_prefix,
+        'spc_locs': tuple(spc_info),
+        'thy_locs': tuple(mod_thy_info[1:]),
+        'tau_locs': tuple(tuple(locs) for locs in tau_locs),
+        'db_style': db_style,
+        'hessians': vib_model == 'tau',
+        'ref_ene': min_cnf_ene,
+    }
     ioprinter.info_message(
-        'Reading data for the Monte Carlo samples from db.json'
+        f'Found {len(tau_locs)} Monte Carlo samples '
         f'at path {tau_save_fs[0].path()}')
-    samp_geoms, samp_enes, samp_grads, samp_hessians = [], [], [], []
-    tot_locs = len(tau_locs)
-    for idx, locs in enumerate(tau_locs):
-
-        if db_style == 'directory':
-            geo = tau_save_fs[-1].file.geometry.read(locs)
-        elif db_style == 'jsondb':
-            geo = tau_save_fs[-1].json.geometry.read(locs)
-
-        # geo_str = autofile.data_types.swrite.geometry(geo)
-        samp_geoms.append(geo)
-
-        if db_style == 'directory':
-            tau_ene = tau_save_fs[-1].file.energy.read(locs)
-        elif db_style == 'jsondb':
-            tau_ene = tau_save_fs[-1].json.energy.read(locs)
-        rel_ene = (tau_ene - min_cnf_ene) * phycon.EH2KCAL
-        # ene_str = autofile.data_types.swrite.energy(rel_ene)
-        samp_enes.append(rel_ene)
-
-        if vib_model == 'tau':
-            if db_style == 'directory':
-                grad = tau_save_fs[-1].file.gradient.read(locs)
-            elif db_style == 'jsondb':
-                grad = tau_save_fs[-1].json.gradient.read(locs)
-            # grad_str = autofile.data_types.swrite.gradient(grad)
-            samp_grads.append(grad)
-
-            if db_style == 'directory':
-                hess = tau_save_fs[-1].file.hessian.read(locs)
-            elif db_style == 'jsondb':
-                hess = tau_save_fs[-1].json.hessian.read(locs)
-            # hess_str = autofile.data_types.swrite.hessian(hess)
-            samp_hessians.append(hess)
-
-        # Print progress message (every 150 geoms read)
-        if idx % 149 == 0:
-            print(f'Read {idx+1}/{tot_locs} samples...')
 
     # Determine the successful conformer ratio
     inf_obj = tau_save_fs[0].file.info.read()
-    excluded_volume_factor = len(samp_geoms) / inf_obj.nsamp
+    excluded_volume_factor = len(tau_locs) / inf_obj.nsamp
     print('excluded volume factor test:',
-          excluded_volume_factor, len(samp_geoms), inf_obj.nsamp)
+          excluded_volume_factor, len(tau_locs), inf_obj.nsamp)
 
     # Create info dictionary
     keys = ['geom', 'sym_factor', 'elec_levels',
             'freqs', 'flux_mode_str',
-            'samp_geoms', 'samp_enes', 'samp_grads', 'samp_hessians',
+            'samp_dct',
             'ref_geom', 'ref_grad', 'ref_hessian',
             'zpe_chnlvl', 'ref_ene', 'excluded_volume_factor']
     vals = [ref_geom[0], sym_factor, spc_dct_i['elec_levels'],
             freqs, tors_strs[2],
-            samp_geoms, samp_enes, samp_grads, samp_hessians,
+            samp_dct,
             ref_geom, ref_grad, ref_hessian,
             zpe_chnlvl, ref_ene, excluded_volume_factor]
     inf_dct = dict(zip(keys, vals))
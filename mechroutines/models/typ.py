@@ -98,6 +98,12 @@ def squash_tors_pot(spc_mod_dct_i):
         and spc_mod_dct_i['tors']['scale'] == 'on')
 
 
+def rrho_pf(spc_mod_dct_i):
+    """ determine if the pf is evaluated in-process rather than by MESSPF
+    """
+    return bool(spc_mod_dct_i.get('pf', {}).get('engine') == 'rrho')
+
+
 def vib_tau(spc_mod_dct_i):
     """ determine if vibrations are treated via tau sampling
     """
@@ -11,6 +11,8 @@ from mechanalyzer.inf import spc as sinfo
 from mechanalyzer.inf import thy as tinfo
 from mechanalyzer.inf import rxn as rinfo
 from mechlib import filesys
+from mechlib import parallel
+from mechlib.reaction import instability_verdicts
 from mechlib.amech_io import printer as ioprinter
 
 
@@ -134,15 +136,8 @@ def conformer_list(
     mod_thy_info = tinfo.modify_orb_label(thy_info, spc_info)
     sort_info_lst = _set_sort_info_lst(
         print_keyword_dct['sort'], thy_dct, spc_info)
-    zrxn = spc_dct_i.get('zrxn', None)
-    _root = filesys.root_locs(
-        spc_dct_i,
-        saddle=(zrxn is not None),
-        name=spc_name)
-    _, cnf_save_fs = filesys.build_fs(
-        run_prefix, save_prefix, 'CONFORMER',
-        thy_locs=mod_thy_info[1:],
-        **_root)
+    cnf_save_fs = conformer_save_fs(
+        spc_name, spc_dct_i, mod_thy_info, run_prefix, save_prefix)
     rng_cnf_locs_lst, rng_cnf_locs_path = filesys.mincnf.conformer_locators(
         cnf_save_fs, mod_thy_info,
         cnf_range=cnf_range, sort_info_lst=sort_info_lst, hbond_cutoffs=hbond_cutoffs,
@@ -151,6 +146,20 @@ def conformer_list(
     return cnf_save_fs, rng_cnf_locs_lst, rng_cnf_locs_path, mod_thy_info
 
 
+def conformer_save_fs(spc_name, spc_dct_i, mod_thy_info,
+                      run_prefix, save_prefix):
+    """ Build the CONFORMER save filesystem of a species at a level
+    """
+    zrxn = spc_dct_i.get('zrxn', None)
+    _root = filesys.root_locs(
+        spc_dct_i, name=spc_name, saddle=(zrxn is not None))
+    _, cnf_save_fs = filesys.build_fs(
+        run_prefix, save_prefix, 'CONFORMER',
+        thy_locs=mod_thy_info[1:],
+        **_root)
+    return cnf_save_fs
+
+
 def conformer_list_from_models(
         spc_name, thy_dct, print_keyword_dct,
         save_prefix, run_prefix,
@@ -169,13 +178,8 @@ def conformer_list_from_models(
     sort_info_lst = _set_sort_info_lst(
         print_keyword_dct['sort'], thy_dct, spc_info)
 
-    zrxn = spc_dct_i.get('zrxn', None)
-    _root = filesys.root_locs(
-        spc_dct_i, name=spc_name, saddle=(zrxn is not None))
-    _, cnf_save_fs = filesys.build_fs(
-        run_prefix, save_prefix, 'CONFORMER',
-        thy_locs=mod_thy_info[1:],
-        **_root)
+    cnf_save_fs = conformer_save_fs(
+        spc_name, spc_dct_i, mod_thy_info, run_prefix, save_prefix)
     rng_cnf_locs_lst, rng_cnf_locs_path = filesys.mincnf.conformer_locators(
         cnf_save_fs, mod_thy_info,
         cnf_range=cnf_range, sort_info_lst=sort_info_lst, hbond_cutoffs=hbond_cutoffs,
@@ -495,9 +499,66 @@ def choose_conformers(
     return cnf_fs, rng_cnf_locs_lst, rng_cnf_locs_path, mod_thy_info
 
 
+def choose_all_conformers(
+        spc_queue, proc_keyword_dct, spc_mod_dct_i,
+        save_prefix, run_prefix, spc_dct, thy_dct):
+    """ Get the locations (locs and paths) of the conformers of every
+        species in the queue, along with the theory info of their level.
+
+        The species are split over the processes if there are enough of
+        them, otherwise the conformers of each species are split.
+
+        :rtype: dict[str: (tuple, tuple, tuple)]
+    """
+
+    nprocs = proc_keyword_dct['nprocs']
+    if 1 < nprocs <= len(spc_queue):
+        args = (
+            dict(proc_keyword_dct, nprocs=1), spc_mod_dct_i,
+            save_prefix, run_prefix, spc_dct, thy_dct)
+        sub_cnf_dct_lst = parallel.execute_in_pool(
+            _choose_conformers_units, spc_queue, args, nprocs=nprocs)
+    else:
+        sub_cnf_dct_lst = [_choose_conformers_dct(
+            proc_keyword_dct, spc_mod_dct_i,
+            save_prefix, run_prefix, spc_dct, thy_dct, spc_queue)]
+
+    cnf_dct = {}
+    for sub_cnf_dct in sub_cnf_dct_lst:
+        cnf_dct.update(sub_cnf_dct)
+
+    return {spc_name: cnf_dct[spc_name] for spc_name in spc_queue}
+
+
+def _choose_conformers_units(proc_keyword_dct, spc_mod_dct_i,
+                             save_prefix, run_prefix, spc_dct, thy_dct,
+                             spc_queue, output_queue=None):
+    """ Choose the conformers of a set of species in a worker
+    """
+    output_queue.put((_choose_conformers_dct(
+        proc_keyword_dct, spc_mod_dct_i,
+        save_prefix, run_prefix, spc_dct, thy_dct, spc_queue),))
+
+
+def _choose_conformers_dct(proc_keyword_dct, spc_mod_dct_i,
+                           save_prefix, run_prefix, spc_dct, thy_dct,
+                           spc_queue):
+    """ Choose the conformers of a set of species
+    """
+    cnf_dct = {}
+    for spc_name in spc_queue:
+        _, locs_lst, locs_path_lst, mod_thy_info = choose_conformers(
+            spc_name, proc_keyword_dct, spc_mod_dct_i,
+            save_prefix, run_prefix, spc_dct[spc_name], thy_dct)
+        cnf_dct[spc_name] = (
+            tuple(tuple(locs) for locs in locs_lst), tuple(locs_path_lst),
+            mod_thy_info)
+    return cnf_dct
+
+
 # Queue manipulation functions
 def remove_unstable(spc_queue, spc_dct, thy_dct, spc_mod_dct_i,
-                    proc_key_dct, save_prefix):
+                    proc_key_dct, save_prefix, nprocs=1):
     """ For each species in the queue see if there are files
         in the save filesystem denoting they are unstable. If so,
         that species is removed from the queue for collection tasks.
@@ -513,16 +574,20 @@ def remove_unstable(spc_queue, spc_dct, thy_dct, spc_mod_dct_i,
         thy_info = tinfo.from_dct(thy_dct.get(
             proc_key_dct['proplvl']))
 
+    # Find the instability files of all of the species at once
+    verdict_dct = instability_verdicts(
+        spc_dct, spc_queue, thy_info, save_prefix, nprocs=nprocs)
+
     stable_queue = ()
     for spc_name in spc_queue:
         if 'ts_' in spc_name:
             stable_queue += (spc_name,)
         else:
-            instab, path = filesys.read.instability_transformation(
-                spc_dct, spc_name, thy_info, save_prefix)
-            if instab is None:
+            verdict = verdict_dct.get(spc_name)
+            if verdict is None:
                 stable_queue += (spc_name,)
             else:
+                _, path = verdict
                 ioprinter.info_message(
                     f'Found instability file at path {path}', newline=1)
                 ioprinter.info_message(
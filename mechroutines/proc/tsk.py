@@ -3,11 +3,12 @@
     format
 """
 
+from mechlib import parallel
 from mechlib.amech_io import printer as ioprinter
 from mechroutines.models import typ
 from mechroutines.proc import _util as util
 from mechroutines.proc import _collect as collect
-from autorun import execute_function_in_parallel
+
 
 def run_tsk(tsk, obj_queue,
             proc_keyword_dct,
@@ -26,68 +27,85 @@ def run_tsk(tsk, obj_queue,
     csv_data = util.set_csv_data(tsk)
     filelabel, thylabel = util.get_file_label(
         tsk, pes_mod_dct_i, proc_keyword_dct, spc_mod_dct_i)
-    chn_basis_ene_dct = {}
     col_array = []
     spc_array = []
+    nprocs = proc_keyword_dct['nprocs']
 
     # Exclude unstable species
     # These species break certain checks (e.g. no ene exists for geo collect)
     obj_queue = util.remove_unstable(
         obj_queue, spc_dct, thy_dct, spc_mod_dct_i,
-        proc_keyword_dct, save_prefix)
+        proc_keyword_dct, save_prefix, nprocs=nprocs)
     obj_queue, ts_miss_data = util.remove_ts_missing(
         obj_queue, spc_dct)
     # obj_queue = util.remove_radrad_ts(
     #     obj_queue, spc_dct)
 
-
     # Set up lists for reporting missing data
     miss_data = ()
     # ts_miss_data = ()
     # disp_dct = {}
-    # Begin the loop over the species
-    for spc_name in obj_queue:
 
-        # info printed to output file
-        ioprinter.obj('line_dash')
-        ioprinter.info_message("Species: ", spc_name)
-
-        # Heat of formation basis molecules and coefficients
-        # does not require filesystem information
-        if 'coeffs' in tsk:
+    # Heat of formation basis molecules and coefficients
+    # does not require filesystem information
+    if 'coeffs' in tsk:
+        for spc_name in obj_queue:
+            ioprinter.obj('line_dash')
+            ioprinter.info_message("Species: ", spc_name)
             label = spc_name
             csv_data_i, spc_array = collect.coeffs(
                 spc_name, spc_dct, pes_mod_dct_i, spc_array)
             csv_data[label] = csv_data_i
             col_array = spc_array
-        # All other tasks require filesystem information
-        else:
-            # unpack spc and level info for conformers
-            spc_dct_i = spc_dct[spc_name]
-            spc_mod_dct_i = util.choose_theory(
-                proc_keyword_dct, spc_mod_dct_i)
-            ret = util.choose_conformers(
-                spc_name, proc_keyword_dct, spc_mod_dct_i,
-                save_prefix, run_prefix, spc_dct_i, thy_dct)
-            cnf_fs, rng_cnf_locs_lst, rng_cnf_locs_path, mod_thy_info = ret
-
-            # Add geo to missing data task if locs absent
-            if not rng_cnf_locs_lst:
+    # All other tasks require filesystem information
+    else:
+        # Get the conformers of every species in the queue
+        spc_mod_dct_i = util.choose_theory(
+            proc_keyword_dct, spc_mod_dct_i)
+        cnf_dct = util.choose_all_conformers(
+            obj_queue, proc_keyword_dct, spc_mod_dct_i,
+            save_prefix, run_prefix, spc_dct, thy_dct)
+
+        # Add geo to missing data task if locs absent
+        for spc_name, (locs_lst, _, mod_thy_info) in cnf_dct.items():
+            if not locs_lst:
                 miss_data += ((spc_name, mod_thy_info, 'geometry'),)
-            # Loop over conformers
-
-            args = (
-                tsk, spc_name, spc_dct, spc_dct_i, spc_mod_dct_i,
-                proc_keyword_dct, thy_dct, mod_thy_info,
-                pes_mod_dct_i, chn_basis_ene_dct, spc_array,
-                rng_cnf_locs_lst, rng_cnf_locs_path, cnf_fs,
-                run_prefix, save_prefix, col_array, miss_data)
-            ret_lst = execute_function_in_parallel(
-                _run_task_for_locs_lst, list(rng_cnf_locs_lst), args,
-                nprocs=proc_keyword_dct['nprocs'])
+
+        # Collect the data for the conformers of all of the species at
+        # once, so that the work is split evenly over the processes
+        items = tuple(
+            (spc_name, cnf_idx)
+            for spc_name in obj_queue
+            for cnf_idx in range(len(cnf_dct[spc_name][0])))
+        items = tuple((idx,) + item for idx, item in enumerate(items))
+        args = (
+            tsk, spc_dct, spc_mod_dct_i, proc_keyword_dct, thy_dct,
+            pes_mod_dct_i, cnf_dct, run_prefix, save_prefix)
+        ret_lst = parallel.execute_in_pool(
+            _run_task_for_items, items, args, nprocs=nprocs)
+
+        # Merge the data in the order of the queue and conformers
+        spc_ret_dct = {spc_name: [] for spc_name in obj_queue}
+        for ret in sorted(
+                (ret for sub_ret_lst in ret_lst for ret in sub_ret_lst),
+                key=lambda ret: ret[0]):
+            spc_ret_dct[items[ret[0]][1]].append(ret[1:])
+
+        for spc_name in obj_queue:
+            # info printed to output file
+            ioprinter.obj('line_dash')
+            ioprinter.info_message("Species: ", spc_name)
+
             species_csv_data = {}
             species_miss_data = ()
-            for (csv_data_j, col_array, miss_data_j) in ret_lst:
+            for (csv_data_j, col_array_j, miss_data_j, spc_array_j,
+                 coeff_labels_j) in spc_ret_dct[spc_name]:
+                if coeff_labels_j:
+                    _remap_basis_coeffs(
+                        csv_data_j, coeff_labels_j, spc_array_j, spc_array)
+                    col_array_j = spc_array if col_array_j else []
+                if col_array_j:
+                    col_array = col_array_j
                 if 'weight' in tsk:
                     if not 'hf_array' in species_csv_data:
                         species_csv_data['hf_array'] = []
@@ -96,13 +114,20 @@ def run_tsk(tsk, obj_queue,
                     species_csv_data['hf_array'] += csv_data_j['hf_array']
                     species_csv_data['locs_lst'] += csv_data_j['locs_lst']
                     species_csv_data['pf_array'] += csv_data_j['pf_array']
+                elif 'freqs' in tsk:
+                    for key in ('freq', 'tfreq', 'allfreq', 'scalefactor'):
+                        species_csv_data.setdefault(key, {}).update(
+                            csv_data_j[key])
                 else:
                     species_csv_data.update(csv_data_j)
                 species_miss_data += miss_data_j
             miss_data += species_miss_data
+
+            if not species_csv_data:
+                continue
             if 'weight' in tsk:
                 locs_lst, weight_lst = collect.pf_weights(
-                    species_csv_data['locs_lst'], 
+                    species_csv_data['locs_lst'],
                     species_csv_data['hf_array'],
                     species_csv_data['pf_array'])
                 for locs, weight in zip(locs_lst, weight_lst):
@@ -113,10 +138,9 @@ def run_tsk(tsk, obj_queue,
                 csv_data['tfreq'].update(species_csv_data['tfreq'])
                 csv_data['allfreq'].update(species_csv_data['allfreq'])
                 csv_data['scalefactor'].update(species_csv_data['scalefactor'])
-                print("species: ",species_csv_data)
-                print("total: ", csv_data)
             else:
                 csv_data.update(species_csv_data)
+
     # Write a report that details what data is missing
     missing_data = miss_data + ts_miss_data
 
@@ -141,143 +165,199 @@ def _skip(spc_name, spc_dct_i):
     return skip
 
 
-def _run_task_for_locs_lst(
+def _run_task_for_items(
+        tsk, spc_dct, spc_mod_dct_i, proc_keyword_dct, thy_dct,
+        pes_mod_dct_i, cnf_dct, run_prefix, save_prefix,
+        items, output_queue=None):
+    """ Collect the data for a set of (index, species, conformer) items
+
+        The energies of the basis species are shared by all of the items,
+        while the basis species used for the coefficients are kept for
+        each item so that they can be merged in order afterwards.
+    """
+
+    chn_basis_ene_dct = {}
+    cnf_fs_dct = {}
+    ret_lst = ()
+    for item_idx, spc_name, cnf_idx in items:
+        spc_dct_i = spc_dct[spc_name]
+        locs_lst, locs_path_lst, mod_thy_info = cnf_dct[spc_name]
+        if spc_name not in cnf_fs_dct:
+            cnf_fs_dct[spc_name] = util.conformer_save_fs(
+                spc_name, spc_dct_i, mod_thy_info, run_prefix, save_prefix)
+
+        spc_array = []
+        csv_data, col_array, miss_data, coeff_labels = _collect_locs_data(
+            tsk, spc_name, spc_dct, spc_dct_i, spc_mod_dct_i,
+            proc_keyword_dct, thy_dct, mod_thy_info,
+            pes_mod_dct_i, chn_basis_ene_dct, spc_array,
+            cnf_idx, locs_lst, locs_path_lst, cnf_fs_dct[spc_name],
+            run_prefix, save_prefix)
+        ret_lst += ((item_idx, csv_data, col_array, miss_data, spc_array,
+                     coeff_labels),)
+
+    output_queue.put((ret_lst,))
+
+
+def _remap_basis_coeffs(csv_data, coeff_labels, item_spc_array, spc_array):
+    """ Rewrite the basis coefficients of the rows collected for one
+        conformer, which follow the path, energy and heat of formation in
+        each row with one of the labels, in terms of the basis species of
+        the whole task, adding any new basis species to them in place
+    """
+    for spc_i in item_spc_array:
+        if spc_i not in spc_array:
+            spc_array.append(spc_i)
+    for label in coeff_labels:
+        row = csv_data[label]
+        coeff_dct = dict(zip(item_spc_array, row[3:]))
+        csv_data[label] = row[:3] + [
+            coeff_dct.get(spc_i, 0) for spc_i in spc_array]
+
+
+def _collect_locs_data(
         tsk, spc_name, spc_dct, spc_dct_i, spc_mod_dct_i,
         proc_keyword_dct, thy_dct, mod_thy_info,
         pes_mod_dct_i, chn_basis_ene_dct, spc_array,
-        locs_lst, locs_path_lst, cnf_fs, run_prefix, save_prefix,
-        col_array, miss_data, proc_locs_lst, output_queue=None):
-    """
+        cnf_idx, locs_lst, locs_path_lst, cnf_fs, run_prefix, save_prefix):
+    """ Collect the data for one conformer of a species, along with the
+        labels of the rows that hold coefficients of the basis species
+
+        :rtype: (dict, list, tuple, tuple(str))
     """
     csv_data = util.set_csv_data(tsk)
-    for locs, locs_path in zip(locs_lst, locs_path_lst):
-        if locs[1] not in proc_locs_lst:
-            continue
-        miss_data_i = None
-        label = spc_name + ':' + ':'.join(locs)
-        print(label)
-
-        if 'freq' in tsk and not _skip(spc_name, spc_dct_i):
-            _dat, miss_data_i = collect.frequencies(
-                spc_name, spc_dct_i, spc_mod_dct_i,
-                proc_keyword_dct, thy_dct,
-                cnf_fs, locs, locs_path, run_prefix, save_prefix)
-            if _dat is not None:
-                csv_data_i, csv_data_j, disp_str = _dat
-                csv_data['freq'][label] = csv_data_i
-                tors_freqs, all_freqs, sfactor = csv_data_j
-                if tors_freqs is not None:
-                    csv_data['tfreq'][label] = tors_freqs
-                    csv_data['allfreq'][label] = all_freqs
-                    csv_data['scalefactor'][label] = [sfactor]
-                # if disp_str is not None:
-                #     disp_dct.update({spc_name: disp_str})
-
-        elif 'geo' in tsk:
-            csv_data_i, miss_data_i = collect.geometry(
-                spc_name, locs, locs_path, cnf_fs, mod_thy_info)
-            print(csv_data_i)
-            csv_data[label] = csv_data_i
-        elif 'date' in tsk:
-            csv_data_i, date_headers, miss_data_i = collect.time_stamp(
-                spc_name, locs, locs_path, cnf_fs, mod_thy_info)
-            csv_data[label] = csv_data_i
-            col_array = date_headers
-        elif 'molden' in tsk:
-            csv_data_i, miss_data_i = collect.molden(
-                spc_name, locs, locs_path, cnf_fs, mod_thy_info)
-            print(csv_data_i)
-            csv_data[label] = csv_data_i
+    col_array = []
+    miss_data = ()
+    coeff_labels = ()
+    locs, locs_path = locs_lst[cnf_idx], locs_path_lst[cnf_idx]
+    miss_data_i = None
+    label = spc_name + ':' + ':'.join(locs)
+    print(label)
 
-        elif 'zma' in tsk:
-            csv_data_i, miss_data_i = collect.zmatrix(
-                spc_name, locs, locs_path, cnf_fs, mod_thy_info)
-            csv_data[label] = csv_data_i
+    if 'freq' in tsk and not _skip(spc_name, spc_dct_i):
+        _dat, miss_data_i = collect.frequencies(
+            spc_name, spc_dct_i, spc_mod_dct_i,
+            proc_keyword_dct, thy_dct,
+            cnf_fs, locs, locs_path, run_prefix, save_prefix)
+        if _dat is not None:
+            csv_data_i, csv_data_j, disp_str = _dat
+            csv_data['freq'][label] = csv_data_i
+            tors_freqs, all_freqs, sfactor = csv_data_j
+            if tors_freqs is not None:
+                csv_data['tfreq'][label] = tors_freqs
+                csv_data['allfreq'][label] = all_freqs
+                csv_data['scalefactor'][label] = [sfactor]
+            # if disp_str is not None:
+            #     disp_dct.update({spc_name: disp_str})
 
-        elif 'torsion' in tsk and not _skip(spc_name, spc_dct_i):
-            csv_data_i, miss_data_i = collect.torsions(
-                spc_name, locs, locs_path, spc_dct_i, spc_mod_dct_i,
-                mod_thy_info, run_prefix, save_prefix)
+    elif 'geo' in tsk:
+        csv_data_i, miss_data_i = collect.geometry(
+            spc_name, locs, locs_path, cnf_fs, mod_thy_info)
+        print(csv_data_i)
+        csv_data[label] = csv_data_i
+    elif 'date' in tsk:
+        csv_data_i, date_headers, miss_data_i = collect.time_stamp(
+            spc_name, locs, locs_path, cnf_fs, mod_thy_info)
+        csv_data[label] = csv_data_i
+        col_array = date_headers
+    elif 'molden' in tsk:
+        csv_data_i, miss_data_i = collect.molden(
+            spc_name, locs, locs_path, cnf_fs, mod_thy_info)
+        print(csv_data_i)
+        csv_data[label] = csv_data_i
 
-        elif 'hess_json' in tsk:
-            csv_data_i, miss_data_i = collect.hess_json(
-                spc_name, spc_dct_i, spc_mod_dct_i,
-                proc_keyword_dct, thy_dct,
-                cnf_fs, locs, locs_path, run_prefix, save_prefix, mod_thy_info)
-            csv_data[label] = csv_data_i
+    elif 'zma' in tsk:
+        csv_data_i, miss_data_i = collect.zmatrix(
+            spc_name, locs, locs_path, cnf_fs, mod_thy_info)
+        csv_data[label] = csv_data_i
 
-        elif 'ene' in tsk:
-            csv_data_i, miss_data_i = collect.energy(
-                spc_name, spc_dct_i, spc_mod_dct_i,
-                proc_keyword_dct, thy_dct, locs, locs_path,
-                cnf_fs, run_prefix, save_prefix)
-            csv_data[label] = csv_data_i
+    elif 'torsion' in tsk and not _skip(spc_name, spc_dct_i):
+        csv_data_i, miss_data_i = collect.torsions(
+            spc_name, locs, locs_path, spc_dct_i, spc_mod_dct_i,
+            mod_thy_info, run_prefix, save_prefix)
 
-        elif 'enthalpy' in tsk or 'weight' in tsk:
-            ret = collect.enthalpy(
-                spc_name, spc_dct, spc_dct_i, spc_mod_dct_i,
-                pes_mod_dct_i, chn_basis_ene_dct, spc_array,
-                locs, locs_path, cnf_fs, run_prefix, save_prefix)
-            csv_data_i, chn_basis_ene_dct, spc_array, miss_data_i = ret
-            if 'weight' in tsk:
-                csv_data['hf_array'].append(csv_data_i[2])
-                csv_data['locs_lst'].append(locs)
-            else:
-                csv_data[label] = csv_data_i
-                col_array = spc_array
-
-        elif 'entropy' in tsk:
-            # this is enthalpy not entropy
-            ret = collect.enthalpy(
-                spc_name, spc_dct, spc_dct_i, spc_mod_dct_i,
-                pes_mod_dct_i, chn_basis_ene_dct, spc_array,
-                locs, locs_path, cnf_fs, run_prefix, save_prefix)
-            csv_data_i, chn_basis_ene_dct, spc_array, miss_data_i = ret
-            csv_data[label] = csv_data_i
+    elif 'hess_json' in tsk:
+        csv_data_i, miss_data_i = collect.hess_json(
+            spc_name, spc_dct_i, spc_mod_dct_i,
+            proc_keyword_dct, thy_dct,
+            cnf_fs, locs, locs_path, run_prefix, save_prefix, mod_thy_info)
+        csv_data[label] = csv_data_i
 
-        elif 'gibbs' in tsk:
-            ret = collect.relative_gibbs(
-                cnf_fs, mod_thy_info, locs, locs_path,
-                locs_lst[0], locs_path_lst[0])
-            csv_data[label] = [ret]
-            
-        elif 'heat' in tsk:
-            ret = collect.enthalpy(
-                spc_name, spc_dct, spc_dct_i, spc_mod_dct_i,
-                pes_mod_dct_i, chn_basis_ene_dct, spc_array,
-                locs, locs_path, cnf_fs, run_prefix, save_prefix)
-            csv_data_i, chn_basis_ene_dct, spc_array, miss_data_i = ret
-            csv_data[label] = csv_data_i
+    elif 'ene' in tsk:
+        csv_data_i, miss_data_i = collect.energy(
+            spc_name, spc_dct_i, spc_mod_dct_i,
+            proc_keyword_dct, thy_dct, locs, locs_path,
+            cnf_fs, run_prefix, save_prefix)
+        csv_data[label] = csv_data_i
 
-        elif 'messpf_inp' in tsk:
-            ret = collect.messpf_input(
-                spc_name, spc_dct_i, spc_mod_dct_i,
-                pes_mod_dct_i, locs, locs_path,
-                cnf_fs, run_prefix, save_prefix)
-            csv_data_i, _, miss_data_i = ret
-            print(csv_data_i)
+    elif 'enthalpy' in tsk or 'weight' in tsk:
+        ret = collect.enthalpy(
+            spc_name, spc_dct, spc_dct_i, spc_mod_dct_i,
+            pes_mod_dct_i, chn_basis_ene_dct, spc_array,
+            locs, locs_path, cnf_fs, run_prefix, save_prefix)
+        csv_data_i, chn_basis_ene_dct, spc_array, miss_data_i = ret
+        if 'weight' in tsk:
+            csv_data['hf_array'].append(csv_data_i[2])
+            csv_data['locs_lst'].append(locs)
+        else:
             csv_data[label] = csv_data_i
+            coeff_labels = (label,)
+            col_array = spc_array
 
-        if 'pf' in tsk or 'weight' in tsk:
-            ret = collect.partition_function(
-                spc_name, spc_dct_i, spc_mod_dct_i,
-                pes_mod_dct_i, locs, locs_path,
-                cnf_fs, run_prefix, save_prefix)
-            csv_data_i, miss_data_i = ret
-            if 'weight' in tsk:
-                csv_data['pf_array'].append(csv_data_i)
-            else:
-                csv_data[label] = csv_data_i[1]
-                col_array = csv_data_i[0]
-        elif 'si' in tsk:
-            csv_data_i, miss_data_i = collect.sidata(
-                spc_name, spc_dct_i, spc_mod_dct_i,
-                proc_keyword_dct, thy_dct,
-                cnf_fs, locs, locs_path, run_prefix, save_prefix, mod_thy_info)
-            print(csv_data_i)
-            csv_data[label] = csv_data_i
+    elif 'entropy' in tsk:
+        # this is enthalpy not entropy
+        ret = collect.enthalpy(
+            spc_name, spc_dct, spc_dct_i, spc_mod_dct_i,
+            pes_mod_dct_i, chn_basis_ene_dct, spc_array,
+            locs, locs_path, cnf_fs, run_prefix, save_prefix)
+        csv_data_i, chn_basis_ene_dct, spc_array, miss_data_i = ret
+        csv_data[label] = csv_data_i
+        coeff_labels = (label,)
+
+    elif 'gibbs' in tsk:
+        ret = collect.relative_gibbs(
+            cnf_fs, mod_thy_info, locs, locs_path,
+            locs_lst[0], locs_path_lst[0])
+        csv_data[label] = [ret]
+        
+    elif 'heat' in tsk:
+        ret = collect.enthalpy(
+            spc_name, spc_dct, spc_dct_i, spc_mod_dct_i,
+            pes_mod_dct_i, chn_basis_ene_dct, spc_array,
+            locs, locs_path, cnf_fs, run_prefix, save_prefix)
+        csv_data_i, chn_basis_ene_dct, spc_array, miss_data_i = ret
+        csv_data[label] = csv_data_i
+        coeff_labels = (label,)
+
+    elif 'messpf_inp' in tsk:
+        ret = collect.messpf_input(
+            spc_name, spc_dct_i, spc_mod_dct_i,
+            pes_mod_dct_i, locs, locs_path,
+            cnf_fs, run_prefix, save_prefix)
+        csv_data_i, _, miss_data_i = ret
+        print(csv_data_i)
+        csv_data[label] = csv_data_i
+
+    if 'pf' in tsk or 'weight' in tsk:
+        ret = collect.partition_function(
+            spc_name, spc_dct_i, spc_mod_dct_i,
+            pes_mod_dct_i, locs, locs_path,
+            cnf_fs, run_prefix, save_prefix)
+        csv_data_i, miss_data_i = ret
+        if 'weight' in tsk:
+            csv_data['pf_array'].append(csv_data_i)
+        else:
+            csv_data[label] = csv_data_i[1]
+            col_array = csv_data_i[0]
+    elif 'si' in tsk:
+        csv_data_i, miss_data_i = collect.sidata(
+            spc_name, spc_dct_i, spc_mod_dct_i,
+            proc_keyword_dct, thy_dct,
+            cnf_fs, locs, locs_path, run_prefix, save_prefix, mod_thy_info)
+        print(csv_data_i)
+        csv_data[label] = csv_data_i
+
+    if miss_data_i is not None:
+        miss_data += (miss_data_i,)
 
-        if miss_data_i is not None:
-            miss_data += (miss_data_i,)
-    output_queue.put(((csv_data, col_array, miss_data,),))
-    return output_queue
+    return csv_data, col_array, miss_data, coeff_labels
@@ -0,0 +1,58 @@
+""" Test the scans of hindered rotors run in forked processes
+"""
+
+# pylint: disable=protected-access
+import os
+import pytest
+from mechroutines.es.runner import _pool
+from mechroutines.es._routines import hr
+
+
+def _exit_call(code):
+    """ Function whose worker process exits with a code
+    """
+    os._exit(code)
+
+
+def _fail_call(code):
+    """ Function that raises an error for a nonzero code
+    """
+    if code:
+        raise ValueError(f'bad code {code}')
+
+
+def _scan_rotor(tors_names, **_):
+    """ Stand-in for the scan of a rotor that fails for some rotors
+    """
+    if tors_names == ('D5',):
+        raise ValueError('bad scan')
+
+
+def test__iter_forked_calls():
+    """ test _pool.iter_forked_calls
+    """
+
+    ret = {idx: (exitcode, error) for idx, exitcode, error in
+           _pool.iter_forked_calls(
+               _exit_call, ({'code': 0}, {'code': 3}, {'code': 0}),
+               nworkers=2)}
+    assert ret == {0: (0, None), 1: (3, None), 2: (0, None)}
+
+    # Errors raised by the calls are passed back
+    ret = {idx: (exitcode, error) for idx, exitcode, error in
+           _pool.iter_forked_calls(
+               _fail_call, ({'code': 0}, {'code': 2}), nworkers=2)}
+    assert ret[0] == (0, None)
+    assert ret[1][0] == 1 and 'ValueError: bad code 2' in ret[1][1]
+
+
+def test__run_rotor_scans(monkeypatch):
+    """ test that hr._run_rotor_scans raises the errors of the scans
+    """
+
+    monkeypatch.setattr(hr, '_scan_rotor', _scan_rotor)
+    hr._run_rotor_scans(
+        ({'tors_names': ('D3',)}, {'tors_names': ('D4',)}), nworkers=2)
+    with pytest.raises(RuntimeError, match='rotor D5 failed'):
+        hr._run_rotor_scans(
+            ({'tors_names': ('D3',)}, {'tors_names': ('D5',)}), nworkers=2)
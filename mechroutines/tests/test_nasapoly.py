@@ -0,0 +1,115 @@
+""" Test the in-process fits of NASA polynomials
+"""
+
+# pylint: disable=protected-access
+import numpy
+import pytest
+from mechroutines.thermo import nasapoly
+
+
+TEMPS = numpy.array([200.0, 298.2, 300.0, 400.0, 500.0, 600.0, 800.0,
+                     1000.0, 1200.0, 1500.0, 1800.0, 2000.0, 2500.0, 3000.0])
+# Coefficients of two species, the same in each temperature range
+COEFFS = numpy.array([
+    [3.5, 1.0e-3, -2.0e-7, 1.0e-10, -2.0e-14, -1000.0, 4.0],
+    [2.5, 0.0, 0.0, 0.0, 0.0, -745.4, 4.4]])
+
+
+def _nasa_values(coeffs, temps):
+    """ Cp/R, H/R and S/R of NASA polynomial coefficients
+    """
+    cps = sum(coeffs[k] * temps**k for k in range(5))
+    hrels = sum(coeffs[k] * temps**(k+1) / (k+1) for k in range(5))
+    hrels = hrels + coeffs[5]
+    ents = coeffs[0] * numpy.log(temps) + sum(
+        coeffs[k] * temps**k / k for k in range(1, 5)) + coeffs[6]
+    return cps, hrels, ents
+
+
+def _fit_values(high_coeffs, low_coeffs, temps):
+    """ Cp/R, H/R and S/R of fitted polynomials in each temperature range
+    """
+    low = temps <= nasapoly.TMID
+    return tuple(
+        numpy.where(low, low_val, high_val)
+        for low_val, high_val in zip(
+            _nasa_values(low_coeffs, temps),
+            _nasa_values(high_coeffs, temps)))
+
+
+def test__fit_polynomial_data():
+    """ test nasapoly.fit_nasa_coefficients for polynomial data
+    """
+
+    vals = [_nasa_values(coeffs, TEMPS) for coeffs in COEFFS]
+    coeffs_lst = nasapoly.fit_nasa_coefficients(
+        TEMPS, *(numpy.array([val[idx] for val in vals]) for idx in range(3)))
+
+    assert len(coeffs_lst) == 2
+    for (high_coeffs, low_coeffs), coeffs in zip(coeffs_lst, COEFFS):
+        assert numpy.allclose(low_coeffs, coeffs, rtol=1.0e-5, atol=1.0e-8)
+        assert numpy.allclose(high_coeffs, coeffs, rtol=1.0e-5, atol=1.0e-8)
+
+
+def test__fit_continuity():
+    """ test that the fits are continuous at the middle temperature
+    """
+
+    # Harmonic oscillator data that no single polynomial fits exactly
+    theta = 1500.0
+    xvals = theta / TEMPS
+    cps = 4.0 + xvals**2 * numpy.exp(xvals) / numpy.expm1(xvals)**2
+    hrels = 4.0 * TEMPS + theta / numpy.expm1(xvals)
+    ents = (4.0 * numpy.log(TEMPS) + xvals / numpy.expm1(xvals) -
+            numpy.log(-numpy.expm1(-xvals)))
+
+    ((high_coeffs, low_coeffs),) = nasapoly.fit_nasa_coefficients(
+        TEMPS, cps[None, :], hrels[None, :], ents[None, :])
+    tmid = numpy.array([nasapoly.TMID])
+    for low_val, high_val in zip(_nasa_values(low_coeffs, tmid),
+                                 _nasa_values(high_coeffs, tmid)):
+        assert numpy.allclose(low_val, high_val)
+    for fit_val, val in zip(_fit_values(high_coeffs, low_coeffs, TEMPS),
+                            (cps, hrels, ents)):
+        assert numpy.allclose(fit_val, val, rtol=1.0e-2)
+
+
+def test__fit_errors():
+    """ test nasapoly.fit_nasa_coefficients for temperatures that do not
+        span the middle temperature
+    """
+    temps = TEMPS[TEMPS < nasapoly.TMID]
+    vals = _nasa_values(COEFFS[0], temps)
+    with pytest.raises(ValueError):
+        nasapoly.fit_nasa_coefficients(
+            temps, *(val[None, :] for val in vals))
+
+
+def test__thermo_functions():
+    """ test nasapoly.thermo_functions for an ideal monatomic gas
+    """
+
+    logq = 1.5 * numpy.log(TEMPS) + 50.0
+    dlogq = 1.5 / TEMPS
+    d2logq = -1.5 / TEMPS**2
+    temps, cps, hrels, ents = nasapoly.thermo_functions(
+        TEMPS, logq, dlogq, d2logq)
+
+    assert numpy.allclose(temps, TEMPS)
+    assert numpy.allclose(cps, 2.5)
+    assert numpy.allclose(hrels, 2.5 * TEMPS)
+    assert numpy.allclose(
+        ents, logq + numpy.log(nasapoly.KB_CGS * TEMPS / nasapoly.STD_PRES) +
+        2.5)
+
+
+def test__ckin_poly_str():
+    """ test nasapoly._ckin_poly_str
+    """
+    poly_str = nasapoly._ckin_poly_str(
+        'CH4', {'C': 1, 'H': 4}, 200.0, 1000.0, 3000.0,
+        COEFFS[0], COEFFS[0])
+    lines = poly_str.splitlines()
+    assert [len(line) for line in lines] == [80, 80, 80, 80]
+    assert [line[-1] for line in lines] == ['1', '2', '3', '4']
+    assert lines[0].startswith('CH4') and 'C   1H   4' in lines[0]
@@ -0,0 +1,85 @@
+""" Test the in-process partition functions
+"""
+
+# pylint: disable=protected-access
+import numpy
+import pytest
+import automol
+from mechroutines.thermo import rrho
+
+
+TEMPS = (300.0, 500.0, 1000.0, 2000.0)
+H_GEO = (('H', (0.0, 0.0, 0.0)),)
+H2O_GEO = (('O', (0.0, 0.0, -0.1243)),
+           ('H', (0.0, 1.4301, 0.9863)),
+           ('H', (0.0, -1.4301, 0.9863)))
+H2O_INF_DCT = {
+    'writer': 'species_block',
+    'geom': H2O_GEO,
+    'sym_factor': 2.0,
+    'freqs': (1648.0, 3832.0, 3943.0),
+    'elec_levels': ((0.0, 1),),
+}
+
+
+def test__atom():
+    """ test rrho.partition_functions for an atom
+    """
+
+    inf_dct = {'writer': 'atom_block', 'geom': H_GEO, 'sym_factor': 1.0,
+               'freqs': (), 'elec_levels': ((0.0, 2),)}
+    temps, logq, dlogq, d2logq = rrho.partition_functions(TEMPS, inf_dct)
+
+    temps = numpy.array(temps)
+    mass = automol.geom.masses(H_GEO)[0] * rrho.AMU2G
+    assert numpy.allclose(logq, numpy.log(2.0) + 1.5 * numpy.log(
+        2.0 * numpy.pi * mass * rrho.KB_CGS * temps / rrho.H_CGS**2))
+    assert numpy.allclose(dlogq, 1.5 / temps)
+    assert numpy.allclose(d2logq, -1.5 / temps**2)
+
+
+def test__derivatives():
+    """ test that the derivatives of rrho.partition_functions match
+        finite differences
+    """
+
+    step = 1.0e-2
+    for temp in TEMPS:
+        _, logq, dlogq, d2logq = rrho.partition_functions(
+            (temp - step, temp, temp + step), H2O_INF_DCT)
+        assert numpy.isclose(
+            dlogq[1], (logq[2] - logq[0]) / (2.0 * step), rtol=1.0e-5)
+        assert numpy.isclose(
+            d2logq[1], (dlogq[2] - dlogq[0]) / (2.0 * step), rtol=1.0e-4)
+
+
+def test__vibration_and_levels():
+    """ test rrho._vibration and rrho._level_sum
+    """
+
+    temps = numpy.array(TEMPS)
+    freq = 1648.0
+    xvals = freq * rrho.WAVEN2K / temps
+    logq, emean, _ = rrho._vibration(temps, (-300.0, freq))
+    assert numpy.allclose(logq, -numpy.log(1.0 - numpy.exp(-xvals)))
+    assert numpy.allclose(
+        emean, freq * rrho.WAVEN2K / (numpy.exp(xvals) - 1.0))
+
+    enes, degens = numpy.array([0.0, 500.0]), numpy.array([2.0, 4.0])
+    logq, emean, evar = rrho._level_sum(temps, enes, degens)
+    pfs = 2.0 + 4.0 * numpy.exp(-500.0 / temps)
+    assert numpy.allclose(logq, numpy.log(pfs))
+    assert numpy.allclose(emean, 2000.0 * numpy.exp(-500.0 / temps) / pfs)
+    assert numpy.allclose(
+        evar, 1.0e6 * numpy.exp(-500.0 / temps) / pfs - emean**2)
+
+
+def test__unsupported():
+    """ test that rrho.partition_functions rejects the MESSPF-only models
+    """
+    for update_dct in ({'writer': 'tau_block'},
+                       {'mdhr_dat': 'mdhr'},
+                       {'xmat': ((1.0,),)},
+                       {'mess_hr_str': 'Rotor'}):
+        with pytest.raises(ValueError):
+            rrho.partition_functions(TEMPS, dict(H2O_INF_DCT, **update_dct))
@@ -0,0 +1,95 @@
+""" Test the cache of data parsed from electronic structure outputs
+"""
+
+import os
+import types
+import numpy
+import autofile
+import elstruct
+from mechroutines.es.runner import _cache
+
+
+JOB = elstruct.Job.ENERGY
+PROG = 'psi4'
+INP_STR = 'energy input'
+
+
+def _run_fs(prefix):
+    """ Build a RUN filesystem with the output of a job
+    """
+    run_fs = autofile.fs.run(str(prefix))
+    run_fs[-1].create([JOB])
+    run_fs[-1].file.output.write('energy output', [JOB])
+    return run_fs
+
+
+def _touch_output(run_fs):
+    """ Move the modification time of the output forward, as for a rerun
+    """
+    out_path = run_fs[-1].file.output.path([JOB])
+    mtime = os.path.getmtime(out_path) + 10.0
+    os.utime(out_path, (mtime, mtime))
+
+
+def test__read_write(tmp_path):
+    """ test _cache.write_cache and _cache.read_cache
+    """
+
+    run_fs = _run_fs(tmp_path)
+    assert not _cache.read_cache(JOB, run_fs, PROG, INP_STR)
+
+    # Arrays are written as lists and read back as tuples
+    data = {'energy': -40.5, 'hessian': numpy.eye(2)}
+    _cache.write_cache(JOB, run_fs, PROG, INP_STR, {'data': data})
+    cache = _cache.read_cache(JOB, run_fs, PROG, INP_STR)
+    assert cache['data'] == {
+        'energy': -40.5, 'hessian': ((1.0, 0.0), (0.0, 1.0))}
+
+    _cache.clear_cache(JOB, run_fs)
+    assert not os.path.exists(
+        os.path.join(run_fs[-1].path([JOB]), _cache.CACHE_NAME))
+    assert not _cache.read_cache(JOB, run_fs, PROG, INP_STR)
+
+
+def test__invalidation(tmp_path):
+    """ test that _cache.read_cache drops stale caches
+    """
+
+    run_fs = _run_fs(tmp_path)
+    _cache.write_cache(JOB, run_fs, PROG, INP_STR, {'data': {'energy': 1.0}})
+    assert _cache.read_cache(JOB, run_fs, PROG, INP_STR)
+
+    # A different program or input
+    assert not _cache.read_cache(JOB, run_fs, 'molpro2015', INP_STR)
+    assert not _cache.read_cache(JOB, run_fs, PROG, 'other input')
+
+    # A rewritten output
+    _touch_output(run_fs)
+    assert not _cache.read_cache(JOB, run_fs, PROG, INP_STR)
+
+
+def test__read_parsed(monkeypatch, tmp_path):
+    """ test _cache.read_parsed
+    """
+
+    nreads = []
+
+    def _energy(prog, method, out_str):
+        nreads.append((prog, method, out_str))
+        return -40.5
+
+    monkeypatch.setitem(_cache.READER_DCT, 'energy', _energy)
+
+    run_fs = _run_fs(tmp_path)
+    inf_obj = types.SimpleNamespace(prog=PROG, method='b3lyp')
+    ret = (inf_obj, INP_STR, 'energy output')
+
+    # The output is only parsed until it changes
+    for _ in range(2):
+        assert _cache.read_parsed(JOB, run_fs, ret, ('energy',)) == {
+            'energy': -40.5}
+    assert nreads == [(PROG, 'b3lyp', 'energy output')]
+
+    _touch_output(run_fs)
+    _cache.read_parsed(JOB, run_fs, ret, ('energy',))
+    assert len(nreads) == 2
@@ -0,0 +1,74 @@
+""" Test the concurrent execution of electronic structure jobs
+"""
+
+import os
+import time
+from mechroutines.es.runner import _pool
+
+
+def _write_job(job, run_fs, delay=0.0):
+    """ Stand-in for run_job that writes the job name after a delay
+    """
+    time.sleep(delay)
+    with open(os.path.join(run_fs, job), 'w', encoding='utf-8') as fobj:
+        fobj.write(job)
+
+
+def _read_job(job, run_fs):
+    """ Stand-in for read_job that reads what _write_job wrote
+    """
+    with open(os.path.join(run_fs, job), 'r', encoding='utf-8') as fobj:
+        ret = fobj.read()
+    return True, ret
+
+
+def _execute_job(job, run_fs, delay=0.0):
+    """ Stand-in for execute_job
+    """
+    _write_job(job, run_fs, delay=delay)
+    return _read_job(job, run_fs)
+
+
+def test__job_workers():
+    """ test _pool.job_workers
+    """
+    assert _pool.job_workers({'nprocs': 4}) == 1
+    assert _pool.job_workers({'nprocs': 4}, ncores=16) == 4
+    assert _pool.job_workers({'nprocs': 8}, ncores=4) == 1
+    assert _pool.job_workers({}, ncores=3) == 3
+
+
+def test__execute_jobs(monkeypatch, tmp_path):
+    """ test _pool.execute_jobs
+    """
+
+    monkeypatch.setattr(_pool, 'run_job', _write_job)
+    monkeypatch.setattr(_pool, 'read_job', _read_job)
+    monkeypatch.setattr(_pool, 'execute_job', _execute_job)
+
+    # Later jobs finish first, but the results are in the order submitted
+    run_fs = str(tmp_path)
+    job_kwargs_lst = tuple(
+        {'job': f'job{idx}', 'run_fs': run_fs, 'delay': 0.1 * (3 - idx)}
+        for idx in range(4))
+    done_idxs = [idx for idx, _ in _pool.iter_executed_jobs(
+        job_kwargs_lst, nworkers=4)]
+    assert sorted(done_idxs) == [0, 1, 2, 3]
+    assert done_idxs != [0, 1, 2, 3]
+
+    rets = tuple((True, f'job{idx}') for idx in range(4))
+    assert _pool.execute_jobs(job_kwargs_lst, nworkers=4) == rets
+    assert _pool.execute_jobs(job_kwargs_lst, nworkers=2) == rets
+    assert _pool.execute_jobs(job_kwargs_lst, nworkers=1) == rets
+
+    # Jobs added while iterating are run as well
+    for nworkers in (1, 2):
+        job_kwargs_lst = [{'job': 'job0', 'run_fs': run_fs}]
+        rets = []
+        for idx, ret in _pool.iter_executed_jobs(
+                job_kwargs_lst, nworkers=nworkers):
+            rets.append((idx, ret))
+            if len(job_kwargs_lst) < 3:
+                job_kwargs_lst.append(
+                    {'job': f'job{len(job_kwargs_lst)}', 'run_fs': run_fs})
+        assert rets == [(idx, (True, f'job{idx}')) for idx in range(3)]
@@ -0,0 +1,138 @@
+""" Test the cache of the MESS data read for each species
+"""
+
+import os
+import pytest
+from mechlib import filesys
+from mechroutines.ktp import _spcinf
+from mechroutines.models import build
+
+
+SPC_DCT = {'OH': {'inchi': 'InChI=1S/HO/h1H', 'mult': 2, 'charge': 0}}
+TSK_KEY_DCT = {'kin_model': 'kmod', 'spc_model': 'smod',
+               'cnf_range': 'min', 'sort': None}
+
+
+def _patch_reads(monkeypatch, ene_path):
+    """ Replace the reads of the SAVE filesystem with stand-ins that
+        count the reads of the species data
+    """
+
+    nreads = []
+
+    def _read_spc_data(_, spc_name, *args, **kwargs):
+        model_basis_energy_dct = args[4]
+        nreads.append((spc_name, kwargs['spc_locs']))
+        model_basis_energy_dct['H2O'] = -76.4
+        return {'ene_chnlvl': -75.7, 'writer': 'species_block'}, (
+            model_basis_energy_dct)
+
+    monkeypatch.setattr(
+        filesys.models, 'get_spc_locs_lst',
+        lambda *args, **kwargs: [('r0', 'c0')])
+    monkeypatch.setattr(
+        filesys.models, 'pf_filesys', lambda *args, **kwargs: None)
+    monkeypatch.setattr(
+        filesys.models, 'pf_input_paths', lambda *args: (ene_path,))
+    monkeypatch.setattr(build, 'read_spc_data', _read_spc_data)
+
+    return nreads
+
+
+def _read(inf_cache, run_prefix, basis_ene_dct=None):
+    """ Read the data of OH
+    """
+    return _spcinf.read_spc_inf(
+        SPC_DCT, 'OH', TSK_KEY_DCT, None, {}, {'ene': {}},
+        run_prefix, run_prefix,
+        {} if basis_ene_dct is None else basis_ene_dct,
+        inf_cache=inf_cache)
+
+
+def test__read_spc_inf(monkeypatch, tmp_path):
+    """ test _spcinf.read_spc_inf within a run
+    """
+
+    prefix = str(tmp_path)
+    ene_path = os.path.join(prefix, 'ene')
+    with open(ene_path, 'w', encoding='utf-8') as fobj:
+        fobj.write('-75.7')
+    nreads = _patch_reads(monkeypatch, ene_path)
+
+    inf_cache = {}
+    inf_dct, basis_ene_dct = _read(inf_cache, prefix)
+    assert nreads == [('OH', ('r0', 'c0'))]
+    assert basis_ene_dct == {'H2O': -76.4}
+
+    # Later reads use the cache, and get their own copies of the data
+    inf_dct['ene_chnlvl'] = 0.0
+    inf_dct2, basis_ene_dct2 = _read(inf_cache, prefix, {'H2': -1.1})
+    assert len(nreads) == 1
+    assert inf_dct2['ene_chnlvl'] == -75.7
+    assert basis_ene_dct2 == {'H2': -1.1, 'H2O': -76.4}
+
+    # Without a cache every call reads the filesystem
+    _read(None, prefix)
+    _read(None, prefix)
+    assert len(nreads) == 3
+
+
+def test__fingerprint_error(monkeypatch, tmp_path):
+    """ test that _spcinf.read_spc_inf does not cache data it cannot
+        fingerprint
+    """
+
+    def _pf_input_paths(*_):
+        raise OSError('missing conformer')
+
+    prefix = str(tmp_path)
+    nreads = _patch_reads(monkeypatch, os.path.join(prefix, 'ene'))
+    monkeypatch.setattr(filesys.models, 'pf_input_paths', _pf_input_paths)
+
+    # The data is only fingerprinted when it is cached
+    _read(None, prefix)
+    assert len(nreads) == 1
+    inf_cache = {}
+    with pytest.raises(OSError):
+        _read(inf_cache, prefix)
+    assert not inf_cache
+
+
+def test__inf_cache_invalidation(monkeypatch, tmp_path):
+    """ test _spcinf.read_inf_cache and _spcinf.write_inf_cache
+    """
+
+    prefix = str(tmp_path)
+    ene_path = os.path.join(prefix, 'ene')
+    with open(ene_path, 'w', encoding='utf-8') as fobj:
+        fobj.write('-75.7')
+    nreads = _patch_reads(monkeypatch, ene_path)
+
+    inf_cache = {}
+    _read(inf_cache, prefix)
+    _spcinf.write_inf_cache(prefix, inf_cache)
+
+    # Entries from a previous run are used if the SAVE files are unchanged
+    inf_cache = _spcinf.read_inf_cache(prefix)
+    key = _spcinf.inf_cache_key('OH', TSK_KEY_DCT)
+    assert not inf_cache[key]['checked']
+    _read(inf_cache, prefix)
+    assert len(nreads) == 1
+    assert inf_cache[key]['checked']
+
+    # and are read again if a file has been rewritten
+    inf_cache = _spcinf.read_inf_cache(prefix)
+    mtime = os.path.getmtime(ene_path) + 10.0
+    os.utime(ene_path, (mtime, mtime))
+    _read(inf_cache, prefix)
+    assert len(nreads) == 2
+
+    # Entries for other task keywords are kept apart
+    assert key != _spcinf.inf_cache_key(
+        'OH', dict(TSK_KEY_DCT, cnf_range='r100'))
+    assert key != _spcinf.inf_cache_key('OH', TSK_KEY_DCT, False)
+
+    # An unreadable cache is ignored
+    with open(os.path.join(prefix, _spcinf.CACHE_NAME), 'wb') as fobj:
+        fobj.write(b'not a pickle')
+    assert not _spcinf.read_inf_cache(prefix)
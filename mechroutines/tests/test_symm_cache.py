@@ -0,0 +1,71 @@
+""" Test the sampled symmetry numbers kept with each conformer
+"""
+
+# pylint: disable=protected-access
+import os
+import numpy
+import autofile
+from autofile import fs
+from mechlib import amech_io
+from mechroutines.models import _symm
+
+
+# Non-planar geometry of four different atoms, in bohr
+GEO = (('C', (0.0, 0.0, 0.0)),
+       ('N', (2.8, 0.0, 0.0)),
+       ('O', (-0.9, 2.5, 0.0)),
+       ('F', (-0.9, -1.2, 2.3)))
+
+
+def _transform(geo, rot, shift=(0.0, 0.0, 0.0)):
+    """ Apply a rotation (or reflection) and a translation to a geometry
+    """
+    return tuple(
+        (sym, tuple(numpy.dot(rot, xyz) + numpy.array(shift)))
+        for sym, xyz in geo)
+
+
+def test__symm_cache(tmp_path):
+    """ test _symm._read_symm_cache and _symm._write_symm_cache
+    """
+
+    cnf_path = str(tmp_path)
+    sym_fs = fs.symmetry(cnf_path)
+    sym_fs[0].create()
+    fprint = amech_io.task_fingerprint(None, paths=(sym_fs[0].path(),))
+
+    assert _symm._read_symm_cache(cnf_path, fprint) is None
+    _symm._write_symm_cache(cnf_path, fprint, 3.0, 1.0)
+    assert _symm._read_symm_cache(cnf_path, fprint) == (3.0, 1.0)
+    assert _symm._read_symm_cache(cnf_path, 'other') is None
+
+    # Sampling another symmetric geometry changes the fingerprint
+    sym_locs = [autofile.schema.generate_new_conformer_id()]
+    sym_fs[-1].create(sym_locs)
+    sym_fs[-1].file.geometry.write(GEO, sym_locs)
+    fprint2 = amech_io.task_fingerprint(None, paths=(sym_fs[0].path(),))
+    assert fprint2 != fprint
+    assert _symm._read_symm_cache(cnf_path, fprint2) is None
+
+    # An unreadable cache is ignored
+    with open(os.path.join(cnf_path, _symm.SYMM_CACHE_NAME), 'w',
+              encoding='utf-8') as fobj:
+        fobj.write('{')
+    assert _symm._read_symm_cache(cnf_path, fprint) is None
+
+
+def test__unique_geos():
+    """ test _symm._unique_geos
+    """
+
+    ang = 0.7
+    rot = numpy.array([[numpy.cos(ang), -numpy.sin(ang), 0.0],
+                       [numpy.sin(ang), numpy.cos(ang), 0.0],
+                       [0.0, 0.0, 1.0]])
+    moved_geo = _transform(GEO, rot, shift=(1.0, -2.0, 0.5))
+    mirror_geo = _transform(GEO, numpy.diag([1.0, 1.0, -1.0]))
+
+    # Rotated copies are removed, but mirror images are kept
+    assert _symm._unique_geos([GEO]) == [GEO]
+    assert _symm._unique_geos([GEO, moved_geo, mirror_geo, GEO]) == [
+        GEO, mirror_geo]
@@ -4,71 +4,38 @@
 
 import sys
 import os
+import json
 import automol.chi
 import automol.geom
 from phydat import phycon
-from autorun import execute_function_in_parallel
+import thermfit
+from mechanalyzer.inf import spc as sinfo
 from mechlib import filesys
+from mechlib import parallel
+from mechlib import amech_io
 from mechlib.amech_io import printer as ioprinter
 from mechroutines.models.ene import read_energy
-import thermfit
+
+
+# Energies of the basis species already read in this run, by model
+BASIS_ENE_NAME = 'basis_energies.json'
+_BASIS_ENE_TABLE = {}
+
+# Index of the species dictionary by InChI and by reaction
+_ICH_INDEX = {}
 
 
 # FUNCTIONS TO CALCULATE ENERGIES FOR THERMOCHEMICAL PARAMETERS #
 def basis_energy(spc_name, spc_basis, uni_refs_dct, spc_dct,
                  spc_model_dct_i, run_prefix, save_prefix,
-                 read_species=True):
+                 read_species=True, nprocs=1):
     """ Reads the electronic and zero-point energies for a species and
         transition state and their constituent basis set.
+
+        The energies of the basis species are kept in a table for the run,
+        so each one is only read from the filesystem once per model. Those
+        not yet in the table are read over `nprocs` processes.
     """
-    def _read_basis_energy(
-            ich_name_dct, spc_dct, uni_refs_dct, spc_model_dct_i,
-            run_prefix, save_prefix, ichs, output_queue=None):
-
-        h_basis_dct = {}
-        print(f'Process {os.getpid()} reading energy for species: {ichs}')
-        for ich in ichs:
-            name = ich_name_dct[ich]
-            if name in spc_dct:
-                spc_dct_i = spc_dct[name]
-                prname = name
-            elif name in uni_refs_dct:
-                spc_dct_i = uni_refs_dct[name]
-                prname = name
-            if 'ts' in name or 'TS' in name:
-                reacs, prods = ich.split('PRODS')
-                reacs = reacs.replace('REACS', '')
-                reacs = reacs.split('REAC')
-                prods = prods.split('PROD')
-                reac_lbl = 'r0'
-                if len(reacs) > 1:
-                    reac_lbl += '+r1'
-                prod_lbl = 'p0'
-                if len(prods) > 1:
-                    prod_lbl += '+p1'
-                ioprinter.info_message(
-                    f'Basis Reaction: {reac_lbl}={prod_lbl} 1 1 1 ')
-                for i, reac in enumerate(reacs):
-                    ioprinter.info_message(
-                        f'r{i},{reac},{automol.chi.smiles(reac)},1')
-                for i, prod in enumerate(prods):
-                    ioprinter.info_message(
-                        f'p{i},{prod},{automol.chi.smiles(prod)},1')
-            ioprinter.debug_message('bases energies test:', ich, name)
-            pf_filesystems = filesys.models.pf_filesys(
-                spc_dct_i, spc_model_dct_i,
-                run_prefix, save_prefix,
-                saddle=('ts' in name or 'TS' in name),
-                name=name)
-            ioprinter.info_message(
-                f'Calculating energy for basis {prname}...', newline=1)
-            h_basis_dct[ich] = read_energy(
-                    spc_dct_i, pf_filesystems,
-                    spc_model_dct_i, run_prefix,
-                    read_ene=True, read_zpe=True,
-                    saddle='ts' in name or 'TS' in name
-                )
-        output_queue.put((h_basis_dct,))
 
     # Initialize ich name dct to noe
     ich_name_dct = {}
@@ -82,24 +49,21 @@ def basis_energy(spc_name, spc_basis, uni_refs_dct, spc_dct,
         else:
             ich_name_dct[_ich_key_name(ich)] = None
 
-    # Get names of the basis species from the respective spc dcts
+    # Get names of the basis species from the respective spc dcts,
+    # with the unique reference species taking precedence
+    spc_ich_idx, spc_rxn_idx = _ich_name_index(spc_dct)
+    ref_ich_idx, ref_rxn_idx = _build_ich_name_index(
+        uni_refs_dct, ts_label='TS')
     for ich in spc_basis:
-        for name in spc_dct:
-            if name != 'global' and 'ts' not in name:
-                if ich == spc_dct[name]['canon_enant_ich'] or ich == spc_dct[name]['inchi']:
-                    ich_name_dct[ich] = name
-            elif name != 'global':
-                if 'reacs' in spc_dct[name]:
-                    if _ich_in_rxn(ich, spc_dct[name]):
-                        ich_name_dct[_ich_key_name(ich)] = name
-
-        for name in uni_refs_dct:
-            if 'TS' in name:
-                ioprinter.info_message(uni_refs_dct[name]['reacs'])
-                if _ich_in_rxn(ich, uni_refs_dct[name]):
-                    ich_name_dct[_ich_key_name(ich)] = name
-            elif ich == uni_refs_dct[name]['canon_enant_ich'] or ich == uni_refs_dct[name]['inchi']:
+        if isinstance(ich, str):
+            name = ref_ich_idx.get(ich, spc_ich_idx.get(ich))
+            if name is not None:
                 ich_name_dct[ich] = name
+        else:
+            rxn_key = (tuple(ich[0]), tuple(ich[1]))
+            name = ref_rxn_idx.get(rxn_key, spc_rxn_idx.get(rxn_key))
+            if name is not None:
+                ich_name_dct[_ich_key_name(ich)] = name
 
     # Check the ich_name_dct
     dct_incomplete = False
@@ -130,22 +94,38 @@ def basis_energy(spc_name, spc_basis, uni_refs_dct, spc_dct,
     else:
         h_spc = None
 
-    # Get the energies of the bases
-    h_basis = []
+    # Get the energies of the bases, reading those not in the table
+    ene_table = _BASIS_ENE_TABLE.setdefault(
+        _model_key(spc_model_dct_i, save_prefix), {})
     ichs = [*ich_name_dct.keys()]
-    args = (
-            ich_name_dct, spc_dct, uni_refs_dct, spc_model_dct_i,
-            run_prefix, save_prefix
-            )
-    h_basis_dct_lst = execute_function_in_parallel(
-        _read_basis_energy, ichs, args, nprocs=1)
-    print('hbasis list', h_basis_dct_lst)
-    for ich in ichs:
+    read_ichs = [
+        ich for ich in ichs
+        if not _current_table_entry(
+            ene_table, ich, ich_name_dct[ich], spc_dct, uni_refs_dct,
+            spc_model_dct_i, run_prefix, save_prefix)]
+    if read_ichs:
+        # Only send the entries of the basis species to the processes
+        basis_spc_dct = {
+            name: spc_dct[name] for name in ich_name_dct.values()
+            if name in spc_dct}
+        args = (
+                ich_name_dct, basis_spc_dct, uni_refs_dct, spc_model_dct_i,
+                run_prefix, save_prefix
+                )
+        h_basis_dct_lst = parallel.execute_in_pool(
+            _read_basis_energy_units, read_ichs, args, nprocs=nprocs)
         for h_basis_dct in h_basis_dct_lst:
-            if ich in h_basis_dct:
-                h_basis.append(h_basis_dct[ich])
-                break
-    print(h_basis)
+            for ich, (ene_basis, fprint) in h_basis_dct.items():
+                if ene_basis is not None:
+                    name = ich_name_dct[ich]
+                    spc_dct_i = uni_refs_dct.get(name, spc_dct.get(name))
+                    ene_table[ich] = {
+                        'ene': ene_basis,
+                        'spc_info': _basis_spc_info(name, spc_dct_i),
+                        'fprint': fprint,
+                        'checked': True}
+    h_basis = [
+        ene_table[ich]['ene'] if ich in ene_table else None for ich in ichs]
     # Check if all the energies found
     no_ene_cnt = 0
     for basis_ene, basis_name in zip(h_basis, ich_name_dct.values()):
@@ -161,6 +141,57 @@ def basis_energy(spc_name, spc_basis, uni_refs_dct, spc_dct,
     return h_spc, h_basis
 
 
+def read_basis_energy_table(run_prefix):
+    """ Read the energies of the basis species kept in the run filesystem
+        into the table for the run. Each energy is only used if the
+        conformer files read for the basis species are unchanged since
+        it was read.
+
+        :param run_prefix: root-path to the run-filesystem
+        :type run_prefix: str
+    """
+
+    table_path = os.path.join(run_prefix, BASIS_ENE_NAME)
+    if os.path.exists(table_path):
+        try:
+            with open(table_path, 'r', encoding='utf-8') as fobj:
+                saved_table = json.load(fobj)
+        except (OSError, ValueError):
+            saved_table = {}
+        for mod_key, saved_ene_table in saved_table.items():
+            ene_table = _BASIS_ENE_TABLE.setdefault(mod_key, {})
+            for ich, entry in saved_ene_table.items():
+                if ich not in ene_table:
+                    entry['checked'] = False
+                    ene_table[ich] = entry
+
+
+def write_basis_energy_table(run_prefix):
+    """ Write the energies of the basis species in the table for the run
+        into the run filesystem, along with fingerprints of the conformer
+        files they were read from. Energies of reaction basis species are
+        not kept.
+
+        :param run_prefix: root-path to the run-filesystem
+        :type run_prefix: str
+    """
+
+    saved_table = {}
+    for mod_key, ene_table in _BASIS_ENE_TABLE.items():
+        for ich, entry in ene_table.items():
+            if (entry['spc_info'] is not None and
+                    entry.get('fprint') is not None):
+                saved_table.setdefault(mod_key, {})[ich] = {
+                    'ene': entry['ene'], 'spc_info': entry['spc_info'],
+                    'fprint': entry['fprint']}
+
+    table_path = os.path.join(run_prefix, BASIS_ENE_NAME)
+    tmp_path = f'{table_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as fobj:
+        json.dump(saved_table, fobj, indent=1)
+    os.replace(tmp_path, table_path)
+
+
 def enthalpy_calculation(
         spc_dct, spc_name, ene_chnlvl,
         chn_basis_ene_dct, pes_mod_dct_i, spc_mod_dct_i,
@@ -267,23 +298,162 @@ def enthalpy_calculation(
 
 
 # Helpers
-def _ich_key_name(ich):
-    """ Build a useful dictionary key of a joined ich
+def _read_basis_energy_units(
+        ich_name_dct, spc_dct, uni_refs_dct, spc_model_dct_i,
+        run_prefix, save_prefix, ichs, output_queue=None):
+    """ Read the energies of a set of basis species
     """
-    return ('REACS' + 'REAC'.join(ich[0]) +
-            r'PRODS' + 'PROD'.join(ich[1]))
+
+    h_basis_dct = {}
+    print(f'Process {os.getpid()} reading energy for species: {ichs}')
+    for ich in ichs:
+        name = ich_name_dct[ich]
+        if name in spc_dct:
+            spc_dct_i = spc_dct[name]
+            prname = name
+        elif name in uni_refs_dct:
+            spc_dct_i = uni_refs_dct[name]
+            prname = name
+        if 'ts' in name or 'TS' in name:
+            reacs, prods = ich.split('PRODS')
+            reacs = reacs.replace('REACS', '')
+            reacs = reacs.split('REAC')
+            prods = prods.split('PROD')
+            reac_lbl = 'r0'
+            if len(reacs) > 1:
+                reac_lbl += '+r1'
+            prod_lbl = 'p0'
+            if len(prods) > 1:
+                prod_lbl += '+p1'
+            ioprinter.info_message(
+                f'Basis Reaction: {reac_lbl}={prod_lbl} 1 1 1 ')
+            for i, reac in enumerate(reacs):
+                ioprinter.info_message(
+                    f'r{i},{reac},{automol.chi.smiles(reac)},1')
+            for i, prod in enumerate(prods):
+                ioprinter.info_message(
+                    f'p{i},{prod},{automol.chi.smiles(prod)},1')
+        ioprinter.debug_message('bases energies test:', ich, name)
+        pf_filesystems = _basis_pf_filesys(
+            spc_dct_i, name, spc_model_dct_i, run_prefix, save_prefix)
+        ioprinter.info_message(
+            f'Calculating energy for basis {prname}...', newline=1)
+        h_basis_dct[ich] = (
+            read_energy(
+                spc_dct_i, pf_filesystems,
+                spc_model_dct_i, run_prefix,
+                read_ene=True, read_zpe=True,
+                saddle='ts' in name or 'TS' in name
+            ),
+            _basis_fingerprint(spc_dct_i, pf_filesystems, spc_model_dct_i))
+    output_queue.put((h_basis_dct,))
+
+
+def _ich_name_index(spc_dct):
+    """ Index of the mechanism names in the species dictionary by InChI
+        and by reaction, built once for each species dictionary
+    """
+    if not (_ICH_INDEX.get('spc_dct') is spc_dct and
+            _ICH_INDEX.get('nspc') == len(spc_dct)):
+        _ICH_INDEX.update({
+            'spc_dct': spc_dct, 'nspc': len(spc_dct),
+            'index': _build_ich_name_index(spc_dct, ts_label='ts')})
+    return _ICH_INDEX['index']
+
+
+def _build_ich_name_index(spc_dct, ts_label='ts'):
+    """ Map the InChIs (both the given and the canonical enantiomer) and
+        the reactions of the entries in a species dictionary to their
+        names. Where several entries match, the last one is used.
+    """
+
+    ich_idx, rxn_idx = {}, {}
+    for name, spc_dct_i in spc_dct.items():
+        if name == 'global':
+            continue
+        if ts_label not in name:
+            for key in ('canon_enant_ich', 'inchi'):
+                if spc_dct_i.get(key) is not None:
+                    ich_idx[spc_dct_i[key]] = name
+        elif 'reacs' in spc_dct_i:
+            reacs, prods = spc_dct_i['reacs'], spc_dct_i['prods']
+            for rcts in (reacs, reacs[::-1]):
+                for prds in (prods, prods[::-1]):
+                    rxn_idx[(tuple(rcts), tuple(prds))] = name
+
+    return ich_idx, rxn_idx
+
+
+def _model_key(spc_model_dct_i, save_prefix):
+    """ Key of the basis energy table for a species model
+    """
+    return amech_io.task_fingerprint(spc_model_dct_i, save_prefix)
 
 
-def _ich_in_rxn(ich, spc_dct_i):
-    """ Check if in a reaction
+def _basis_spc_info(name, spc_dct_i):
+    """ Species info of a basis species, or None for a reaction
     """
+    spc_info = None
+    if spc_dct_i is not None and 'ts' not in name and 'TS' not in name:
+        spc_info = list(sinfo.from_dct(spc_dct_i, canonical=True))
+    return spc_info
 
-    reacs = spc_dct_i['reacs']
-    reacs_rev = reacs[::-1]
-    prods = spc_dct_i['prods']
-    prods_rev = prods[::-1]
 
-    return bool(
-        list(ich[0]) in (reacs, reacs_rev) and
-        list(ich[1]) in (prods, prods_rev)
-    )
+def _basis_pf_filesys(spc_dct_i, name, spc_model_dct_i,
+                      run_prefix, save_prefix):
+    """ Set up the pf filesystems of a basis species or reaction
+    """
+    return filesys.models.pf_filesys(
+        spc_dct_i, spc_model_dct_i,
+        run_prefix, save_prefix,
+        saddle=('ts' in name or 'TS' in name),
+        name=name)
+
+
+def _basis_fingerprint(spc_dct_i, pf_filesystems, spc_model_dct_i):
+    """ Fingerprint of the files read for the energy of a basis species,
+        which include the torsional scans used for the ZPVE corrections,
+        or None if they cannot be located
+    """
+    try:
+        fprint = amech_io.task_fingerprint(
+            paths=filesys.models.pf_input_paths(
+                pf_filesystems, spc_dct_i, spc_model_dct_i))
+    except (Exception, SystemExit):  # pylint: disable=broad-except
+        fprint = None
+    return fprint
+
+
+def _current_table_entry(ene_table, ich, name, spc_dct, uni_refs_dct,
+                         spc_model_dct_i, run_prefix, save_prefix):
+    """ Assess if the table has an energy for a basis species that was
+        read in this run, or kept from a previous run and still current
+    """
+    entry = ene_table.get(ich)
+    if entry is not None and not entry['checked']:
+        spc_dct_i = spc_dct.get(name, uni_refs_dct.get(name))
+        fprint = None
+        if spc_dct_i is not None:
+            try:
+                pf_filesystems = _basis_pf_filesys(
+                    spc_dct_i, name, spc_model_dct_i,
+                    run_prefix, save_prefix)
+            except (Exception, SystemExit):  # pylint: disable=broad-except
+                # The energy is read again, which reports the error
+                pf_filesystems = None
+            if pf_filesystems is not None:
+                fprint = _basis_fingerprint(
+                    spc_dct_i, pf_filesystems, spc_model_dct_i)
+        entry['checked'] = (
+            fprint is not None and entry['fprint'] == fprint)
+        if not entry['checked']:
+            ene_table.pop(ich)
+            entry = None
+    return entry is not None
+
+
+def _ich_key_name(ich):
+    """ Build a useful dictionary key of a joined ich
+    """
+    return ('REACS' + 'REAC'.join(ich[0]) +
+            r'PRODS' + 'PROD'.join(ich[1]))
@@ -1,14 +1,35 @@
 """
  Generates NASA Polynomial from MESS+THERMP+PAC99 outputs
+
+ The polynomials may instead be fit in-process from the partition functions
+ in the MESSPF outputs, for a batch of species at once, with `numpy`.
 """
 
 import automol
 import autorun
 import ioformat
+import numpy
+from phydat import phycon
+from mechlib.amech_io import reader
 from mechlib.amech_io import writer
 from mechlib.amech_io import printer as ioprinter
 
 
+# Constants for the in-process fits
+RGAS = 1.98720425864083e-3   # gas constant, kcal/(mol K)
+KB_CGS = 1.380649e-16        # Boltzmann constant, erg/K
+STD_PRES = 1.0e6             # standard-state pressure (1 bar), dyn/cm2
+TREF = 298.15                # reference temperature of the heat of formation
+TMID = 1000.0                # temperature between the two fit ranges
+
+# H(298) - H(0) of the elements in their standard states, kcal/mol per atom
+ELEMENT_H298_DCT = {
+    'H': 1.012, 'C': 0.251, 'N': 1.036, 'O': 1.037, 'F': 1.055,
+    'Si': 0.769, 'S': 1.054, 'Cl': 1.097, 'Br': 2.930,
+    'He': 1.481, 'Ne': 1.481, 'Ar': 1.481,
+}
+
+
 def build_polynomial(spc_name, spc_dct, pf_path, nasa_path,
                      spc_locs_idx=None, spc_mod=None):
     """ For a given species: obtain partition function data read from a
@@ -38,16 +59,8 @@ def build_polynomial(spc_name, spc_dct, pf_path, nasa_path,
     formula_str = automol.chi.formula_layer(spc_dct_i['inchi'])
     formula_dct = automol.chi.formula(spc_dct_i['inchi'])
 
-    if spc_locs_idx == 'final':
-        hform0 = spc_dct_i['Hfs']['final'][0]
-        spc_label = spc_name
-    elif spc_locs_idx is not None:
-        hform0 = spc_dct_i['Hfs'][spc_locs_idx][spc_mod][0]
-        spc_label = spc_name  # + '_{:g}'.format(spc_locs_idx)
-        # spc_label = spc_name + '_' + spc_locs[1][:5]
-    else:
-        hform0 = spc_dct_i['Hfs'][0]
-        spc_label = spc_name
+    hform0, spc_label = _hform0_and_label(
+        spc_name, spc_dct, spc_locs_idx, spc_mod)
     thermp_script_str = autorun.SCRIPT_DCT['thermp']
     pac99_script_str = autorun.SCRIPT_DCT['pac99'].format(formula_str)
 
@@ -62,3 +75,254 @@ def build_polynomial(spc_name, spc_dct, pf_path, nasa_path,
     ckin_str = '\n' + writer.ckin.nasa_polynomial(hform0, hform298, poly_str)
 
     return ckin_str
+
+
+def build_polynomials(spc_inps, spc_dct):
+    """ For a batch of species: obtain the partition functions read from
+        the MESSPF output files in the RUN filesystem and the previously
+        computed 0 K heats-of-formation from the species dictionary. Then
+        fit the ChemKin-formatted 7-coefficient NASA polynomials of all of
+        the species in-process, in place of running ThermP and PAC99.
+
+        The heat capacity, enthalpy, and entropy of each species are found
+        from the partition function and its derivatives at each temperature
+        of the MESSPF output, where MESS gives the partition function with
+        the translational part per cm3. The polynomials of all species
+        with the same temperatures are fit together.
+
+        :param spc_inps: (name, pf path, conformer index, spc model) of the
+            species to fit polynomials for
+        :type spc_inps: tuple((str, str, int, str))
+        :param spc_dct:
+        :type spc_dct:
+        :return: CHEMKIN string of each species, or None if its fit failed
+        :rtype: tuple(str)
+    """
+
+    ckin_strs = [None] * len(spc_inps)
+
+    # Compute the thermodynamic functions of each species, grouped by temps
+    grp_dct = {}
+    for idx, (spc_name, pf_path, spc_locs_idx, spc_mod) in enumerate(
+            spc_inps):
+        ioprinter.nasa('fit', path=pf_path)
+        try:
+            temps, logq, dlogq, d2logq = reader.mess.messpf(pf_path)
+            hform0, spc_label = _hform0_and_label(
+                spc_name, spc_dct, spc_locs_idx, spc_mod)
+            formula_dct = automol.chi.formula(spc_dct[spc_name]['inchi'])
+            temps, cps, hrels, ents = thermo_functions(
+                temps, logq, dlogq, d2logq)
+            hform298 = _hform298(hform0, formula_dct, temps, cps, hrels)
+        except (Exception, SystemExit) as err:  # pylint: disable=broad-except
+            ioprinter.error_message(
+                f'Reading partition functions for {spc_name} failed: {err}')
+            continue
+        # Enthalpy relative to the elements at 298 K, as NASA polynomials use
+        hrels = (
+            hrels + (hform298 * phycon.EH2KCAL) / RGAS -
+            _interp_hrel(TREF, temps, cps, hrels))
+        grp_dct.setdefault(tuple(temps), []).append(
+            (idx, cps, hrels, ents, hform0, hform298, spc_label, formula_dct))
+
+    # Fit the polynomials of each group of species together
+    for temps, grp in grp_dct.items():
+        temps = numpy.array(temps)
+        try:
+            coeffs_lst = fit_nasa_coefficients(
+                temps,
+                numpy.array([inp[1] for inp in grp]),
+                numpy.array([inp[2] for inp in grp]),
+                numpy.array([inp[3] for inp in grp]))
+        except (ValueError, numpy.linalg.LinAlgError) as err:
+            ioprinter.error_message(f'Fitting NASA polynomials failed: {err}')
+            continue
+        for inp, (high_coeffs, low_coeffs) in zip(grp, coeffs_lst):
+            idx, _, _, _, hform0, hform298, spc_label, formula_dct = inp
+            poly_str = _ckin_poly_str(
+                spc_label, formula_dct, min(temps), TMID, max(temps),
+                high_coeffs, low_coeffs)
+            ckin_strs[idx] = (
+                '\n' + writer.ckin.nasa_polynomial(hform0, hform298, poly_str))
+
+    return tuple(ckin_strs)
+
+
+def thermo_functions(temps, logq, dlogq, d2logq):
+    """ Compute the heat capacity, the enthalpy relative to 0 K, and the
+        entropy of an ideal gas at the standard-state pressure from its
+        partition function per cm3 and derivatives.
+
+        :param temps: temperatures (K)
+        :type temps: tuple(float)
+        :param logq: natural log of the partition function
+        :param dlogq: first derivative of logq wrt temperature
+        :param d2logq: second derivative of logq wrt temperature
+        :return: temps, Cp/R, (H(T) - H(0))/R (K), S/R
+        :rtype: tuple(numpy.ndarray)
+    """
+    temps = numpy.asarray(temps, dtype=float)
+    logq = numpy.asarray(logq, dtype=float)
+    dlogq = numpy.asarray(dlogq, dtype=float)
+    d2logq = numpy.asarray(d2logq, dtype=float)
+
+    cps = 1.0 + 2.0 * temps * dlogq + temps**2 * d2logq
+    hrels = temps + temps**2 * dlogq
+    ents = (
+        logq + numpy.log(KB_CGS * temps / STD_PRES) + temps * dlogq + 1.0)
+
+    return temps, cps, hrels, ents
+
+
+def fit_nasa_coefficients(temps, cps, hrels, ents, tmid=TMID):
+    """ Fit the coefficients of the two-range 7-coefficient NASA
+        polynomials of a batch of species, with all species sharing the
+        temperatures.
+
+        The heat capacities are fit by least squares with the heat capacity
+        and its first two derivatives continuous at `tmid`. The enthalpy
+        and entropy constants are then set to best fit the enthalpies and
+        entropies while keeping them continuous at `tmid`.
+
+        :param temps: temperatures (K)
+        :type temps: numpy.ndarray
+        :param cps: Cp/R of each species at each temperature
+        :type cps: numpy.ndarray
+        :param hrels: H/R (K) of each species at each temperature
+        :type hrels: numpy.ndarray
+        :param ents: S/R of each species at each temperature
+        :type ents: numpy.ndarray
+        :return: (high-range, low-range) coefficients of each species
+        :rtype: tuple((numpy.ndarray, numpy.ndarray))
+    """
+
+    temps = numpy.asarray(temps, dtype=float)
+    low = temps <= tmid
+    if low.all() or not low.any():
+        raise ValueError(
+            f'Temperatures must span {tmid} K to fit NASA polynomials')
+
+    # Fit Cp/R in each range, with temperatures scaled by tmid
+    taus = temps / tmid
+    amat_low = numpy.vander(taus[low], 5, increasing=True)
+    amat_high = numpy.vander(taus[~low], 5, increasing=True)
+    cons = numpy.array([
+        [1.0, 1.0, 1.0, 1.0, 1.0],
+        [0.0, 1.0, 2.0, 3.0, 4.0],
+        [0.0, 0.0, 2.0, 6.0, 12.0]])
+    kkt = numpy.zeros((13, 13))
+    kkt[:5, :5] = 2.0 * amat_low.T @ amat_low
+    kkt[5:10, 5:10] = 2.0 * amat_high.T @ amat_high
+    kkt[10:, :5] = cons
+    kkt[10:, 5:10] = -cons
+    kkt[:10, 10:] = kkt[10:, :10].T
+    rhs = numpy.zeros((13, len(cps)))
+    rhs[:5] = 2.0 * amat_low.T @ cps[:, low].T
+    rhs[5:10] = 2.0 * amat_high.T @ cps[:, ~low].T
+    sol = numpy.linalg.lstsq(kkt, rhs, rcond=None)[0]
+    scale = tmid ** numpy.arange(5)
+    cp_low = (sol[:5] / scale[:, None]).T
+    cp_high = (sol[5:10] / scale[:, None]).T
+
+    # Set the enthalpy and entropy constants
+    h_low, h_high = _h_poly(cp_low, temps), _h_poly(cp_high, temps)
+    s_low, s_high = _s_poly(cp_low, temps), _s_poly(cp_high, temps)
+    tmids = numpy.array([tmid])
+    dh_mid = (_h_poly(cp_low, tmids) - _h_poly(cp_high, tmids))[:, 0]
+    ds_mid = (_s_poly(cp_low, tmids) - _s_poly(cp_high, tmids))[:, 0]
+    a6_low = numpy.mean(numpy.where(
+        low, hrels - h_low, hrels - h_high - dh_mid[:, None]), axis=1)
+    a7_low = numpy.mean(numpy.where(
+        low, ents - s_low, ents - s_high - ds_mid[:, None]), axis=1)
+
+    low_coeffs = numpy.column_stack((cp_low, a6_low, a7_low))
+    high_coeffs = numpy.column_stack(
+        (cp_high, a6_low + dh_mid, a7_low + ds_mid))
+
+    return tuple(zip(high_coeffs, low_coeffs))
+
+
+def _h_poly(cp_coeffs, temps):
+    """ H/R of the heat capacity terms of NASA polynomials, less the
+        constant, for each species at each temperature
+    """
+    powers = numpy.arange(1, 6)
+    return (cp_coeffs / powers) @ (temps[None, :] ** powers[:, None])
+
+
+def _s_poly(cp_coeffs, temps):
+    """ S/R of the heat capacity terms of NASA polynomials, less the
+        constant, for each species at each temperature
+    """
+    powers = numpy.arange(1, 5)
+    return (
+        numpy.outer(cp_coeffs[:, 0], numpy.log(temps)) +
+        (cp_coeffs[:, 1:] / powers) @ (temps[None, :] ** powers[:, None]))
+
+
+def _hform0_and_label(spc_name, spc_dct, spc_locs_idx, spc_mod):
+    """ Get the 0 K heat of formation of a species and its label
+    """
+    spc_dct_i = spc_dct[spc_name]
+    if spc_locs_idx == 'final':
+        hform0 = spc_dct_i['Hfs']['final'][0]
+        spc_label = spc_name
+    elif spc_locs_idx is not None:
+        hform0 = spc_dct_i['Hfs'][spc_locs_idx][spc_mod][0]
+        spc_label = spc_name  # + '_{:g}'.format(spc_locs_idx)
+        # spc_label = spc_name + '_' + spc_locs[1][:5]
+    else:
+        hform0 = spc_dct_i['Hfs'][0]
+        spc_label = spc_name
+    return hform0, spc_label
+
+
+def _interp_hrel(temp, temps, cps, hrels):
+    """ Interpolate the enthalpy to a temperature between two of those
+        of the partition function, using the heat capacities as slopes
+    """
+    idx = numpy.searchsorted(temps, temp)
+    if idx == 0 or idx == len(temps):
+        raise ValueError(
+            f'Partition function temperatures do not include {temp} K')
+    tmp1, tmp2 = temps[idx-1], temps[idx]
+    dtmp = tmp2 - tmp1
+    frac = (temp - tmp1) / dtmp
+    # Cubic Hermite interpolation
+    return (
+        (2*frac**3 - 3*frac**2 + 1) * hrels[idx-1] +
+        (frac**3 - 2*frac**2 + frac) * dtmp * cps[idx-1] +
+        (-2*frac**3 + 3*frac**2) * hrels[idx] +
+        (frac**3 - frac**2) * dtmp * cps[idx])
+
+
+def _hform298(hform0, formula_dct, temps, cps, hrels):
+    """ Convert a 0 K heat of formation (Hartree) to 298 K using the
+        thermal enthalpy of the species and those of its elements
+    """
+    ele_h298 = 0.0
+    for ele, count in formula_dct.items():
+        if ele not in ELEMENT_H298_DCT:
+            raise ValueError(f'No reference enthalpy for element {ele}')
+        ele_h298 += count * ELEMENT_H298_DCT[ele]
+    spc_h298 = RGAS * _interp_hrel(TREF, temps, cps, hrels)
+    return hform0 + (spc_h298 - ele_h298) * phycon.KCAL2EH
+
+
+def _ckin_poly_str(spc_label, formula_dct, tlow, tmid, thigh,
+                   high_coeffs, low_coeffs):
+    """ Format the coefficients into the four lines of a ChemKin NASA
+        polynomial entry
+    """
+    ele_str = ''.join(
+        f'{ele.upper():<2}{count:>3d}'
+        for ele, count in sorted(formula_dct.items())[:4])
+    coeffs = tuple(high_coeffs) + tuple(low_coeffs)
+    coeff_strs = [f'{coeff:15.8E}' for coeff in coeffs]
+    return (
+        f'{spc_label:<18}{"":6}{ele_str:<20}G'
+        f'{tlow:10.3f}{thigh:10.3f}{tmid:8.3f}{"":6}1\n' +
+        ''.join(coeff_strs[0:5]) + '    2\n' +
+        ''.join(coeff_strs[5:10]) + '    3\n' +
+        ''.join(coeff_strs[10:14]) + f'{"":19}4'
+    )
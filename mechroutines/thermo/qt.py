@@ -4,6 +4,7 @@ Collates information for, and writes MESS files for rate calculations
 
 import mess_io
 from mechroutines.models import build, blocks
+from mechroutines.thermo import rrho
 
 
 def make_messpf_str(temps, spc_dct, spc_name, spc_locs,
@@ -31,12 +32,10 @@ def make_messpf_str(temps, spc_dct, spc_name, spc_locs,
     """
 
     # Read the filesystem for the information
-    inf_dct, _ = build.read_spc_data(
-        spc_dct, spc_name,
+    inf_dct = _read_inf_dct(
+        spc_dct, spc_name, spc_locs,
         pes_mod_dct_i, spc_mod_dct_i,
-        run_prefix, save_prefix, {}, calc_chn_ene=False,
-        calc_ene_trans=False,
-        spc_locs=spc_locs)
+        run_prefix, save_prefix)
 
     # Write the header string for the MESS input file
     globkey_str = mess_io.writer.global_pf_input(
@@ -63,3 +62,50 @@ def make_messpf_str(temps, spc_dct, spc_name, spc_locs,
     mess_inp_str = mess_io.writer.messpf_inp_str(globkey_str, spc_str)
 
     return mess_inp_str, dat_str_dct
+
+
+def make_rrho_pf(temps, spc_dct, spc_name, spc_locs,
+                 pes_mod_dct_i, spc_mod_dct_i,
+                 run_prefix, save_prefix):
+    """ Reads all information in the save filesys for a given species
+        that is required for its partition functions and evaluates them
+        in-process, in place of writing and running a MESSPF input.
+
+        :param temps: temperatures to calculate partition functions (in K)
+        :type temps: tuple(float)
+        :param spc_dct:
+        :type spc_dct:
+        :param spc_name: mechanism name of species to evaluate pfs for
+        :type spc_name: str
+        :param pes_mod_dct_i: keyword dict of specific kin model
+        :type pes_mod_dct_i: dict[]
+        :param spc_mod_dct_i: keyword dict of specific species model
+        :type spc_mod_dct_i: dict[]
+        :param run_prefix: root-path to the run-filesystem
+        :type run_prefix: str
+        :param save_prefix: root-path to the save-filesystem
+        :type save_prefix: str
+        :return: temps, ln(Q), d ln(Q)/dT, d2 ln(Q)/dT2
+        :rtype: tuple(tuple(float))
+    """
+
+    inf_dct = _read_inf_dct(
+        spc_dct, spc_name, spc_locs,
+        pes_mod_dct_i, spc_mod_dct_i,
+        run_prefix, save_prefix)
+
+    return rrho.partition_functions(temps, inf_dct)
+
+
+def _read_inf_dct(spc_dct, spc_name, spc_locs,
+                  pes_mod_dct_i, spc_mod_dct_i,
+                  run_prefix, save_prefix):
+    """ Read the filesystem info for the partition functions of a species
+    """
+    inf_dct, _ = build.read_spc_data(
+        spc_dct, spc_name,
+        pes_mod_dct_i, spc_mod_dct_i,
+        run_prefix, save_prefix, {}, calc_chn_ene=False,
+        calc_ene_trans=False,
+        spc_locs=spc_locs)
+    return inf_dct
@@ -0,0 +1,217 @@
+"""
+ Evaluates partition functions in-process for the models that MESSPF
+ treats analytically or with simple one-dimensional level sums
+
+ The partition functions are built from the info dictionary read from
+ the SAVE filesystem for the species (see `mechroutines.models.build`):
+ translations, rigid rotations, harmonic vibrations, one-dimensional
+ hindered rotors, and electronic levels. The log of the partition function
+ and its first and second temperature derivatives are returned in the same
+ form as those read from a MESSPF output, so that they can be written to a
+ pf.dat file and used by the rest of ThermoDriver.
+
+ All of the energies are referenced to the ground state of the species,
+ and the translational partition function is per cm3.
+"""
+
+import automol
+import numpy
+from phydat import phycon
+
+
+# Constants in CGS units, and for converting to temperatures
+KB_CGS = 1.380649e-16            # Boltzmann constant, erg/K
+H_CGS = 6.62607015e-27           # Planck constant, erg s
+AMU2G = 1.66053906660e-24        # atomic mass unit, g
+WAVEN2K = 1.438776877            # cm-1 to K
+ROT_CONST = 16.857629206         # B (cm-1) times I (amu Ang^2)
+
+# Energy (cm-1) up to which the levels of the hindered rotors are found,
+# in units of the thermal energy at the highest temperature
+HR_EMAX_KT = 40.0
+
+
+def partition_functions(temps, inf_dct):
+    """ Compute the partition function of a species and its derivatives
+        at a set of temperatures from the data read from the filesystem.
+
+        Supports the info dictionaries for atoms and for molecules
+        treated with rigid rotations, harmonic (or fundamental)
+        vibrations, and rigid or one-dimensional hindered torsions.
+
+        :param temps: temperatures to calculate partition functions (in K)
+        :type temps: tuple(float)
+        :param inf_dct: required molecular info for the species
+        :type inf_dct: dict[str:___]
+        :return: temps, ln(Q), d ln(Q)/dT, d2 ln(Q)/dT2
+        :rtype: tuple(tuple(float))
+    """
+
+    _check_supported(inf_dct)
+
+    temps = numpy.asarray(temps, dtype=float)
+    geo = inf_dct['geom']
+    masses = numpy.array(automol.geom.masses(geo))
+    xyzs = numpy.array(automol.geom.coordinates(geo)) * phycon.BOHR2ANG
+
+    # Sum the ln(Q), <E>, and Var(E) of each motion, with energies in K
+    logq, emean, evar = _translation(temps, sum(masses))
+    for term in (_rotation(temps, masses, xyzs, inf_dct['sym_factor']),
+                 _vibration(temps, inf_dct['freqs']),
+                 _electronic(temps, inf_dct['elec_levels'])):
+        logq, emean, evar = logq + term[0], emean + term[1], evar + term[2]
+    for hr_dat in inf_dct.get('hr_dat', ()):
+        term = _hindered_rotor(temps, hr_dat)
+        logq, emean, evar = logq + term[0], emean + term[1], evar + term[2]
+
+    dlogq = emean / temps**2
+    d2logq = evar / temps**4 - 2.0 * emean / temps**3
+
+    return (tuple(temps.tolist()), tuple(logq.tolist()),
+            tuple(dlogq.tolist()), tuple(d2logq.tolist()))
+
+
+def _check_supported(inf_dct):
+    """ Raise an error for models that need the full MESSPF treatment
+    """
+    if inf_dct.get('writer') not in ('atom_block', 'species_block'):
+        raise ValueError(
+            f"In-process partition functions do not support the "
+            f"{inf_dct.get('writer')} treatment, use the messpf engine")
+    if any(inf_dct.get(key) for key in (
+            'mdhr_dat', 'xmat', 'rovib_coups', 'rot_dists')):
+        raise ValueError(
+            'In-process partition functions do not support multi-dimensional '
+            'rotors or anharmonic (VPT2) models, use the messpf engine')
+    if inf_dct.get('mess_hr_str') and not inf_dct.get('hr_dat'):
+        raise ValueError(
+            'No hindered rotor data was read for the in-process '
+            'partition functions')
+
+
+def _translation(temps, mass):
+    """ Classical translational partition function per cm3
+    """
+    logq = 1.5 * numpy.log(
+        2.0 * numpy.pi * mass * AMU2G * KB_CGS * temps / H_CGS**2)
+    return logq, 1.5 * temps, 1.5 * temps**2
+
+
+def _rotation(temps, masses, xyzs, sym_factor):
+    """ Classical rigid-rotor partition function
+    """
+    moms = numpy.linalg.eigvalsh(_inertia_tensor(masses, xyzs))
+    moms = moms[moms > 1.0e-6 * max(moms.max(), 1.0)]
+    if not moms.size:
+        zeros = numpy.zeros_like(temps)
+        return zeros, zeros, zeros
+
+    rot_temps = ROT_CONST * WAVEN2K / moms
+    if moms.size < 3:
+        # Linear molecule
+        logq = numpy.log(temps / (sym_factor * rot_temps[-1]))
+        return logq, temps, temps**2
+    logq = (
+        0.5 * numpy.log(numpy.pi) - numpy.log(sym_factor) +
+        0.5 * numpy.log(temps**3 / numpy.prod(rot_temps)))
+    return logq, 1.5 * temps, 1.5 * temps**2
+
+
+def _vibration(temps, freqs):
+    """ Harmonic-oscillator partition function of the real frequencies
+    """
+    zeros = numpy.zeros_like(temps)
+    vib_temps = numpy.array([freq for freq in freqs if freq > 0.0])
+    if not vib_temps.size:
+        return zeros, zeros, zeros
+
+    vib_temps = vib_temps * WAVEN2K
+    xvals = vib_temps[None, :] / temps[:, None]
+    logq = -numpy.sum(numpy.log1p(-numpy.exp(-xvals)), axis=1)
+    emean = numpy.sum(vib_temps / numpy.expm1(xvals), axis=1)
+    evar = numpy.sum(
+        vib_temps**2 * numpy.exp(xvals) / numpy.expm1(xvals)**2, axis=1)
+    return logq, emean, evar
+
+
+def _electronic(temps, elec_levels):
+    """ Partition function of the electronic levels, (energy in cm-1,
+        degeneracy), referenced to the lowest level
+    """
+    enes = numpy.array([lvl[0] for lvl in elec_levels], dtype=float)
+    degens = numpy.array([lvl[1] for lvl in elec_levels], dtype=float)
+    return _level_sum(temps, (enes - enes.min()) * WAVEN2K, degens)
+
+
+def _hindered_rotor(temps, hr_dat):
+    """ Partition function of a one-dimensional hindered rotor from the
+        levels of its potential, with the reduced moment of inertia of
+        the rotating group at the reference geometry
+    """
+    geo, group, axis, symmetry, pot = hr_dat
+    masses = numpy.array(automol.geom.masses(geo))
+    xyzs = numpy.array(automol.geom.coordinates(geo)) * phycon.BOHR2ANG
+    bconst = ROT_CONST / _reduced_moment(masses, xyzs, group, axis)
+
+    # Fourier components of the potential over one period, in cm-1
+    pot = numpy.array(pot, dtype=float) * phycon.KCAL2EH * phycon.EH2WAVEN
+    npot = len(pot)
+    comps = numpy.fft.fft(pot) / npot
+    kmax = (npot - 1) // 2
+
+    # Hamiltonian in the free-rotor basis exp(i m phi)
+    emax = HR_EMAX_KT * temps.max() / WAVEN2K + pot.max() - pot.min()
+    mmax = max(int(numpy.ceil(numpy.sqrt(emax / bconst))), kmax * symmetry)
+    mvals = numpy.arange(-mmax, mmax + 1)
+    ham = numpy.diag(bconst * mvals**2).astype(complex)
+    for kval in range(-kmax, kmax + 1):
+        ham += numpy.diag(
+            numpy.full(len(mvals) - abs(kval) * symmetry, comps[kval]),
+            k=-kval * symmetry)
+    levels = numpy.linalg.eigvalsh(ham)
+    levels = levels[levels - levels[0] < emax]
+
+    logq, emean, evar = _level_sum(
+        temps, (levels - levels[0]) * WAVEN2K, numpy.ones_like(levels))
+    return logq - numpy.log(symmetry), emean, evar
+
+
+def _level_sum(temps, enes, degens):
+    """ ln(Q), <E>, and Var(E) of a set of levels with energies in K
+    """
+    bfacs = degens[None, :] * numpy.exp(-enes[None, :] / temps[:, None])
+    pfs = numpy.sum(bfacs, axis=1)
+    emean = numpy.sum(bfacs * enes, axis=1) / pfs
+    evar = numpy.sum(bfacs * enes**2, axis=1) / pfs - emean**2
+    return numpy.log(pfs), emean, evar
+
+
+def _inertia_tensor(masses, xyzs):
+    """ Inertia tensor about the center of mass (amu Ang^2)
+    """
+    rel_xyzs = xyzs - numpy.dot(masses, xyzs) / sum(masses)
+    return (
+        numpy.sum(masses * numpy.sum(rel_xyzs**2, axis=1)) * numpy.eye(3) -
+        numpy.einsum('i,ij,ik->jk', masses, rel_xyzs, rel_xyzs))
+
+
+def _reduced_moment(masses, xyzs, group, axis):
+    """ Reduced moment of inertia (amu Ang^2) of a rotating group coupled
+        to the overall rotations, with the center of mass held fixed
+    """
+    com = numpy.dot(masses, xyzs) / sum(masses)
+    unit = xyzs[axis[1]] - xyzs[axis[0]]
+    unit /= numpy.linalg.norm(unit)
+
+    # Displacements of the atoms for each rotation
+    disps = [numpy.cross(vec, xyzs - com) for vec in numpy.eye(3)]
+    int_disp = numpy.zeros_like(xyzs)
+    idxs = list(group)
+    int_disp[idxs] = numpy.cross(unit, xyzs[idxs] - xyzs[axis[0]])
+    int_disp -= numpy.dot(masses, int_disp) / sum(masses)
+    disps.append(int_disp)
+
+    kin_mat = numpy.array([
+        [numpy.sum(masses[:, None] * disp1 * disp2) for disp2 in disps]
+        for disp1 in disps])
+    return 1.0 / numpy.linalg.pinv(kin_mat)[3, 3]
@@ -1,16 +1,21 @@
 """ Tasks for THERMODRIVER
 """
 
+import os
+import ioformat
 import autorun
 from automol.chi import formula_layer as fstring
 import thermfit
 from mechlib import filesys
+from mechlib import parallel
+from mechlib import amech_io
 from mechlib.amech_io import reader
 from mechlib.amech_io import writer
 from mechlib.amech_io import parser
 from mechlib.amech_io import output_path
 from mechlib.amech_io import printer as ioprinter
 from mechroutines.models import ene
+from mechroutines.models import typ
 from mechroutines.thermo import qt
 from mechroutines.thermo import nasapoly
 from mechroutines.thermo import basis as thmbasis
@@ -19,8 +24,21 @@ from mechroutines.thermo import basis as thmbasis
 def write_messpf_task(
         write_messpf_tsk, spc_locs_dct, spc_dct,
         pes_mod_dct, spc_mod_dct,
-        run_prefix, save_prefix, thm_paths_dct):
+        run_prefix, save_prefix, thm_paths_dct,
+        nprocs=1, graph_dct=None):
     """ Write messpf input file
+
+        The inputs for each (species, conformer locators, model) unit are
+        built and written by a pool of `nprocs` processes. A unit that fails
+        is reported and does not stop the others.
+
+        For units whose species model uses the `rrho` partition function
+        engine, the partition functions are evaluated in-process and the
+        pf.dat file is written in place of the MESSPF input.
+
+        If a task graph is given, units whose species information, models,
+        and conformer files read from the SAVE filesystem are unchanged
+        since their input was last written are skipped.
     """
     ioprinter.messpf('write_header')
 
@@ -29,20 +47,33 @@ def write_messpf_task(
     for spc_name in spc_locs_dct:
         ioprinter.therm_paths_messpf_write_locations(
             spc_name, spc_locs_dct[spc_name], spc_mods, thm_paths_dct)
-        for spc_locs in spc_locs_dct[spc_name]:
-            for spc_mod in spc_mods:
-                messpf_inp_str, dat_dct = qt.make_messpf_str(
-                    pes_mod_dct[pes_mod]['therm_temps'],
-                    spc_dct, spc_name, spc_locs,
-                    pes_mod_dct[pes_mod], spc_mod_dct[spc_mod],
-                    run_prefix, save_prefix)
-                ioprinter.messpf('input_string')
-                ioprinter.info_message(messpf_inp_str)
-                autorun.write_input(
-                    thm_paths_dct[spc_name][tuple(spc_locs)][spc_mod][0],
-                    messpf_inp_str,
-                    aux_dct=dat_dct,
-                    input_name='pf.inp')
+
+    units = _messpf_units(spc_locs_dct, spc_mods)
+    if graph_dct is not None:
+        fprint_dct = {}
+        for unit in units:
+            spc_name, spc_locs, spc_mod = unit
+            paths = _unit_input_paths(
+                spc_dct[spc_name], spc_name, spc_locs,
+                spc_mod_dct[spc_mod], run_prefix, save_prefix)
+            fprint_dct[unit] = (
+                amech_io.task_fingerprint(
+                    spc_dct[spc_name], spc_locs,
+                    pes_mod_dct[pes_mod], spc_mod_dct[spc_mod], paths=paths)
+                if paths is not None else None)
+        units = _unchanged_units_removed(
+            units, 'write_messpf', fprint_dct, graph_dct,
+            lambda unit: (os.path.join(
+                thm_paths_dct[unit[0]][unit[1]][unit[2]][0],
+                'pf.dat' if typ.rrho_pf(spc_mod_dct[unit[2]]) else 'pf.inp'),))
+
+    args = (spc_dct, pes_mod_dct[pes_mod], spc_mod_dct,
+            run_prefix, save_prefix, thm_paths_dct)
+    written_dct = _execute_units(_write_messpf_units, units, args, nprocs)
+    _report_failed_units(written_dct, 'Writing MESSPF input')
+
+    if graph_dct is not None:
+        _record_units(written_dct, 'write_messpf', fprint_dct, graph_dct)
 
     ioprinter.info_message('\n\n')
     ioprinter.obj('line_dash')
@@ -50,8 +81,20 @@ def write_messpf_task(
 
 def run_messpf_task(
         run_messpf_tsk, spc_locs_dct, spc_dct,
-        thm_paths_dct):
+        thm_paths_dct, nprocs=1, graph_dct=None, spc_mod_dct=None):
     """ Run messpf input file
+
+        MESSPF is run for each (species, conformer locators, model) unit by
+        a pool of `nprocs` processes. The partition functions of the models
+        are then combined for each set of conformer locators, in order,
+        skipping any set for which a model failed.
+
+        Units whose species model uses the `rrho` partition function engine
+        are not run, since their partition functions were already evaluated
+        when the inputs were written; they are read from their pf.dat file.
+
+        If a task graph is given, MESSPF is not rerun for units whose input
+        is unchanged since it was last run; their existing output is read.
     """
     ioprinter.messpf('run_header')
 
@@ -60,21 +103,51 @@ def run_messpf_task(
     for spc_name in spc_locs_dct:
         ioprinter.therm_paths_messpf_run_locations(
             spc_name, spc_locs_dct[spc_name], spc_mods, thm_paths_dct)
-        # Run MESSPF for all requested models, combine the PFS at the end
+
+    # Run MESSPF for all requested models, combine the PFS at the end
+    units = _messpf_units(spc_locs_dct, spc_mods)
+    pf_dct = {}
+    if spc_mod_dct is not None:
+        rrho_units = tuple(
+            unit for unit in units if typ.rrho_pf(spc_mod_dct[unit[2]]))
+        pf_dct.update(_read_messpf_units(thm_paths_dct, rrho_units))
+        units = tuple(unit for unit in units if unit not in rrho_units)
+    if graph_dct is not None:
+        fprint_dct = {
+            unit: amech_io.task_fingerprint(content_paths=(os.path.join(
+                thm_paths_dct[unit[0]][unit[1]][unit[2]][0], 'pf.inp'),))
+            for unit in units}
+        run_units = _unchanged_units_removed(
+            units, 'run_messpf', fprint_dct, graph_dct,
+            lambda unit: (os.path.join(
+                thm_paths_dct[unit[0]][unit[1]][unit[2]][0], 'pf.dat'),))
+        pf_dct.update({
+            unit: reader.mess.messpf(
+                thm_paths_dct[unit[0]][unit[1]][unit[2]][0])
+            for unit in units if unit not in run_units})
+        units = run_units
+    run_pf_dct = _execute_units(
+        _run_messpf_units, units, (thm_paths_dct,), nprocs)
+    _report_failed_units(run_pf_dct, 'Running MESSPF')
+    pf_dct.update(run_pf_dct)
+
+    if graph_dct is not None:
+        _record_units(run_pf_dct, 'run_messpf', fprint_dct, graph_dct)
+
+    for spc_name in spc_locs_dct:
         ioprinter.message(f'Run MESSPF: {spc_name}', newline=1)
         _locs_pfs = []
         for spc_locs in spc_locs_dct[spc_name]:
-            _mod_pfs = []
-            for spc_mod in spc_mods:
-                autorun.run_script(
-                    autorun.SCRIPT_DCT['messpf'],
-                    thm_paths_dct[spc_name][tuple(spc_locs)][spc_mod][0])
-                _mod_pfs.append(
-                    reader.mess.messpf(
-                        thm_paths_dct[spc_name][tuple(spc_locs)][spc_mod][0]))
+            _mod_pfs = [pf_dct.get((spc_name, tuple(spc_locs), spc_mod))
+                        for spc_mod in spc_mods]
+            if any(pf is None for pf in _mod_pfs):
+                ioprinter.warning_message(
+                    f'Not combining partition functions for {spc_name} '
+                    f'{spc_locs}, since MESSPF failed for a model')
+                continue
 
             # Unpack the the pf model combination information
-            spc_mod_info = parser.models.split_model(spc_mod)
+            spc_mod_info = parser.models.split_model(spc_mods[-1])
             _spc_mods, coeffs, operators = spc_mod_info
 
             final_pf = thermfit.pf.combine(_mod_pfs, coeffs, operators)
@@ -89,6 +162,174 @@ def run_messpf_task(
     ioprinter.obj('line_dash')
 
 
+def _messpf_units(spc_locs_dct, spc_mods):
+    """ List the (species, conformer locators, model) units of the
+        MESSPF tasks, in the order they are reported
+    """
+    return tuple((spc_name, tuple(spc_locs), spc_mod)
+                 for spc_name in spc_locs_dct
+                 for spc_locs in spc_locs_dct[spc_name]
+                 for spc_mod in spc_mods)
+
+
+def _write_messpf_units(
+        spc_dct, pes_mod_dct_i, spc_mod_dct,
+        run_prefix, save_prefix, thm_paths_dct,
+        units, output_queue=None):
+    """ Write the MESSPF inputs for a set of units
+    """
+    written_dct = {}
+    for unit in units:
+        spc_name, spc_locs, spc_mod = unit
+        if typ.rrho_pf(spc_mod_dct[spc_mod]):
+            written_dct[unit] = _write_rrho_pf(
+                unit, spc_dct, pes_mod_dct_i, spc_mod_dct[spc_mod],
+                run_prefix, save_prefix, thm_paths_dct)
+            continue
+        try:
+            messpf_inp_str, dat_dct = qt.make_messpf_str(
+                pes_mod_dct_i['therm_temps'],
+                spc_dct, spc_name, spc_locs,
+                pes_mod_dct_i, spc_mod_dct[spc_mod],
+                run_prefix, save_prefix)
+            ioprinter.messpf('input_string')
+            ioprinter.info_message(messpf_inp_str)
+            autorun.write_input(
+                thm_paths_dct[spc_name][spc_locs][spc_mod][0],
+                messpf_inp_str,
+                aux_dct=dat_dct,
+                input_name='pf.inp')
+            written_dct[unit] = True
+        except (Exception, SystemExit) as err:  # pylint: disable=broad-except
+            ioprinter.error_message(
+                f'Writing MESSPF input for {unit} failed: {err}')
+            written_dct[unit] = None
+    output_queue.put((written_dct,))
+
+
+def _write_rrho_pf(unit, spc_dct, pes_mod_dct_i, spc_mod_dct_i,
+                   run_prefix, save_prefix, thm_paths_dct):
+    """ Evaluate the partition functions of a unit in-process and write
+        them to its pf.dat file
+    """
+    spc_name, spc_locs, spc_mod = unit
+    try:
+        pfs = qt.make_rrho_pf(
+            pes_mod_dct_i['therm_temps'],
+            spc_dct, spc_name, spc_locs,
+            pes_mod_dct_i, spc_mod_dct_i,
+            run_prefix, save_prefix)
+        writer.mess.output(
+            fstring(spc_dct[spc_name]['inchi']), pfs,
+            thm_paths_dct[spc_name][spc_locs][spc_mod][0],
+            filename='pf.dat')
+        written = True
+    except (Exception, SystemExit) as err:  # pylint: disable=broad-except
+        ioprinter.error_message(
+            f'Evaluating partition functions for {unit} failed: {err}')
+        written = None
+    return written
+
+
+def _read_messpf_units(thm_paths_dct, units):
+    """ Read the partition functions already written for a set of units
+    """
+    pf_dct = {}
+    for unit in units:
+        spc_name, spc_locs, spc_mod = unit
+        try:
+            pf_dct[unit] = reader.mess.messpf(
+                thm_paths_dct[spc_name][spc_locs][spc_mod][0])
+        except OSError as err:
+            ioprinter.error_message(
+                f'Reading partition functions for {unit} failed: {err}')
+            pf_dct[unit] = None
+    return pf_dct
+
+
+def _run_messpf_units(thm_paths_dct, units, output_queue=None):
+    """ Run MESSPF and read the partition functions for a set of units
+    """
+    pf_dct = {}
+    for unit in units:
+        spc_name, spc_locs, spc_mod = unit
+        pf_path = thm_paths_dct[spc_name][spc_locs][spc_mod][0]
+        try:
+            autorun.run_script(autorun.SCRIPT_DCT['messpf'], pf_path)
+            pf_dct[unit] = reader.mess.messpf(pf_path)
+        except (Exception, SystemExit) as err:  # pylint: disable=broad-except
+            ioprinter.error_message(
+                f'Running MESSPF for {unit} failed: {err}')
+            pf_dct[unit] = None
+    output_queue.put((pf_dct,))
+
+
+def _execute_units(func, units, args, nprocs):
+    """ Run `func` over the units with a pool of processes and
+        gather the results of every unit into one dictionary
+    """
+    ret_dct = {}
+    if units:
+        nprocs = max(1, min(nprocs, len(units)))
+        for sub_ret_dct in parallel.execute_in_pool(
+                func, units, args, nprocs=nprocs):
+            ret_dct.update(sub_ret_dct)
+    return ret_dct
+
+
+def _unchanged_units_removed(units, task, fprint_dct, graph_dct,
+                             out_paths_fn):
+    """ Remove the units whose inputs are unchanged since they were last
+        run and whose outputs still exist
+    """
+    run_units = ()
+    for unit in units:
+        if amech_io.task_is_current(
+                graph_dct, amech_io.task_key(task, *unit),
+                fprint_dct[unit], out_paths_fn(unit)):
+            ioprinter.info_message(
+                f'Inputs unchanged for {task} {unit}, skipping...')
+        else:
+            run_units += (unit,)
+    return run_units
+
+
+def _record_units(ret_dct, task, fprint_dct, graph_dct, data_fn=None):
+    """ Record the fingerprints of the units that succeeded in the
+        task graph, along with any data to reuse from them
+    """
+    for unit, ret in ret_dct.items():
+        if ret is not None:
+            amech_io.record_task(
+                graph_dct, amech_io.task_key(task, *unit), fprint_dct[unit],
+                data=data_fn(ret) if data_fn is not None else None)
+
+
+def _unit_input_paths(spc_dct_i, spc_name, spc_locs, spc_mod_dct_i,
+                      run_prefix, save_prefix):
+    """ Paths of the files read from the SAVE filesystem by a unit, or None
+        if they cannot be found, in which case the unit is always run
+    """
+    try:
+        pf_filesystems = filesys.models.pf_filesys(
+            spc_dct_i, spc_mod_dct_i, run_prefix, save_prefix, False,
+            name=spc_name, spc_locs=spc_locs)
+        paths = filesys.models.pf_input_paths(
+            pf_filesystems, spc_dct_i, spc_mod_dct_i)
+    except (Exception, SystemExit):  # pylint: disable=broad-except
+        # The unit will report the error when it is run
+        paths = None
+    return paths
+
+
+def _report_failed_units(ret_dct, task_str):
+    """ Print the units whose job failed
+    """
+    for unit, ret in ret_dct.items():
+        if ret is None:
+            ioprinter.warning_message(f'{task_str} failed for {unit}')
+
+
 def produce_boltzmann_weighted_conformers_pf(
         run_messpf_tsk, spc_locs_dct, spc_dct,
         thm_paths_dct):
@@ -307,7 +548,7 @@ def get_heats_of_formation(
             None, basis_ichs,
             uniref_dct, spc_dct,
             spc_mod_dct_i,
-            run_prefix, save_prefix, read_species=False)
+            run_prefix, save_prefix, read_species=False, nprocs=nprocs)
         for spc_basis_i, ene_basis_i in zip(basis_ichs, ene_basis):
             chn_basis_ene_dct[spc_mod][spc_basis_i] = ene_basis_i
 
@@ -333,44 +574,99 @@ def get_heats_of_formation(
 def nasa_polynomial_task(
         mdriver_path, spc_locs_dct, thm_paths_dct, spc_dct,
         spc_mod_dct, spc_mods, sort_info_lst, ref_scheme,
-        spc_grp_dct=None):
-    ckin_nasa_str_dct = {}
-    ckin_nasa_str_dct[0] = ''
+        spc_grp_dct=None, nprocs=1, graph_dct=None, fit_method='thermp'):
     """ generate the nasa polynomials
+
+        The polynomials of each unit (a set of conformer locators, the
+        combined conformers of a species, or a group of species) are fit by
+        a pool of `nprocs` processes and assembled in order. A unit that
+        fails is reported and left out of the CHEMKIN strings.
+
+        With the 'thermp' fit method, each unit is fit by running ThermP
+        and PAC99. With the 'numpy' fit method, all of the units are fit
+        together in this process from their partition functions.
+
+        If a task graph is given, the polynomials of units whose partition
+        function and heats of formation are unchanged since they were last
+        fit are reused instead of being refit.
     """
     ckin_nasa_str_dct = {}
     ckin_nasa_str_dct[0] = ''
     ckin_path = output_path('CKIN', prefix=mdriver_path)
+
+    # Set the path to the pf.dat file and NASA run dir of each unit
+    units, unit_path_dct = [], {}
+    for spc_name in spc_locs_dct:
+        for idx, spc_locs in enumerate(spc_locs_dct[spc_name], start=1):
+            unit = (spc_name, idx)
+            units.append(unit)
+            unit_path_dct[unit] = (
+                thm_paths_dct[spc_name][tuple(spc_locs)]['mod_total'])
+        unit = (spc_name, 0)
+        units.append(unit)
+        unit_path_dct[unit] = thm_paths_dct[spc_name]['spc_total']
+    if spc_grp_dct is not None:
+        for grp_name in spc_grp_dct:
+            unit = (grp_name, 1000)
+            units.append(unit)
+            unit_path_dct[unit] = thm_paths_dct[grp_name]['spc_group']
+
+    poly_dct = {}
+    units = tuple(units)
+    if graph_dct is not None:
+        fprint_dct = {}
+        for unit in units:
+            pf_str = None
+            if os.path.exists(os.path.join(unit_path_dct[unit][0], 'pf.dat')):
+                pf_str = ioformat.pathtools.read_file(
+                    unit_path_dct[unit][0], 'pf.dat')
+            fprint_dct[unit] = amech_io.task_fingerprint(
+                repr(spc_dct[unit[0]].get('Hfs')), spc_mods, pf_str,
+                fit_method)
+        fit_units = _unchanged_units_removed(
+            units, 'nasa_polynomial', fprint_dct, graph_dct,
+            lambda unit: ())
+        poly_dct.update({
+            unit: amech_io.task_data(
+                graph_dct, amech_io.task_key('nasa_polynomial', *unit))
+            for unit in units if unit not in fit_units})
+        units = fit_units
+
+    if fit_method == 'numpy':
+        fit_poly_dct = _fit_nasa_polynomials(
+            spc_dct, spc_mods, unit_path_dct, units)
+    else:
+        args = (spc_dct, spc_mods, unit_path_dct)
+        fit_poly_dct = _execute_units(
+            _nasa_polynomial_units, units, args, nprocs)
+    _report_failed_units(fit_poly_dct, 'Fitting NASA polynomial')
+    poly_dct.update(fit_poly_dct)
+
+    if graph_dct is not None:
+        _record_units(fit_poly_dct, 'nasa_polynomial', fprint_dct, graph_dct,
+                      data_fn=lambda poly_str: poly_str)
+
+    # Assemble the CHEMKIN strings in order
+    header_str = writer.ckin.model_header(
+        spc_mods, spc_mod_dct,
+        sort_info_lst=sort_info_lst,
+        refscheme=ref_scheme)
     for spc_name in spc_locs_dct:
         for idx, spc_locs in enumerate(spc_locs_dct[spc_name], start=1):
             if idx not in ckin_nasa_str_dct:
                 ckin_nasa_str_dct[idx] = ''
-            spc_locs = tuple(spc_locs)
-            ioprinter.nasa('calculate', spc_name)
-            ioprinter.message('for: ', spc_locs, ' combined models')
-            ckin_nasa_str_dct[idx] += writer.ckin.model_header(
-                spc_mods, spc_mod_dct,
-                sort_info_lst=sort_info_lst,
-                refscheme=ref_scheme)
-            ckin_nasa_str_dct[idx] += nasapoly.build_polynomial(
-                spc_name, spc_dct,
-                thm_paths_dct[spc_name][tuple(spc_locs)]['mod_total'][0],
-                thm_paths_dct[spc_name][tuple(spc_locs)]['mod_total'][1],
-                spc_locs_idx=idx-1, spc_mod=','.join(spc_mods))
-            ckin_nasa_str_dct[idx] += '\n\n'
-            # ioprinter.info_message('CKIN NASA STR\n')
-            # ioprinter.info_message(ckin_nasa_str_dct[idx])
+            ioprinter.message('for: ', tuple(spc_locs), ' combined models')
+            poly_str = poly_dct.get((spc_name, idx))
+            if poly_str is not None:
+                ckin_nasa_str_dct[idx] += header_str
+                ckin_nasa_str_dct[idx] += poly_str
+                ckin_nasa_str_dct[idx] += '\n\n'
         ioprinter.message('for combined rid cids:', spc_locs_dct[spc_name])
-        ckin_nasa_str_dct[0] += writer.ckin.model_header(
-            spc_mods, spc_mod_dct,
-            sort_info_lst=sort_info_lst,
-            refscheme=ref_scheme)
-        ckin_nasa_str_dct[0] += nasapoly.build_polynomial(
-            spc_name, spc_dct,
-            thm_paths_dct[spc_name]['spc_total'][0],
-            thm_paths_dct[spc_name]['spc_total'][1],
-            spc_locs_idx='final', spc_mod=','.join(spc_mods))
-        ckin_nasa_str_dct[0] += '\n\n'
+        poly_str = poly_dct.get((spc_name, 0))
+        if poly_str is not None:
+            ckin_nasa_str_dct[0] += header_str
+            ckin_nasa_str_dct[0] += poly_str
+            ckin_nasa_str_dct[0] += '\n\n'
     for idx in ckin_nasa_str_dct:
         ioprinter.info_message('CKIN NASA STR {}\n'.format(str(idx)))
         ioprinter.info_message(ckin_nasa_str_dct[idx])
@@ -379,17 +675,45 @@ def nasa_polynomial_task(
         ckin_nasa_str_dct[1000] = ''
         for grp_name in spc_grp_dct:
             ioprinter.message('for combined species:', grp_name)
-            ckin_nasa_str_dct[1000] += writer.ckin.model_header(
-                spc_mods, spc_mod_dct,
-                sort_info_lst=sort_info_lst,
-                refscheme=ref_scheme)
-            ckin_nasa_str_dct[1000] += nasapoly.build_polynomial(
-                grp_name, spc_dct,
-                thm_paths_dct[grp_name]['spc_group'][0],
-                thm_paths_dct[grp_name]['spc_group'][1],
-                spc_locs_idx='final', spc_mod=','.join(spc_mods))
-            ckin_nasa_str_dct[1000] += '\n\n'
+            poly_str = poly_dct.get((grp_name, 1000))
+            if poly_str is not None:
+                ckin_nasa_str_dct[1000] += header_str
+                ckin_nasa_str_dct[1000] += poly_str
+                ckin_nasa_str_dct[1000] += '\n\n'
         ioprinter.info_message('CKIN NASA STR COMBINED SPECIES\n')
         ioprinter.info_message(ckin_nasa_str_dct[1000])
 
     return ckin_nasa_str_dct, ckin_path
+
+
+def _nasa_polynomial_units(
+        spc_dct, spc_mods, unit_path_dct,
+        units, output_queue=None):
+    """ Fit the NASA polynomials for a set of units
+    """
+    poly_dct = {}
+    for unit in units:
+        spc_name, idx = unit
+        pf_path, nasa_path = unit_path_dct[unit][:2]
+        spc_locs_idx = 'final' if idx in (0, 1000) else idx - 1
+        ioprinter.nasa('calculate', spc_name)
+        try:
+            poly_dct[unit] = nasapoly.build_polynomial(
+                spc_name, spc_dct, pf_path, nasa_path,
+                spc_locs_idx=spc_locs_idx, spc_mod=','.join(spc_mods))
+        except (Exception, SystemExit) as err:  # pylint: disable=broad-except
+            ioprinter.error_message(
+                f'Fitting NASA polynomial for {unit} failed: {err}')
+            poly_dct[unit] = None
+    output_queue.put((poly_dct,))
+
+
+def _fit_nasa_polynomials(spc_dct, spc_mods, unit_path_dct, units):
+    """ Fit the NASA polynomials for a set of units in this process
+    """
+    spc_inps = tuple(
+        (spc_name, unit_path_dct[(spc_name, idx)][0],
+         'final' if idx in (0, 1000) else idx - 1, ','.join(spc_mods))
+        for spc_name, idx in units)
+    poly_strs = nasapoly.build_polynomials(spc_inps, spc_dct)
+    return dict(zip(units, poly_strs))
@@ -0,0 +1,103 @@
+""" Test the catalog of conformer energies in the CONFS layer
+"""
+
+import os
+import numpy
+import autofile
+from phydat import phycon
+from mechlib.filesys import _catalog
+
+
+SP_THY_LOCS = ('b3lyp', '6-31g*', 'R')
+
+
+def _conformer_fs(prefix, ene=-40.5, freqs=(1000.0, 2000.0)):
+    """ Build a save filesystem with a single conformer
+    """
+    cnf_fs = autofile.fs.conformer(str(prefix))
+    locs = (autofile.schema.generate_new_ring_id(),
+            autofile.schema.generate_new_conformer_id())
+    cnf_fs[-1].create(locs)
+    sp_fs = autofile.fs.single_point(cnf_fs[-1].path(locs))
+    sp_fs[-1].create(SP_THY_LOCS)
+    sp_fs[-1].file.energy.write(ene, SP_THY_LOCS)
+    if freqs is not None:
+        cnf_fs[-1].file.harmonic_frequencies.write(freqs, locs)
+
+    return cnf_fs, locs
+
+
+def _touch(path):
+    """ Move the modification time of a file forward
+    """
+    mtime = os.path.getmtime(path) + 10.0
+    os.utime(path, (mtime, mtime))
+
+
+def test__read_write(tmp_path):
+    """ test _catalog.update_conformer and _catalog.level_entries
+    """
+
+    cnf_fs, locs = _conformer_fs(tmp_path)
+
+    # A missing or unreadable catalog is empty
+    assert _catalog.read_catalog(cnf_fs) == {'levels': {}}
+    with open(_catalog.catalog_path(cnf_fs), 'w', encoding='utf-8') as fobj:
+        fobj.write('{not json')
+    assert _catalog.read_catalog(cnf_fs) == {'levels': {}}
+
+    _catalog.update_conformer(cnf_fs, locs, SP_THY_LOCS)
+    catalog = _catalog.read_catalog(cnf_fs)
+    entry = _catalog.level_entries(catalog, SP_THY_LOCS)[tuple(locs)]
+    assert entry['ene'] == -40.5
+    assert entry['zpe'] is not None and entry['zpe'] > 0.0
+    assert _catalog.level_entries(catalog, ('mp2', 'cc-pvdz', 'R')) == {}
+
+    # Entries of other conformers are kept when new ones are merged
+    _catalog.merge_entries(cnf_fs, SP_THY_LOCS, {('r0', 'c0'): entry})
+    lvl_dct = _catalog.level_entries(
+        _catalog.read_catalog(cnf_fs), SP_THY_LOCS)
+    assert set(lvl_dct) == {tuple(locs), ('r0', 'c0')}
+    assert not [name for name in os.listdir(cnf_fs[0].path())
+                if name.endswith('.tmp')]
+
+
+def test__invalidation(tmp_path):
+    """ test _catalog.current_entry
+    """
+
+    cnf_fs, locs = _conformer_fs(tmp_path / 'freqs')
+    entry = _catalog.build_entry(cnf_fs, locs, SP_THY_LOCS)
+    assert _catalog.current_entry(
+        entry, cnf_fs, locs, SP_THY_LOCS, need_zpe=True) == entry
+
+    # Rewriting the frequencies only invalidates entries that need the ZPE
+    _touch(cnf_fs[-1].file.harmonic_frequencies.path(locs))
+    assert _catalog.current_entry(entry, cnf_fs, locs, SP_THY_LOCS) == entry
+    assert _catalog.current_entry(
+        entry, cnf_fs, locs, SP_THY_LOCS, need_zpe=True) is None
+
+    # Rewriting the energy invalidates the entry
+    sp_fs = autofile.fs.single_point(cnf_fs[-1].path(locs))
+    _touch(sp_fs[-1].file.energy.path(SP_THY_LOCS))
+    assert _catalog.current_entry(entry, cnf_fs, locs, SP_THY_LOCS) is None
+    assert _catalog.current_entry(None, cnf_fs, locs, SP_THY_LOCS) is None
+
+    # Entries without frequencies never satisfy a ZPE request
+    cnf_fs, locs = _conformer_fs(tmp_path / 'no_freqs', freqs=None)
+    entry = _catalog.build_entry(cnf_fs, locs, SP_THY_LOCS)
+    assert entry['zpe'] is None
+    assert _catalog.current_entry(
+        entry, cnf_fs, locs, SP_THY_LOCS, need_zpe=True) is None
+
+
+def test__harmonic_zpe(tmp_path):
+    """ test that _catalog.harmonic_zpe leaves out the imaginary modes
+    """
+
+    assert numpy.isclose(
+        _catalog.harmonic_zpe((-500.0, 1000.0, 2000.0)),
+        1500.0 * phycon.WAVEN2EH)
+    cnf_fs, locs = _conformer_fs(tmp_path, freqs=(-500.0, 1000.0, 2000.0))
+    entry = _catalog.build_entry(cnf_fs, locs, SP_THY_LOCS)
+    assert numpy.isclose(entry['zpe'], 1500.0 * phycon.WAVEN2EH)
@@ -0,0 +1,79 @@
+""" Test the record of task inputs used to skip unchanged tasks
+"""
+
+import os
+from mechlib.amech_io import _graph
+
+
+def test__task_fingerprint(tmp_path):
+    """ test _graph.task_fingerprint
+    """
+
+    save_dir = str(tmp_path)
+    file_path = tmp_path / 'geom.xyz'
+    file_path.write_text('geo', encoding='utf-8')
+    model_dct = {'vib': {'mod': 'harm'}, 'ene': {'lvl1': (1.0, 'lvl_b3')}}
+
+    fprint = _graph.task_fingerprint(model_dct, 'C2H6', paths=(save_dir,))
+    assert fprint == _graph.task_fingerprint(
+        dict(reversed(model_dct.items())), 'C2H6', paths=(save_dir,))
+    assert fprint != _graph.task_fingerprint(
+        model_dct, 'C2H4', paths=(save_dir,))
+
+    # Adding or rewriting a file below a path changes the fingerprint
+    (tmp_path / 'ene.dat').write_text('-79.8', encoding='utf-8')
+    fprint2 = _graph.task_fingerprint(model_dct, 'C2H6', paths=(save_dir,))
+    assert fprint2 != fprint
+    mtime = os.path.getmtime(file_path) + 10.0
+    os.utime(file_path, (mtime, mtime))
+    assert fprint2 != _graph.task_fingerprint(
+        model_dct, 'C2H6', paths=(save_dir,))
+
+    # Files given by content are only hashed by what they hold
+    fprint = _graph.task_fingerprint(content_paths=(file_path,))
+    file_path.write_text('geo', encoding='utf-8')
+    assert fprint == _graph.task_fingerprint(content_paths=(file_path,))
+    file_path.write_text('geo2', encoding='utf-8')
+    assert fprint != _graph.task_fingerprint(content_paths=(file_path,))
+
+    # Missing paths and dictionaries with mixed key types are hashed
+    assert _graph.task_fingerprint(
+        {1: 'a', 'b': 2}, paths=(os.path.join(save_dir, 'none'),))
+
+
+def test__task_graph(tmp_path):
+    """ test _graph.record_task and _graph.task_is_current
+    """
+
+    run_dir = str(tmp_path)
+    out_path = tmp_path / 'pf.inp'
+    key = _graph.task_key('messpf', 'C2H6', 'mod1')
+    assert key == 'messpf|C2H6|mod1'
+
+    graph_dct = _graph.read_task_graph(run_dir)
+    assert graph_dct == {}
+    assert not _graph.task_is_current(graph_dct, key, 'abc')
+
+    _graph.record_task(graph_dct, key, 'abc', data={'hf': [1.0]})
+    _graph.write_task_graph(run_dir, graph_dct)
+    graph_dct = _graph.read_task_graph(run_dir)
+    assert _graph.task_is_current(graph_dct, key, 'abc')
+    assert not _graph.task_is_current(graph_dct, key, 'abd')
+    assert _graph.task_data(graph_dct, key) == {'hf': [1.0]}
+    assert _graph.task_data(graph_dct, 'other') is None
+
+    # Tasks whose outputs were removed are not current
+    assert not _graph.task_is_current(
+        graph_dct, key, 'abc', out_paths=(out_path,))
+    out_path.write_text('pf', encoding='utf-8')
+    assert _graph.task_is_current(
+        graph_dct, key, 'abc', out_paths=(out_path,))
+
+    # Units that could not be fingerprinted are never current
+    _graph.record_task(graph_dct, key, None)
+    assert key not in graph_dct
+    assert not _graph.task_is_current(graph_dct, key, None)
+
+    # An unreadable record is ignored
+    (tmp_path / _graph.GRAPH_NAME).write_text('{', encoding='utf-8')
+    assert _graph.read_task_graph(run_dir) == {}
@@ -0,0 +1,118 @@
+""" Test the cache of the instability verdicts of species
+"""
+
+# pylint: disable=protected-access
+import os
+import json
+from mechlib import parallel
+from mechlib.reaction import _instab
+
+
+SPC_DCT = {
+    'CH2OOH': {'inchi': 'InChI=1S/CH3O2/c1-3-2/h2H,1H2'},
+    'CH3': {'inchi': 'InChI=1S/CH3/h1H3'},
+    'ts_1_1_1': {'inchi': None},
+}
+THY_INFO = ('gaussian09', 'b3lyp', '6-31g*', 'U')
+
+
+def _patch_reads(monkeypatch, fprint_dct):
+    """ Replace the reads of the SAVE filesystem with stand-ins that give
+        the fingerprint of each species and count the verdicts read
+    """
+
+    read_names = []
+
+    def _verdict_units(spc_dct, thy_info, save_prefix, zma_locs,
+                       spc_names, output_queue=None):
+        assert (thy_info, save_prefix, zma_locs) == (
+            THY_INFO, save_prefix, (0,))
+        verdict_dct = {}
+        for spc_name in spc_names:
+            read_names.append(spc_name)
+            ichs = (['InChI=1S/CH2O/c1-2/h1H2', 'InChI=1S/HO/h1H']
+                    if spc_name == 'CH2OOH' else None)
+            verdict_dct[spc_name] = {
+                'fprint': fprint_dct[spc_dct[spc_name]['inchi']],
+                'checked': True, 'ichs': ichs, 'path': spc_name}
+        output_queue.put((verdict_dct,))
+
+    monkeypatch.setattr(_instab, '_VERDICT_CACHE', {})
+    monkeypatch.setattr(
+        _instab, '_verdict_key',
+        lambda spc_dct_i, *_: (spc_dct_i['inchi'], None, THY_INFO))
+    monkeypatch.setattr(
+        _instab, '_verdict_fingerprint',
+        lambda spc_dct_i, *_: fprint_dct[spc_dct_i['inchi']])
+    monkeypatch.setattr(_instab, '_instability_verdict_units', _verdict_units)
+    monkeypatch.setattr(
+        parallel, 'execute_in_pool',
+        lambda func, items, args, nprocs=1: parallel._run_serial(
+            func, list(items), args))
+
+    return read_names
+
+
+def _new_run(monkeypatch):
+    """ Forget the verdicts held in memory, as for a new run
+    """
+    monkeypatch.setattr(_instab, '_VERDICT_CACHE', {})
+
+
+def test__instability_verdicts(monkeypatch, tmp_path):
+    """ test _instab.instability_verdicts
+    """
+
+    save_prefix = str(tmp_path)
+    fprint_dct = {SPC_DCT['CH2OOH']['inchi']: 'a', SPC_DCT['CH3']['inchi']: 'b'}
+    read_names = _patch_reads(monkeypatch, fprint_dct)
+    spc_names = ('CH2OOH', 'CH3', 'CH3', 'ts_1_1_1')
+
+    verdict_dct = _instab.instability_verdicts(
+        SPC_DCT, spc_names, THY_INFO, save_prefix)
+    assert verdict_dct == {
+        'CH2OOH': (('InChI=1S/CH2O/c1-2/h1H2', 'InChI=1S/HO/h1H'), 'CH2OOH'),
+        'CH3': None}
+    assert read_names == ['CH2OOH', 'CH3']
+    with open(os.path.join(save_prefix, _instab.VERDICT_CACHE_NAME), 'r',
+              encoding='utf-8') as fobj:
+        assert set(json.load(fobj)) == set(fprint_dct)
+
+    # Verdicts are only read once in a run
+    assert _instab.instability_verdicts(
+        SPC_DCT, spc_names, THY_INFO, save_prefix) == verdict_dct
+    assert len(read_names) == 2
+
+
+def test__verdict_invalidation(monkeypatch, tmp_path):
+    """ test that saved verdicts are reread once the species change
+    """
+
+    save_prefix = str(tmp_path)
+    fprint_dct = {SPC_DCT['CH2OOH']['inchi']: 'a', SPC_DCT['CH3']['inchi']: 'b'}
+    read_names = _patch_reads(monkeypatch, fprint_dct)
+    spc_names = ('CH2OOH', 'CH3')
+    verdict_dct = _instab.instability_verdicts(
+        SPC_DCT, spc_names, THY_INFO, save_prefix)
+
+    # Verdicts saved by a previous run are reused if the species are the same
+    _new_run(monkeypatch)
+    cache = _instab._verdict_cache(save_prefix)
+    assert not any(entry['checked'] for entry in cache.values())
+    assert _instab.instability_verdicts(
+        SPC_DCT, spc_names, THY_INFO, save_prefix) == verdict_dct
+    assert read_names == ['CH2OOH', 'CH3']
+    assert all(entry['checked'] for entry in cache.values())
+
+    # and only those of the changed species are read again
+    _new_run(monkeypatch)
+    fprint_dct[SPC_DCT['CH3']['inchi']] = 'c'
+    _instab.instability_verdicts(SPC_DCT, spc_names, THY_INFO, save_prefix)
+    assert read_names == ['CH2OOH', 'CH3', 'CH3']
+
+    # An unreadable file of verdicts is ignored
+    _new_run(monkeypatch)
+    with open(os.path.join(save_prefix, _instab.VERDICT_CACHE_NAME), 'w',
+              encoding='utf-8') as fobj:
+        fobj.write('{')
+    assert _instab._verdict_cache(save_prefix) == {}
@@ -0,0 +1,109 @@
+""" Test the pool of worker processes shared by parallel sections
+"""
+
+# pylint: disable=protected-access
+import os
+import time
+import pytest
+from mechlib import parallel
+
+
+def _add(offset, items, output_queue=None):
+    """ Put each item plus an offset on the queue, with the first
+        sublists taking the longest
+    """
+    time.sleep(0.05 * (10 - min(items)))
+    for item in items:
+        output_queue.put((item + offset,))
+
+
+def _lookup(dct, items, output_queue=None):
+    """ Put the value in a dictionary of each item on the queue
+    """
+    for item in items:
+        output_queue.put((dct.get(item),))
+
+
+def _pid(items, output_queue=None):
+    """ Put the process ID for each item on the queue
+    """
+    for _ in items:
+        output_queue.put((os.getpid(),))
+
+
+def _nested_pid(items, output_queue=None):
+    """ Put the process IDs used by a nested parallel section on the queue
+    """
+    for item in items:
+        pids = parallel.execute_in_pool(_pid, (item, item), (), nprocs=2)
+        output_queue.put(((os.getpid(),) + tuple(pids),))
+
+
+def _fail(items, output_queue=None):
+    """ Raise an error for some items
+    """
+    for item in items:
+        if item == 3:
+            raise ValueError('bad item')
+        output_queue.put((item,))
+
+
+def test__result_order():
+    """ test that parallel.execute_in_pool keeps the order of the sublists
+    """
+
+    items = tuple(range(7))
+    with parallel.worker_pool(3):
+        for nprocs in (1, 2, 3):
+            ret = parallel.execute_in_pool(_add, items, (10,), nprocs=nprocs)
+            assert ret == [
+                item + 10
+                for idx in range(nprocs) for item in items[idx::nprocs]]
+        assert os.getpid() not in parallel.execute_in_pool(
+            _pid, items, (), nprocs=3)
+
+
+def test__shared_objects():
+    """ test parallel.worker_pool and parallel.unshare
+    """
+
+    spc_dct = {0: 'CH4'}
+    assert not parallel.pool_is_open()
+    with parallel.worker_pool(2, shared=(spc_dct,)):
+        assert parallel.pool_is_open()
+        assert parallel.execute_in_pool(
+            _lookup, (0, 1), (spc_dct,), nprocs=2) == ['CH4', None]
+
+        # Workers see shared objects as they were when the pool was opened,
+        # so passing one that was modified since is an error
+        spc_dct[1] = 'C2H6'
+        with pytest.raises(RuntimeError, match='unshare'):
+            parallel.execute_in_pool(_lookup, (0, 1), (spc_dct,), nprocs=2)
+        parallel.unshare(spc_dct)
+        assert parallel.execute_in_pool(
+            _lookup, (0, 1), (spc_dct,), nprocs=2) == ['CH4', 'C2H6']
+    assert not parallel.pool_is_open()
+
+
+def test__nested_and_errors():
+    """ test parallel.execute_in_pool inside workers and for errors
+    """
+
+    with parallel.worker_pool(2):
+        # Nested sections run serially in the worker
+        for pids in parallel.execute_in_pool(
+                _nested_pid, (0, 1), (), nprocs=2):
+            assert len(set(pids)) == 1 and pids[0] != os.getpid()
+
+        # Errors are raised once all sublists are done, and the pool
+        # remains usable
+        with pytest.raises(RuntimeError, match='bad item'):
+            parallel.execute_in_pool(_fail, tuple(range(6)), (), nprocs=2)
+        assert parallel.execute_in_pool(
+            _fail, (0, 1, 2), (), nprocs=2) == [0, 2, 1]
+
+
+def test__run_serial():
+    """ test parallel._run_serial
+    """
+    assert parallel._run_serial(_add, (2, 1), (1,)) == [3, 2]
@@ -0,0 +1,104 @@
+""" Test the rate tables built from the MESSRATE outputs
+"""
+
+# pylint: disable=protected-access
+import os
+import numpy
+import mess_io
+from mechlib.amech_io.reader import mess
+
+
+TEMPS = (500.0, 1000.0, 1500.0)
+PRESSURES = (1.0, 10.0)
+RXN1 = (('H', 'O2'), ('HO2',), (None,))
+RXN2 = (('HO2',), ('H', 'O2'), (None,))
+
+
+def _patch_parser(monkeypatch):
+    """ Replace the parser of rate.out with a stand-in that counts the
+        times it is called
+    """
+
+    nparses = []
+
+    def _get_rxn_ktp_dct(out_str, **kwargs):
+        nparses.append((out_str, kwargs))
+        temps = numpy.array(TEMPS)
+        return {
+            RXN1: {1.0: (temps, 1.0e12 * temps),
+                   'high': (temps, 2.0e12 * temps)},
+            RXN2: {10.0: (temps[:2], numpy.array([1.0, 2.0]))}}
+
+    monkeypatch.setattr(
+        mess_io.reader.rates, 'get_rxn_ktp_dct', _get_rxn_ktp_dct)
+
+    return nparses
+
+
+def _assert_equal(rxn_ktp_dct1, rxn_ktp_dct2):
+    """ Assert that two sets of rates are the same
+    """
+    assert list(rxn_ktp_dct1) == list(rxn_ktp_dct2)
+    for rxn, ktp_dct in rxn_ktp_dct1.items():
+        assert list(ktp_dct) == list(rxn_ktp_dct2[rxn])
+        for pressure, (temps, kts) in ktp_dct.items():
+            assert numpy.allclose(temps, rxn_ktp_dct2[rxn][pressure][0])
+            assert numpy.allclose(kts, rxn_ktp_dct2[rxn][pressure][1])
+
+
+def test__rate_table(monkeypatch, tmp_path):
+    """ test mess.rate_table
+    """
+
+    nparses = _patch_parser(monkeypatch)
+    mess_path = str(tmp_path)
+    assert mess.rate_table(mess_path, TEMPS, PRESSURES) is None
+
+    out_path = tmp_path / 'rate.out'
+    out_path.write_text('rates', encoding='utf-8')
+    rxn_ktp_dct = mess.rate_table(mess_path, TEMPS, PRESSURES)
+    assert len(nparses) == 1
+    assert nparses[0][1]['tmin'] == 500.0 and nparses[0][1]['pmax'] == 10.0
+    assert os.path.exists(os.path.join(mess_path, mess.RATE_TABLE_NAME))
+
+    # Later reads use the table, which holds the same rates
+    _assert_equal(mess.rate_table(mess_path, TEMPS, PRESSURES), rxn_ktp_dct)
+    assert len(nparses) == 1
+
+    # The table is rebuilt for other filters or a rewritten rate.out
+    mess.rate_table(mess_path, TEMPS[1:], PRESSURES)
+    assert len(nparses) == 2
+    mtime = os.path.getmtime(out_path) + 10.0
+    os.utime(out_path, (mtime, mtime))
+    _assert_equal(mess.rate_table(mess_path, TEMPS, PRESSURES), rxn_ktp_dct)
+    assert len(nparses) == 3
+
+
+def test__read_rate_table(tmp_path):
+    """ test mess._read_rate_table for stale and unreadable tables
+    """
+
+    table_path = str(tmp_path / mess.RATE_TABLE_NAME)
+    assert mess._read_rate_table(table_path, 'a') is None
+
+    mess._write_rate_table(table_path, 'a', {RXN1: {}})
+    assert mess._read_rate_table(table_path, 'a') == {}
+    assert mess._read_rate_table(table_path, 'b') is None
+
+    (tmp_path / mess.RATE_TABLE_NAME).write_text(
+        'not a table', encoding='utf-8')
+    assert mess._read_rate_table(table_path, 'a') is None
+
+
+def test__mess_strings(tmp_path):
+    """ test that mess._MessStrings only reads the files that are used
+    """
+
+    (tmp_path / 'mess.inp').write_text('input', encoding='utf-8')
+    (tmp_path / 'rate.out').write_text('rates', encoding='utf-8')
+
+    mess_strs = mess._MessStrings(str(tmp_path))
+    assert set(mess_strs) == set(mess.MESS_FILE_DCT)
+    assert not mess_strs._dct
+    assert mess_strs['inp'] == 'input'
+    assert list(mess_strs._dct) == ['inp']
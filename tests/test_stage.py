@@ -0,0 +1,127 @@
+""" Test the staged writes into the CONFS layer
+"""
+
+# pylint: disable=protected-access
+import os
+import time
+import socket
+import numpy
+import automol
+import autofile
+from mechlib.filesys import _stage
+
+
+GEO = (('O', (0.0, 0.0, 0.0)),
+       ('H', (0.0, 1.4305, 1.1092)),
+       ('H', (0.0, -1.4305, 1.1092)))
+GEO2 = (('O', (0.0, 0.0, 0.0)),
+        ('H', (0.0, 1.5305, 1.1092)),
+        ('H', (0.0, -1.5305, 1.1092)))
+FREQS = (1600.0, 3700.0, 3800.0)
+
+
+def _new_locs():
+    """ Build new conformer locators
+    """
+    return (autofile.schema.generate_new_ring_id(),
+            autofile.schema.generate_new_conformer_id())
+
+
+def _stage_names(cnf_fs):
+    """ Names of the staging directories next to the CONFS layer
+    """
+    prefix = os.path.dirname(cnf_fs[0].path())
+    return [name for name in os.listdir(prefix)
+            if name.startswith(_stage.STAGE_PREFIX)]
+
+
+def test__new_conformer(tmp_path):
+    """ test _stage.conformer_transaction for a new conformer
+    """
+
+    cnf_fs = autofile.fs.conformer(str(tmp_path))
+    locs = _new_locs()
+    with _stage.conformer_transaction(cnf_fs) as stage_fs:
+        stage_fs[-1].create(locs)
+        stage_fs[-1].file.geometry.write(GEO, locs)
+        stage_path = stage_fs[-1].path(locs)
+        assert not cnf_fs[-1].exists(locs)
+        assert _stage.final_path(stage_path) == cnf_fs[-1].path(locs)
+
+    assert cnf_fs[-1].file.geometry.exists(locs)
+    assert not _stage_names(cnf_fs)
+
+
+def test__existing_conformer(tmp_path):
+    """ test _stage.conformer_transaction over an existing conformer
+    """
+
+    cnf_fs = autofile.fs.conformer(str(tmp_path))
+    locs, other_locs = _new_locs(), _new_locs()
+    for locs_i in (locs, other_locs):
+        cnf_fs[-1].create(locs_i)
+        cnf_fs[-1].file.geometry.write(GEO, locs_i)
+        cnf_fs[-1].file.harmonic_frequencies.write(FREQS, locs_i)
+
+    # Staged files replace or add to those of the conformer
+    with _stage.conformer_transaction(cnf_fs) as stage_fs:
+        stage_fs[-1].create(locs)
+        stage_fs[-1].file.geometry.write(GEO2, locs)
+        stage_fs[-1].file.hessian.write(numpy.eye(9), locs)
+
+    assert numpy.allclose(
+        automol.geom.coordinates(cnf_fs[-1].file.geometry.read(locs)),
+        automol.geom.coordinates(GEO2))
+    assert cnf_fs[-1].file.hessian.exists(locs)
+    assert cnf_fs[-1].file.harmonic_frequencies.exists(locs)
+    assert not cnf_fs[-1].file.hessian.exists(other_locs)
+    assert {tuple(locs_i) for locs_i in cnf_fs[-1].existing()} == {
+        tuple(locs), tuple(other_locs)}
+    assert not _stage_names(cnf_fs)
+
+
+def test__failed_transaction(tmp_path):
+    """ test that _stage.conformer_transaction commits nothing on errors
+    """
+
+    cnf_fs = autofile.fs.conformer(str(tmp_path))
+    locs = _new_locs()
+    try:
+        with _stage.conformer_transaction(cnf_fs) as stage_fs:
+            stage_fs[-1].create(locs)
+            stage_fs[-1].file.geometry.write(GEO, locs)
+            raise ValueError('failed job')
+    except ValueError:
+        pass
+
+    assert not cnf_fs[-1].exists(locs)
+    assert not _stage_names(cnf_fs)
+
+
+def test__remove_stale_stages(tmp_path):
+    """ test _stage._remove_stale_stages
+    """
+
+    # A process ID that no longer exists
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0)
+    os.waitpid(pid, 0)
+
+    prefix = str(tmp_path)
+    host = socket.gethostname()
+    names = {
+        'dead': f'{_stage.STAGE_PREFIX}{pid}@{host}@a_b',
+        'live': f'{_stage.STAGE_PREFIX}{os.getpid()}@{host}@c_d',
+        'old': f'{_stage.STAGE_PREFIX}{os.getpid()}@other.host@e',
+        'new': f'{_stage.STAGE_PREFIX}{os.getpid()}@other.host@f',
+    }
+    for name in names.values():
+        os.mkdir(os.path.join(prefix, name))
+    old_time = time.time() - 2.0 * _stage.STALE_STAGE_AGE
+    os.utime(os.path.join(prefix, names['old']), (old_time, old_time))
+    assert _stage._stage_owner(names['dead']) == (host, pid)
+
+    _stage._remove_stale_stages(prefix)
+    assert sorted(os.listdir(prefix)) == sorted(
+        (names['live'], names['new']))
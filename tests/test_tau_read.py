@@ -0,0 +1,146 @@
+""" Test the reads of the tau samples
+"""
+
+import numpy
+import pytest
+from mechlib.filesys import read
+
+
+class _Data:
+    """ Data of one kind for each tau sample, counting the reads
+    """
+
+    def __init__(self, name, reads):
+        self.name = name
+        self.reads = reads
+
+    def read(self, locs):
+        """ Read the data of a sample file
+        """
+        self.reads.append(('file', self.name, locs))
+        return _value(self.name, locs)
+
+    def read_all(self, locs_lst):
+        """ Read the data of the samples from the JSON database
+        """
+        self.reads.append(('json', self.name, tuple(locs_lst)))
+        return [_value(self.name, locs) for locs in locs_lst]
+
+
+class _Layer:  # pylint: disable=too-few-public-methods
+    """ Files and JSON database of the tau samples
+    """
+
+    def __init__(self, reads):
+        names = ('energy', 'geometry', 'gradient', 'hessian')
+        self.file = type('File', (), {
+            name: _Data(name, reads) for name in names})()
+        self.json = type('Json', (), {
+            name: _Data(name, reads) for name in names})()
+
+
+def _value(name, locs):
+    """ Stand-in data of a sample
+    """
+    return (name, locs[0])
+
+
+def _tau_fs():
+    """ Stand-in for a TAU filesystem that records the reads
+    """
+    reads = []
+    return [None, _Layer(reads)], reads
+
+
+TAU_LOCS = tuple((f't{idx}',) for idx in range(7))
+
+
+def test__directory_chunks():
+    """ test read.tau_sample_data for files read in chunks
+    """
+
+    tau_fs, reads = _tau_fs()
+    hesses = read.tau_sample_data(
+        tau_fs, TAU_LOCS, 'hessian', db_style='directory', chunk_size=3)
+    assert not reads
+    assert len(hesses) == 7
+
+    # Indexing reads the chunk holding the sample once
+    assert hesses[4] == ('hessian', 't4')
+    assert hesses[5] == ('hessian', 't5')
+    assert hesses[-4] == ('hessian', 't3')
+    assert [locs for _, _, locs in reads] == [('t3',), ('t4',), ('t5',)]
+    assert hesses[1:7:2] == [('hessian', f't{idx}') for idx in (1, 3, 5)]
+    with pytest.raises(IndexError):
+        _ = hesses[7]
+
+    # Iterating reads every sample once
+    del reads[:]
+    assert list(hesses) == [('hessian', locs[0]) for locs in TAU_LOCS]
+    assert len(reads) == 7
+
+
+def test__jsondb():
+    """ test that the tau sample reads read the JSON database in chunks
+    """
+
+    tau_fs, reads = _tau_fs()
+    grads = read.tau_sample_data(tau_fs, TAU_LOCS, 'gradient', chunk_size=3)
+    assert list(grads) == [('gradient', locs[0]) for locs in TAU_LOCS]
+    assert reads == [('json', 'gradient', TAU_LOCS[i:i+3])
+                     for i in (0, 3, 6)]
+
+    del reads[:]
+    assert grads[6] == ('gradient', 't6')
+    assert grads[0] == ('gradient', 't0')
+    assert reads == [('json', 'gradient', TAU_LOCS[6:]),
+                     ('json', 'gradient', TAU_LOCS[:3])]
+
+    with pytest.raises(AssertionError):
+        read.tau_sample_data(tau_fs, TAU_LOCS, 'energy')
+
+
+def test__tau_samples(monkeypatch):
+    """ test read.tau_samples
+    """
+
+    tau_fs, reads = _tau_fs()
+    monkeypatch.setattr(
+        read, 'build_fs', lambda *args, **kwargs: (None, tau_fs))
+    samp_dct = {'save_prefix': 'save', 'spc_locs': ('InChI=1S/H', 0, 2),
+                'thy_locs': ('gaussian09', 'b3lyp', '6-31g*', 'U'),
+                'tau_locs': TAU_LOCS, 'db_style': 'jsondb',
+                'hessians': False}
+
+    # Only the energies are read before the samples are walked
+    tau_fs[-1].json.energy.read_all = lambda locs_lst: [0.0] * len(locs_lst)
+    enes, geos, grads, hessians = read.tau_samples(samp_dct, chunk_size=3)
+    assert numpy.allclose(enes, numpy.zeros(7))
+    assert not reads
+    assert list(geos) == [('geometry', locs[0]) for locs in TAU_LOCS]
+    assert grads == [] and hessians == []
+
+    samp_dct['hessians'] = True
+    _, _, grads, hessians = read.tau_samples(samp_dct, chunk_size=3)
+    assert hessians[3] == ('hessian', 't3')
+    assert len(grads) == 7
+
+
+def test__tau_sample_energies():
+    """ test read.tau_sample_energies
+    """
+
+    class _Energy:  # pylint: disable=too-few-public-methods
+        """ Energies of the samples
+        """
+        @staticmethod
+        def read_all(locs_lst):
+            """ Read the energies from the JSON database
+            """
+            return [float(locs[0][1:]) for locs in locs_lst]
+
+    tau_fs, _ = _tau_fs()
+    tau_fs[-1].json.energy = _Energy()
+    assert numpy.allclose(
+        read.tau_sample_energies(tau_fs, TAU_LOCS), numpy.arange(7))
+    assert read.tau_sample_energies(tau_fs, ()).size == 0
@@ -0,0 +1,129 @@
+""" Test the uniqueness checks against saved conformers
+"""
+
+# pylint: disable=protected-access
+import numpy
+from mechlib.filesys import unique
+
+
+# Water and a copy with the hydrogens swapped, in bohr
+GEO = (('O', (0.0, 0.0, 0.0)),
+       ('H', (0.0, 1.4305, 1.1092)),
+       ('H', (0.0, -1.4305, 1.1092)))
+SWAP_GEO = (GEO[0], GEO[2], GEO[1])
+# Water with one OH bond stretched
+STRETCH_GEO = (('O', (0.0, 0.0, 0.0)),
+               ('H', (0.0, 1.4305, 1.1092)),
+               ('H', (0.0, -2.4305, 2.1092)))
+ENE = -76.4
+
+
+def test__near_energy_idxs():
+    """ test unique._near_energy_idxs
+    """
+    assert unique._near_energy_idxs(ENE, (), 1.0e-5).size == 0
+    assert list(unique._near_energy_idxs(
+        ENE, (ENE + 1.0e-3, ENE + 1.0e-6, ENE), 1.0e-5)) == [1, 2]
+
+
+def test__descriptors():
+    """ test unique.descriptors
+    """
+
+    # Descriptors of a geometry are only computed once
+    dmat, spec = unique.descriptors(GEO)
+    assert unique.descriptors(GEO)[0] is dmat
+    assert dmat.shape == (3, 3)
+    assert spec.shape == (3,)
+
+    # Geometries that cannot be hashed are still handled
+    list_geo = tuple((sym, list(xyz)) for sym, xyz in GEO)
+    assert numpy.allclose(unique.descriptors(list_geo)[0], dmat)
+
+
+def test__prefilters():
+    """ test unique._dist_candidates and unique._coulomb_candidates
+    """
+    geos = (STRETCH_GEO, GEO, SWAP_GEO)
+    assert list(unique._dist_candidates(
+        GEO, geos, unique.DIST_THRESH)) == [1, 2]
+    assert list(unique._coulomb_candidates(
+        GEO, geos, unique.COULOMB_RTOL)) == [1, 2]
+    assert unique._dist_candidates(GEO, (), unique.DIST_THRESH).size == 0
+
+
+def test__geo_unique():
+    """ test unique.geo_unique
+    """
+    assert not unique.geo_unique(GEO, ENE, (STRETCH_GEO, GEO), (ENE, ENE))
+    # Geometries are only compared if an energy lies within the threshold
+    assert unique.geo_unique(GEO, ENE, (GEO,), (ENE + 1.0e-3,))
+    assert unique.geo_unique(GEO, ENE, (STRETCH_GEO,), (ENE,))
+    assert unique.geo_unique(GEO, ENE, (), ())
+
+
+def test__sym_unique():
+    """ test unique.sym_unique
+    """
+
+    # The index points into the full list of saved geometries
+    saved_geos = (STRETCH_GEO, GEO, SWAP_GEO)
+    saved_enes = (ENE, ENE + 1.0e-3, ENE)
+    assert unique.sym_unique(GEO, ENE, saved_geos, saved_enes) == 2
+    assert unique.sym_unique(
+        GEO, ENE, saved_geos[:2], saved_enes[:2]) is None
+
+
+def test__batch_unique():
+    """ test unique.batch_unique
+    """
+
+    # Geometries are compared against the earlier unique ones of the batch
+    geos = (GEO, SWAP_GEO, STRETCH_GEO, GEO)
+    enes = (ENE, ENE, ENE, ENE + 1.0e-3)
+    assert unique.batch_unique(geos, enes, (), ()) == (
+        (True, None), (False, None), (True, None), (True, None))
+
+    # and give the same results as the checks of single geometries
+    saved_geos = (STRETCH_GEO, GEO, SWAP_GEO)
+    saved_enes = (ENE, ENE + 1.0e-3, ENE)
+    assert unique.batch_unique(
+        (GEO, STRETCH_GEO), (ENE + 1.0e-3, ENE - 1.0e-2),
+        saved_geos, saved_enes) == (
+            (unique.geo_unique(GEO, ENE + 1.0e-3, saved_geos, saved_enes),
+             None),
+            (True, None))
+
+
+def test__buckets_and_torsions():
+    """ test unique._bucket_near_energy_idxs and unique._torsion_candidates
+    """
+
+    enes = (ENE, ENE + 0.9e-5, ENE + 1.5e-5, ENE - 3.0e-5)
+    buckets = {}
+    for idx, ene in enumerate(enes):
+        buckets.setdefault(unique._ene_bucket(ene, 1.0e-5), []).append(idx)
+    assert list(unique._bucket_near_energy_idxs(
+        ENE, enes, buckets, 1.0e-5)) == [0, 1]
+    assert unique._bucket_near_energy_idxs(
+        ENE + 1.0, enes, buckets, 1.0e-5).size == 0
+
+    # Torsional angles are compared across the periodic boundary
+    fprints = [numpy.array([0.1, 3.1]), numpy.array([6.2, -3.1]),
+               numpy.array([1.0, 3.1])]
+    assert list(unique._torsion_candidates(
+        numpy.array([0.0, 3.14]), fprints, unique.TORS_THRESH)) == [0, 1]
+    assert list(unique._torsion_candidates(
+        numpy.array([]), [numpy.array([])] * 2, unique.TORS_THRESH)) == [0, 1]
+    assert unique._torsion_candidates(
+        numpy.array([0.0]), [], unique.TORS_THRESH).size == 0
+
+
+if __name__ == '__main__':
+    test__near_energy_idxs()
+    test__descriptors()
+    test__prefilters()
+    test__geo_unique()
+    test__sym_unique()
+    test__batch_unique()
+    test__buckets_and_torsions()